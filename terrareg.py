@@ -2,7 +2,11 @@
 from argparse import ArgumentParser
 
 from terrareg.server import Server
+import terrareg.analytics
 import terrareg.config
+import terrareg.models
+import terrareg.module_extraction_worker
+import terrareg.provider_release_poller
 
 
 parser = ArgumentParser('terrareg')
@@ -14,11 +18,57 @@ parser.add_argument('--ssl-cert-private-key', dest='ssl_priv_key',
 parser.add_argument('--ssl-cert-public-key', dest='ssl_pub_key',
                     default=config.SSL_CERT_PUBLIC_KEY,
                     help='Path to SSL public key')
+parser.add_argument('--extraction-worker', dest='extraction_worker',
+                    action='store_true', default=False,
+                    help='Run module extraction workers, without starting the server')
+parser.add_argument('--provider-release-worker', dest='provider_release_worker',
+                    action='store_true', default=False,
+                    help='Run provider release poller and provider index workers, without starting the server')
+parser.add_argument('--compact-analytics', dest='compact_analytics',
+                    action='store_true', default=False,
+                    help='Roll up module downloads from previous days into the daily download table, archive downloads older than ANALYTICS_RETENTION_DAYS and exit')
+parser.add_argument('--backfill-graph-data', dest='backfill_graph_data',
+                    action='store_true', default=False,
+                    help='Generate graph data for module versions indexed before graph data was pre-generated and exit')
 
 args = parser.parse_args()
 
 s = Server(ssl_public_key=args.ssl_pub_key, ssl_private_key=args.ssl_priv_key)
 
+if args.compact_analytics:
+    rollup_count = terrareg.analytics.AnalyticsEngine.compact_download_rollup()
+    print(f'Created {rollup_count} daily download rollup rows')
+    archived_count = terrareg.analytics.AnalyticsEngine.archive_analytics()
+    print(f'Archived {archived_count} downloads')
+    exit(0)
+
+if args.backfill_graph_data:
+    backfill_count = terrareg.models.ModuleDetails.backfill_graph_json()
+    print(f'Generated graph data for {backfill_count} module details')
+    exit(0)
+
+if args.extraction_worker:
+    worker_pool = terrareg.module_extraction_worker.ModuleExtractionWorkerPool(
+        worker_count=max(config.MODULE_EXTRACTION_WORKER_COUNT, 1)
+    )
+    worker_pool.start()
+    worker_pool.join()
+    exit(0)
+
+if args.provider_release_worker:
+    scheduler = terrareg.provider_release_poller.ProviderReleaseScheduler(
+        worker_count=max(config.PROVIDER_INDEX_WORKER_COUNT, 1)
+    )
+    scheduler.start()
+    scheduler.join()
+    exit(0)
+
+if config.ASYNC_MODULE_EXTRACTION and config.MODULE_EXTRACTION_WORKER_COUNT:
+    terrareg.module_extraction_worker.ModuleExtractionWorkerPool().start()
+
+if config.PROVIDER_RELEASE_POLL_INTERVAL and config.PROVIDER_INDEX_WORKER_COUNT:
+    terrareg.provider_release_poller.ProviderReleaseScheduler().start()
+
 if config.SERVER == terrareg.config.ServerType.WAITRESS:
     s.run_waitress()
 else:
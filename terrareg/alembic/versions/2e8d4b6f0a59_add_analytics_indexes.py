@@ -0,0 +1,30 @@
+"""Add indexes to analytics table
+
+Revision ID: 2e8d4b6f0a59
+Revises: 9c3f6a2e8b17
+Create Date: 2026-10-16 22:03:19.774120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e8d4b6f0a59'
+down_revision = '9c3f6a2e8b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_analytics_timestamp', 'analytics', ['timestamp'], unique=False)
+    op.create_index('ix_analytics_parent_module_version_timestamp', 'analytics', ['parent_module_version', 'timestamp'], unique=False)
+    op.create_index('ix_analytics_parent_module_version_token_environment', 'analytics', ['parent_module_version', 'analytics_token', 'environment'], unique=False)
+    op.create_index('ix_analytics_module_provider_names', 'analytics', ['module_name', 'provider_name', 'namespace_name'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_analytics_module_provider_names', table_name='analytics')
+    op.drop_index('ix_analytics_parent_module_version_token_environment', table_name='analytics')
+    op.drop_index('ix_analytics_parent_module_version_timestamp', table_name='analytics')
+    op.drop_index('ix_analytics_timestamp', table_name='analytics')
@@ -0,0 +1,35 @@
+"""Add analytics daily download table
+
+Revision ID: 3b5e1c9a7d42
+Revises: e98dbcb7eb8a
+Create Date: 2026-10-16 11:02:17.204815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b5e1c9a7d42'
+down_revision = 'e98dbcb7eb8a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('analytics_daily_download',
+    sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+    sa.Column('module_version_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('environment', sa.String(length=128), nullable=True),
+    sa.Column('download_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_analytics_daily_download_date'), 'analytics_daily_download', ['date'], unique=False)
+    op.create_index('ix_analytics_daily_download_module_version_id_date', 'analytics_daily_download', ['module_version_id', 'date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_analytics_daily_download_module_version_id_date', table_name='analytics_daily_download')
+    op.drop_index(op.f('ix_analytics_daily_download_date'), table_name='analytics_daily_download')
+    op.drop_table('analytics_daily_download')
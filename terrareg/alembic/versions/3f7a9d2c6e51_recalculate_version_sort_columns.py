@@ -0,0 +1,72 @@
+"""Recalculate sortable version columns, ranking development and post-releases
+
+Revision ID: 3f7a9d2c6e51
+Revises: 8b3f6d1a9c27
+Create Date: 2026-10-16 10:03:27.918342
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from terrareg.version_sort_key import get_version_sort_key
+
+
+# revision identifiers, used by Alembic.
+revision = '3f7a9d2c6e51'
+down_revision = '8b3f6d1a9c27'
+branch_labels = None
+depends_on = None
+
+
+VERSION_TABLES = ['module_version', 'provider_version']
+
+
+def get_previous_version_sort_key(version):
+    """Return sort key columns, as generated prior to this revision"""
+    match = re.match(r'^([0-9]+)\.([0-9]+)\.([0-9]+)(?:-(.+))?$', version or '')
+    if not match:
+        return {
+            'version_major': 0, 'version_minor': 0, 'version_patch': 0,
+            'version_prerelease_rank': 0, 'version_prerelease': '',
+        }
+
+    major, minor, patch, prerelease = match.groups()
+    prerelease_key = ''
+    if prerelease:
+        prerelease_label, prerelease_number = re.match(r'^(.*?)([0-9]*)$', prerelease).groups()
+        prerelease_key = prerelease_label
+        if prerelease_number:
+            prerelease_key += prerelease_number.lstrip('0').rjust(10, '0')
+
+    return {
+        'version_major': int(major),
+        'version_minor': int(minor),
+        'version_patch': int(patch),
+        'version_prerelease_rank': 0 if prerelease else 1,
+        'version_prerelease': prerelease_key[:128],
+    }
+
+
+def update_sort_columns(get_sort_key):
+    """Update sort columns of all versions, using sort key function"""
+    c = op.get_bind()
+    for table_name in VERSION_TABLES:
+        res = c.execute(sa.sql.text(f"SELECT id, version FROM {table_name}")).fetchall()
+        for row_id, version in res:
+            c.execute(
+                sa.sql.text(f"""
+                    UPDATE {table_name}
+                    SET version_major=:version_major, version_minor=:version_minor, version_patch=:version_patch,
+                        version_prerelease_rank=:version_prerelease_rank, version_prerelease=:version_prerelease
+                    WHERE id=:id
+                """),
+                id=row_id, **get_sort_key(version))
+
+
+def upgrade():
+    update_sort_columns(get_version_sort_key)
+
+
+def downgrade():
+    update_sort_columns(get_previous_version_sort_key)
@@ -0,0 +1,28 @@
+"""Add content_hash column to submodule and force_full_extraction column to module_extraction_job
+
+Revision ID: 4a7d2e9c1b38
+Revises: c3f81d6a2e57
+Create Date: 2026-10-16 18:26:05.772941
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a7d2e9c1b38'
+down_revision = 'c3f81d6a2e57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('submodule', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('module_extraction_job', sa.Column('force_full_extraction', sa.Boolean(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('module_extraction_job') as module_extraction_job_op:
+        module_extraction_job_op.drop_column('force_full_extraction')
+    with op.batch_alter_table('submodule') as submodule_op:
+        submodule_op.drop_column('content_hash')
@@ -0,0 +1,58 @@
+"""Add analytics rollup state table
+
+Revision ID: 5d2a8c1f7e64
+Revises: 2e8d4b6f0a59
+Create Date: 2026-10-16 23:41:06.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2a8c1f7e64'
+down_revision = '2e8d4b6f0a59'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('analytics_rollup_state',
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('last_analytics_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Convert date-based rollup into an analytics ID high-water mark.
+    # Downloads were previously rolled up for all days up to the latest rolled up date,
+    # so roll up any downloads below the mark with a later date, which had not yet been rolled up.
+    c = op.get_bind()
+    rollup_end_date = c.execute(sa.sql.text("SELECT MAX(date) FROM analytics_daily_download")).scalar()
+    if rollup_end_date is None:
+        return
+
+    last_analytics_id = c.execute(
+        sa.sql.text("SELECT MAX(id) FROM analytics WHERE DATE(timestamp) <= :rollup_end_date"),
+        rollup_end_date=rollup_end_date
+    ).scalar()
+    if last_analytics_id is None:
+        return
+
+    c.execute(
+        sa.sql.text("""
+            INSERT INTO analytics_daily_download (module_version_id, date, environment, download_count)
+            SELECT parent_module_version, DATE(timestamp), environment, COUNT(*)
+            FROM analytics
+            WHERE id <= :last_analytics_id AND DATE(timestamp) > :rollup_end_date
+            GROUP BY parent_module_version, DATE(timestamp), environment
+        """),
+        last_analytics_id=last_analytics_id, rollup_end_date=rollup_end_date
+    )
+    c.execute(
+        sa.sql.text("INSERT INTO analytics_rollup_state (name, last_analytics_id) VALUES ('module_download', :last_analytics_id)"),
+        last_analytics_id=last_analytics_id
+    )
+
+
+def downgrade():
+    op.drop_table('analytics_rollup_state')
@@ -0,0 +1,107 @@
+"""Add module version dependency table
+
+Revision ID: 5d2a8c4f1e63
+Revises: 3b5e1c9a7d42
+Create Date: 2026-10-16 14:21:36.418206
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from terrareg.alembic.versions import Enum
+from terrareg.utils import sanitise_html_content
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2a8c4f1e63'
+down_revision = '3b5e1c9a7d42'
+branch_labels = None
+depends_on = None
+
+
+def get_dependency_rows(terraform_docs):
+    """Obtain module and provider dependency rows from terraform-docs blob"""
+    if not terraform_docs:
+        return []
+    if isinstance(terraform_docs, bytes):
+        terraform_docs = terraform_docs.decode('utf-8')
+    try:
+        module_specs = json.loads(terraform_docs)
+    except ValueError:
+        return []
+
+    rows = []
+    for module in module_specs.get('modules') or []:
+        source = module.get('source') or ''
+        # Ignore any modules that reference local directories
+        if source.startswith('./') or source.startswith('../'):
+            continue
+        rows.append({
+            'dependency_type': 'MODULE',
+            'name': module.get('name'),
+            'namespace': None,
+            'source': source,
+            'version': module.get('version'),
+        })
+
+    for provider in module_specs.get('providers') or []:
+        name_split = provider['name'].split('/')
+        name = provider['name']
+        namespace = 'hashicorp'
+        if len(name_split) > 1:
+            namespace = name_split[0]
+            name = '/'.join(name_split[1:])
+        rows.append({
+            'dependency_type': 'PROVIDER',
+            'name': sanitise_html_content(name),
+            'namespace': sanitise_html_content(namespace),
+            'source': '',
+            'version': provider.get('version'),
+        })
+    return rows
+
+
+def upgrade():
+    op.create_table('module_version_dependency',
+    sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+    sa.Column('module_version_id', sa.Integer(), nullable=False),
+    sa.Column('path', sa.String(length=1024), nullable=False),
+    sa.Column('dependency_type', Enum('MODULE', 'PROVIDER', name='moduledependencytype'), nullable=False),
+    sa.Column('name', sa.String(length=128), nullable=True),
+    sa.Column('namespace', sa.String(length=128), nullable=True),
+    sa.Column('source', sa.String(length=1024), nullable=True),
+    sa.Column('version', sa.String(length=128), nullable=True),
+    sa.ForeignKeyConstraint(['module_version_id'], ['module_version.id'], name='fk_module_version_dependency_module_version_id_module_version_id', onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_module_version_dependency_module_version_id'), 'module_version_dependency', ['module_version_id'], unique=False)
+
+    # Populate dependencies of pre-existing module versions and their submodules
+    c = op.get_bind()
+    res = c.execute(sa.sql.text("""
+        SELECT module_version.id, '' AS path, module_details.terraform_docs
+        FROM module_version
+        INNER JOIN module_details ON module_details.id = module_version.module_details_id
+        UNION ALL
+        SELECT submodule.parent_module_version, submodule.path, module_details.terraform_docs
+        FROM submodule
+        INNER JOIN module_details ON module_details.id = submodule.module_details_id
+        WHERE submodule.type = 'submodule'
+    """)).fetchall()
+    for module_version_id, path, terraform_docs in res:
+        for row in get_dependency_rows(terraform_docs):
+            c.execute(
+                sa.sql.text("""
+                    INSERT INTO module_version_dependency(module_version_id, path, dependency_type, name, namespace, source, version)
+                    VALUES(:module_version_id, :path, :dependency_type, :name, :namespace, :source, :version)
+                """),
+                module_version_id=module_version_id, path=path, **row)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_module_version_dependency_module_version_id'), table_name='module_version_dependency')
+    op.drop_table('module_version_dependency')
+
+    if op.get_bind().engine.name == 'postgresql':
+        op.execute('DROP TYPE moduledependencytype')
@@ -0,0 +1,53 @@
+"""Add provider release poll columns and provider_index_job table
+
+Revision ID: 7b1e5f3a9d42
+Revises: 4a7d2e9c1b38
+Create Date: 2026-10-16 20:04:37.118264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from terrareg.alembic.versions import Enum
+
+
+# revision identifiers, used by Alembic.
+revision = '7b1e5f3a9d42'
+down_revision = '4a7d2e9c1b38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('provider', sa.Column('last_release_poll_at', sa.DateTime(), nullable=True))
+    op.add_column('provider', sa.Column('last_release_poll_error', sa.String(length=1024), nullable=True))
+    op.create_index(op.f('ix_provider_last_release_poll_at'), 'provider', ['last_release_poll_at'], unique=False)
+
+    op.create_table('provider_index_job',
+    sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+    sa.Column('provider_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.String(length=128), nullable=False),
+    sa.Column('status', Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='providerindexjobstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('worker_id', sa.String(length=128), nullable=True),
+    sa.Column('error', sa.String(length=1024), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['provider_id'], ['provider.id'], name='fk_provider_index_job_provider_id_provider_id', onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_provider_index_job_status'), 'provider_index_job', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_provider_index_job_status'), table_name='provider_index_job')
+    op.drop_table('provider_index_job')
+
+    if op.get_bind().engine.name == 'postgresql':
+        op.execute('DROP TYPE providerindexjobstatus')
+
+    op.drop_index(op.f('ix_provider_last_release_poll_at'), table_name='provider')
+    with op.batch_alter_table('provider') as provider_op:
+        provider_op.drop_column('last_release_poll_error')
+        provider_op.drop_column('last_release_poll_at')
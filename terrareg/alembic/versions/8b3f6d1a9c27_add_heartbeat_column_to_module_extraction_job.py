@@ -0,0 +1,30 @@
+"""Add heartbeat_at column to module extraction job
+
+Revision ID: 8b3f6d1a9c27
+Revises: 5d2a8c1f7e64
+Create Date: 2026-10-16 09:12:44.513870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b3f6d1a9c27'
+down_revision = '5d2a8c1f7e64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('module_extraction_job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+    # Use start time of running jobs as initial heartbeat
+    c = op.get_bind()
+    c.execute(sa.sql.text("UPDATE module_extraction_job SET heartbeat_at=started_at WHERE started_at IS NOT NULL"))
+
+
+def downgrade():
+    with op.batch_alter_table('module_extraction_job', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,58 @@
+"""Add sortable version columns to module_version and provider_version
+
+Revision ID: 9c3f6a2e8b17
+Revises: 7b1e5f3a9d42
+Create Date: 2026-10-16 21:12:48.530761
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from terrareg.version_sort_key import get_version_sort_key
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3f6a2e8b17'
+down_revision = '7b1e5f3a9d42'
+branch_labels = None
+depends_on = None
+
+
+SORT_COLUMNS = ['version_major', 'version_minor', 'version_patch', 'version_prerelease_rank', 'version_prerelease']
+
+VERSION_TABLES = {
+    'module_version': 'module_provider_id',
+    'provider_version': 'provider_id',
+}
+
+
+def upgrade():
+    for table_name, parent_column in VERSION_TABLES.items():
+        with op.batch_alter_table(table_name) as table_op:
+            table_op.add_column(sa.Column('version_major', sa.Integer(), nullable=True))
+            table_op.add_column(sa.Column('version_minor', sa.Integer(), nullable=True))
+            table_op.add_column(sa.Column('version_patch', sa.Integer(), nullable=True))
+            table_op.add_column(sa.Column('version_prerelease_rank', sa.Integer(), nullable=True))
+            table_op.add_column(sa.Column('version_prerelease', sa.String(length=128), nullable=True))
+
+        # Populate sort columns of pre-existing versions
+        c = op.get_bind()
+        res = c.execute(sa.sql.text(f"SELECT id, version FROM {table_name}")).fetchall()
+        for row_id, version in res:
+            c.execute(
+                sa.sql.text(f"""
+                    UPDATE {table_name}
+                    SET version_major=:version_major, version_minor=:version_minor, version_patch=:version_patch,
+                        version_prerelease_rank=:version_prerelease_rank, version_prerelease=:version_prerelease
+                    WHERE id=:id
+                """),
+                id=row_id, **get_version_sort_key(version))
+
+        op.create_index(f'ix_{table_name}_version_sort', table_name, [parent_column] + SORT_COLUMNS, unique=False)
+
+
+def downgrade():
+    for table_name in VERSION_TABLES:
+        op.drop_index(f'ix_{table_name}_version_sort', table_name=table_name)
+        with op.batch_alter_table(table_name) as table_op:
+            for column in reversed(SORT_COLUMNS):
+                table_op.drop_column(column)
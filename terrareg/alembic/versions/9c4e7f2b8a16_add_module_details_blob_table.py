@@ -0,0 +1,146 @@
+"""Add module_details_blob table and move module_details content into it
+
+Revision ID: 9c4e7f2b8a16
+Revises: 5d2a8c4f1e63
+Create Date: 2026-10-16 16:47:12.530918
+
+"""
+import gzip
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e7f2b8a16'
+down_revision = '5d2a8c4f1e63'
+branch_labels = None
+depends_on = None
+
+
+BLOB_COLUMNS = ['readme_content', 'terraform_docs', 'tfsec', 'infracost', 'terraform_graph', 'terraform_modules']
+
+# Must match terrareg.blob_store.BlobStore.MIN_COMPRESSION_SIZE
+MIN_COMPRESSION_SIZE = 128
+
+
+def medium_blob():
+    """Return column type for medium blob."""
+    return sa.LargeBinary(length=16777215).with_variant(mysql.MEDIUMBLOB(), 'mysql')
+
+
+def compress(content):
+    """Return compression type and compressed content"""
+    if len(content) >= MIN_COMPRESSION_SIZE:
+        compressed = gzip.compress(content, mtime=0)
+        if len(compressed) < len(content):
+            return 'gzip', compressed
+    return 'none', content
+
+
+def upgrade():
+    op.create_table('module_details_blob',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('compression', sa.String(length=128), nullable=False),
+    sa.Column('content', medium_blob(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('reference_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    for column in BLOB_COLUMNS:
+        op.add_column('module_details', sa.Column(f'{column}_hash', sa.String(length=64), nullable=True))
+
+    # Move content of each module details row into blob table,
+    # de-duplicating identical content.
+    # Content is obtained for one row at a time, to avoid loading
+    # the content of all rows into memory.
+    c = op.get_bind()
+    reference_counts = {}
+    module_details_ids = [
+        row['id']
+        for row in c.execute(sa.sql.text("SELECT id FROM module_details ORDER BY id")).fetchall()
+    ]
+    for module_details_id in module_details_ids:
+        row = c.execute(
+            sa.sql.text(f"SELECT id, {', '.join(BLOB_COLUMNS)} FROM module_details WHERE id = :id"),
+            id=module_details_id
+        ).first()
+        hashes = {}
+        for column in BLOB_COLUMNS:
+            content = row[column]
+            if content is None:
+                continue
+            content = bytes(content)
+            hash_ = hashlib.sha256(content).hexdigest()
+            hashes[f'{column}_hash'] = hash_
+
+            if hash_ not in reference_counts:
+                reference_counts[hash_] = 0
+                compression, compressed_content = compress(content)
+                c.execute(
+                    sa.sql.text("""
+                        INSERT INTO module_details_blob(hash, compression, content, size, reference_count)
+                        VALUES(:hash, :compression, :content, :size, 0)
+                    """),
+                    hash=hash_, compression=compression, content=compressed_content, size=len(content))
+            reference_counts[hash_] += 1
+
+        if hashes:
+            c.execute(
+                sa.sql.text(f"""
+                    UPDATE module_details SET {', '.join(f'{column} = :{column}' for column in hashes)}
+                    WHERE id = :id
+                """),
+                id=row['id'], **hashes)
+
+    for hash_, reference_count in reference_counts.items():
+        c.execute(
+            sa.sql.text("UPDATE module_details_blob SET reference_count = :reference_count WHERE hash = :hash"),
+            hash=hash_, reference_count=reference_count)
+
+    with op.batch_alter_table('module_details') as module_details_op:
+        for column in BLOB_COLUMNS:
+            module_details_op.drop_column(column)
+
+
+def downgrade():
+    for column in BLOB_COLUMNS:
+        op.add_column('module_details', sa.Column(column, medium_blob(), nullable=True))
+
+    # Restore content from blob table, obtaining the content
+    # for one row at a time, to avoid loading all blobs into memory
+    c = op.get_bind()
+
+    def get_blob_content(hash_):
+        """Return decompressed content of blob"""
+        row = c.execute(
+            sa.sql.text("SELECT compression, content FROM module_details_blob WHERE hash = :hash"),
+            hash=hash_
+        ).first()
+        if row is None:
+            return None
+        content = bytes(row['content'])
+        return gzip.decompress(content) if row['compression'] == 'gzip' else content
+
+    res = c.execute(sa.sql.text(f"SELECT id, {', '.join(f'{column}_hash' for column in BLOB_COLUMNS)} FROM module_details"))
+    for row in res.fetchall():
+        contents = {
+            column: get_blob_content(row[f'{column}_hash'])
+            for column in BLOB_COLUMNS
+            if row[f'{column}_hash']
+        }
+        if contents:
+            c.execute(
+                sa.sql.text(f"""
+                    UPDATE module_details SET {', '.join(f'{column} = :{column}' for column in contents)}
+                    WHERE id = :id
+                """),
+                id=row['id'], **contents)
+
+    with op.batch_alter_table('module_details') as module_details_op:
+        for column in BLOB_COLUMNS:
+            module_details_op.drop_column(f'{column}_hash')
+
+    op.drop_table('module_details_blob')
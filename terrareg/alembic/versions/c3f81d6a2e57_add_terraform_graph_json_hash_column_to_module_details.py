@@ -0,0 +1,39 @@
+"""Add terraform_graph_json_hash column to module_details
+
+Revision ID: c3f81d6a2e57
+Revises: 9c4e7f2b8a16
+Create Date: 2026-10-16 17:32:48.114072
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f81d6a2e57'
+down_revision = '9c4e7f2b8a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('module_details', sa.Column('terraform_graph_json_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    # Remove references to graph JSON blobs and delete any that are no longer used
+    c = op.get_bind()
+    res = c.execute(sa.sql.text("""
+        SELECT terraform_graph_json_hash, COUNT(*) AS reference_count
+        FROM module_details
+        WHERE terraform_graph_json_hash IS NOT NULL
+        GROUP BY terraform_graph_json_hash
+    """)).fetchall()
+    for hash_, reference_count in res:
+        c.execute(
+            sa.sql.text("UPDATE module_details_blob SET reference_count = reference_count - :reference_count WHERE hash = :hash"),
+            hash=hash_, reference_count=reference_count)
+    c.execute(sa.sql.text("DELETE FROM module_details_blob WHERE reference_count <= 0"))
+
+    with op.batch_alter_table('module_details') as module_details_op:
+        module_details_op.drop_column('terraform_graph_json_hash')
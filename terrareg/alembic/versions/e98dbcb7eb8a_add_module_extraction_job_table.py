@@ -0,0 +1,47 @@
+"""Add module extraction job table
+
+Revision ID: e98dbcb7eb8a
+Revises: c72f7c6ef6a7
+Create Date: 2026-10-16 09:12:41.530127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+from terrareg.alembic.versions import Enum
+
+
+# revision identifiers, used by Alembic.
+revision = 'e98dbcb7eb8a'
+down_revision = 'c72f7c6ef6a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('module_extraction_job',
+    sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+    sa.Column('module_provider_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.String(length=128), nullable=False),
+    sa.Column('status', Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='moduleextractionjobstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('progress', sa.String(length=128), nullable=True),
+    sa.Column('worker_id', sa.String(length=128), nullable=True),
+    sa.Column('error', sa.String(length=1024), nullable=True),
+    sa.Column('log', sa.LargeBinary(length=16777215).with_variant(mysql.MEDIUMBLOB(), 'mysql'), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['module_provider_id'], ['module_provider.id'], name='fk_module_extraction_job_module_provider_id_module_provider_id', onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_module_extraction_job_status'), 'module_extraction_job', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_module_extraction_job_status'), table_name='module_extraction_job')
+    op.drop_table('module_extraction_job')
+
+    if op.get_bind().engine.name == 'postgresql':
+        op.execute('DROP TYPE moduleextractionjobstatus')
@@ -1,4 +1,6 @@
 
+import gzip
+import json
 import re
 import datetime
 from typing import Union, List, Optional
@@ -7,9 +9,16 @@ import sqlalchemy
 
 from terrareg.database import Database
 from terrareg.config import Config
+import terrareg.analytics_buffer
+import terrareg.file_storage
 import terrareg.models
 import terrareg.provider_version_model
 import terrareg.provider_model
+import terrareg.provider_index_job_model
+import terrareg.provider_release_poller
+import terrareg.terraform_plugin_cache
+import terrareg.git_mirror_cache
+import terrareg.rendered_markdown_cache
 import terrareg.database
 
 
@@ -21,6 +30,23 @@ class AnalyticsEngine:
 
     DEFAULT_ENVIRONMENT_NAME = 'Default'
 
+    # Directory in file storage containing archived analytics
+    ARCHIVE_DIRECTORY = '/analytics_archive'
+    # Number of analytics rows read from the database for each write to an archive file
+    ARCHIVE_BATCH_SIZE = 10000
+    # Name of module download rollup in analytics rollup state table
+    DOWNLOAD_ROLLUP_NAME = 'module_download'
+
+    # Minimum age of downloads that are rolled up, so that rows
+    # with an ID lower than the rollup high-water mark, which are
+    # inserted by transactions that have not yet committed, are not skipped
+    DOWNLOAD_ROLLUP_SAFETY_WINDOW = datetime.timedelta(minutes=5)
+
+    # Minimum number of days of downloads retained in the analytics table.
+    # Download statistics count the first (partial) day of each interval,
+    # the longest being a year, from the analytics table.
+    MINIMUM_ANALYTICS_RETENTION_DAYS = 366
+
     @classmethod
     def get_datetime_now(cls):
         """Return datetime now"""
@@ -124,6 +150,17 @@ class AnalyticsEngine:
 
         return analytics_token
 
+    @staticmethod
+    def insert_analytics_event(table_name: str, **values):
+        """Insert row into analytics table, or add to analytics buffer, if enabled."""
+        if terrareg.analytics_buffer.AnalyticsBuffer.is_enabled():
+            terrareg.analytics_buffer.AnalyticsBuffer.get().add(table_name, values)
+            return
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(getattr(db, table_name).insert().values(**values))
+
     @staticmethod
     def record_module_version_download(
         namespace_name: str,
@@ -152,8 +189,8 @@ class AnalyticsEngine:
         environment = AnalyticsEngine.get_environment_from_token(auth_token)
 
         # Insert analytics details into DB
-        db = Database.get()
-        insert_statement = db.analytics.insert().values(
+        AnalyticsEngine.insert_analytics_event(
+            'analytics',
             parent_module_version=module_version.pk,
             timestamp=AnalyticsEngine.get_datetime_now(),
             terraform_version=terraform_version,
@@ -164,20 +201,240 @@ class AnalyticsEngine:
             module_name=module_name,
             provider_name=provider_name
         )
+
+    @classmethod
+    def _get_download_rollup_last_id(cls, conn) -> Optional[int]:
+        """
+        Return the ID of the latest analytics row that has been rolled up into the daily download table.
+
+        All analytics rows up to this ID have been rolled up, and no later rows.
+        """
+        db = Database.get()
+        return conn.execute(sqlalchemy.select(
+            db.analytics_rollup_state.c.last_analytics_id
+        ).where(
+            db.analytics_rollup_state.c.name == cls.DOWNLOAD_ROLLUP_NAME
+        )).scalar()
+
+    @classmethod
+    def compact_download_rollup(cls) -> int:
+        """
+        Roll up downloads for all days prior to the current day into the daily download table.
+
+        Analytics rows are rolled up in order of ID, after the latest row already rolled up,
+        up to the first download of the current day or within the rollup safety window,
+        so that downloads in uncommitted transactions, with a lower ID than downloads that
+        have been committed, are not skipped.
+        Downloads recorded with an earlier timestamp after the rollup (e.g. from the analytics buffer)
+        are rolled up by the next run, creating additional rows for the day.
+
+        This should be run periodically from a single process (see `python terrareg.py --compact-analytics`).
+        Returns the number of rollup rows created.
+        """
+        db = Database.get()
+        now = cls.get_datetime_now()
+        rollup_end = min(
+            datetime.datetime.combine(now.date(), datetime.time.min),
+            now - cls.DOWNLOAD_ROLLUP_SAFETY_WINDOW
+        )
+
+        with Database.start_transaction() as transaction:
+            conn = transaction.connection
+            previous_last_id = cls._get_download_rollup_last_id(conn)
+            not_rolled_up_condition = (
+                db.analytics.c.id > previous_last_id
+                if previous_last_id is not None else
+                sqlalchemy.true()
+            )
+
+            # Roll up rows before the first download of the current day,
+            # or within the safety window, so that these are not rolled up
+            first_excluded_id = conn.execute(sqlalchemy.select(
+                sqlalchemy.func.min(db.analytics.c.id)
+            ).where(
+                not_rolled_up_condition,
+                db.analytics.c.timestamp >= rollup_end
+            )).scalar()
+            if first_excluded_id is not None:
+                last_id = first_excluded_id - 1
+            else:
+                last_id = conn.execute(sqlalchemy.select(
+                    sqlalchemy.func.max(db.analytics.c.id)
+                ).where(
+                    not_rolled_up_condition
+                )).scalar()
+
+            if last_id is None or (previous_last_id is not None and last_id <= previous_last_id):
+                return 0
+
+            download_date = sqlalchemy.func.date(db.analytics.c.timestamp)
+            select = sqlalchemy.select(
+                db.analytics.c.parent_module_version,
+                download_date,
+                db.analytics.c.environment,
+                sqlalchemy.func.count()
+            ).select_from(
+                db.analytics
+            ).where(
+                not_rolled_up_condition,
+                db.analytics.c.id <= last_id
+            ).group_by(
+                db.analytics.c.parent_module_version,
+                download_date,
+                db.analytics.c.environment
+            )
+
+            res = conn.execute(
+                db.analytics_daily_download.insert().from_select(
+                    ['module_version_id', 'date', 'environment', 'download_count'],
+                    select
+                )
+            )
+
+            if previous_last_id is None:
+                conn.execute(db.analytics_rollup_state.insert().values(
+                    name=cls.DOWNLOAD_ROLLUP_NAME,
+                    last_analytics_id=last_id
+                ))
+            else:
+                conn.execute(db.analytics_rollup_state.update().where(
+                    db.analytics_rollup_state.c.name == cls.DOWNLOAD_ROLLUP_NAME
+                ).values(
+                    last_analytics_id=last_id
+                ))
+            return res.rowcount
+
+    @classmethod
+    def archive_analytics(cls) -> int:
+        """
+        Move downloads older than ANALYTICS_RETENTION_DAYS from the analytics table into
+        gzip-compressed archive files in the data directory, with an archive file for each month.
+
+        Only downloads that have been rolled up into the daily download table are archived,
+        and downloads within MINIMUM_ANALYTICS_RETENTION_DAYS are always retained,
+        so download statistics are unaffected. This is performed by `python terrareg.py --compact-analytics`,
+        after rolling up downloads.
+        Returns the number of archived downloads.
+        """
+        retention_days = Config().ANALYTICS_RETENTION_DAYS
+        if retention_days <= 0:
+            return 0
+        retention_days = max(retention_days, cls.MINIMUM_ANALYTICS_RETENTION_DAYS)
+
+        db = Database.get()
         with db.get_connection() as conn:
-            conn.execute(insert_statement)
+            rollup_last_id = cls._get_download_rollup_last_id(conn)
+            if rollup_last_id is None:
+                return 0
 
-    def get_total_downloads():
-        """Return number of downloads for a given module version."""
+            retention_start = datetime.datetime.combine(
+                cls.get_datetime_now().date() - datetime.timedelta(days=retention_days),
+                datetime.time.min
+            )
+            oldest_timestamp = conn.execute(sqlalchemy.select(
+                sqlalchemy.func.min(db.analytics.c.timestamp)
+            ).where(
+                db.analytics.c.id <= rollup_last_id,
+                db.analytics.c.timestamp < retention_start
+            )).scalar()
+
+        if oldest_timestamp is None:
+            return 0
+
+        file_storage = terrareg.file_storage.FileStorageFactory().get_file_storage()
+        archived_count = 0
+        month_start = datetime.datetime(year=oldest_timestamp.year, month=oldest_timestamp.month, day=1)
+        while month_start < retention_start:
+            next_month_start = (month_start + datetime.timedelta(days=32)).replace(day=1)
+            archived_count += cls._archive_analytics_range(
+                file_storage=file_storage,
+                from_timestamp=month_start,
+                to_timestamp=min(next_month_start, retention_start),
+                rollup_last_id=rollup_last_id
+            )
+            month_start = next_month_start
+        return archived_count
+
+    @classmethod
+    def _archive_analytics_range(cls, file_storage: 'terrareg.file_storage.BaseFileStorage',
+                                 from_timestamp: datetime.datetime, to_timestamp: datetime.datetime,
+                                 rollup_last_id: int) -> int:
+        """
+        Write rolled up downloads between timestamps to an archive file and delete them from the analytics table.
+
+        The archive file contains a JSON object for each download.
+        Returns the number of archived downloads.
+        """
         db = Database.get()
-        select = sqlalchemy.select(
-            [sqlalchemy.func.count()]
-        ).select_from(
-            db.analytics
+        range_condition = sqlalchemy.and_(
+            db.analytics.c.id <= rollup_last_id,
+            db.analytics.c.timestamp >= from_timestamp,
+            db.analytics.c.timestamp < to_timestamp
         )
         with db.get_connection() as conn:
-            res = conn.execute(select)
-            return res.scalar()
+            id_row = conn.execute(sqlalchemy.select(
+                sqlalchemy.func.min(db.analytics.c.id).label('min_id'),
+                sqlalchemy.func.max(db.analytics.c.id).label('max_id'),
+                sqlalchemy.func.count().label('count')
+            ).where(
+                range_condition
+            )).first()
+        if not id_row['count']:
+            return 0
+
+        # Include ID range in file name, so that downloads archived
+        # for the same month by subsequent runs are stored in a new file
+        archive_name = f"analytics-{from_timestamp.strftime('%Y-%m')}-{id_row['min_id']}-{id_row['max_id']}.jsonl"
+        with file_storage.open_writer(cls.ARCHIVE_DIRECTORY, f"{archive_name}.gz") as fh, \
+                gzip.GzipFile(filename=archive_name, fileobj=fh, mode='wb') as gzip_fh:
+            last_id = id_row['min_id'] - 1
+            while True:
+                with db.get_connection() as conn:
+                    rows = conn.execute(db.analytics.select().where(
+                        range_condition,
+                        db.analytics.c.id > last_id,
+                        db.analytics.c.id <= id_row['max_id']
+                    ).order_by(
+                        db.analytics.c.id
+                    ).limit(cls.ARCHIVE_BATCH_SIZE)).all()
+                if not rows:
+                    break
+
+                for row in rows:
+                    row_data = dict(row)
+                    row_data['timestamp'] = row_data['timestamp'].isoformat()
+                    gzip_fh.write(f"{json.dumps(row_data)}\n".encode('utf-8'))
+                last_id = rows[-1]['id']
+
+        # Delete archived rows, once the archive file has been created
+        with db.get_connection() as conn:
+            conn.execute(db.analytics.delete().where(
+                range_condition,
+                db.analytics.c.id <= id_row['max_id']
+            ))
+        return id_row['count']
+
+    @classmethod
+    def get_total_downloads(cls):
+        """Return total number of module downloads."""
+        db = Database.get()
+        with db.get_connection() as conn:
+            rollup_last_id = cls._get_download_rollup_last_id(conn)
+
+            rollup_select = sqlalchemy.select(
+                sqlalchemy.func.coalesce(sqlalchemy.func.sum(db.analytics_daily_download.c.download_count), 0)
+            ).select_from(
+                db.analytics_daily_download
+            )
+            select = sqlalchemy.select(
+                [sqlalchemy.func.count()]
+            ).select_from(
+                db.analytics
+            )
+            if rollup_last_id is not None:
+                select = select.where(db.analytics.c.id > rollup_last_id)
+
+            return int(conn.execute(rollup_select).scalar()) + conn.execute(select).scalar()
 
     @staticmethod
     def get_global_module_usage_base_query(include_empty_auth_token=False):
@@ -254,50 +511,138 @@ class AnalyticsEngine:
             }
         return data
 
-    def get_module_version_total_downloads(module_version):
+    @classmethod
+    def get_module_version_total_downloads(cls, module_version):
         """Return number of downloads for a given module version."""
-        db = Database.get()
-        select = sqlalchemy.select(
-            [sqlalchemy.func.count()]
-        ).select_from(
-            db.analytics
-        ).join(
-            db.module_version,
-            db.module_version.c.id == db.analytics.c.parent_module_version
-        ).where(
-            db.module_version.c.id == module_version.pk
-        )
-        with db.get_connection() as conn:
-            res = conn.execute(select)
-            return res.scalar()
+        return cls.get_module_versions_total_downloads([module_version]).get(module_version.pk, 0)
+
+    @classmethod
+    def get_module_versions_total_downloads(cls, module_versions):
+        """Return dict of number of downloads, keyed by module version ID, for list of module versions."""
+        module_version_ids = [module_version.pk for module_version in module_versions]
+        total_downloads = {module_version_id: 0 for module_version_id in module_version_ids}
+        if not module_version_ids:
+            return total_downloads
 
-    @staticmethod
-    def get_module_provider_download_stats(module_provider):
-        """Return number of downloads for intervals."""
         db = Database.get()
-        stats = {}
-        for i in [(7, 'week'), (31, 'month'), (365, 'year'), (None, 'total')]:
+        with db.get_connection() as conn:
+            rollup_last_id = cls._get_download_rollup_last_id(conn)
 
+            rollup_select = sqlalchemy.select(
+                db.analytics_daily_download.c.module_version_id,
+                sqlalchemy.func.sum(db.analytics_daily_download.c.download_count)
+            ).select_from(
+                db.analytics_daily_download
+            ).where(
+                db.analytics_daily_download.c.module_version_id.in_(module_version_ids)
+            ).group_by(
+                db.analytics_daily_download.c.module_version_id
+            )
             select = sqlalchemy.select(
-                [sqlalchemy.func.count()]
+                db.analytics.c.parent_module_version,
+                sqlalchemy.func.count()
             ).select_from(
                 db.analytics
+            ).where(
+                db.analytics.c.parent_module_version.in_(module_version_ids)
+            ).group_by(
+                db.analytics.c.parent_module_version
             )
-            select = AnalyticsEngine._join_filter_analytics_table_by_module_provider(
-                db=db, query=select, module_provider=module_provider)
+            if rollup_last_id is not None:
+                select = select.where(db.analytics.c.id > rollup_last_id)
 
-            # If a checking a given time frame, limit by number of days
-            if i[0]:
-                from_timestamp = AnalyticsEngine.get_datetime_now() - datetime.timedelta(days=i[0])
-                select = select.where(
-                    db.analytics.c.timestamp >= from_timestamp
-                )
+            for module_version_id, download_count in conn.execute(rollup_select):
+                total_downloads[module_version_id] += int(download_count)
+            for module_version_id, download_count in conn.execute(select):
+                total_downloads[module_version_id] += download_count
 
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                stats[i[1]] = res.scalar()
+        return total_downloads
 
-        return stats
+    @classmethod
+    def get_module_provider_download_stats(cls, module_provider):
+        """
+        Return number of downloads for intervals.
+
+        Downloads that have been rolled up are obtained from the daily download table,
+        with the analytics table used for the remaining downloads and for the first (partial) day of each interval.
+        """
+        db = Database.get()
+        now = cls.get_datetime_now()
+        intervals = [(7, 'week'), (31, 'month'), (365, 'year'), (None, 'total')]
+
+        with db.get_connection() as conn:
+            rollup_last_id = cls._get_download_rollup_last_id(conn)
+
+            rollup_counts = []
+            raw_counts = []
+            # Conditions for analytics rows that are not included in the rollup
+            raw_row_conditions = []
+            if rollup_last_id is not None:
+                raw_row_conditions.append(db.analytics.c.id > rollup_last_id)
+            for days, _ in intervals:
+                from_timestamp = (now - datetime.timedelta(days=days)) if days else None
+
+                # Count rolled up days, excluding the first day of the interval,
+                # which is only partially included in the interval
+                rollup_condition = sqlalchemy.true()
+                raw_condition = sqlalchemy.true()
+                if from_timestamp is not None:
+                    first_day_end = datetime.datetime.combine(
+                        from_timestamp.date() + datetime.timedelta(days=1),
+                        datetime.time.min
+                    )
+                    rollup_condition = db.analytics_daily_download.c.date >= first_day_end.date()
+                    raw_condition = db.analytics.c.timestamp >= from_timestamp
+                    if rollup_last_id is not None:
+                        raw_condition = sqlalchemy.and_(
+                            raw_condition,
+                            sqlalchemy.or_(
+                                db.analytics.c.timestamp < first_day_end,
+                                db.analytics.c.id > rollup_last_id
+                            )
+                        )
+                        raw_row_conditions.append(sqlalchemy.and_(
+                            db.analytics.c.timestamp >= from_timestamp,
+                            db.analytics.c.timestamp < first_day_end
+                        ))
+                elif rollup_last_id is not None:
+                    raw_condition = db.analytics.c.id > rollup_last_id
+
+                rollup_counts.append(sqlalchemy.func.coalesce(sqlalchemy.func.sum(
+                    sqlalchemy.case((rollup_condition, db.analytics_daily_download.c.download_count), else_=0)
+                ), 0))
+                raw_counts.append(sqlalchemy.func.coalesce(sqlalchemy.func.sum(
+                    sqlalchemy.case((raw_condition, 1), else_=0)
+                ), 0))
+
+            rollup_select = sqlalchemy.select(
+                *rollup_counts
+            ).select_from(
+                db.analytics_daily_download
+            ).join(
+                db.module_version,
+                db.module_version.c.id == db.analytics_daily_download.c.module_version_id
+            ).where(
+                db.module_version.c.module_provider_id == module_provider.pk
+            )
+            raw_select = sqlalchemy.select(
+                *raw_counts
+            ).select_from(
+                db.analytics
+            )
+            raw_select = AnalyticsEngine._join_filter_analytics_table_by_module_provider(
+                db=db, query=raw_select, module_provider=module_provider)
+            # Limit analytics rows to those that are not included in the rollup
+            if raw_row_conditions:
+                raw_select = raw_select.where(sqlalchemy.or_(*raw_row_conditions))
+
+            rollup_row = conn.execute(rollup_select).first() if rollup_last_id is not None else None
+            raw_row = conn.execute(raw_select).first()
+
+        return {
+            name: int(raw_row[itx]) + (int(rollup_row[itx]) if rollup_row else 0)
+            for itx, (_, name) in enumerate(intervals)
+        }
 
     @staticmethod
     def check_module_provider_redirect_usage(module_provider_redirect):
@@ -464,6 +809,9 @@ class AnalyticsEngine:
             conn.execute(db.analytics.delete().where(
                 db.analytics.c.parent_module_version == module_version.pk
             ))
+            conn.execute(db.analytics_daily_download.delete().where(
+                db.analytics_daily_download.c.module_version_id == module_version.pk
+            ))
 
     @classmethod
     def migrate_analytics_to_new_module_version(cls, old_version_version_pk, new_module_version):
@@ -476,6 +824,11 @@ class AnalyticsEngine:
             ).values(
                 parent_module_version=new_module_version.pk
             ))
+            conn.execute(db.analytics_daily_download.update().where(
+                db.analytics_daily_download.c.module_version_id == old_version_version_pk
+            ).values(
+                module_version_id=new_module_version.pk
+            ))
 
     @classmethod
     def get_module_provider_version_statistics(cls):
@@ -572,6 +925,87 @@ class AnalyticsEngine:
             )
         prometheus_generator.add_metric(module_provider_usage_metric)
 
+        # Add Terraform plugin cache metrics, if the cache has been used
+        if (plugin_cache_statistics := terrareg.terraform_plugin_cache.TerraformPluginCache().get_statistics()) is not None:
+            for statistic, type_, help in [
+                    ('hits', 'counter', 'Terraform providers used from the plugin cache during module extraction'),
+                    ('misses', 'counter', 'Terraform providers downloaded into the plugin cache during module extraction'),
+                    ('evictions', 'counter', 'Terraform providers evicted from the plugin cache'),
+                    ('size', 'gauge', 'Size of the Terraform plugin cache in bytes')]:
+                plugin_cache_metric = PrometheusMetric(
+                    name=f'terraform_plugin_cache_{statistic}',
+                    type_=type_,
+                    help=help
+                )
+                plugin_cache_metric.add_data_row(value=plugin_cache_statistics.get(statistic, 0))
+                prometheus_generator.add_metric(plugin_cache_metric)
+
+        # Add git mirror cache metrics, if the cache has been used
+        if Config().ENABLE_GIT_MIRROR_CACHE and (git_mirror_cache_statistics := terrareg.git_mirror_cache.GitMirrorCache().get_statistics()) is not None:
+            for statistic, type_, help in [
+                    ('hits', 'counter', 'Module git clones performed from an existing repository mirror'),
+                    ('misses', 'counter', 'Module git clones that required a new repository mirror'),
+                    ('evictions', 'counter', 'Repository mirrors evicted from the git mirror cache'),
+                    ('size', 'gauge', 'Size of the git mirror cache in bytes')]:
+                git_mirror_cache_metric = PrometheusMetric(
+                    name=f'git_mirror_cache_{statistic}',
+                    type_=type_,
+                    help=help
+                )
+                git_mirror_cache_metric.add_data_row(value=git_mirror_cache_statistics.get(statistic, 0))
+                prometheus_generator.add_metric(git_mirror_cache_metric)
+
+        # Add rendered markdown cache metrics, if the cache is enabled
+        if (markdown_cache_statistics := terrareg.rendered_markdown_cache.RenderedMarkdownCache.get().get_statistics()) is not None:
+            for statistic, type_, help in [
+                    ('hits', 'counter', 'Markdown content served from the rendered markdown cache'),
+                    ('misses', 'counter', 'Markdown content rendered and added to the rendered markdown cache'),
+                    ('evictions', 'counter', 'Rendered markdown content evicted from the cache'),
+                    ('size', 'gauge', 'Size of the rendered markdown cache in bytes')]:
+                markdown_cache_metric = PrometheusMetric(
+                    name=f'rendered_markdown_cache_{statistic}',
+                    type_=type_,
+                    help=help
+                )
+                markdown_cache_metric.add_data_row(value=markdown_cache_statistics.get(statistic, 0))
+                prometheus_generator.add_metric(markdown_cache_metric)
+
+        # Add database connection pool metrics, if a sized connection pool is used
+        if (pool_statistics := terrareg.database.Database.get_pool_statistics()) is not None:
+            for statistic, help in [
+                    ('size', 'Number of connections maintained in the database connection pool'),
+                    ('checked_out', 'Database connections currently in use'),
+                    ('overflow', 'Database connections currently open in addition to the pool size')]:
+                pool_metric = PrometheusMetric(
+                    name=f'database_pool_{statistic}',
+                    type_='gauge',
+                    help=help
+                )
+                pool_metric.add_data_row(value=pool_statistics[statistic])
+                prometheus_generator.add_metric(pool_metric)
+
+        # Add provider release polling metrics, if polling is enabled
+        if Config().PROVIDER_RELEASE_POLL_INTERVAL:
+            now = datetime.datetime.now()
+            latest_poll_at, oldest_poll_at = terrareg.provider_release_poller.ProviderReleasePoller.get_statistics()
+            queued_job_count, oldest_queued_job_at = terrareg.provider_index_job_model.ProviderIndexJob.get_queue_statistics()
+            for name, type_, help, value in [
+                    ('provider_release_poll_last_timestamp', 'gauge', 'Unix timestamp of the most recent poll of a provider source for new releases',
+                     latest_poll_at.timestamp() if latest_poll_at else 0),
+                    ('provider_release_poll_lag_seconds', 'gauge', 'Time since the provider that has gone longest without being polled for new releases was polled',
+                     (now - oldest_poll_at).total_seconds() if oldest_poll_at else 0),
+                    ('provider_index_jobs_queued', 'gauge', 'Provider releases queued for indexing',
+                     queued_job_count),
+                    ('provider_index_queue_lag_seconds', 'gauge', 'Time since the oldest queued provider release was queued for indexing',
+                     (now - oldest_queued_job_at).total_seconds() if oldest_queued_job_at else 0)]:
+                provider_release_metric = PrometheusMetric(
+                    name=name,
+                    type_=type_,
+                    help=help
+                )
+                provider_release_metric.add_data_row(value=value)
+                prometheus_generator.add_metric(provider_release_metric)
+
         return prometheus_generator.generate()
 
 
@@ -616,16 +1050,14 @@ class ProviderAnalytics:
             return
 
         # Insert analytics details into DB
-        db = Database.get()
-        insert_statement = db.provider_analytics.insert().values(
+        AnalyticsEngine.insert_analytics_event(
+            'provider_analytics',
             provider_version_id=provider_version.pk,
             timestamp=AnalyticsEngine.get_datetime_now(),
             terraform_version=terraform_version,
             namespace_name=namespace_name,
             provider_name=provider_name
         )
-        with db.get_connection() as conn:
-            conn.execute(insert_statement)
 
     @staticmethod
     def get_provider_version_total_downloads(provider_version: 'terrareg.provider_version_model.ProviderVersion'):
@@ -0,0 +1,223 @@
+"""Write-behind buffer for recording download analytics."""
+
+import atexit
+import datetime
+import fcntl
+import glob
+import json
+import os
+import threading
+import traceback
+import uuid
+from typing import List, Optional, Tuple
+
+import terrareg.config
+import terrareg.database
+
+
+class AnalyticsBuffer:
+    """
+    Buffer analytics events, inserting them into the database in batches.
+
+    Each event is appended to a spool file before being buffered in memory,
+    so that events can be recovered if the process exits before they are inserted.
+    Each process writes to its own spool file, which is locked whilst the process is running.
+    Spool files that are not locked, which were left by processes that have exited,
+    are inserted into the database by the flush thread when it starts.
+    """
+
+    _INSTANCE = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    # Tables that events may be recorded for
+    _TABLES = ['analytics', 'provider_analytics']
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """Return whether analytics buffering is enabled"""
+        return terrareg.config.Config().ANALYTICS_BUFFER_MAX_EVENTS > 0
+
+    @classmethod
+    def get(cls) -> 'AnalyticsBuffer':
+        """Return buffer instance for process, starting it if it has not yet been created"""
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is None:
+                cls._INSTANCE = cls()
+                cls._INSTANCE.start()
+            return cls._INSTANCE
+
+    def __init__(self, spool_directory: Optional[str]=None,
+                 max_events: Optional[int]=None,
+                 flush_interval: Optional[float]=None):
+        """Store member variables"""
+        config = terrareg.config.Config()
+        self._spool_directory = config.ANALYTICS_BUFFER_SPOOL_DIRECTORY if spool_directory is None else spool_directory
+        self._max_events = config.ANALYTICS_BUFFER_MAX_EVENTS if max_events is None else max_events
+        self._flush_interval = config.ANALYTICS_BUFFER_FLUSH_INTERVAL if flush_interval is None else flush_interval
+
+        # Lock for events and spool file
+        self._lock = threading.Lock()
+        # Lock to ensure only a single flush is performed at a time
+        self._flush_lock = threading.Lock()
+        self._flush_required = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self._events: List[Tuple[str, dict]] = []
+        self._spool_fh = None
+        self._spool_file = None
+        # Spool files containing events that have been removed from the buffer,
+        # which are removed once the events have been inserted
+        self._flushing_spool_files = []
+
+    def _open_spool_file(self):
+        """Create and lock new spool file for process"""
+        os.makedirs(self._spool_directory, exist_ok=True)
+        spool_file = os.path.join(self._spool_directory, f"{uuid.uuid4().hex}.spool")
+        # Lock the file before it is given the spool file name,
+        # so that it is not recovered by other processes
+        spool_fh = open(f"{spool_file}.tmp", "a")
+        fcntl.flock(spool_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        os.rename(f"{spool_file}.tmp", spool_file)
+        return spool_fh, spool_file
+
+    @staticmethod
+    def _serialise_event(table_name: str, values: dict) -> str:
+        """Return spool file line for event"""
+        return json.dumps({
+            "table": table_name,
+            "values": {
+                key: (value.isoformat() if isinstance(value, datetime.datetime) else value)
+                for key, value in values.items()
+            }
+        }) + "\n"
+
+    @staticmethod
+    def _deserialise_event(line: str) -> Tuple[str, dict]:
+        """Return table name and values from spool file line"""
+        event = json.loads(line)
+        values = event["values"]
+        if values.get("timestamp"):
+            values["timestamp"] = datetime.datetime.fromisoformat(values["timestamp"])
+        return event["table"], values
+
+    def start(self):
+        """Open spool file and start flush thread"""
+        self._spool_fh, self._spool_file = self._open_spool_file()
+        self._thread = threading.Thread(target=self._run, name="analytics-buffer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Stop flush thread and flush remaining events"""
+        self._stop_event.set()
+        self._flush_required.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        # Remove spool file, if all events have been inserted
+        with self._lock:
+            if self._spool_fh is not None and not self._events and not self._flushing_spool_files:
+                os.unlink(self._spool_file)
+                self._spool_fh.close()
+                self._spool_fh = None
+
+    def add(self, table_name: str, values: dict):
+        """Add event to buffer"""
+        with self._lock:
+            self._spool_fh.write(self._serialise_event(table_name, values))
+            self._spool_fh.flush()
+            self._events.append((table_name, values))
+            event_count = len(self._events)
+
+        if event_count >= self._max_events:
+            self._flush_required.set()
+
+    def _run(self):
+        """Recover orphaned spool files and flush events until stopped"""
+        try:
+            self.recover_spool_files()
+        except Exception:
+            print(f"Failed to recover analytics spool files: {traceback.format_exc()}")
+
+        while not self._stop_event.is_set():
+            self._flush_required.wait(self._flush_interval)
+            self._flush_required.clear()
+            try:
+                self.flush()
+            except Exception:
+                print(f"Failed to flush analytics: {traceback.format_exc()}")
+
+        # Perform final flush of events before exiting
+        try:
+            self.flush()
+        except Exception:
+            print(f"Failed to flush analytics: {traceback.format_exc()}")
+
+    @classmethod
+    def _insert_events(cls, events: List[Tuple[str, dict]]):
+        """Insert events into database, using a single insert for each table"""
+        db = terrareg.database.Database.get()
+        # Use a dedicated connection, as the flush is not performed
+        # in the context of a request
+        with db.get_engine().begin() as conn:
+            for table_name in cls._TABLES:
+                rows = [values for event_table_name, values in events if event_table_name == table_name]
+                if rows:
+                    conn.execute(getattr(db, table_name).insert(), rows)
+
+    def flush(self):
+        """Insert all buffered events into the database"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._events:
+                    return
+                events = self._events
+                self._events = []
+                # Replace spool file, retaining the current spool file until the events have been inserted
+                self._flushing_spool_files.append((self._spool_fh, self._spool_file))
+                self._spool_fh, self._spool_file = self._open_spool_file()
+
+            try:
+                self._insert_events(events)
+            except Exception:
+                # Return events to buffer, to be retried on the next flush
+                with self._lock:
+                    self._events = events + self._events
+                raise
+
+            for spool_fh, spool_file in self._flushing_spool_files:
+                os.unlink(spool_file)
+                spool_fh.close()
+            self._flushing_spool_files = []
+
+    def recover_spool_files(self):
+        """Insert events from spool files of processes that have exited"""
+        for spool_file in glob.glob(os.path.join(self._spool_directory, "*.spool")):
+            try:
+                spool_fh = open(spool_file, "r")
+            except FileNotFoundError:
+                # Spool file has been recovered by another process
+                continue
+
+            with spool_fh:
+                # Skip spool files that are in use
+                try:
+                    fcntl.flock(spool_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                # Skip spool files that were removed whilst obtaining the lock
+                if not os.path.exists(spool_file):
+                    continue
+
+                # Ignore incomplete line, which may exist if the process
+                # exited whilst writing an event
+                events = [
+                    self._deserialise_event(line)
+                    for line in spool_fh.readlines()
+                    if line.endswith("\n")
+                ]
+                if events:
+                    self._insert_events(events)
+                os.unlink(spool_file)
@@ -0,0 +1,161 @@
+"""Generation of module source archives."""
+
+import os
+import shutil
+import stat
+import tarfile
+import time
+from typing import BinaryIO, Callable, Iterator, Set, Tuple
+import zipfile
+
+
+class _TeeReader:
+    """File handle wrapper, writing all content that is read to a second file handle"""
+
+    def __init__(self, source_fh: BinaryIO, tee_fh: BinaryIO):
+        """Store member variables"""
+        self._source_fh = source_fh
+        self._tee_fh = tee_fh
+
+    def read(self, size: int=-1) -> bytes:
+        """Read from source file handle and write content to tee file handle"""
+        data = self._source_fh.read(size)
+        self._tee_fh.write(data)
+        return data
+
+
+class ArchiveGenerator:
+    """
+    Generate tar.gz and zip archives of a directory in a single pass.
+
+    The directory is walked once and each file is read once, with the content
+    being written to both archives.
+    Archives are written to the provided file handles as a stream,
+    so the file handles do not need to be seekable.
+
+    Symlinks are stored as links in the tar.gz archive. Since symlinks are not
+    recreated when Terraform extracts zip archives, the zip archive contains
+    the content of the symlink target, if it is within the source directory.
+    """
+
+    def __init__(self, source_directory: str, exclude_filter: Callable[[str], bool]):
+        """
+        Store member variables.
+
+        exclude_filter is called with the path of each file and directory, relative
+        to the source directory, and should return True for paths to be excluded.
+        Excluded directories are not traversed.
+        """
+        self._source_directory = source_directory
+        self._exclude_filter = exclude_filter
+        self._real_source_directory = os.path.realpath(source_directory)
+
+    def _walk(self) -> Iterator[Tuple[str, str]]:
+        """Yield path and archive name of each file and directory to be archived, in sorted order"""
+        for root, dirs, files in os.walk(self._source_directory):
+            relative_root = os.path.relpath(root, self._source_directory)
+            if relative_root == os.curdir:
+                relative_root = ""
+
+            # Remove excluded directories, to avoid traversing them.
+            # Symlinks to directories are not followed by os.walk and
+            # are archived as symlinks.
+            dirs[:] = sorted(
+                dir_
+                for dir_ in dirs
+                if not self._exclude_filter(os.path.join(relative_root, dir_))
+            )
+
+            for name in sorted(dirs + files):
+                arcname = os.path.join(relative_root, name)
+                if name in files and self._exclude_filter(arcname):
+                    continue
+                yield os.path.join(root, name), arcname
+
+    @staticmethod
+    def _get_zip_info(arcname: str, file_stat: os.stat_result) -> zipfile.ZipInfo:
+        """Create zip info for file, directory or symlink"""
+        if stat.S_ISDIR(file_stat.st_mode):
+            arcname += "/"
+        date_time = time.localtime(file_stat.st_mtime)[0:6]
+        # Zip format does not support timestamps before 1980
+        if date_time[0] < 1980:
+            date_time = (1980, 1, 1, 0, 0, 0)
+        zip_info = zipfile.ZipInfo(arcname, date_time=date_time)
+        zip_info.external_attr = (file_stat.st_mode & 0xFFFF) << 16
+        if stat.S_ISDIR(file_stat.st_mode):
+            # Set MS-DOS directory flag
+            zip_info.external_attr |= 0x10
+        else:
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            # Set size of file, so that zip64 extensions are used for large files
+            zip_info.file_size = file_stat.st_size
+        return zip_info
+
+    def _write_zip_link_target(self, zip_: zipfile.ZipFile, path: str, arcname: str, expanded_directories: Set[str]) -> None:
+        """
+        Write content of path to zip, following symlinks.
+
+        Symlinks to paths outside of the source directory are not archived.
+        Directories are written recursively, skipping any directories that are
+        already being written, to avoid symlink loops.
+        """
+        target = os.path.realpath(path)
+        if os.path.commonpath([self._real_source_directory, target]) != self._real_source_directory:
+            return
+        try:
+            target_stat = os.stat(target)
+        except FileNotFoundError:
+            # Ignore broken symlinks
+            return
+
+        if stat.S_ISREG(target_stat.st_mode):
+            with open(target, "rb") as source_fh, \
+                    zip_.open(self._get_zip_info(arcname, target_stat), mode="w") as zip_entry_fh:
+                shutil.copyfileobj(source_fh, zip_entry_fh)
+
+        elif stat.S_ISDIR(target_stat.st_mode) and target not in expanded_directories:
+            zip_.writestr(self._get_zip_info(arcname, target_stat), b"")
+            for name in sorted(os.listdir(target)):
+                child_arcname = os.path.join(arcname, name)
+                if self._exclude_filter(child_arcname):
+                    continue
+                self._write_zip_link_target(
+                    zip_=zip_,
+                    path=os.path.join(target, name),
+                    arcname=child_arcname,
+                    expanded_directories=expanded_directories | {target}
+                )
+
+    def generate(self, tar_gz_fh: BinaryIO, zip_fh: BinaryIO) -> None:
+        """Write tar.gz and zip archives to file handles"""
+        with tarfile.open(fileobj=tar_gz_fh, mode="w|gz") as tar, \
+                zipfile.ZipFile(zip_fh, mode="w", compression=zipfile.ZIP_DEFLATED) as zip_:
+
+            for path, arcname in self._walk():
+                file_stat = os.lstat(path)
+                tar_info = tar.gettarinfo(path, arcname=arcname)
+                zip_info = self._get_zip_info(arcname, file_stat)
+
+                if stat.S_ISREG(file_stat.st_mode):
+                    # Stream file content to zip entry whilst it is read by tarfile
+                    with open(path, "rb") as source_fh, zip_.open(zip_info, mode="w") as zip_entry_fh:
+                        tar.addfile(tar_info, _TeeReader(source_fh, zip_entry_fh))
+
+                elif stat.S_ISLNK(file_stat.st_mode):
+                    # Store symlinks as links in the tar.gz, rather than
+                    # archiving content from outside of the directory,
+                    # and store the content of the link target in the zip
+                    tar.addfile(tar_info)
+                    self._write_zip_link_target(
+                        zip_=zip_,
+                        path=path,
+                        arcname=arcname,
+                        expanded_directories={self._real_source_directory}
+                    )
+
+                elif stat.S_ISDIR(file_stat.st_mode):
+                    tar.addfile(tar_info)
+                    zip_.writestr(zip_info, b"")
+
+                # Ignore other file types, such as sockets and FIFOs
@@ -0,0 +1,155 @@
+"""Content-addressed store for module details content."""
+
+import gzip
+import hashlib
+from typing import Dict, Iterable, Optional, Tuple
+
+import sqlalchemy
+
+from terrareg.database import Database
+
+
+class BlobStore:
+    """
+    Content-addressed store of module details content, such as READMEs and terraform-docs output.
+
+    Content is keyed by the SHA256 hash of the uncompressed content, so identical content
+    shared between module versions, submodules and examples is only stored once.
+    Content is compressed, if compression reduces the size of the content.
+    Each blob holds a count of the module details rows that reference it and
+    is removed once it is no longer referenced.
+    """
+
+    COMPRESSION_NONE = "none"
+    COMPRESSION_GZIP = "gzip"
+
+    # Content smaller than this is not compressed,
+    # as the gzip header outweighs any saving
+    MIN_COMPRESSION_SIZE = 128
+
+    @staticmethod
+    def get_hash(content: bytes) -> str:
+        """Return hash of content"""
+        return hashlib.sha256(content).hexdigest()
+
+    @classmethod
+    def compress(cls, content: bytes) -> Tuple[str, bytes]:
+        """Return compression type and compressed content"""
+        if len(content) >= cls.MIN_COMPRESSION_SIZE:
+            # Use fixed mtime, to ensure identical content is compressed identically
+            compressed = gzip.compress(content, mtime=0)
+            if len(compressed) < len(content):
+                return cls.COMPRESSION_GZIP, compressed
+        return cls.COMPRESSION_NONE, content
+
+    @classmethod
+    def decompress(cls, compression: str, content: bytes) -> bytes:
+        """Decompress content"""
+        if compression == cls.COMPRESSION_GZIP:
+            return gzip.decompress(content)
+        elif compression == cls.COMPRESSION_NONE:
+            return content
+        raise ValueError(f"Unknown blob compression: {compression}")
+
+    @classmethod
+    def add_reference(cls, content: bytes) -> str:
+        """Store content, if it does not already exist, and add reference to it, returning the hash of the content"""
+        db = Database.get()
+        hash_ = cls.get_hash(content)
+
+        increment_reference = db.module_details_blob.update().where(
+            db.module_details_blob.c.hash == hash_
+        ).values(
+            reference_count=db.module_details_blob.c.reference_count + 1
+        )
+        with db.get_connection() as conn:
+            if conn.execute(increment_reference).rowcount:
+                return hash_
+
+        compression, compressed_content = cls.compress(content)
+        insert = db.module_details_blob.insert().values(
+            hash=hash_,
+            compression=compression,
+            content=compressed_content,
+            size=len(content),
+            reference_count=1
+        )
+        try:
+            with Database.get_new_transaction_or_nested():
+                with db.get_connection() as conn:
+                    conn.execute(insert)
+        except sqlalchemy.exc.IntegrityError:
+            # Blob has been created by another process since checking if it existed
+            with db.get_connection() as conn:
+                conn.execute(increment_reference)
+
+        return hash_
+
+    @classmethod
+    def add_hash_references(cls, hashes: Iterable[Optional[str]]) -> None:
+        """Add reference to each pre-existing blob, by hash"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            for hash_, count in cls._count_hashes(hashes).items():
+                conn.execute(
+                    db.module_details_blob.update().where(
+                        db.module_details_blob.c.hash == hash_
+                    ).values(
+                        reference_count=db.module_details_blob.c.reference_count + count
+                    )
+                )
+
+    @staticmethod
+    def _count_hashes(hashes: Iterable[Optional[str]]) -> Dict[str, int]:
+        """Return number of occurrences of each hash, ignoring empty hashes"""
+        # Module details may reference the same content multiple times
+        reference_counts: Dict[str, int] = {}
+        for hash_ in hashes:
+            if hash_:
+                reference_counts[hash_] = reference_counts.get(hash_, 0) + 1
+        return reference_counts
+
+    @classmethod
+    def remove_references(cls, hashes: Iterable[Optional[str]]) -> None:
+        """Remove reference to each hash, deleting blobs that are no longer referenced"""
+        db = Database.get()
+        reference_counts = cls._count_hashes(hashes)
+        if not reference_counts:
+            return
+
+        with db.get_connection() as conn:
+            for hash_, count in reference_counts.items():
+                conn.execute(
+                    db.module_details_blob.update().where(
+                        db.module_details_blob.c.hash == hash_
+                    ).values(
+                        reference_count=db.module_details_blob.c.reference_count - count
+                    )
+                )
+            conn.execute(
+                db.module_details_blob.delete().where(
+                    db.module_details_blob.c.hash.in_(list(reference_counts)),
+                    db.module_details_blob.c.reference_count <= 0
+                )
+            )
+
+    @classmethod
+    def get_contents(cls, hashes: Iterable[Optional[str]]) -> Dict[str, bytes]:
+        """Return map of hash to uncompressed content for all hashes"""
+        hashes = set(hash_ for hash_ in hashes if hash_)
+        if not hashes:
+            return {}
+
+        db = Database.get()
+        select = sqlalchemy.select(
+            db.module_details_blob.c.hash,
+            db.module_details_blob.c.compression,
+            db.module_details_blob.c.content
+        ).where(
+            db.module_details_blob.c.hash.in_(list(hashes))
+        )
+        with db.get_connection() as conn:
+            return {
+                row['hash']: cls.decompress(compression=row['compression'], content=row['content'])
+                for row in conn.execute(select).fetchall()
+            }
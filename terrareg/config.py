@@ -4,7 +4,7 @@ from enum import Enum
 import os
 import tempfile
 
-from terrareg.errors import InvalidBooleanConfigurationError, InvalidUploadDirectoryError
+from terrareg.errors import InvalidBooleanConfigurationError, InvalidUploadDirectoryError, InvalidGitMirrorCacheDirectoryError
 
 
 class ModuleVersionReindexMode(Enum):
@@ -33,6 +33,12 @@ class DefaultUiInputOutputView(Enum):
     EXPANDED = "expanded"
 
 
+class SearchIndexType(Enum):
+    """Type of search index"""
+    DATABASE = "database"
+    INVERTED_INDEX = "inverted-index"
+
+
 class Product(Enum):
     """Type of product"""
     TERRAFORM = "terraform"
@@ -160,6 +166,70 @@ class Config:
         """
         return os.environ.get('DATABASE_URL', 'sqlite:///modules.db')
 
+    @property
+    def DATABASE_READ_URL(self):
+        """
+        URL for a read replica of the database.
+
+        When set, read-only API requests (such as the Terraform registry APIs, module/provider search, provider documentation and module/provider details)
+        perform select queries using the read replica.
+        Queries that modify data, transactions and any queries performed later in the same request, after data has been modified, use `DATABASE_URL`.
+
+        Data read from the replica may be delayed by the replication lag of the replica.
+
+        Uses the same format and connection pool configuration as `DATABASE_URL`.
+
+        Leave empty to perform all queries using `DATABASE_URL`.
+        """
+        return os.environ.get('DATABASE_READ_URL', '')
+
+    @property
+    def DATABASE_POOL_SIZE(self):
+        """
+        Number of database connections kept open in the connection pool of each process.
+
+        Each request uses a single connection, so this should be at least the number of concurrent requests handled by each process.
+
+        This is not used for SQLite databases.
+        """
+        return int(os.environ.get('DATABASE_POOL_SIZE', '5'))
+
+    @property
+    def DATABASE_POOL_MAX_OVERFLOW(self):
+        """
+        Maximum number of database connections opened in addition to `DATABASE_POOL_SIZE`, when all pooled connections are in use.
+
+        This is not used for SQLite databases.
+        """
+        return int(os.environ.get('DATABASE_POOL_MAX_OVERFLOW', '10'))
+
+    @property
+    def DATABASE_POOL_TIMEOUT(self):
+        """
+        Maximum duration, in seconds, to wait for a database connection to become available, when the maximum number of connections are in use.
+
+        This is not used for SQLite databases.
+        """
+        return int(os.environ.get('DATABASE_POOL_TIMEOUT', '30'))
+
+    @property
+    def DATABASE_POOL_RECYCLE(self):
+        """
+        Duration, in seconds, after which pooled database connections are re-opened.
+
+        This should be lower than any idle connection timeout of the database server.
+        """
+        return int(os.environ.get('DATABASE_POOL_RECYCLE', '300'))
+
+    @property
+    def DATABASE_POOL_PRE_PING(self):
+        """
+        Whether to test pooled database connections before use, re-opening any connections that have been closed by the database server.
+
+        Connections are tested once per request.
+        """
+        return self.convert_boolean(os.environ.get('DATABASE_POOL_PRE_PING', 'True'))
+
     @property
     def LISTEN_PORT(self):
         """
@@ -239,6 +309,61 @@ class Config:
         """
         return self.convert_boolean(os.environ.get('DISABLE_ANALYTICS', 'False'))
 
+    @property
+    def ANALYTICS_BUFFER_MAX_EVENTS(self):
+        """
+        Number of module/provider download analytics events to buffer before they are inserted into the database.
+
+        When set, downloads are recorded to a local spool file (see `ANALYTICS_BUFFER_SPOOL_DIRECTORY`) and inserted into the database in batches
+        by a background thread, once this number of events have been buffered or after `ANALYTICS_BUFFER_FLUSH_INTERVAL` seconds.
+        This removes the database insert from module/provider download requests.
+
+        Buffered events are not included in analytics until they have been inserted.
+
+        Set to `0` to insert analytics during each download request.
+        """
+        return int(os.environ.get('ANALYTICS_BUFFER_MAX_EVENTS', '0'))
+
+    @property
+    def ANALYTICS_BUFFER_FLUSH_INTERVAL(self):
+        """
+        Maximum time, in seconds, that download analytics events are buffered before they are inserted into the database.
+
+        See `ANALYTICS_BUFFER_MAX_EVENTS`.
+        """
+        return float(os.environ.get('ANALYTICS_BUFFER_FLUSH_INTERVAL', '5'))
+
+    @property
+    def ANALYTICS_BUFFER_SPOOL_DIRECTORY(self):
+        """
+        Directory used to store buffered download analytics events, so that events are not lost if Terrareg exits before they are inserted into the database.
+
+        Events left by processes that have exited are inserted into the database when Terrareg next starts buffering events.
+
+        This directory should be persistent across restarts of Terrareg.
+
+        See `ANALYTICS_BUFFER_MAX_EVENTS`.
+        """
+        return os.environ.get('ANALYTICS_BUFFER_SPOOL_DIRECTORY', os.path.join(tempfile.gettempdir(), 'terrareg-analytics-spool'))
+
+    @property
+    def ANALYTICS_RETENTION_DAYS(self):
+        """
+        Number of days of module download analytics to retain in the database.
+
+        When set, `python terrareg.py --compact-analytics` moves downloads older than this number of days,
+        which have been rolled up into daily download totals, from the database into gzip-compressed archive files,
+        stored in the `analytics_archive` directory of `DATA_DIRECTORY`, with an archive file for each month.
+
+        Values lower than `366` are treated as `366`, as download statistics count the first (partial) day of
+        each interval, the longest being a year, from downloads in the database.
+        Download statistics continue to include archived downloads, from the daily download totals.
+        Archived downloads are not used for analytics token usage or to determine if redirects are in use (see `REDIRECT_DELETION_LOOKBACK_DAYS`).
+
+        Set to `0` to retain all downloads in the database.
+        """
+        return int(os.environ.get('ANALYTICS_RETENTION_DAYS', '0'))
+
     @property
     def DEFAULT_UI_DETAILS_VIEW(self):
         """
@@ -572,6 +697,95 @@ class Config:
         val = os.environ.get('GIT_CLONE_TIMEOUT', '300')
         return None if val is None else int(val)
 
+    @property
+    def ENABLE_GIT_MIRROR_CACHE(self):
+        """
+        Whether to cache bare mirrors of module git repositories, used when importing module versions from git.
+
+        When enabled, each repository is cloned once into the cache (see `GIT_MIRROR_CACHE_DIRECTORY`) and updated with an incremental fetch
+        for each subsequent import. Each module version is then extracted from a shallow clone of the tag from the local mirror,
+        rather than cloning the full repository from the git server.
+        """
+        return self.convert_boolean(os.environ.get('ENABLE_GIT_MIRROR_CACHE', 'False'))
+
+    @property
+    def GIT_MIRROR_CACHE_DIRECTORY(self):
+        """
+        Directory used to store bare mirrors of module git repositories (see `ENABLE_GIT_MIRROR_CACHE`).
+
+        By default, this uses a 'git-mirrors' sub-directory of the DATA_DIRECTORY.
+
+        However, if the DATA_DIRECTORY is configured to 's3', this path must be changed to a local directory.
+        """
+        git_mirror_cache_directory = os.environ.get('GIT_MIRROR_CACHE_DIRECTORY', os.path.join(self.DATA_DIRECTORY, 'git-mirrors'))
+        if git_mirror_cache_directory.startswith('s3://'):
+            raise InvalidGitMirrorCacheDirectoryError('GIT_MIRROR_CACHE_DIRECTORY must be configured with a path, if DATA_DIRECTORY is configured for s3.')
+        return git_mirror_cache_directory
+
+    @property
+    def GIT_MIRROR_CACHE_MAX_SIZE(self):
+        """
+        Maximum size, in MB, of the git mirror cache (see `ENABLE_GIT_MIRROR_CACHE`).
+
+        When the cache exceeds this size after a module version is cloned, the least recently used repository mirrors are removed from the cache.
+
+        Set to `0` to disable the size limit.
+        """
+        return int(os.environ.get('GIT_MIRROR_CACHE_MAX_SIZE', '10240'))
+
+    @property
+    def ASYNC_MODULE_EXTRACTION(self):
+        """
+        Whether module versions imported via the import API endpoints and git provider hooks are extracted asynchronously.
+
+        When enabled, these endpoints create an extraction job and return a `202` response containing the job ID,
+        rather than performing the extraction within the request.
+        The job status, progress and logs can be obtained from the module provider `extraction-jobs` API endpoints.
+
+        Jobs are processed by extraction workers, which are started alongside the server (see `MODULE_EXTRACTION_WORKER_COUNT`)
+        or can be run separately using `python terrareg.py --extraction-worker`.
+        """
+        return self.convert_boolean(os.environ.get('ASYNC_MODULE_EXTRACTION', 'False'))
+
+    @property
+    def MODULE_EXTRACTION_WORKER_COUNT(self):
+        """
+        Number of extraction worker processes to start alongside the server when `ASYNC_MODULE_EXTRACTION` is enabled.
+
+        Set to `0` to disable starting workers in the server process, if workers are run separately.
+        """
+        return int(os.environ.get('MODULE_EXTRACTION_WORKER_COUNT', '2'))
+
+    @property
+    def MODULE_EXTRACTION_WORKER_POLL_INTERVAL(self):
+        """Interval, in seconds, between extraction workers polling for new extraction jobs."""
+        return int(os.environ.get('MODULE_EXTRACTION_WORKER_POLL_INTERVAL', '5'))
+
+    @property
+    def MODULE_EXTRACTION_JOB_MAX_ATTEMPTS(self):
+        """Maximum number of attempts to extract a module version before marking the extraction job as failed."""
+        return int(os.environ.get('MODULE_EXTRACTION_JOB_MAX_ATTEMPTS', '3'))
+
+    @property
+    def MODULE_EXTRACTION_JOB_RETRY_BACKOFF(self):
+        """
+        Base delay, in seconds, before retrying a failed extraction job.
+
+        The delay doubles for each subsequent attempt.
+        """
+        return int(os.environ.get('MODULE_EXTRACTION_JOB_RETRY_BACKOFF', '30'))
+
+    @property
+    def MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT(self):
+        """
+        Duration, in seconds, since the last heartbeat of a running extraction job, after which
+        the job is assumed to have been abandoned by a terminated worker.
+
+        Abandoned jobs are re-queued, or marked as failed if the maximum number of attempts has been reached.
+        Running jobs record a heartbeat as the extraction progresses.
+        """
+        return int(os.environ.get('MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT', '3600'))
+
     @property
     def GIT_PROVIDER_CONFIG(self):
         """
@@ -766,6 +980,44 @@ class Config:
         """
         return os.environ.get('MODULE_LINKS', '[]')
 
+    @property
+    def SEARCH_INDEX(self):
+        """
+        Search index used for searching modules and providers.
+
+        This can be set to one of:
+
+         * 'database' - Searches are performed using wildcard matches against the database.
+         * 'inverted-index' - Searches are performed against an in-memory inverted index, ranking results using BM25.
+           The index is built from the database on the first search and is updated as modules and providers are modified.
+
+        The inverted index is held by each Terrareg process, so modifications made by other processes
+        (such as other Terrareg instances or CLI scripts) are applied when the index is rebuilt (see SEARCH_INDEX_REFRESH_INTERVAL).
+        """
+        return SearchIndexType(os.environ.get('SEARCH_INDEX', 'database'))
+
+    @property
+    def SEARCH_INDEX_REFRESH_INTERVAL(self):
+        """
+        Interval, in seconds, at which the inverted search index is rebuilt from the database.
+
+        This ensures that modifications made by other processes are included in search results.
+
+        Set to 0 to disable periodic rebuilding of the index.
+        """
+        return int(os.environ.get('SEARCH_INDEX_REFRESH_INTERVAL', '300'))
+
+    @property
+    def MARKDOWN_CACHE_MAX_SIZE(self):
+        """
+        Maximum size, in MB, of the in-memory cache of markdown content (READMEs, additional module files, input/output descriptions and provider documentation) rendered as HTML.
+
+        Each Terrareg process holds its own cache. When the cache exceeds this size, the least recently used content is removed.
+
+        Set to `0` to disable the cache.
+        """
+        return int(os.environ.get('MARKDOWN_CACHE_MAX_SIZE', '64'))
+
     @property
     def ENABLE_ACCESS_CONTROLS(self):
         """
@@ -938,6 +1190,36 @@ class Config:
         """
         return os.environ.get("TERRAFORM_ARCHIVE_MIRROR", "")
 
+    @property
+    def TERRAFORM_BINARY_CACHE_DIRECTORY(self):
+        """
+        Directory used to cache installed Terraform/OpenTofu binaries.
+
+        Each version is installed once and shared between all module extractions,
+        allowing Terraform to be run for multiple modules concurrently.
+        """
+        return os.environ.get("TERRAFORM_BINARY_CACHE_DIRECTORY", os.path.join(tempfile.gettempdir(), "terrareg-terraform-binaries"))
+
+    @property
+    def TERRAFORM_PLUGIN_CACHE_DIRECTORY(self):
+        """
+        Directory used to cache Terraform providers that are downloaded when initialising modules during extraction.
+
+        The cache is shared between all module extractions, so that providers are only downloaded once.
+        """
+        return os.environ.get("TERRAFORM_PLUGIN_CACHE_DIRECTORY", os.path.join(tempfile.gettempdir(), "terrareg-terraform-plugin-cache"))
+
+    @property
+    def TERRAFORM_PLUGIN_CACHE_MAX_SIZE(self):
+        """
+        Maximum size, in MB, of the Terraform provider plugin cache (see `TERRAFORM_PLUGIN_CACHE_DIRECTORY`).
+
+        When the cache exceeds this size after a module is initialised, the least recently used providers are removed from the cache.
+
+        Set to `0` to disable the size limit.
+        """
+        return int(os.environ.get("TERRAFORM_PLUGIN_CACHE_MAX_SIZE", "5120"))
+
     @property
     def MANAGE_TERRAFORM_RC_FILE(self):
         """
@@ -966,6 +1248,47 @@ class Config:
         """
         return float(os.environ.get("SENTRY_TRACES_SAMPLE_RATE", "1.0"))
 
+    @property
+    def SUBMODULE_EXTRACTION_CONCURRENCY(self):
+        """
+        Maximum number of submodules/examples that are analysed concurrently during module extraction.
+
+        Analysis of each submodule runs terraform-docs, tfsec, terraform and infracost, so increasing this
+        reduces the time taken to index modules with many submodules/examples, at the cost of additional CPU and memory usage.
+
+        Set to `1` to analyse submodules sequentially.
+        """
+        return int(os.environ.get('SUBMODULE_EXTRACTION_CONCURRENCY', '4'))
+
+    @property
+    def SUBMODULE_EXTRACTION_TIMEOUT(self):
+        """
+        Timeout, in seconds, for each external tool (terraform-docs, tfswitch, tfsec, terraform and infracost)
+        run during module extraction.
+
+        If a tool does not complete within this time, it is killed and the module extraction fails.
+
+        Leave empty to disable the timeout.
+        """
+        val = os.environ.get('SUBMODULE_EXTRACTION_TIMEOUT', '600')
+        return int(val) if val else None
+
+    @property
+    def INCREMENTAL_MODULE_EXTRACTION(self):
+        """
+        Whether to re-use the analysis of submodules and examples that are unchanged from a previous version of the module provider.
+
+        When enabled, a hash of the content of each submodule/example (including any local modules that it calls) is stored when it is analysed.
+        When a submodule/example with a matching hash exists in another version of the module provider,
+        the previous analysis is re-used, rather than running terraform-docs, tfsec, terraform and infracost.
+
+        Analysis of all submodules/examples can be forced for an individual import, using the `force_full_extraction` attribute of the module version import API.
+
+        The hash only includes the content of the module, so the re-used analysis will not reflect changes to
+        remote modules and providers resolved by terraform init, the Terraform version installed by tfswitch or Infracost pricing.
+        """
+        return self.convert_boolean(os.environ.get('INCREMENTAL_MODULE_EXTRACTION', 'False'))
+
     @property
     def EXAMPLE_FILE_EXTENSIONS(self):
         """
@@ -1087,6 +1410,103 @@ class Config:
         """
         return os.environ.get('PROVIDER_SOURCES', '[]')
 
+    @property
+    def PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY(self):
+        """
+        Maximum number of provider release binaries that are downloaded concurrently when indexing a provider version.
+
+        Each binary is streamed to a temporary file, so increasing this increases the temporary disk space used during indexing.
+
+        Set to `1` to download binaries sequentially.
+        """
+        return int(os.environ.get('PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY', '4'))
+
+    @property
+    def PROVIDER_ARTIFACT_DOWNLOAD_RETRIES(self):
+        """
+        Number of times the download of a provider release binary is retried, if the download fails or does not match the checksum of the release.
+        """
+        return int(os.environ.get('PROVIDER_ARTIFACT_DOWNLOAD_RETRIES', '2'))
+
+    @property
+    def PROVIDER_SOURCE_HTTP_CACHE_DIRECTORY(self):
+        """
+        Directory used to cache responses from provider source APIs (e.g. Github).
+
+        Cached responses are used to make conditional requests, which are not counted against API rate limits, when the response has not changed.
+
+        By default, this uses a 'provider-source-http-cache' sub-directory of the DATA_DIRECTORY.
+        If the DATA_DIRECTORY is configured to 's3', the cache is disabled by default.
+
+        Set to an empty value to disable the cache.
+        """
+        default_directory = '' if self.DATA_DIRECTORY.startswith('s3://') else os.path.join(self.DATA_DIRECTORY, 'provider-source-http-cache')
+        return os.environ.get('PROVIDER_SOURCE_HTTP_CACHE_DIRECTORY', default_directory)
+
+    @property
+    def PROVIDER_SOURCE_HTTP_POOL_SIZE(self):
+        """
+        Maximum number of connections, per host, that are kept open to provider source APIs (e.g. Github) and re-used between requests.
+        """
+        return int(os.environ.get('PROVIDER_SOURCE_HTTP_POOL_SIZE', '10'))
+
+    @property
+    def PROVIDER_SOURCE_RATE_LIMIT_MAX_WAIT(self):
+        """
+        Maximum duration, in seconds, to wait for a provider source API (e.g. Github) rate limit to reset, when the rate limit has been exhausted.
+
+        If the rate limit resets after a longer duration, the request is not delayed and will fail.
+
+        Set to `0` to disable waiting for rate limits.
+        """
+        return int(os.environ.get('PROVIDER_SOURCE_RATE_LIMIT_MAX_WAIT', '60'))
+
+    @property
+    def PROVIDER_RELEASE_POLL_INTERVAL(self):
+        """
+        Interval, in seconds, between polling the provider source of each provider for new releases.
+
+        New releases are queued and indexed by provider index workers (see `PROVIDER_INDEX_WORKER_COUNT`),
+        which are started alongside the server or can be run separately using `python terrareg.py --provider-release-worker`.
+
+        Conditional requests are used when polling, so polls that find no new releases do not count against Github API rate limits.
+
+        Set to `0` to disable polling, requiring new provider versions to be indexed via the API.
+        """
+        return int(os.environ.get('PROVIDER_RELEASE_POLL_INTERVAL', '0'))
+
+    @property
+    def PROVIDER_INDEX_WORKER_COUNT(self):
+        """
+        Number of provider index workers to start alongside the server when `PROVIDER_RELEASE_POLL_INTERVAL` is enabled.
+
+        Set to `0` to disable starting the release poller and workers in the server process, if they are run separately.
+        """
+        return int(os.environ.get('PROVIDER_INDEX_WORKER_COUNT', '2'))
+
+    @property
+    def PROVIDER_INDEX_SOURCE_CONCURRENCY(self):
+        """
+        Maximum number of provider versions indexed concurrently from each provider source, across all provider index workers.
+
+        Set to `0` to disable the limit.
+        """
+        return int(os.environ.get('PROVIDER_INDEX_SOURCE_CONCURRENCY', '2'))
+
+    @property
+    def PROVIDER_INDEX_JOB_MAX_ATTEMPTS(self):
+        """Maximum number of attempts to index a polled provider release before marking the index job as failed."""
+        return int(os.environ.get('PROVIDER_INDEX_JOB_MAX_ATTEMPTS', '3'))
+
+    @property
+    def PROVIDER_INDEX_JOB_RETRY_BACKOFF(self):
+        """
+        Base delay, in seconds, before retrying a failed provider index job.
+
+        The delay doubles for each subsequent attempt.
+        """
+        return int(os.environ.get('PROVIDER_INDEX_JOB_RETRY_BACKOFF', '300'))
+
     @property
     def PROVIDER_CATEGORIES(self):
         """
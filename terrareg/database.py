@@ -1,6 +1,8 @@
 """Provide database class."""
 
 from contextlib import contextmanager
+from typing import Callable, Dict, Union
+
 import sqlalchemy
 import sqlalchemy.dialects.mysql
 
@@ -10,12 +12,16 @@ from terrareg.audit_action import AuditAction
 
 import terrareg.config
 from terrareg.errors import DatabaseMustBeIniistalisedError
+from terrareg.request_identity_map import RequestIdentityMap
 from terrareg.provider_tier import ProviderTier
 from terrareg.user_group_namespace_permission_type import UserGroupNamespacePermissionType
 from terrareg.namespace_type import NamespaceType
 from terrareg.provider_source_type import ProviderSourceType
 import terrareg.provider_documentation_type
 import terrareg.provider_binary_types
+from terrareg.module_extraction_job_status import ModuleExtractionJobStatus
+from terrareg.provider_index_job_status import ProviderIndexJobStatus
+from terrareg.module_dependency_type import ModuleDependencyType
 
 
 class Database():
@@ -23,6 +29,7 @@ class Database():
 
     _META = None
     _ENGINE = None
+    _READ_ENGINE = None
     _INSTANCE = None
 
     blob_encoding_format = 'utf-8'
@@ -63,9 +70,11 @@ class Database():
         self._namespace = None
         self._module_provider_redirect = None
         self._module_provider = None
+        self._module_details_blob = None
         self._module_details = None
         self._module_version = None
         self._sub_module = None
+        self._module_version_dependency = None
         self._gpg_key = None
         self._provider_category = None
         self._provider_source = None
@@ -75,10 +84,15 @@ class Database():
         self._provider_version_documentation = None
         self._provider_version_binary = None
         self._analytics = None
+        self._analytics_daily_download = None
+        self._analytics_rollup_state = None
         self._provider_analytics = None
         self._example_file = None
         self._module_version_file = None
+        self._module_extraction_job = None
+        self._provider_index_job = None
         self.transaction_connection = None
+        self.transaction = None
 
     @property
     def session(self):
@@ -157,6 +171,13 @@ class Database():
             raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
         return self._module_provider
 
+    @property
+    def module_details_blob(self):
+        """Return module_details_blob table."""
+        if self._module_details_blob is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._module_details_blob
+
     @property
     def module_details(self):
         """Return module_details table."""
@@ -178,6 +199,13 @@ class Database():
             raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
         return self._sub_module
 
+    @property
+    def module_version_dependency(self):
+        """Return module_version_dependency table."""
+        if self._module_version_dependency is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._module_version_dependency
+
     @property
     def analytics(self):
         """Return analytics table."""
@@ -185,6 +213,20 @@ class Database():
             raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
         return self._analytics
 
+    @property
+    def analytics_daily_download(self):
+        """Return analytics_daily_download table."""
+        if self._analytics_daily_download is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._analytics_daily_download
+
+    @property
+    def analytics_rollup_state(self):
+        """Return analytics_rollup_state table."""
+        if self._analytics_rollup_state is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._analytics_rollup_state
+
     @property
     def provider_analytics(self):
         """Return provider_analytics table."""
@@ -206,6 +248,20 @@ class Database():
             raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
         return self._module_version_file
 
+    @property
+    def module_extraction_job(self):
+        """Return module_extraction_job table."""
+        if self._module_extraction_job is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._module_extraction_job
+
+    @property
+    def provider_index_job(self):
+        """Return provider_index_job table."""
+        if self._provider_index_job is None:
+            raise DatabaseMustBeIniistalisedError('Database class must be initialised.')
+        return self._provider_index_job
+
     @property
     def gpg_key(self):
         """Return gpg_key table."""
@@ -275,6 +331,7 @@ class Database():
         cls._INSTANCE = None
         cls._META = None
         cls._ENGINE = None
+        cls._READ_ENGINE = None
 
     @classmethod
     def get(cls):
@@ -290,18 +347,143 @@ class Database():
             cls._META = sqlalchemy.MetaData()
         return cls._META
 
+    @staticmethod
+    def _create_engine(database_url: str) -> sqlalchemy.engine.Engine:
+        """Create engine for database URL, using configured connection pool"""
+        config = terrareg.config.Config()
+        pool_kwargs = {}
+        # SQLite uses pool classes that do not support sizing
+        if sqlalchemy.engine.make_url(database_url).get_backend_name() != 'sqlite':
+            pool_kwargs = {
+                'pool_size': config.DATABASE_POOL_SIZE,
+                'max_overflow': config.DATABASE_POOL_MAX_OVERFLOW,
+                'pool_timeout': config.DATABASE_POOL_TIMEOUT,
+            }
+        return sqlalchemy.create_engine(
+            database_url,
+            echo=config.DEBUG,
+            pool_pre_ping=config.DATABASE_POOL_PRE_PING,
+            pool_recycle=config.DATABASE_POOL_RECYCLE,
+            **pool_kwargs
+        )
+
     @classmethod
     def get_engine(cls) -> sqlalchemy.engine.Engine:
         """Get singleton instance of engine."""
         if cls._ENGINE is None:
-            cls._ENGINE = sqlalchemy.create_engine(
-                terrareg.config.Config().DATABASE_URL,
-                echo=terrareg.config.Config().DEBUG,
-                pool_pre_ping=True,
-                pool_recycle=300
-            )
+            cls._ENGINE = cls._create_engine(terrareg.config.Config().DATABASE_URL)
         return cls._ENGINE
 
+    @classmethod
+    def get_read_engine(cls) -> Union[None, sqlalchemy.engine.Engine]:
+        """Get singleton instance of engine for read replica, if configured."""
+        if cls._READ_ENGINE is None and (read_url := terrareg.config.Config().DATABASE_READ_URL):
+            cls._READ_ENGINE = cls._create_engine(read_url)
+        return cls._READ_ENGINE
+
+    @classmethod
+    def dispose_inherited_connections(cls) -> None:
+        """
+        Discard pooled connections inherited from the parent process, without closing them,
+        so that connections are not shared with the parent process after fork.
+        """
+        for engine in [cls._ENGINE, cls._READ_ENGINE]:
+            if engine is not None:
+                engine.dispose(close=False)
+
+    @classmethod
+    def get_pool_statistics(cls) -> Union[None, Dict[str, int]]:
+        """Return utilisation of connection pool, if the engine uses a sized connection pool"""
+        if cls._ENGINE is None or not isinstance(cls._ENGINE.pool, sqlalchemy.pool.QueuePool):
+            return None
+        pool = cls._ENGINE.pool
+        return {
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+        }
+
+    @classmethod
+    def register_app(cls, app: flask.Flask) -> None:
+        """
+        Enable request-scoped connections for Flask app.
+
+        Whilst in a request context of the app, queries performed outside of a transaction
+        share a single connection, which is checked out of the pool on first use
+        and returned when the request context is torn down.
+        """
+        app.extensions['terrareg_database'] = True
+        app.teardown_appcontext(cls._release_request_connection)
+
+    @staticmethod
+    def _release_request_connection(exception=None) -> None:
+        """Return request-scoped connections to the pool"""
+        for connection_attribute in ['database_request_connection', 'database_read_request_connection']:
+            connection = flask.g.pop(connection_attribute, None)
+            if connection is not None:
+                connection.close()
+
+    @classmethod
+    def _get_request_connection(cls) -> Union[None, sqlalchemy.engine.Connection]:
+        """Return request-scoped connection, if enabled for the current request context"""
+        if not has_request_context() or not flask.current_app.extensions.get('terrareg_database'):
+            return None
+
+        connection = flask.g.get('database_request_connection', None)
+        if connection is None or connection.closed:
+            connection = cls.get_engine().connect()
+            flask.g.database_request_connection = connection
+        return connection
+
+    @classmethod
+    @contextmanager
+    def read_only(cls):
+        """
+        Allow select queries within the context to use the read replica, if configured.
+
+        Queries that modify data, and any subsequent queries in the request, continue to use the primary database.
+        This only applies within request contexts of apps registered using `register_app`.
+        """
+        if not has_request_context():
+            yield
+            return
+
+        previous_read_only = flask.g.get('database_read_only', False)
+        flask.g.database_read_only = True
+        try:
+            yield
+        finally:
+            flask.g.database_read_only = previous_read_only
+
+    @staticmethod
+    def mark_written() -> None:
+        """Mark that data has been modified during the current request, so that subsequent queries use the primary database"""
+        if has_request_context():
+            flask.g.database_written = True
+
+    @staticmethod
+    def can_use_read_replica() -> bool:
+        """Return whether select queries in the current context can use the read replica"""
+        return (
+            has_request_context() and
+            flask.g.get('database_read_only', False) and
+            not flask.g.get('database_written', False)
+        )
+
+    @classmethod
+    def _get_read_request_connection(cls) -> Union[None, sqlalchemy.engine.Connection]:
+        """Return request-scoped read replica connection, if queries in the current context can use the read replica"""
+        if (not cls.can_use_read_replica() or
+                not flask.current_app.extensions.get('terrareg_database') or
+                (read_engine := cls.get_read_engine()) is None):
+            return None
+
+        connection = flask.g.get('database_read_request_connection', None)
+        if connection is None or connection.closed:
+            connection = read_engine.connect()
+            flask.g.database_read_request_connection = connection
+        return connection
+
     def initialise(self):
         """Initialise database schema."""
         meta = self.get_meta()
@@ -505,15 +687,28 @@ class Database():
             )
         )
 
+        self._module_details_blob = sqlalchemy.Table(
+            'module_details_blob', meta,
+            # SHA256 hash of uncompressed content
+            sqlalchemy.Column('hash', sqlalchemy.String(64), primary_key=True),
+            sqlalchemy.Column('compression', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=False),
+            sqlalchemy.Column('content', Database.medium_blob(), nullable=False),
+            # Size of uncompressed content
+            sqlalchemy.Column('size', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('reference_count', sqlalchemy.Integer, nullable=False, default=0)
+        )
+
         self._module_details = sqlalchemy.Table(
             'module_details', meta,
             sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True, autoincrement=True),
-            sqlalchemy.Column('readme_content', Database.medium_blob()),
-            sqlalchemy.Column('terraform_docs', Database.medium_blob()),
-            sqlalchemy.Column('tfsec', Database.medium_blob()),
-            sqlalchemy.Column('infracost', Database.medium_blob()),
-            sqlalchemy.Column('terraform_graph', Database.medium_blob()),
-            sqlalchemy.Column('terraform_modules', Database.medium_blob()),
+            # Hashes of content stored in module_details_blob table
+            sqlalchemy.Column('readme_content_hash', sqlalchemy.String(64), nullable=True),
+            sqlalchemy.Column('terraform_docs_hash', sqlalchemy.String(64), nullable=True),
+            sqlalchemy.Column('tfsec_hash', sqlalchemy.String(64), nullable=True),
+            sqlalchemy.Column('infracost_hash', sqlalchemy.String(64), nullable=True),
+            sqlalchemy.Column('terraform_graph_hash', sqlalchemy.String(64), nullable=True),
+            sqlalchemy.Column('terraform_graph_json_hash', sqlalchemy.String(64), nullable=True),
+            sqlalchemy.Column('terraform_modules_hash', sqlalchemy.String(64), nullable=True),
             sqlalchemy.Column('terraform_version', Database.medium_blob())
         )
 
@@ -554,7 +749,17 @@ class Database():
             sqlalchemy.Column('variable_template', Database.medium_blob()),
             sqlalchemy.Column('internal', sqlalchemy.Boolean, nullable=False),
             sqlalchemy.Column('published', sqlalchemy.Boolean),
-            sqlalchemy.Column('extraction_version', sqlalchemy.Integer)
+            sqlalchemy.Column('extraction_version', sqlalchemy.Integer),
+            # Sortable components of version, see terrareg.version_sort_key
+            sqlalchemy.Column('version_major', sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column('version_minor', sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column('version_patch', sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column('version_prerelease_rank', sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column('version_prerelease', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Index(
+                'ix_module_version_version_sort', 'module_provider_id',
+                'version_major', 'version_minor', 'version_patch', 'version_prerelease_rank', 'version_prerelease'
+            ),
         )
 
         self._sub_module = sqlalchemy.Table(
@@ -581,7 +786,33 @@ class Database():
             ),
             sqlalchemy.Column('type', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
             sqlalchemy.Column('path', sqlalchemy.String(LARGE_COLUMN_SIZE)),
-            sqlalchemy.Column('name', sqlalchemy.String(GENERAL_COLUMN_SIZE))
+            sqlalchemy.Column('name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
+            # Hash of submodule source, used to re-use analysis between module versions
+            sqlalchemy.Column('content_hash', sqlalchemy.String(64), nullable=True)
+        )
+
+        # Module and provider dependencies of module versions and their submodules,
+        # extracted from terraform-docs output when the module version is indexed
+        self._module_version_dependency = sqlalchemy.Table(
+            'module_version_dependency', meta,
+            sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True, autoincrement=True),
+            sqlalchemy.Column(
+                'module_version_id',
+                sqlalchemy.ForeignKey(
+                    'module_version.id',
+                    name='fk_module_version_dependency_module_version_id_module_version_id',
+                    onupdate='CASCADE',
+                    ondelete='CASCADE'),
+                nullable=False,
+                index=True
+            ),
+            # Path of submodule, or empty string for root module
+            sqlalchemy.Column('path', sqlalchemy.String(LARGE_COLUMN_SIZE), nullable=False),
+            sqlalchemy.Column('dependency_type', sqlalchemy.Enum(ModuleDependencyType), nullable=False),
+            sqlalchemy.Column('name', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('namespace', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('source', sqlalchemy.String(LARGE_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('version', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True)
         )
 
         self._analytics = sqlalchemy.Table(
@@ -598,6 +829,31 @@ class Database():
             sqlalchemy.Column('namespace_name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
             sqlalchemy.Column('module_name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
             sqlalchemy.Column('provider_name', sqlalchemy.String(GENERAL_COLUMN_SIZE)),
+
+            sqlalchemy.Index('ix_analytics_timestamp', 'timestamp'),
+            sqlalchemy.Index('ix_analytics_parent_module_version_timestamp', 'parent_module_version', 'timestamp'),
+            sqlalchemy.Index('ix_analytics_parent_module_version_token_environment', 'parent_module_version', 'analytics_token', 'environment'),
+            sqlalchemy.Index('ix_analytics_module_provider_names', 'module_name', 'provider_name', 'namespace_name'),
+        )
+
+        # Daily rollup of module version downloads, generated from
+        # the analytics table for days prior to the current day
+        self._analytics_daily_download = sqlalchemy.Table(
+            'analytics_daily_download', meta,
+            sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True, autoincrement=True),
+            sqlalchemy.Column('module_version_id', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Column('date', sqlalchemy.Date, nullable=False, index=True),
+            sqlalchemy.Column('environment', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('download_count', sqlalchemy.Integer, nullable=False),
+            sqlalchemy.Index('ix_analytics_daily_download_module_version_id_date', 'module_version_id', 'date'),
+        )
+
+        # ID of the latest analytics row included in each rollup,
+        # as analytics may be inserted after later downloads
+        self._analytics_rollup_state = sqlalchemy.Table(
+            'analytics_rollup_state', meta,
+            sqlalchemy.Column('name', sqlalchemy.String(GENERAL_COLUMN_SIZE), primary_key=True),
+            sqlalchemy.Column('last_analytics_id', sqlalchemy.Integer, nullable=False),
         )
 
         self._provider_analytics = sqlalchemy.Table(
@@ -645,6 +901,33 @@ class Database():
             sqlalchemy.Column('content', Database.medium_blob())
         )
 
+        self._module_extraction_job = sqlalchemy.Table(
+            'module_extraction_job', meta,
+            sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True, autoincrement=True),
+            sqlalchemy.Column(
+                'module_provider_id',
+                sqlalchemy.ForeignKey(
+                    'module_provider.id',
+                    name='fk_module_extraction_job_module_provider_id_module_provider_id',
+                    onupdate='CASCADE',
+                    ondelete='CASCADE'),
+                nullable=False
+            ),
+            sqlalchemy.Column('version', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=False),
+            sqlalchemy.Column('status', sqlalchemy.Enum(ModuleExtractionJobStatus), nullable=False, index=True),
+            sqlalchemy.Column('attempts', sqlalchemy.Integer, nullable=False, default=0),
+            sqlalchemy.Column('progress', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('worker_id', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('error', sqlalchemy.String(LARGE_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('log', Database.medium_blob(), nullable=True),
+            sqlalchemy.Column('force_full_extraction', sqlalchemy.Boolean, nullable=False, default=False),
+            sqlalchemy.Column('created_at', sqlalchemy.DateTime, nullable=False),
+            sqlalchemy.Column('next_attempt_at', sqlalchemy.DateTime, nullable=True),
+            sqlalchemy.Column('started_at', sqlalchemy.DateTime, nullable=True),
+            sqlalchemy.Column('heartbeat_at', sqlalchemy.DateTime, nullable=True),
+            sqlalchemy.Column('finished_at', sqlalchemy.DateTime, nullable=True)
+        )
+
         self._gpg_key = sqlalchemy.Table(
             'gpg_key', meta,
             sqlalchemy.Column('id', sqlalchemy.Integer, primary_key = True),
@@ -749,7 +1032,32 @@ class Database():
                     use_alter=True
                 ),
                 nullable=True
-            )
+            ),
+            sqlalchemy.Column('last_release_poll_at', sqlalchemy.DateTime, nullable=True, index=True),
+            sqlalchemy.Column('last_release_poll_error', sqlalchemy.String(LARGE_COLUMN_SIZE), nullable=True),
+        )
+
+        self._provider_index_job = sqlalchemy.Table(
+            'provider_index_job', meta,
+            sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True, autoincrement=True),
+            sqlalchemy.Column(
+                'provider_id',
+                sqlalchemy.ForeignKey(
+                    'provider.id',
+                    name='fk_provider_index_job_provider_id_provider_id',
+                    onupdate='CASCADE',
+                    ondelete='CASCADE'),
+                nullable=False
+            ),
+            sqlalchemy.Column('version', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=False),
+            sqlalchemy.Column('status', sqlalchemy.Enum(ProviderIndexJobStatus), nullable=False, index=True),
+            sqlalchemy.Column('attempts', sqlalchemy.Integer, nullable=False, default=0),
+            sqlalchemy.Column('worker_id', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('error', sqlalchemy.String(LARGE_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Column('created_at', sqlalchemy.DateTime, nullable=False),
+            sqlalchemy.Column('next_attempt_at', sqlalchemy.DateTime, nullable=True),
+            sqlalchemy.Column('started_at', sqlalchemy.DateTime, nullable=True),
+            sqlalchemy.Column('finished_at', sqlalchemy.DateTime, nullable=True)
         )
 
         self._provider_version = sqlalchemy.Table(
@@ -781,6 +1089,16 @@ class Database():
             sqlalchemy.Column('published_at', sqlalchemy.DateTime),
             sqlalchemy.Column('extraction_version', sqlalchemy.Integer),
             sqlalchemy.Column('protocol_versions', self.medium_blob()),
+            # Sortable components of version, see terrareg.version_sort_key
+            sqlalchemy.Column('version_major', sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column('version_minor', sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column('version_patch', sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column('version_prerelease_rank', sqlalchemy.Integer, nullable=True),
+            sqlalchemy.Column('version_prerelease', sqlalchemy.String(GENERAL_COLUMN_SIZE), nullable=True),
+            sqlalchemy.Index(
+                'ix_provider_version_version_sort', 'provider_id',
+                'version_major', 'version_minor', 'version_patch', 'version_prerelease_rank', 'version_prerelease'
+            ),
         )
 
         self._provider_version_documentation = sqlalchemy.Table(
@@ -892,13 +1210,36 @@ class Database():
 
         return None
 
+    @classmethod
+    def run_after_commit(cls, callback: Callable[[], None]):
+        """
+        Run callback once the current transaction has been committed.
+
+        If not within a transaction, the callback is run immediately.
+        Callbacks are not run if the transaction is rolled back.
+        """
+        if has_request_context():
+            transaction = flask.g.get('database_transaction', None)
+        else:
+            transaction = cls.get().transaction
+
+        if transaction is None:
+            callback()
+        else:
+            transaction.after_commit_callbacks.append(callback)
+
     @classmethod
     def start_transaction(cls):
         """Start DB transaction, store in current context and return"""
         # Check if currently in transaction
         if cls.get_current_transaction():
             raise Exception('Already within database transaction')
-        conn = Database.get().get_connection()
+        # Use primary database for the remainder of the request,
+        # so that data modified by the transaction is visible
+        cls.mark_written()
+        conn = cls._get_request_connection()
+        if conn is None:
+            conn = cls.get_engine().connect()
         return Transaction(conn)
 
     @classmethod
@@ -912,6 +1253,8 @@ class Database():
                 yield nested
             except:
                 nested.rollback()
+                # Remove rows that may have been loaded from the rolled back savepoint
+                RequestIdentityMap.clear()
                 raise
         else:
             with cls.start_transaction() as transaction:
@@ -930,10 +1273,65 @@ class Database():
             # to handle 'with get_connection():'
             return TransactionConnectionWrapper(current_transaction)
 
+        # Route select queries to read replica, if enabled for request
+        if (read_connection := cls._get_read_request_connection()) is not None:
+            return ReadRoutingConnection(read_connection)
+
+        # Re-use connection for request, if available
+        if (request_connection := cls._get_request_connection()) is not None:
+            return ConnectionWrapper(request_connection)
+
         # If transaction is not currently active, return database connection
         return cls.get().get_engine().connect()
 
 
+class ConnectionWrapper:
+    """Wrap request-scoped connection, so that it is not closed after use in 'with get_connection():'"""
+
+    def __init__(self, connection):
+        """Store connection"""
+        self._connection = connection
+
+    def __enter__(self):
+        """On enter, return connection."""
+        return self._connection
+
+    def __exit__(self, *args, **kwargs):
+        """Do nothing on exit"""
+        self._connection = None
+
+
+class ReadRoutingConnection:
+    """
+    Wrap request-scoped connections, executing select queries using the read replica connection
+    and all other queries using the primary database connection.
+    """
+
+    def __init__(self, read_connection):
+        """Store read replica connection"""
+        self._read_connection = read_connection
+
+    def __enter__(self):
+        """On enter, return self, to route executed queries."""
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        """Do nothing on exit"""
+        pass
+
+    def execute(self, statement, *args, **kwargs):
+        """Execute statement using read replica, if it is a select query, otherwise using the primary database"""
+        if getattr(statement, 'is_select', False) and Database.can_use_read_replica():
+            return self._read_connection.execute(statement, *args, **kwargs)
+
+        Database.mark_written()
+        return Database._get_request_connection().execute(statement, *args, **kwargs)
+
+    def __getattr__(self, name):
+        """Pass other attributes through to primary database connection"""
+        return getattr(Database._get_request_connection(), name)
+
+
 class TransactionConnectionWrapper:
 
     def __init__(self, transaction):
@@ -966,6 +1364,8 @@ class Transaction:
         """Store database connection."""
         self._connection = connection
         self._transaction_outer = None
+        # Callbacks to run after the transaction has been committed
+        self.after_commit_callbacks = []
     
     def __enter__(self):
         """Start transaction and store in current context."""
@@ -977,8 +1377,10 @@ class Transaction:
         # returned by any get_connection methods
         if has_request_context():
             flask.g.database_transaction_connection = self._connection
+            flask.g.database_transaction = self
         else:
             Database.get().transaction_connection = self._connection
+            Database.get().transaction = self
 
         return self
 
@@ -986,8 +1388,19 @@ class Transaction:
         """End transaction and remove from current context."""
         if has_request_context():
             flask.g.database_transaction_connection = None
+            flask.g.database_transaction = None
         else:
             Database.get().transaction_connection = None
+            Database.get().transaction = None
 
+        # Remove rows loaded during the transaction, as it may be rolled back
+        RequestIdentityMap.clear()
+
+        exc_type = args[0] if args else kwargs.get('exc_type')
         self._transaction_outer.__exit__(*args, **kwargs)
 
+        # Run callbacks once the transaction has been committed
+        if exc_type is None:
+            for callback in self.after_commit_callbacks:
+                callback()
+
@@ -186,8 +186,20 @@ class InvalidUserGroupNameError(TerraregError):
     pass
 
 
-class UnableToGetGlobalTerraformLockError(TerraregError):
-    """Unable to acquire thread lock whilst switching Terraform"""
+class UnableToObtainTerraformBinaryCacheLockError(TerraregError):
+    """Unable to acquire lock on Terraform binary cache whilst installing Terraform"""
+
+    pass
+
+
+class UnableToObtainTerraformPluginCacheLockError(TerraregError):
+    """Unable to acquire lock on Terraform plugin cache whilst initialising module"""
+
+    pass
+
+
+class UnableToObtainGitMirrorCacheLockError(TerraregError):
+    """Unable to acquire lock on git mirror cache whilst cloning module repository"""
 
     pass
 
@@ -432,6 +444,12 @@ class InvalidUploadDirectoryError(TerraregError):
     pass
 
 
+class InvalidGitMirrorCacheDirectoryError(TerraregError):
+    """Git mirror cache directory is configured incorrectly."""
+
+    pass
+
+
 class FileUploadError(TerraregError):
     """Error whilst uploading a file"""
 
@@ -1,10 +1,12 @@
 
 import re
-from typing import TextIO, Tuple
+from typing import BinaryIO, Iterator, TextIO, Tuple
 import abc
+from contextlib import contextmanager
 from io import BytesIO, TextIOWrapper
 import os
 import shutil
+import uuid
 
 import boto3
 import botocore.exceptions
@@ -55,6 +57,15 @@ class BaseFileStorage(abc.ABC):
         """Write file to file storage from content"""
         ...
 
+    @abc.abstractmethod
+    def open_writer(self, dest_directory: str, dest_filename: str) -> Iterator[BinaryIO]:
+        """
+        Context manager providing binary file handle to stream content to file in storage.
+
+        The file is only created once the context exits without error.
+        """
+        ...
+
 
 class LocalFileStorage(BaseFileStorage):
     """Handle local file storage."""
@@ -156,6 +167,116 @@ class LocalFileStorage(BaseFileStorage):
         with open(path, mode) as fh:
             fh.write(content)
 
+    @contextmanager
+    def open_writer(self, dest_directory: str, dest_filename: str) -> Iterator[BinaryIO]:
+        """Write to temporary file in destination directory, which is renamed to the destination file on completion"""
+        self._check_not_directory(dest_directory, dest_filename)
+
+        # Create directory to store file
+        self.make_directory(dest_directory)
+
+        dest_directory = self._generate_path(dest_directory)
+        dest_full_path = os.path.join(dest_directory, dest_filename)
+
+        # Write to temporary file in destination directory,
+        # so that it can be atomically renamed
+        temp_path = os.path.join(dest_directory, f".{dest_filename}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "xb") as fh:
+                yield fh
+            os.replace(temp_path, dest_full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
+class S3MultipartUploadWriter:
+    """
+    Binary file handle, uploading content to s3 object using multipart upload.
+
+    Content is buffered until a part can be uploaded, limiting memory usage to
+    approximately the size of a single part.
+    Content smaller than a single part is uploaded in a single request.
+    """
+
+    # Minimum part size supported by s3 is 5MB
+    PART_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, s3_client, bucket_name: str, key: str):
+        """Store member variables"""
+        self._s3_client = s3_client
+        self._bucket_name = bucket_name
+        self._key = key
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id = None
+        self._parts = []
+
+    def write(self, data: bytes) -> int:
+        """Add content to buffer, uploading parts once buffer reaches part size"""
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self.PART_SIZE:
+            self._upload_part(self._buffer[:self.PART_SIZE])
+            del self._buffer[:self.PART_SIZE]
+        return len(data)
+
+    def tell(self) -> int:
+        """Return number of bytes written"""
+        return self._position
+
+    def flush(self) -> None:
+        """Do nothing, as content is only uploaded when a part is complete"""
+        pass
+
+    def _upload_part(self, data: bytearray) -> None:
+        """Upload part of object, creating multipart upload if it does not exist"""
+        if self._upload_id is None:
+            self._upload_id = self._s3_client.create_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=self._key
+            )["UploadId"]
+
+        part_number = len(self._parts) + 1
+        res = self._s3_client.upload_part(
+            Bucket=self._bucket_name,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(data)
+        )
+        self._parts.append({"ETag": res["ETag"], "PartNumber": part_number})
+
+    def complete(self) -> None:
+        """Upload remaining content and complete upload"""
+        if self._upload_id is None:
+            self._s3_client.put_object(
+                Bucket=self._bucket_name,
+                Key=self._key,
+                Body=bytes(self._buffer)
+            )
+        else:
+            if self._buffer:
+                self._upload_part(self._buffer)
+            self._s3_client.complete_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=self._key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts}
+            )
+        self._buffer = bytearray()
+
+    def abort(self) -> None:
+        """Abort multipart upload, removing any uploaded parts"""
+        if self._upload_id is not None:
+            self._s3_client.abort_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=self._key,
+                UploadId=self._upload_id
+            )
+        self._buffer = bytearray()
+
 
 class S3FileStorage(BaseFileStorage):
     """Handle file storage in s3"""
@@ -204,9 +325,27 @@ class S3FileStorage(BaseFileStorage):
 
     def upload_file(self, source_path: str, dest_directory: str, dest_filename: str) -> None:
         """Upload file to s3"""
-        with open(source_path, 'rb') as fh:
-            content = fh.read()
-        self.write_file(path=f'{dest_directory}/{dest_filename}', content=content, binary=True)
+        # Use managed transfer, which streams the file
+        # and uses multipart uploads for large files
+        self._get_bucket().upload_file(
+            Filename=source_path,
+            Key=self._generate_key(f'{dest_directory}/{dest_filename}')
+        )
+
+    @contextmanager
+    def open_writer(self, dest_directory: str, dest_filename: str) -> Iterator[BinaryIO]:
+        """Stream content to s3 object using multipart upload"""
+        writer = S3MultipartUploadWriter(
+            s3_client=self._s3_client,
+            bucket_name=self._bucket_name,
+            key=self._generate_key(f'{dest_directory}/{dest_filename}')
+        )
+        try:
+            yield writer
+            writer.complete()
+        except BaseException:
+            writer.abort()
+            raise
 
     def write_file(self, path: str, content: any, binary: bool):
         """Write file to file storage from content"""
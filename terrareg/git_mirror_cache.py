@@ -0,0 +1,221 @@
+"""Cache of bare git repository mirrors, used when cloning modules during extraction."""
+
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from typing import Dict, Optional
+
+import terrareg.config
+import terrareg.errors
+from terrareg.utils import FileLockTimeoutError, exclusive_file_lock
+
+
+class GitMirrorCache:
+    """
+    Bare mirrors of module git repositories, shared between all module extractions.
+
+    Each repository is stored in a bare repository named by the hash of the clone URL,
+    which is updated with an incremental fetch each time a module version is cloned.
+    Module versions are extracted from a shallow clone of the tag from the mirror.
+    The modification time of the mirror is used to record the last use,
+    allowing the least recently used mirrors to be evicted when the cache exceeds the maximum size.
+    """
+
+    LOCK_TIMEOUT = 600
+    _STATISTICS_FILE = ".statistics.json"
+    _LOCK_FILE = ".lock"
+
+    def __init__(self, directory: Optional[str]=None, max_size: Optional[int]=None):
+        """Store member variables"""
+        config = terrareg.config.Config()
+        self._directory = config.GIT_MIRROR_CACHE_DIRECTORY if directory is None else directory
+        # Convert maximum size from MB to bytes
+        self._max_size = (config.GIT_MIRROR_CACHE_MAX_SIZE if max_size is None else max_size) * 1024 * 1024
+
+    @property
+    def directory(self) -> str:
+        """Return path of cache directory"""
+        return self._directory
+
+    @contextmanager
+    def _lock(self, lock_file: str, timeout: int):
+        """Obtain exclusive lock on lock file in cache directory"""
+        os.makedirs(self._directory, exist_ok=True)
+        try:
+            with exclusive_file_lock(os.path.join(self._directory, lock_file), timeout=timeout):
+                yield
+        except FileLockTimeoutError:
+            raise terrareg.errors.UnableToObtainGitMirrorCacheLockError(
+                f"Unable to obtain git mirror cache lock in {timeout} seconds"
+            )
+
+    @staticmethod
+    def _get_mirror_name(git_url: str) -> str:
+        """Return directory name of mirror for git URL"""
+        return f"{hashlib.sha256(git_url.encode('utf-8')).hexdigest()}.git"
+
+    def _get_mirror_names(self):
+        """Return names of all mirrors in cache"""
+        if not os.path.isdir(self._directory):
+            return []
+        return [
+            name
+            for name in os.listdir(self._directory)
+            if name.endswith(".git") and os.path.isdir(os.path.join(self._directory, name))
+        ]
+
+    @staticmethod
+    def _get_directory_size(directory: str) -> int:
+        """
+        Return total size of files in directory.
+
+        Files that are removed whilst calculating the size, such as temporary
+        files created by git whilst another process fetches into the mirror, are ignored.
+        """
+        size = 0
+        for root, _, files in os.walk(directory):
+            for file_ in files:
+                try:
+                    size += os.lstat(os.path.join(root, file_)).st_size
+                except OSError:
+                    continue
+        return size
+
+    def _get_last_use(self, mirror_name: str) -> float:
+        """Return last use time of mirror, or 0 if the mirror has been removed"""
+        try:
+            return os.path.getmtime(os.path.join(self._directory, mirror_name))
+        except OSError:
+            return 0
+
+    def _read_statistics(self) -> Optional[Dict[str, int]]:
+        """Read statistics file from cache directory"""
+        try:
+            with open(os.path.join(self._directory, self._STATISTICS_FILE), "r") as statistics_fh:
+                return json.load(statistics_fh)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_statistics(self, statistics: Dict[str, int]):
+        """Write statistics file to cache directory"""
+        statistics_file = os.path.join(self._directory, self._STATISTICS_FILE)
+        with open(f"{statistics_file}.tmp", "w") as statistics_fh:
+            json.dump(statistics, statistics_fh)
+        os.replace(f"{statistics_file}.tmp", statistics_file)
+
+    def get_statistics(self) -> Optional[Dict[str, int]]:
+        """
+        Return cache hit, miss and eviction counts and the current size of the cache.
+
+        Returns None if the cache has not yet been used.
+        """
+        return self._read_statistics()
+
+    def _evict(self, mirror_sizes: Dict[str, int], in_use_mirror: str) -> int:
+        """Remove least recently used mirrors until cache is within maximum size, returning the number of evicted mirrors"""
+        total_size = sum(mirror_sizes.values())
+        if not self._max_size or total_size <= self._max_size:
+            return 0
+
+        evicted = 0
+        mirrors_by_last_use = sorted(mirror_sizes.keys(), key=self._get_last_use)
+        for mirror_name in mirrors_by_last_use:
+            if total_size <= self._max_size:
+                break
+            if mirror_name == in_use_mirror:
+                continue
+
+            # Skip mirrors that are being used by other extractions
+            try:
+                with self._lock(f"{mirror_name}.lock", timeout=0):
+                    shutil.rmtree(os.path.join(self._directory, mirror_name))
+            except terrareg.errors.UnableToObtainGitMirrorCacheLockError:
+                continue
+            except OSError as exc:
+                print(f"Failed to evict git mirror {mirror_name}: {exc}")
+                continue
+
+            total_size -= mirror_sizes.pop(mirror_name)
+            evicted += 1
+
+        return evicted
+
+    def _record_usage(self, mirror_name: str, hit: bool):
+        """Record statistics and evict least recently used mirrors"""
+        with self._lock(self._LOCK_FILE, timeout=self.LOCK_TIMEOUT):
+            mirror_sizes = {
+                name: self._get_directory_size(os.path.join(self._directory, name))
+                for name in self._get_mirror_names()
+            }
+            evictions = self._evict(mirror_sizes=mirror_sizes, in_use_mirror=mirror_name)
+
+            statistics = self._read_statistics() or {"hits": 0, "misses": 0, "evictions": 0}
+            statistics["hits" if hit else "misses"] += 1
+            statistics["evictions"] += evictions
+            statistics["size"] = sum(mirror_sizes.values())
+            self._write_statistics(statistics)
+
+    def clone(self, git_url: str, authenticated_git_url: str, tag: str, target_directory: str,
+              env: Dict[str, str], timeout: Optional[int]):
+        """
+        Update mirror of repository and create shallow clone of tag in target directory.
+
+        The mirror is keyed by the git URL, without credentials.
+        The authenticated git URL is only used to fetch from the remote and is not stored in the mirror.
+
+        Raises subprocess.CalledProcessError if a git command fails.
+        """
+        mirror_name = self._get_mirror_name(git_url)
+        mirror_path = os.path.join(self._directory, mirror_name)
+
+        # Lock the mirror, to avoid concurrent fetches and eviction whilst it is in use
+        with self._lock(f"{mirror_name}.lock", timeout=self.LOCK_TIMEOUT):
+            hit = os.path.isdir(mirror_path)
+            if not hit:
+                subprocess.check_output(
+                    ["git", "init", "--bare", mirror_path],
+                    stderr=subprocess.STDOUT
+                )
+
+            try:
+                subprocess.check_output(
+                    [
+                        "git", "fetch", "--prune", "--force",
+                        authenticated_git_url,
+                        "+refs/heads/*:refs/heads/*",
+                        "+refs/tags/*:refs/tags/*"
+                    ],
+                    cwd=mirror_path,
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    timeout=timeout
+                )
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                # Remove newly created mirror, so that a failed
+                # initial fetch is not treated as a cache hit
+                if not hit:
+                    shutil.rmtree(mirror_path, ignore_errors=True)
+                raise
+
+            subprocess.check_output(
+                [
+                    "git", "clone", "--single-branch", "--depth", "1",
+                    "--branch", tag,
+                    f"file://{os.path.abspath(mirror_path)}",
+                    target_directory
+                ],
+                stderr=subprocess.STDOUT,
+                env=env
+            )
+
+            # Mark mirror as most recently used
+            os.utime(mirror_path)
+
+        # Failing to record statistics or evict mirrors does not affect the clone
+        try:
+            self._record_usage(mirror_name=mirror_name, hit=hit)
+        except (OSError, terrareg.errors.UnableToObtainGitMirrorCacheLockError) as exc:
+            print(f"Failed to record git mirror cache usage: {exc}")
@@ -0,0 +1,228 @@
+"""Per-namespace GPG keyrings and OpenPGP signature inspection."""
+
+import base64
+from dataclasses import dataclass
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import gnupg
+
+
+@dataclass(frozen=True)
+class SignatureIssuer:
+    """Issuer of an OpenPGP signature, as declared in the signature packet"""
+
+    key_id: Optional[str]
+    fingerprint: Optional[str]
+
+
+# OpenPGP packet tag for signature packets (RFC 4880 4.3)
+_SIGNATURE_PACKET_TAG = 2
+# Signature subpacket types (RFC 4880 5.2.3.1, RFC 9580 5.2.3.7)
+_ISSUER_KEY_ID_SUBPACKET = 16
+_ISSUER_FINGERPRINT_SUBPACKET = 33
+
+
+def _dearmor(signature: bytes) -> bytes:
+    """Convert ASCII armored signature to binary"""
+    lines = signature.decode('utf-8').strip().splitlines()
+    body = []
+    in_body = False
+    for line in lines[1:]:
+        line = line.strip()
+        if line.startswith("-----END"):
+            break
+        if not in_body:
+            # Armor headers are terminated by an empty line
+            if not line:
+                in_body = True
+            elif ":" not in line:
+                in_body = True
+                body.append(line)
+            continue
+        if line.startswith("="):
+            # CRC checksum
+            break
+        body.append(line)
+    return base64.b64decode("".join(body))
+
+
+def _read_packet(data: bytes) -> Tuple[int, bytes]:
+    """Read first OpenPGP packet from data, returning the packet tag and body"""
+    header = data[0]
+    if not header & 0x80:
+        raise ValueError("Invalid OpenPGP packet header")
+
+    if header & 0x40:
+        # New format packet
+        tag = header & 0x3F
+        first_octet = data[1]
+        if first_octet < 192:
+            return tag, data[2:2 + first_octet]
+        elif first_octet < 224:
+            length = ((first_octet - 192) << 8) + data[2] + 192
+            return tag, data[3:3 + length]
+        elif first_octet == 255:
+            length = int.from_bytes(data[2:6], 'big')
+            return tag, data[6:6 + length]
+        raise ValueError("Partial body length not supported for signature packets")
+
+    # Old format packet
+    tag = (header >> 2) & 0x0F
+    length_type = header & 0x03
+    if length_type == 3:
+        return tag, data[1:]
+    length_size = 1 << length_type
+    length = int.from_bytes(data[1:1 + length_size], 'big')
+    return tag, data[1 + length_size:1 + length_size + length]
+
+
+def _read_subpackets(data: bytes) -> List[Tuple[int, bytes]]:
+    """Parse signature subpacket area, returning list of subpacket type and body"""
+    subpackets = []
+    offset = 0
+    while offset < len(data):
+        first_octet = data[offset]
+        if first_octet < 192:
+            length = first_octet
+            offset += 1
+        elif first_octet < 255:
+            length = ((first_octet - 192) << 8) + data[offset + 1] + 192
+            offset += 2
+        else:
+            length = int.from_bytes(data[offset + 1:offset + 5], 'big')
+            offset += 5
+        if length < 1:
+            raise ValueError("Invalid signature subpacket length")
+        # Strip critical bit from subpacket type
+        subpackets.append((data[offset] & 0x7F, data[offset + 1:offset + length]))
+        offset += length
+    return subpackets
+
+
+def get_signature_issuer(signature: bytes) -> Optional[SignatureIssuer]:
+    """
+    Obtain issuer key ID and fingerprint from detached signature,
+    without requiring the signature to be verified.
+
+    Returns None if the signature cannot be parsed or does not declare an issuer.
+    """
+    try:
+        if signature.lstrip().startswith(b"-----BEGIN PGP"):
+            signature = _dearmor(signature.lstrip())
+
+        tag, body = _read_packet(signature)
+        if tag != _SIGNATURE_PACKET_TAG:
+            return None
+
+        version = body[0]
+        if version == 3:
+            # Version 3 signatures contain the key ID in a fixed position
+            return SignatureIssuer(key_id=body[7:15].hex().upper(), fingerprint=None)
+        elif version in (4, 5, 6):
+            # Subpacket area lengths are 4 octets for version 6 signatures
+            length_size = 4 if version == 6 else 2
+            offset = 4
+            hashed_length = int.from_bytes(body[offset:offset + length_size], 'big')
+            offset += length_size
+            hashed_subpackets = body[offset:offset + hashed_length]
+            offset += hashed_length
+            unhashed_length = int.from_bytes(body[offset:offset + length_size], 'big')
+            offset += length_size
+            unhashed_subpackets = body[offset:offset + unhashed_length]
+        else:
+            return None
+
+        key_id = None
+        fingerprint = None
+        for subpacket_type, subpacket in _read_subpackets(hashed_subpackets) + _read_subpackets(unhashed_subpackets):
+            if subpacket_type == _ISSUER_KEY_ID_SUBPACKET and len(subpacket) == 8:
+                key_id = subpacket.hex().upper()
+            elif subpacket_type == _ISSUER_FINGERPRINT_SUBPACKET and len(subpacket) > 1:
+                # First octet is the key version
+                fingerprint = subpacket[1:].hex().upper()
+                # Key ID of version 4 keys are the low 64 bits of the fingerprint
+                if key_id is None and subpacket[0] == 4:
+                    key_id = fingerprint[-16:]
+
+    except (IndexError, ValueError, UnicodeDecodeError):
+        return None
+
+    if key_id is None and fingerprint is None:
+        return None
+    return SignatureIssuer(key_id=key_id, fingerprint=fingerprint)
+
+
+class NamespaceGpgKeyring:
+    """
+    GPG keyring containing the GPG keys of a namespace.
+
+    Keyrings are built lazily, importing keys as they are first used
+    for verification, and are retained for the life of the process.
+    Keyrings must be invalidated when keys are added to or removed from the namespace.
+    """
+
+    _KEYRINGS: Dict[int, 'NamespaceGpgKeyring'] = {}
+    _KEYRINGS_LOCK = threading.Lock()
+
+    @classmethod
+    def get(cls, namespace_pk: int) -> 'NamespaceGpgKeyring':
+        """Return keyring for namespace"""
+        with cls._KEYRINGS_LOCK:
+            if namespace_pk not in cls._KEYRINGS:
+                cls._KEYRINGS[namespace_pk] = cls()
+            return cls._KEYRINGS[namespace_pk]
+
+    @classmethod
+    def invalidate(cls, namespace_pk: int) -> None:
+        """Remove keyring for namespace, causing it to be rebuilt on next use"""
+        with cls._KEYRINGS_LOCK:
+            # The temporary directory is removed once
+            # the keyring is no longer in use
+            cls._KEYRINGS.pop(namespace_pk, None)
+
+    def __init__(self):
+        """Create GPG home directory for keyring"""
+        self._temp_directory = tempfile.TemporaryDirectory()
+        self._gpg = gnupg.GPG(gnupghome=self._temp_directory.name, keyring=None, use_agent=False)
+        self._lock = threading.Lock()
+        self._fingerprints = set()
+
+    def _import_keys(self, gpg_keys: List['terrareg.models.GpgKey']) -> None:
+        """Import any GPG keys that are not already present in the keyring"""
+        missing_keys = [
+            gpg_key
+            for gpg_key in gpg_keys
+            if gpg_key.fingerprint not in self._fingerprints
+        ]
+        if not missing_keys:
+            return
+
+        # Import all keys using a single gpg call
+        self._gpg.import_keys(key_data="\n".join(gpg_key.ascii_armor for gpg_key in missing_keys))
+        self._fingerprints.update(gpg_key.fingerprint for gpg_key in missing_keys)
+
+    def verify(self, gpg_keys: List['terrareg.models.GpgKey'], signature: bytes, data: bytes) -> Optional['terrareg.models.GpgKey']:
+        """Verify signature of data, returning the GPG key, from the given list, that generated the signature"""
+        if not gpg_keys:
+            return None
+
+        with self._lock:
+            self._import_keys(gpg_keys)
+
+            with tempfile.NamedTemporaryFile() as sig_fh:
+                sig_fh.write(signature)
+                sig_fh.flush()
+                res = self._gpg.verify_data(sig_filename=sig_fh.name, data=data)
+
+        if not res.valid:
+            return None
+
+        # Match on the fingerprint of the primary key, as
+        # the signature may have been generated by a sub-key
+        signing_fingerprint = res.pubkey_fingerprint or res.fingerprint
+        for gpg_key in gpg_keys:
+            if gpg_key.fingerprint == signing_fingerprint:
+                return gpg_key
+        return None
@@ -20,12 +20,14 @@ import pygraphviz
 import networkx as nx
 
 from terrareg.loose_version import LooseVersion
+from terrareg.version_sort_key import get_version_order_by, get_version_sort_key
 import terrareg.analytics
 from terrareg.database import Database
 import terrareg.config
 import terrareg.audit
 import terrareg.audit_action
 from terrareg.namespace_type import NamespaceType
+from terrareg.module_dependency_type import ModuleDependencyType
 import terrareg.result_data
 from terrareg.errors import (
     DuplicateGpgKeyError, DuplicateModuleProviderError, DuplicateNamespaceDisplayNameError, GpgKeyInUseError, InvalidGpgKeyError, InvalidModuleNameError, InvalidModuleProviderNameError, InvalidNamespaceDisplayNameError, InvalidUserGroupNameError,
@@ -41,13 +43,18 @@ from terrareg.errors import (
     ProviderNameNotPermittedError, RepositoryUrlParseError
 )
 import terrareg.version_constraint
-from terrareg.utils import convert_markdown_to_html, get_public_url_details, safe_join_paths, sanitise_html_content
+from terrareg.utils import get_public_url_details, safe_join_paths, sanitise_html_content
 from terrareg.validators import GitUrlValidator
 from terrareg.constants import EXTRACTION_VERSION
 from terrareg.presigned_url import TerraformSourcePresignedUrl
 import terrareg.provider_model
 import terrareg.provider_version_model
 import terrareg.registry_resource_type
+import terrareg.search_index
+import terrareg.blob_store
+import terrareg.gpg_keyring
+import terrareg.rendered_markdown_cache
+from terrareg.request_identity_map import RequestIdentityMap
 import terrareg.file_storage
 import terrareg.provider_source.factory
 import terrareg.provider_source.base
@@ -591,6 +598,24 @@ class GitProvider:
             return None
         return git_provider
 
+    @classmethod
+    def get_by_ids(cls, ids):
+        """Return dict of git providers, keyed by ID, obtaining all rows in a single query."""
+        if not ids:
+            return {}
+
+        db = Database.get()
+        select = db.git_provider.select().where(
+            db.git_provider.c.id.in_(list(ids))
+        )
+        git_providers = {}
+        with db.get_connection() as conn:
+            for row in conn.execute(select):
+                git_provider = cls(id=row['id'])
+                git_provider._row_cache = row
+                git_providers[row['id']] = git_provider
+        return git_providers
+
     @property
     def pk(self):
         """Return DB ID for git provider."""
@@ -642,7 +667,7 @@ class GitProvider:
             )
             with db.get_connection() as conn:
                 res = conn.execute(select)
-                return res.fetchone()
+                self._row_cache = res.fetchone()
         return self._row_cache
 
 
@@ -812,6 +837,9 @@ class Namespace(object):
         if not pk:
             return None
 
+        if (row := RequestIdentityMap.get('namespace', ('pk', pk))) is not None:
+            return cls.from_db_row(row)
+
         db = Database.get()
         display_name_query = sqlalchemy.select(
             db.namespace.c.namespace
@@ -867,6 +895,7 @@ class Namespace(object):
         )
         with db.get_connection() as conn:
             conn.execute(module_provider_insert)
+        RequestIdentityMap.invalidate('namespace')
 
     @classmethod
     def create(cls, name, display_name=None, type_=None):
@@ -1104,8 +1133,18 @@ class Namespace(object):
         self._name = name
         self._cache_db_row = None
 
+    @classmethod
+    def from_db_row(cls, row):
+        """Create namespace object from pre-fetched database row."""
+        namespace = cls(name=row['namespace'])
+        namespace._cache_db_row = row
+        return namespace
+
     def _get_db_row(self):
         """Return database row for namespace."""
+        if self._cache_db_row is None:
+            self._cache_db_row = RequestIdentityMap.get('namespace', ('name', self._name))
+
         if self._cache_db_row is None:
             db = Database.get()
             select = db.namespace.select(
@@ -1116,6 +1155,9 @@ class Namespace(object):
                 res = conn.execute(select)
                 self._cache_db_row = res.fetchone()
 
+            if self._cache_db_row is not None:
+                RequestIdentityMap.add('namespace', [('name', self._name), ('pk', self._cache_db_row['id'])], self._cache_db_row)
+
         return self._cache_db_row
 
     def update_display_name(self, new_display_name):
@@ -1224,6 +1266,12 @@ class Namespace(object):
 
         # Remove cached DB row
         self._cache_db_row = None
+        RequestIdentityMap.invalidate('namespace')
+
+        # Rebuild search indexes, as the namespace is indexed
+        # for all modules and providers in the namespace
+        terrareg.search_index.ModuleSearchIndex.invalidate_all()
+        terrareg.search_index.ProviderSearchIndex.invalidate_all()
 
     def get_view_url(self, resource_type: 'terrareg.registry_resource_type.RegistryResourceType'):
         """Return view URL"""
@@ -1310,6 +1358,7 @@ class Namespace(object):
         delete = sqlalchemy.delete(db.namespace).where(db.namespace.c.id==self.pk)
         with db.get_connection() as conn:
             conn.execute(delete)
+        RequestIdentityMap.invalidate('namespace')
 
     def create_provider_data_directory(self):
         """Create data directory for providers"""
@@ -1382,6 +1431,55 @@ class GpgKey:
             return cls(pk=row['id'])
         return None
 
+    @classmethod
+    def get_by_key_id_and_namespace(cls, key_id: str, namespace) -> Union[None, 'GpgKey']:
+        """Get GPG key by GPG key ID"""
+        db = Database.get()
+        select = sqlalchemy.select(
+            db.gpg_key.c.id
+        ).select_from(
+            db.gpg_key
+        ).where(
+            db.gpg_key.c.key_id==key_id,
+            db.gpg_key.c.namespace_id==namespace.pk
+        )
+
+        with db.get_connection() as conn:
+            row = conn.execute(select).fetchone()
+
+        if row:
+            return cls(pk=row['id'])
+        return None
+
+    @classmethod
+    def get_by_signature(cls, namespace, signature: bytes, data: bytes) -> Union[None, 'GpgKey']:
+        """
+        Obtain GPG key from namespace that generated the signature for the data.
+
+        The issuer of the signature is used to select the matching GPG key,
+        falling back to verifying against all keys in the namespace
+        if the issuer cannot be determined (or is a sub-key).
+        """
+        gpg_keys = None
+        issuer = terrareg.gpg_keyring.get_signature_issuer(signature)
+        if issuer is not None:
+            gpg_key = None
+            if issuer.fingerprint:
+                gpg_key = cls.get_by_fingerprint(issuer.fingerprint)
+                if gpg_key is not None and gpg_key._get_db_row()['namespace_id'] != namespace.pk:
+                    gpg_key = None
+            if gpg_key is None and issuer.key_id:
+                gpg_key = cls.get_by_key_id_and_namespace(key_id=issuer.key_id, namespace=namespace)
+            if gpg_key is not None:
+                gpg_keys = [gpg_key]
+
+        if gpg_keys is None:
+            gpg_keys = cls.get_by_namespace(namespace=namespace)
+
+        return terrareg.gpg_keyring.NamespaceGpgKeyring.get(namespace.pk).verify(
+            gpg_keys=gpg_keys, signature=signature, data=data
+        )
+
     @classmethod
     def get_by_fingerprint(cls, fingerprint) -> Union['GpgKey', None]:
         """Get GPG key by fingerprint"""
@@ -1430,6 +1528,8 @@ class GpgKey:
 
         obj = cls(pk=pk)
 
+        terrareg.gpg_keyring.NamespaceGpgKeyring.invalidate(namespace.pk)
+
         terrareg.audit.AuditEvent.create_audit_event(
             action=terrareg.audit_action.AuditAction.GPG_KEY_CREATE,
             object_type=obj.__class__.__name__,
@@ -1517,12 +1617,8 @@ class GpgKey:
 
     def verify_data_signature(self, signature: bytes, data: bytes):
         """Check if GPG key matches signature"""
-        with self._get_gpg_object(ascii_armor=self.ascii_armor) as (gpg_object, _):
-            with tempfile.NamedTemporaryFile() as sig_fh:
-                sig_fh.write(signature)
-                sig_fh.flush()
-                res = gpg_object.verify_data(sig_filename=sig_fh.name, data=data)
-                return res.valid
+        keyring = terrareg.gpg_keyring.NamespaceGpgKeyring.get(self._get_db_row()['namespace_id'])
+        return keyring.verify(gpg_keys=[self], signature=signature, data=data) is not None
 
     def delete(self):
         """Delete GPG key"""
@@ -1535,6 +1631,7 @@ class GpgKey:
             object_id=self.pk,
             old_value=None, new_value=None
         )
+        namespace_id = self._get_db_row()['namespace_id']
         db = Database.get()
         gpg_key_delete = db.gpg_key.delete().where(
             db.gpg_key.c.id == self.pk
@@ -1542,6 +1639,8 @@ class GpgKey:
         with db.get_connection() as conn:
             conn.execute(gpg_key_delete)
 
+        terrareg.gpg_keyring.NamespaceGpgKeyring.invalidate(namespace_id)
+
     def get_api_data(self):
         """Return API data for model"""
         return {
@@ -1624,6 +1723,47 @@ class Module(object):
 class ModuleDetails:
     """Object to store common details between root module, submodules and examples."""
 
+    # Columns whose content is stored in the blob store,
+    # with the module_details row referencing the hash of the content
+    BLOB_COLUMNS = ['readme_content', 'terraform_docs', 'tfsec', 'infracost',
+                    'terraform_graph', 'terraform_graph_json', 'terraform_modules']
+
+    # Combinations of full_resource_names and full_module_names
+    # that graph JSON is pre-generated for
+    GRAPH_JSON_OPTIONS = [
+        (full_resource_names, full_module_names)
+        for full_resource_names in [False, True]
+        for full_module_names in [False, True]
+    ]
+
+    @classmethod
+    def backfill_graph_json(cls) -> int:
+        """Generate graph JSON for all module details that have graph data without pre-generated graph JSON"""
+        db = Database.get()
+        select = sqlalchemy.select(
+            db.module_details.c.id
+        ).where(
+            db.module_details.c.terraform_graph_hash != None,
+            db.module_details.c.terraform_graph_json_hash == None
+        )
+        with db.get_connection() as conn:
+            ids = [row['id'] for row in conn.execute(select).fetchall()]
+
+        generated_count = 0
+        for id_ in ids:
+            try:
+                cls(id=id_).update_graph_json()
+            except Exception as exc:
+                print(f"Failed to generate graph JSON for module details {id_}: {exc}")
+                continue
+            generated_count += 1
+        return generated_count
+
+    @staticmethod
+    def _get_graph_json_key(full_resource_names: bool, full_module_names: bool) -> str:
+        """Return key of graph JSON options in pre-generated graph JSON"""
+        return f"full_resource_names={str(full_resource_names).lower()},full_module_names={str(full_module_names).lower()}"
+
     @classmethod
     def create(cls):
         """Create instance of object in database."""
@@ -1640,6 +1780,31 @@ class ModuleDetails:
         """Return ID of module details row."""
         return self._id
 
+    def copy(self) -> 'ModuleDetails':
+        """Create copy of module details, referencing the same content in the blob store"""
+        db = Database.get()
+        select = sqlalchemy.select(
+            *[db.module_details.c[f"{column}_hash"] for column in self.BLOB_COLUMNS],
+            db.module_details.c.terraform_version
+        ).where(
+            db.module_details.c.id == self.pk
+        )
+        with db.get_connection() as conn:
+            attributes = dict(conn.execute(select).fetchone())
+
+        with Database.get_new_transaction_or_nested():
+            module_details = self.create()
+            terrareg.blob_store.BlobStore.add_hash_references(
+                attributes[f"{column}_hash"] for column in self.BLOB_COLUMNS
+            )
+            update = module_details.get_db_where(
+                db=db, statement=db.module_details.update()
+            ).values(**attributes)
+            with db.get_connection() as conn:
+                conn.execute(update)
+
+        return module_details
+
     @property
     def terraform_docs(self):
         """Return terraform_docs column"""
@@ -1682,7 +1847,35 @@ class ModuleDetails:
         return None
 
     def get_graph_json(self, full_resource_names=False, full_module_names=False):
-        """Return graph JSON for resources."""
+        """Return graph JSON for resources, using pre-generated graph JSON, if available."""
+        db_row = self._get_db_row()
+        if db_row and db_row.get("terraform_graph_json"):
+            graph_json = json.loads(Database.decode_blob(db_row["terraform_graph_json"]))
+            key = self._get_graph_json_key(full_resource_names=full_resource_names, full_module_names=full_module_names)
+            if key in graph_json:
+                return graph_json[key]
+
+        return self._generate_graph_json(full_resource_names=full_resource_names, full_module_names=full_module_names)
+
+    def update_graph_json(self):
+        """Generate graph JSON for all options and store against module details"""
+        graph_json = None
+        # Parse graph once, to generate graph JSON for each of the options
+        parsed_graph = self._parse_terraform_graph()
+        if parsed_graph is not None:
+            graph_json = json.dumps({
+                self._get_graph_json_key(full_resource_names=full_resource_names, full_module_names=full_module_names):
+                    self._generate_graph_json(
+                        full_resource_names=full_resource_names,
+                        full_module_names=full_module_names,
+                        parsed_graph=parsed_graph
+                    )
+                for full_resource_names, full_module_names in self.GRAPH_JSON_OPTIONS
+            })
+        self.update_attributes(terraform_graph_json=graph_json)
+
+    def _parse_terraform_graph(self):
+        """Return NX graph of terraform graph data and yearly cost of resources, or None if there is no graph data."""
         terraform_graph = self.terraform_graph
         if not terraform_graph:
             return None
@@ -1704,6 +1897,20 @@ class ModuleDetails:
                     resource_costs[name] = 0
                 resource_costs[name] += round((float(resource["monthlyCost"]) * 12), 2)
 
+        return nx_graph, resource_costs
+
+    def _generate_graph_json(self, full_resource_names=False, full_module_names=False, parsed_graph=None):
+        """
+        Generate graph JSON for resources from terraform graph data.
+
+        The result of _parse_terraform_graph can be passed, to avoid parsing the graph data.
+        """
+        if parsed_graph is None:
+            parsed_graph = self._parse_terraform_graph()
+            if parsed_graph is None:
+                return None
+        nx_graph, resource_costs = parsed_graph
+
         module_var_output_local_re = re.compile(r'^(module\.[^\.]+\.)+(var|local|output)\.[^\.]+$')
         # Capture modules resources, such as:
         # module.module1
@@ -1722,8 +1929,8 @@ class ModuleDetails:
 
         # Store node renames, to be renamed after initial iteration
         renames = {}
-        # Store nodes to be removed
-        to_remove = []
+        # Store nodes to be removed, using dict to retain order
+        to_remove = {}
         # Store labels to be pushed to graph JSON
         labels = {}
         # Store type mappings for determine node attributes
@@ -1734,8 +1941,7 @@ class ModuleDetails:
 
         def remove_node(node):
             """Add a node to the remove_nodes list, if they are not already present"""
-            if node not in to_remove:
-                to_remove.append(node)
+            to_remove[node] = True
 
         for node_label in nx_graph.nodes:
             # Remove leading '[root] ' name and expand/close suffices from node names
@@ -1815,11 +2021,16 @@ class ModuleDetails:
             "edges": []
         }
 
+        # Count children of each node
+        child_counts = {}
+        for parent in parents.values():
+            child_counts[parent] = child_counts.get(parent, 0) + 1
+
         for node in nx_graph.nodes:
             data = {
                 "id": node,
                 "label": labels.get(node),
-                "child_count": list(parents.values()).count(node)
+                "child_count": child_counts.get(node, 0)
             }
 
             style = {}
@@ -1847,7 +2058,7 @@ class ModuleDetails:
             })
 
         # Add edges to graph
-        seen_module_links = []
+        seen_module_links = set()
         for edge in nx_graph.edges:
             # Only add edges for module-module links
             if (type_mapping[edge[0]] == "module" and type_mapping[edge[1]] == "module" and
@@ -1855,7 +2066,7 @@ class ModuleDetails:
                     # to avoid links in both directions
                     edge[0] in edge[1]):
                 # Mark module as having been seen in edges
-                seen_module_links.append(edge[1])
+                seen_module_links.add(edge[1])
 
                 cytoscape_json["edges"].append({
                     "data": {
@@ -1922,7 +2133,7 @@ class ModuleDetails:
         self._cache_db_row = None
 
     def _get_db_row(self):
-        """Return database row for module details."""
+        """Return database row for module details, with content obtained from blob store."""
         if self._cache_db_row is None:
             db = Database.get()
             select = db.module_details.select(
@@ -1931,7 +2142,18 @@ class ModuleDetails:
             )
             with db.get_connection() as conn:
                 res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+                row = res.fetchone()
+
+            if row is None:
+                return None
+
+            row = dict(row)
+            contents = terrareg.blob_store.BlobStore.get_contents(
+                [row[f"{column}_hash"] for column in self.BLOB_COLUMNS]
+            )
+            for column in self.BLOB_COLUMNS:
+                row[column] = contents.get(row[f"{column}_hash"])
+            self._cache_db_row = row
 
         return self._cache_db_row
 
@@ -1941,20 +2163,48 @@ class ModuleDetails:
             db.module_details.c.id == self.pk
         )
 
+    def _get_blob_hashes(self):
+        """Return hashes of blob store content referenced by row"""
+        db = Database.get()
+        select = sqlalchemy.select(
+            *[db.module_details.c[f"{column}_hash"] for column in self.BLOB_COLUMNS]
+        ).where(
+            db.module_details.c.id == self.pk
+        )
+        with db.get_connection() as conn:
+            row = conn.execute(select).fetchone()
+        return dict(row) if row else {}
+
     def update_attributes(self, **kwargs):
         """Update DB row."""
         # Check for any blob and encode the values
         for kwarg in kwargs:
-            if kwarg in ['readme_content', 'terraform_docs', 'tfsec', 'infracost',
-                         'terraform_graph', 'terraform_modules', 'terraform_version']:
+            if kwarg in self.BLOB_COLUMNS + ['terraform_version']:
                 kwargs[kwarg] = Database.encode_blob(kwargs[kwarg])
 
         db = Database.get()
-        update = self.get_db_where(
-            db=db, statement=db.module_details.update()
-        ).values(**kwargs)
-        with db.get_connection() as conn:
-            conn.execute(update)
+        with Database.get_new_transaction_or_nested():
+            # Replace content stored in blob store with hash of content,
+            # removing references to content being replaced
+            blob_columns = [column for column in self.BLOB_COLUMNS if column in kwargs]
+            if blob_columns:
+                previous_hashes = self._get_blob_hashes()
+                for column in blob_columns:
+                    content = kwargs.pop(column)
+                    kwargs[f"{column}_hash"] = (
+                        terrareg.blob_store.BlobStore.add_reference(content)
+                        if content is not None else
+                        None
+                    )
+                terrareg.blob_store.BlobStore.remove_references(
+                    previous_hashes.get(f"{column}_hash") for column in blob_columns
+                )
+
+            update = self.get_db_where(
+                db=db, statement=db.module_details.update()
+            ).values(**kwargs)
+            with db.get_connection() as conn:
+                conn.execute(update)
 
         # Remove cached DB row
         self._cache_db_row = None
@@ -1964,6 +2214,8 @@ class ModuleDetails:
         assert self.pk is not None
         db = Database.get()
 
+        terrareg.blob_store.BlobStore.remove_references(self._get_blob_hashes().values())
+
         with db.get_connection() as conn:
             # Delete module details from module_details table
             delete_statement = db.module_details.delete().where(
@@ -2313,6 +2565,7 @@ class ModuleProvider(object):
         )
         with db.get_connection() as conn:
             conn.execute(module_provider_insert)
+        RequestIdentityMap.invalidate('module_provider')
 
         obj = cls(module=module, name=name)
 
@@ -2595,6 +2848,25 @@ class ModuleProvider(object):
         self._module = module
         self._name = name
         self._cache_db_row = None
+        self._cache_latest_version = None
+        self._cache_git_provider = None
+
+    @classmethod
+    def from_db_row(cls, module: Module, row, latest_version_row=None, git_provider: Optional['GitProvider']=None):
+        """
+        Create module provider object from pre-fetched database row.
+
+        The latest version and git provider may also be provided,
+        avoiding further queries when they are used.
+        """
+        module_provider = cls(module=module, name=row['provider'])
+        module_provider._cache_db_row = row
+        if latest_version_row is not None:
+            module_provider._cache_latest_version = ModuleVersion.from_db_row(
+                module_provider=module_provider, row=latest_version_row
+            )
+        module_provider._cache_git_provider = git_provider
+        return module_provider
 
     def get_db_where(self, db, statement):
         """Filter DB query by where for current object."""
@@ -2605,21 +2877,29 @@ class ModuleProvider(object):
     def _get_db_row(self):
         """Return database row for module provider."""
         if self._cache_db_row is None:
-            db = Database.get()
-            select = db.module_provider.select(
-            ).join(
-                db.namespace,
-                db.module_provider.c.namespace_id==db.namespace.c.id
-            ).where(
-                db.namespace.c.id == self._module._namespace.pk,
-                # Use like to be case insensitive in SQLite,
-                # since MySQL is case insensitive for '==' operations.
-                db.module_provider.c.module.like(self._module.name),
-                db.module_provider.c.provider.like(self.name)
-            )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            # Names are matched case-insensitively
+            identity_key = ('name', self._module._namespace.pk, self._module.name.lower(), self.name.lower())
+            self._cache_db_row = RequestIdentityMap.get('module_provider', identity_key)
+
+            if self._cache_db_row is None:
+                db = Database.get()
+                select = db.module_provider.select(
+                ).join(
+                    db.namespace,
+                    db.module_provider.c.namespace_id==db.namespace.c.id
+                ).where(
+                    db.namespace.c.id == self._module._namespace.pk,
+                    # Use like to be case insensitive in SQLite,
+                    # since MySQL is case insensitive for '==' operations.
+                    db.module_provider.c.module.like(self._module.name),
+                    db.module_provider.c.provider.like(self.name)
+                )
+                with db.get_connection() as conn:
+                    res = conn.execute(select)
+                    self._cache_db_row = res.fetchone()
+
+                if self._cache_db_row is not None:
+                    RequestIdentityMap.add('module_provider', [identity_key, ('pk', self._cache_db_row['id'])], self._cache_db_row)
 
         return self._cache_db_row
 
@@ -2657,17 +2937,22 @@ class ModuleProvider(object):
                 # during normal conditions
                 print(f'An error occured when attempting to remove module provider directory: {str(exc)}')
 
+        terrareg.search_index.ModuleSearchIndex.invalidate(self.pk)
+
         with db.get_connection() as conn:
             # Delete module from module_version table
             delete_statement = db.module_provider.delete().where(
                 db.module_provider.c.id == self.pk
             )
             conn.execute(delete_statement)
+        RequestIdentityMap.invalidate('module_provider')
 
     def get_git_provider(self):
         """Return the git provider associated with this module provider."""
         if self._get_db_row()['git_provider_id']:
-            return GitProvider.get(id=self._get_db_row()['git_provider_id'])
+            if self._cache_git_provider is None:
+                self._cache_git_provider = GitProvider.get(id=self._get_db_row()['git_provider_id'])
+            return self._cache_git_provider
         return None
 
     @property
@@ -2819,14 +3104,18 @@ class ModuleProvider(object):
     def update_attributes(self, **kwargs):
         """Update DB row."""
         db = Database.get()
+        terrareg.search_index.ModuleSearchIndex.invalidate(self.pk)
         update = self.get_db_where(
             db=db, statement=db.module_provider.update()
         ).values(**kwargs)
         with db.get_connection() as conn:
             conn.execute(update)
 
-        # Remove cached DB row
+        # Remove cached DB row and cached objects obtained from it
         self._cache_db_row = None
+        RequestIdentityMap.invalidate('module_provider')
+        self._cache_latest_version = None
+        self._cache_git_provider = None
 
     def update_verified(self, verified):
         """Update verified flag of module provider."""
@@ -3107,6 +3396,14 @@ class ModuleProvider(object):
 
     def get_latest_version(self):
         """Return latest published version of module."""
+        if self._cache_latest_version is not None:
+            return self._cache_latest_version
+
+        # Use row of latest version, if already loaded during the request
+        if (latest_version_id := self._get_db_row()['latest_version_id']) and \
+                (row := RequestIdentityMap.get('module_version', ('pk', latest_version_id))) is not None:
+            return ModuleVersion.from_db_row(module_provider=self, row=row)
+
         db = Database.get()
         select = sqlalchemy.select(db.module_version.c.version).select_from(db.module_provider).join(
             db.module_version,
@@ -3124,39 +3421,41 @@ class ModuleProvider(object):
         return ModuleVersion(module_provider=self, version=version['version'])
 
     def calculate_latest_version(self):
-        """Obtain all versions of module and sort by semantic version numbers to obtain latest version."""
+        """Obtain latest version of module, using the sortable version columns."""
         db = Database.get()
-        select = db.select_module_version_joined_module_provider(
+        select = sqlalchemy.select(
             db.module_version.c.version
+        ).select_from(
+            db.module_version
         ).where(
-            db.module_provider.c.id == self.pk,
+            db.module_version.c.module_provider_id == self.pk,
             db.module_version.c.published == True,
             db.module_version.c.beta == False
-        )
+        ).order_by(
+            *get_version_order_by(db.module_version)
+        ).limit(1)
         with db.get_connection() as conn:
-            res = conn.execute(select)
-
-            # Convert to list
-            rows = [r for r in res]
+            row = conn.execute(select).first()
 
-        # Sort rows by semantic versioning
-        rows.sort(key=lambda x: LooseVersion(x['version']), reverse=True)
-
-        # Ensure at least one row
-        if not rows:
+        if row is None:
             return None
 
-        # Obtain latest row
-        return ModuleVersion(module_provider=self, version=rows[0]['version'])
+        return ModuleVersion(module_provider=self, version=row['version'])
 
     def get_versions(self, include_beta=True, include_unpublished=False):
         """Return all module provider versions."""
         db = Database.get()
 
-        select = db.select_module_version_joined_module_provider(
-            db.module_version.c.version
+        # Select entire rows, so that the module version
+        # objects do not need to re-query them
+        select = sqlalchemy.select(
+            *db.module_version.c
+        ).select_from(
+            db.module_version
         ).where(
-            db.module_provider.c.id == self.pk
+            db.module_version.c.module_provider_id == self.pk
+        ).order_by(
+            *get_version_order_by(db.module_version)
         )
         # Remove unpublished versions, it not including them
         if not include_unpublished:
@@ -3170,17 +3469,99 @@ class ModuleProvider(object):
             )
 
         with db.get_connection() as conn:
-            res = conn.execute(select)
-            module_versions = [
-                ModuleVersion(module_provider=self, version=r['version'])
-                for r in res
-            ]
-        module_versions.sort(
-            key=lambda x: LooseVersion(x.version),
-            reverse=True
-        )
+            rows = conn.execute(select).all()
+
+        module_versions = []
+        for row in rows:
+            RequestIdentityMap.add('module_version', [('version', self.pk, row['version']), ('pk', row['id'])], row)
+            module_versions.append(ModuleVersion.from_db_row(module_provider=self, row=row))
         return module_versions
 
+    def _get_version_dependency_rows(self, include_beta=True, include_unpublished=False):
+        """Return rows of module versions, joined to their dependencies."""
+        db = Database.get()
+
+        select = sqlalchemy.select(
+            db.module_version.c.version.label('module_version'),
+            db.module_version_dependency.c.path,
+            db.module_version_dependency.c.dependency_type,
+            db.module_version_dependency.c.name,
+            db.module_version_dependency.c.namespace,
+            db.module_version_dependency.c.source,
+            db.module_version_dependency.c.version
+        ).select_from(
+            db.module_version
+        ).outerjoin(
+            db.module_version_dependency,
+            db.module_version.c.id == db.module_version_dependency.c.module_version_id
+        ).where(
+            db.module_version.c.module_provider_id == self.pk
+        ).order_by(
+            db.module_version_dependency.c.id
+        )
+        if not include_unpublished:
+            select = select.where(
+                db.module_version.c.published == True
+            )
+        if not include_beta:
+            select = select.where(
+                db.module_version.c.beta == False
+            )
+
+        with db.get_connection() as conn:
+            return [dict(row) for row in conn.execute(select)]
+
+    def get_terraform_api_versions(self, include_beta=True, include_unpublished=False):
+        """
+        Return versions of module provider, with root module and submodule
+        dependencies, for Terraform versions API.
+
+        Dependencies are obtained from the module_version_dependency table,
+        populated when the module version is indexed.
+        """
+        versions = {}
+        for row in self._get_version_dependency_rows(include_beta=include_beta, include_unpublished=include_unpublished):
+            paths = versions.setdefault(row['module_version'], {})
+            # Module versions without dependencies have no joined dependency rows
+            if row['path'] is None:
+                continue
+
+            dependencies = paths.setdefault(row['path'], {'providers': [], 'dependencies': []})
+            if row['dependency_type'] is ModuleDependencyType.PROVIDER:
+                dependencies['providers'].append({
+                    'name': row['name'],
+                    'namespace': row['namespace'],
+                    'source': row['source'],
+                    'version': row['version'],
+                })
+            else:
+                dependencies['dependencies'].append({
+                    'name': row['name'],
+                    'source': row['source'],
+                    'version': row['version'],
+                })
+
+        return [
+            {
+                'version': version,
+                'root': paths.get('', {'providers': [], 'dependencies': []}),
+                'submodules': [
+                    {
+                        'path': path,
+                        'providers': dependencies['providers'],
+                        'dependencies': dependencies['dependencies'],
+                    }
+                    for path, dependencies in sorted(paths.items())
+                    if path != ''
+                ]
+            }
+            for version, paths in sorted(
+                versions.items(),
+                key=lambda x: LooseVersion(x[0]),
+                reverse=True
+            )
+        ]
+
     def get_api_outline(self):
         """Return dict of basic provider details for API response."""
         try:
@@ -3465,8 +3846,8 @@ module "{self.module_version.module_provider.module.name}" {{
         if readme_md:
             readme_md = self.replace_source_in_file(
                 readme_md, server_hostname)
-            readme_html = convert_markdown_to_html(file_name='README.md', markdown_html=readme_md)
-            return sanitise_html_content(readme_html, allow_markdown_html=True)
+            return terrareg.rendered_markdown_cache.RenderedMarkdownCache.get().render(
+                file_name='README.md', content=readme_md)
         return None
 
     @property
@@ -3495,9 +3876,11 @@ module "{self.module_version.module_provider.module.name}" {{
             description = input_.get("description")
             if description:
                 if html:
-                    description = convert_markdown_to_html(file_name="", markdown_html=description)
-                # Always sanitise HTML
-                description = sanitise_html_content(text=description, allow_markdown_html=True)
+                    description = terrareg.rendered_markdown_cache.RenderedMarkdownCache.get().render(
+                        file_name="", content=description)
+                else:
+                    # Always sanitise HTML
+                    description = sanitise_html_content(text=description, allow_markdown_html=True)
                 input_["description"] = description
         return inputs
 
@@ -3509,9 +3892,11 @@ module "{self.module_version.module_provider.module.name}" {{
             description = output.get("description")
             if description:
                 if html:
-                    description = convert_markdown_to_html(file_name="", markdown_html=description)
-                # Always sanitise HTML
-                description = sanitise_html_content(text=description, allow_markdown_html=True)
+                    description = terrareg.rendered_markdown_cache.RenderedMarkdownCache.get().render(
+                        file_name="", content=description)
+                else:
+                    # Always sanitise HTML
+                    description = sanitise_html_content(text=description, allow_markdown_html=True)
                 output["description"] = description
         return outputs
 
@@ -3675,6 +4060,28 @@ module "{self.module_version.module_provider.module.name}" {{
             })
         return providers
 
+    def get_dependency_rows(self):
+        """Return module and provider dependencies as rows for module_version_dependency table."""
+        return [
+            {
+                'dependency_type': ModuleDependencyType.MODULE,
+                'name': dependency['name'],
+                'namespace': None,
+                'source': dependency['source'],
+                'version': dependency['version'],
+            }
+            for dependency in self.get_terraform_dependencies()
+        ] + [
+            {
+                'dependency_type': ModuleDependencyType.PROVIDER,
+                'name': provider['name'],
+                'namespace': provider['namespace'],
+                'source': provider['source'],
+                'version': provider['version'],
+            }
+            for provider in self.get_terraform_provider_dependencies()
+        ]
+
     def get_terraform_version_constraints(self):
         """Obtain terraform version requirement"""
         for requirement in self.get_module_specs().get("requirements", []):
@@ -4001,8 +4408,20 @@ class ModuleVersion(TerraformSpecsObject):
         self._module_provider = module_provider
         self._version = version
         self._cache_db_row = None
+        self._cache_total_downloads = None
         super(ModuleVersion, self).__init__()
 
+    @classmethod
+    def from_db_row(cls, module_provider: ModuleProvider, row):
+        """Create module version object from pre-fetched database row."""
+        module_version = cls(module_provider=module_provider, version=row['version'])
+        module_version._cache_db_row = row
+        return module_version
+
+    def set_total_downloads_cache(self, total_downloads: int):
+        """Set pre-fetched total downloads of module version."""
+        self._cache_total_downloads = total_downloads
+
     def __eq__(self, __o):
         """Check if two module versions are the same"""
         if isinstance(__o, self.__class__):
@@ -4012,16 +4431,23 @@ class ModuleVersion(TerraformSpecsObject):
     def _get_db_row(self):
         """Get object from database"""
         if self._cache_db_row is None:
-            db = Database.get()
-            select = db.module_version.select().join(
-                db.module_provider, db.module_version.c.module_provider_id == db.module_provider.c.id
-            ).where(
-                db.module_provider.c.id == self._module_provider.pk,
-                db.module_version.c.version == self.version
-            )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            identity_key = ('version', self._module_provider.pk, self.version)
+            self._cache_db_row = RequestIdentityMap.get('module_version', identity_key)
+
+            if self._cache_db_row is None:
+                db = Database.get()
+                select = db.module_version.select().join(
+                    db.module_provider, db.module_version.c.module_provider_id == db.module_provider.c.id
+                ).where(
+                    db.module_provider.c.id == self._module_provider.pk,
+                    db.module_version.c.version == self.version
+                )
+                with db.get_connection() as conn:
+                    res = conn.execute(select)
+                    self._cache_db_row = res.fetchone()
+
+                if self._cache_db_row is not None:
+                    RequestIdentityMap.add('module_version', [identity_key, ('pk', self._cache_db_row['id'])], self._cache_db_row)
         return self._cache_db_row
 
     def get_terraform_example_version_string(self):
@@ -4287,6 +4713,8 @@ class ModuleVersion(TerraformSpecsObject):
 
     def get_total_downloads(self):
         """Obtain total number of downloads for module version."""
+        if self._cache_total_downloads is not None:
+            return self._cache_total_downloads
         return terrareg.analytics.AnalyticsEngine.get_module_version_total_downloads(
             module_version=self
         )
@@ -4399,6 +4827,9 @@ class ModuleVersion(TerraformSpecsObject):
 
         # Clear cached DB row
         self._cache_db_row = None
+        RequestIdentityMap.invalidate('module_version')
+
+        terrareg.search_index.ModuleSearchIndex.invalidate(self._module_provider.pk)
 
     def delete(self, delete_related_analytics=True):
         """Delete module version and all associated submodules."""
@@ -4447,6 +4878,10 @@ class ModuleVersion(TerraformSpecsObject):
                 print(f'An error occured when attempting to remove module provider directory: {str(exc)}')
 
         with db.get_connection() as conn:
+            conn.execute(db.module_version_dependency.delete().where(
+                db.module_version_dependency.c.module_version_id == self.pk
+            ))
+
             # Delete module from module_version table
             delete_statement = db.module_version.delete().where(
                 db.module_version.c.id == self.pk
@@ -4455,6 +4890,7 @@ class ModuleVersion(TerraformSpecsObject):
 
             # Invalidate cache for previous DB row
             self._cache_db_row = None
+        RequestIdentityMap.invalidate('module_version')
 
         # Update latest version of parent module
         new_latest_version = self._module_provider.calculate_latest_version()
@@ -4495,7 +4931,8 @@ class ModuleVersion(TerraformSpecsObject):
                 version=self.version,
                 published=False,
                 beta=self._extracted_beta_flag,
-                internal=False
+                internal=False,
+                **get_version_sort_key(self.version)
             )
             conn.execute(insert_statement)
 
@@ -4539,6 +4976,29 @@ class ModuleVersion(TerraformSpecsObject):
                 for r in res
             ]
 
+    def update_dependencies(self):
+        """
+        Replace stored module and provider dependencies of
+        root module and submodules with those from terraform-docs.
+        """
+        rows = [
+            dict(row, module_version_id=self.pk, path='')
+            for row in self.get_dependency_rows()
+        ]
+        for submodule in self.get_submodules():
+            rows += [
+                dict(row, module_version_id=self.pk, path=submodule.path)
+                for row in submodule.get_dependency_rows()
+            ]
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.module_version_dependency.delete().where(
+                db.module_version_dependency.c.module_version_id == self.pk
+            ))
+            if rows:
+                conn.execute(db.module_version_dependency.insert(), rows)
+
 
 class BaseSubmodule(TerraformSpecsObject):
     """Base submodule, for submodule and examples from a module version."""
@@ -4565,6 +5025,34 @@ class BaseSubmodule(TerraformSpecsObject):
 
         return cls(module_version=module_version, module_path=row['path'])
 
+    @classmethod
+    def get_module_details_by_content_hash(cls, module_version: ModuleVersion, module_path: str, content_hash: str) -> Optional[ModuleDetails]:
+        """
+        Return module details of submodule with matching path and content hash
+        from another version of the module provider.
+        """
+        db = Database.get()
+        select = sqlalchemy.select(
+            db.sub_module.c.module_details_id
+        ).select_from(
+            db.sub_module
+        ).join(
+            db.module_version,
+            db.sub_module.c.parent_module_version == db.module_version.c.id
+        ).where(
+            db.module_version.c.module_provider_id == module_version.module_provider.pk,
+            db.sub_module.c.parent_module_version != module_version.pk,
+            db.sub_module.c.type == cls.TYPE,
+            db.sub_module.c.path == module_path,
+            db.sub_module.c.content_hash == content_hash,
+            db.sub_module.c.module_details_id != None
+        ).limit(1)
+        with db.get_connection() as conn:
+            row = conn.execute(select).fetchone()
+        if row is None:
+            return None
+        return ModuleDetails(id=row['module_details_id'])
+
     @classmethod
     def create(cls, module_version: ModuleVersion, module_path: str):
         """Create instance of object in database."""
@@ -4984,9 +5472,8 @@ class ModuleVersionFile(FileObject):
             # Perform sanitisation of markdown after
             # conversion to HTML
             content = super(ModuleVersionFile, self).get_content(sanitise=False)
-            content = convert_markdown_to_html(file_name=self.file_name, markdown_html=content)
-            # return content
-            content = sanitise_html_content(content, allow_markdown_html=True)
+            content = terrareg.rendered_markdown_cache.RenderedMarkdownCache.get().render(
+                file_name=self.file_name, content=content)
         else:
             content = super(ModuleVersionFile, self).get_content()
             content = '<pre>' + content + '</pre>'
@@ -0,0 +1,9 @@
+
+from enum import Enum
+
+
+class ModuleDependencyType(Enum):
+    """Type of module version dependency"""
+
+    MODULE = "module"
+    PROVIDER = "provider"
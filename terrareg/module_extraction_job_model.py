@@ -0,0 +1,399 @@
+
+import datetime
+from typing import List, Optional
+
+import sqlalchemy
+
+import terrareg.config
+import terrareg.database
+import terrareg.models
+from terrareg.module_extraction_job_status import ModuleExtractionJobStatus
+
+
+class ModuleExtractionJob:
+    """Queued extraction of a module version, processed by extraction workers."""
+
+    @classmethod
+    def create(cls, module_provider: 'terrareg.models.ModuleProvider', version: str, force_full_extraction: bool=False) -> 'ModuleExtractionJob':
+        """
+        Queue extraction of module version.
+
+        If an extraction job is already queued for the version,
+        the existing job is returned.
+        """
+        if (existing_job := cls._get_queued_job(module_provider=module_provider, version=version)):
+            if force_full_extraction and not existing_job.force_full_extraction:
+                db = terrareg.database.Database.get()
+                with db.get_connection() as conn:
+                    existing_job._update_attributes(conn, force_full_extraction=True)
+            return existing_job
+
+        db = terrareg.database.Database.get()
+        insert = sqlalchemy.insert(db.module_extraction_job).values(
+            module_provider_id=module_provider.pk,
+            version=version,
+            status=ModuleExtractionJobStatus.QUEUED,
+            attempts=0,
+            progress='Queued',
+            force_full_extraction=force_full_extraction,
+            created_at=datetime.datetime.now(),
+            next_attempt_at=datetime.datetime.now(),
+        )
+        with db.get_connection() as conn:
+            res = conn.execute(insert)
+            return cls(pk=res.inserted_primary_key[0])
+
+    @classmethod
+    def _get_queued_job(cls, module_provider: 'terrareg.models.ModuleProvider', version: str) -> Optional['ModuleExtractionJob']:
+        """Return queued job for module version, if one exists"""
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            db.module_extraction_job.c.id
+        ).select_from(
+            db.module_extraction_job
+        ).where(
+            db.module_extraction_job.c.module_provider_id==module_provider.pk,
+            db.module_extraction_job.c.version==version,
+            db.module_extraction_job.c.status==ModuleExtractionJobStatus.QUEUED
+        )
+        with db.get_connection() as conn:
+            row = conn.execute(select).first()
+        if row:
+            return cls(pk=row['id'])
+        return None
+
+    @classmethod
+    def get(cls, module_provider: 'terrareg.models.ModuleProvider', pk: int) -> Optional['ModuleExtractionJob']:
+        """Obtain extraction job by ID for module provider"""
+        obj = cls(pk=pk)
+        if obj._get_db_row() is None or obj._get_db_row()['module_provider_id'] != module_provider.pk:
+            return None
+        return obj
+
+    @classmethod
+    def get_by_module_provider(cls, module_provider: 'terrareg.models.ModuleProvider', limit: int=50) -> List['ModuleExtractionJob']:
+        """Return most recent extraction jobs for module provider"""
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            db.module_extraction_job.c.id
+        ).select_from(
+            db.module_extraction_job
+        ).where(
+            db.module_extraction_job.c.module_provider_id==module_provider.pk
+        ).order_by(
+            db.module_extraction_job.c.id.desc()
+        ).limit(limit)
+        with db.get_connection() as conn:
+            rows = conn.execute(select).all()
+        return [
+            cls(pk=row['id'])
+            for row in rows
+        ]
+
+    @classmethod
+    def _requeue_stale_jobs(cls, conn, now: datetime.datetime):
+        """
+        Re-queue running jobs that have not recorded a heartbeat within the running job timeout,
+        or mark them as failed if the maximum number of attempts has been reached.
+        """
+        db = terrareg.database.Database.get()
+        running_timeout = terrareg.config.Config().MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT
+        stale_condition = sqlalchemy.and_(
+            db.module_extraction_job.c.status==ModuleExtractionJobStatus.RUNNING,
+            db.module_extraction_job.c.heartbeat_at < now - datetime.timedelta(seconds=running_timeout)
+        )
+        error = 'Extraction did not complete within the running job timeout'
+        conn.execute(sqlalchemy.update(db.module_extraction_job).where(
+            stale_condition,
+            db.module_extraction_job.c.attempts < terrareg.config.Config().MODULE_EXTRACTION_JOB_MAX_ATTEMPTS
+        ).values(
+            status=ModuleExtractionJobStatus.QUEUED,
+            progress='Awaiting retry',
+            error=error,
+            next_attempt_at=now,
+        ))
+        conn.execute(sqlalchemy.update(db.module_extraction_job).where(
+            stale_condition
+        ).values(
+            status=ModuleExtractionJobStatus.FAILED,
+            progress='Failed',
+            error=error,
+            finished_at=now,
+        ))
+
+    @classmethod
+    def claim_next(cls, worker_id: str) -> Optional['ModuleExtractionJob']:
+        """
+        Claim the oldest queued job that is due to be attempted.
+
+        Running jobs that have not recorded a heartbeat within the running job timeout,
+        such as those of terminated workers, are first re-queued.
+
+        The claim is performed using a conditional update on the job status,
+        so that only a single worker can claim each job.
+        """
+        db = terrareg.database.Database.get()
+        now = datetime.datetime.now()
+        select = sqlalchemy.select(
+            db.module_extraction_job.c.id
+        ).select_from(
+            db.module_extraction_job
+        ).where(
+            db.module_extraction_job.c.status==ModuleExtractionJobStatus.QUEUED,
+            db.module_extraction_job.c.next_attempt_at <= now
+        ).order_by(
+            db.module_extraction_job.c.next_attempt_at,
+            db.module_extraction_job.c.id
+        ).limit(10)
+
+        with db.get_connection() as conn:
+            cls._requeue_stale_jobs(conn, now)
+
+            candidate_ids = [row['id'] for row in conn.execute(select).all()]
+
+            for candidate_id in candidate_ids:
+                update = sqlalchemy.update(db.module_extraction_job).where(
+                    db.module_extraction_job.c.id==candidate_id,
+                    db.module_extraction_job.c.status==ModuleExtractionJobStatus.QUEUED
+                ).values(
+                    status=ModuleExtractionJobStatus.RUNNING,
+                    attempts=db.module_extraction_job.c.attempts + 1,
+                    worker_id=worker_id,
+                    progress='Starting extraction',
+                    started_at=now,
+                    heartbeat_at=now,
+                    finished_at=None,
+                )
+                res = conn.execute(update)
+                if res.rowcount == 1:
+                    return cls(pk=candidate_id, worker_id=worker_id)
+
+        return None
+
+    @property
+    def pk(self) -> int:
+        """Return ID of job"""
+        return self._pk
+
+    @property
+    def module_provider(self) -> Optional['terrareg.models.ModuleProvider']:
+        """Return module provider that the job is extracting a version for"""
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            db.namespace.c.namespace,
+            db.module_provider.c.module,
+            db.module_provider.c.provider
+        ).select_from(
+            db.module_provider
+        ).join(
+            db.namespace,
+            db.module_provider.c.namespace_id==db.namespace.c.id
+        ).where(
+            db.module_provider.c.id==self._get_db_row()['module_provider_id']
+        )
+        with db.get_connection() as conn:
+            row = conn.execute(select).first()
+        if not row:
+            return None
+
+        namespace = terrareg.models.Namespace.get(name=row['namespace'])
+        module = terrareg.models.Module(namespace=namespace, name=row['module'])
+        return terrareg.models.ModuleProvider.get(module=module, name=row['provider'])
+
+    @property
+    def version(self) -> str:
+        """Return version being extracted"""
+        return self._get_db_row()['version']
+
+    @property
+    def status(self) -> ModuleExtractionJobStatus:
+        """Return status of job"""
+        return self._get_db_row()['status']
+
+    @property
+    def attempts(self) -> int:
+        """Return number of attempts that have been started for the job"""
+        return self._get_db_row()['attempts']
+
+    @property
+    def force_full_extraction(self) -> bool:
+        """Return whether analysis of all submodules and examples is forced, rather than re-using analysis of unchanged submodules"""
+        return bool(self._get_db_row()['force_full_extraction'])
+
+    @property
+    def log(self) -> str:
+        """Return log messages of job"""
+        return terrareg.database.Database.decode_blob(self._get_db_row()['log']) or ''
+
+    def __init__(self, pk: int, worker_id: Optional[str]=None):
+        """
+        Store member variables.
+
+        The worker ID is provided for jobs claimed by a worker and
+        is required to update the running job.
+        """
+        self._pk = pk
+        self._worker_id = worker_id
+        self._cache_db_row = None
+        self._pending_log_lines = []
+
+    def _get_db_row(self):
+        """Get object from database"""
+        if self._cache_db_row is None:
+            db = terrareg.database.Database.get()
+            select = db.module_extraction_job.select().where(
+                db.module_extraction_job.c.id == self._pk
+            )
+            with db.get_connection() as conn:
+                res = conn.execute(select)
+                self._cache_db_row = res.fetchone()
+        return self._cache_db_row
+
+    def _get_log_with_pending_lines(self) -> str:
+        """Return log, including any lines that have not yet been stored"""
+        return ''.join([self.log] + self._pending_log_lines)
+
+    def _add_log_line(self, message: str):
+        """Add timestamped message to pending log lines"""
+        self._pending_log_lines.append(f'[{datetime.datetime.now().isoformat()}] {message}\n')
+
+    def _update_attributes(self, conn, **kwargs):
+        """Update attributes of job using the provided connection"""
+        db = terrareg.database.Database.get()
+        update = sqlalchemy.update(db.module_extraction_job).where(
+            db.module_extraction_job.c.id==self._pk
+        ).values(**kwargs)
+        conn.execute(update)
+        self._cache_db_row = None
+
+    def _update_running_attributes(self, conn, **kwargs) -> bool:
+        """
+        Update attributes of job, whilst it is running and claimed by the worker.
+
+        Returns whether the job was updated, which is not the case
+        if the job has since been re-queued and claimed by another worker.
+        """
+        db = terrareg.database.Database.get()
+        update = sqlalchemy.update(db.module_extraction_job).where(
+            db.module_extraction_job.c.id==self._pk,
+            db.module_extraction_job.c.worker_id==self._worker_id,
+            db.module_extraction_job.c.status==ModuleExtractionJobStatus.RUNNING
+        ).values(**kwargs)
+        res = conn.execute(update)
+        self._cache_db_row = None
+        if res.rowcount != 1:
+            print(f'Extraction job {self._pk} is no longer running for worker {self._worker_id}, discarding update')
+            return False
+        return True
+
+    def heartbeat(self):
+        """
+        Record heartbeat of running job, to avoid the job being re-queued as abandoned.
+
+        The heartbeat is stored using a connection outside of any current transaction.
+        Failures to store the heartbeat are ignored.
+        """
+        try:
+            with terrareg.database.Database.get_engine().connect() as conn:
+                self._update_running_attributes(conn, heartbeat_at=datetime.datetime.now())
+        except sqlalchemy.exc.OperationalError:
+            pass
+
+    def update_progress(self, message: str):
+        """
+        Record progress of the running job, along with a heartbeat.
+
+        The progress is stored using a connection outside of any current transaction,
+        so that it is visible whilst the extraction transaction is in progress.
+        Failures to store progress are ignored, as the log is retained and stored when the job completes.
+        """
+        self._add_log_line(message)
+        try:
+            with terrareg.database.Database.get_engine().connect() as conn:
+                self._update_running_attributes(
+                    conn,
+                    progress=message[:128],
+                    log=terrareg.database.Database.encode_blob(self._get_log_with_pending_lines()),
+                    heartbeat_at=datetime.datetime.now()
+                )
+        except sqlalchemy.exc.OperationalError:
+            return
+        self._pending_log_lines = []
+
+    def mark_succeeded(self):
+        """
+        Mark job as successfully completed.
+
+        The job is not updated if it has since been claimed by another worker.
+        """
+        self._add_log_line('Extraction completed successfully')
+        db = terrareg.database.Database.get()
+        with db.get_connection() as conn:
+            self._update_running_attributes(
+                conn,
+                status=ModuleExtractionJobStatus.SUCCEEDED,
+                progress='Completed',
+                error=None,
+                log=terrareg.database.Database.encode_blob(self._get_log_with_pending_lines()),
+                finished_at=datetime.datetime.now()
+            )
+        self._pending_log_lines = []
+
+    def mark_failed(self, error: str):
+        """
+        Record failure of job attempt.
+
+        If the maximum number of attempts has not been reached, the job is re-queued
+        with an exponential backoff, otherwise the job is marked as failed.
+
+        The job is not updated if it has since been claimed by another worker.
+        """
+        config = terrareg.config.Config()
+        now = datetime.datetime.now()
+        attempts = self.attempts
+
+        self._add_log_line(f'Attempt {attempts} failed: {error}')
+
+        attributes = {
+            'error': error[:1024],
+            'finished_at': now,
+        }
+        if attempts < config.MODULE_EXTRACTION_JOB_MAX_ATTEMPTS:
+            retry_delay = config.MODULE_EXTRACTION_JOB_RETRY_BACKOFF * (2 ** (attempts - 1))
+            self._add_log_line(f'Retrying in {retry_delay} seconds')
+            attributes['status'] = ModuleExtractionJobStatus.QUEUED
+            attributes['progress'] = 'Awaiting retry'
+            attributes['next_attempt_at'] = now + datetime.timedelta(seconds=retry_delay)
+        else:
+            attributes['status'] = ModuleExtractionJobStatus.FAILED
+            attributes['progress'] = 'Failed'
+
+        attributes['log'] = terrareg.database.Database.encode_blob(self._get_log_with_pending_lines())
+
+        db = terrareg.database.Database.get()
+        with db.get_connection() as conn:
+            self._update_running_attributes(conn, **attributes)
+        self._pending_log_lines = []
+
+    def get_api_details(self, include_log: bool=False) -> dict:
+        """Return API details for job"""
+        row = self._get_db_row()
+        details = {
+            'id': self._pk,
+            'version': row['version'],
+            'status': row['status'].value,
+            'progress': row['progress'],
+            'attempts': row['attempts'],
+            'error': row['error'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'started_at': row['started_at'].isoformat() if row['started_at'] else None,
+            'finished_at': row['finished_at'].isoformat() if row['finished_at'] else None,
+            'next_attempt_at': (
+                row['next_attempt_at'].isoformat()
+                if row['next_attempt_at'] and row['status'] is ModuleExtractionJobStatus.QUEUED else
+                None
+            ),
+        }
+        if include_log:
+            details['log'] = self.log
+        return details
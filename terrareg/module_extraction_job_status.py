@@ -0,0 +1,11 @@
+
+from enum import Enum
+
+
+class ModuleExtractionJobStatus(Enum):
+    """Status of module extraction job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -0,0 +1,161 @@
+"""Workers for processing queued module extraction jobs."""
+
+import contextlib
+import multiprocessing
+import os
+import socket
+import threading
+import traceback
+from typing import List, Optional
+
+import flask
+
+import terrareg.config
+import terrareg.database
+import terrareg.errors
+import terrareg.models
+import terrareg.module_extractor
+from terrareg.module_extraction_job_model import ModuleExtractionJob
+
+
+class ModuleExtractionWorker:
+    """Process queued module extraction jobs."""
+
+    def __init__(self, worker_id: str, app: flask.Flask, stop_event: threading.Event):
+        """Store member variables"""
+        self._worker_id = worker_id
+        self._app = app
+        self._stop_event = stop_event
+
+    def run(self):
+        """Process jobs until stopped, waiting for the poll interval when no jobs are available."""
+        poll_interval = terrareg.config.Config().MODULE_EXTRACTION_WORKER_POLL_INTERVAL
+        while not self._stop_event.is_set():
+            try:
+                processed_job = self.process_next_job()
+            except Exception:
+                print(f'Extraction worker {self._worker_id} failed to process job: {traceback.format_exc()}')
+                processed_job = False
+
+            if not processed_job:
+                self._stop_event.wait(poll_interval)
+
+    def process_next_job(self) -> bool:
+        """Claim and process the next available job, returning whether a job was processed."""
+        # Each job is processed in its own request context, so that
+        # the database transaction and authentication state are isolated
+        # between workers.
+        with self._app.test_request_context():
+            job = ModuleExtractionJob.claim_next(worker_id=self._worker_id)
+            if job is None:
+                return False
+
+            self.process_job(job)
+            return True
+
+    @contextlib.contextmanager
+    def _record_heartbeats(self, job: ModuleExtractionJob):
+        """
+        Record heartbeats for job in a background thread, whilst the context is active.
+
+        Heartbeats are recorded several times within the running job timeout, so that
+        jobs with long-running extraction steps are not re-queued as abandoned.
+        """
+        interval = max(terrareg.config.Config().MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT / 4, 1)
+        stop_event = threading.Event()
+
+        def record_heartbeats():
+            while not stop_event.wait(interval):
+                job.heartbeat()
+
+        thread = threading.Thread(target=record_heartbeats, name=f'module-extraction-heartbeat-{job.pk}', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop_event.set()
+            thread.join()
+
+    def process_job(self, job: ModuleExtractionJob):
+        """Perform extraction of module version for job."""
+        module_provider = job.module_provider
+        if module_provider is None:
+            job.mark_failed('Module provider no longer exists')
+            return
+
+        job.update_progress(f'Extraction of {module_provider.id}/{job.version} started by worker {self._worker_id}')
+        try:
+            with self._record_heartbeats(job), terrareg.database.Database.start_transaction():
+                module_version = terrareg.models.ModuleVersion(module_provider=module_provider, version=job.version)
+
+                with module_version.module_create_extraction_wrapper():
+                    with terrareg.module_extractor.GitModuleExtractor(module_version=module_version, extraction_job=job,
+                                                                      force_full_extraction=job.force_full_extraction) as me:
+                        me.process_upload()
+
+        except terrareg.errors.TerraregError as exc:
+            job.mark_failed(str(exc))
+        except Exception as exc:
+            job.mark_failed(f'Unexpected error during extraction: {str(exc)}')
+            if terrareg.config.Config().DEBUG:
+                print(traceback.format_exc())
+        else:
+            job.mark_succeeded()
+
+
+def _run_worker_process(worker_id: str, stop_event):
+    """Run extraction worker in worker process, until the stop event is set"""
+    terrareg.database.Database.dispose_inherited_connections()
+    # Application used to provide request contexts for jobs
+    app = flask.Flask(__name__)
+    terrareg.database.Database.register_app(app)
+    ModuleExtractionWorker(worker_id=worker_id, app=app, stop_event=stop_event).run()
+
+
+class ModuleExtractionWorkerPool:
+    """
+    Pool of module extraction worker processes.
+
+    Workers are run in separate processes, so that extractions do not compete
+    with request handling for the interpreter lock of the server process.
+    The pool must be started after the database has been initialised.
+    """
+
+    def __init__(self, worker_count: Optional[int]=None):
+        """Store member variables"""
+        self._worker_count = (
+            terrareg.config.Config().MODULE_EXTRACTION_WORKER_COUNT
+            if worker_count is None else
+            worker_count
+        )
+        self._context = multiprocessing.get_context('fork')
+        self._stop_event = self._context.Event()
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+
+    def _get_worker_id(self, index: int) -> str:
+        """Return unique ID for worker"""
+        return f'{socket.gethostname()}-{os.getpid()}-{index}'
+
+    def start(self):
+        """Start worker processes"""
+        for index in range(self._worker_count):
+            process = self._context.Process(
+                target=_run_worker_process,
+                args=(self._get_worker_id(index), self._stop_event),
+                name=f'module-extraction-worker-{index}',
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout: Optional[float]=None):
+        """Signal workers to stop and wait for in-progress jobs to complete"""
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout=timeout)
+        self._processes = []
+
+    def join(self):
+        """Wait for worker processes to exit"""
+        for process in self._processes:
+            process.join()
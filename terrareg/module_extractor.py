@@ -1,17 +1,17 @@
 """Provide extraction method of modules."""
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 import os
-import threading
-from typing import Optional, Type
+from typing import List, Optional, Tuple, Type
 import tempfile
 import uuid
 import zipfile
-import tarfile
 import subprocess
 import json
 import re
 import glob
+import hashlib
 import pathlib
 import urllib.parse
 
@@ -23,6 +23,7 @@ import markdown
 import pathspec
 
 import terrareg.models
+import terrareg.archive_generator
 from terrareg.database import Database
 from terrareg.errors import (
     UnableToProcessTerraformError,
@@ -30,11 +31,18 @@ from terrareg.errors import (
     InvalidTerraregMetadataFileError,
     MetadataDoesNotContainRequiredAttributeError,
     GitCloneError,
-    UnableToGetGlobalTerraformLockError,
+    UnableToObtainTerraformBinaryCacheLockError,
+    UnableToObtainTerraformPluginCacheLockError,
     TerraformVersionSwitchError
 )
 import terrareg.terraform_product
-from terrareg.utils import PathDoesNotExistError, get_public_url_details, safe_iglob, safe_join_paths
+import terrareg.terraform_plugin_cache
+import terrareg.git_mirror_cache
+from terrareg.utils import (
+    FileLockTimeoutError, PathDoesNotExistError, PathIsNotWithinBaseDirectoryError,
+    check_subdirectory_within_base_dir, exclusive_file_lock,
+    get_public_url_details, safe_iglob, safe_join_paths
+)
 from terrareg.config import Config
 from terrareg.constants import EXTRACTION_VERSION
 import terrareg.file_storage
@@ -45,20 +53,18 @@ class ModuleExtractor:
 
     TERRAREG_METADATA_FILES = ['terrareg.json', '.terrareg.json']
     IGNORE_FILE = ".tfignore"
-    TERRAFORM_LOCK = threading.Lock()
+    TERRAFORM_BINARY_CACHE_LOCK_TIMEOUT = 60
 
-    def __init__(self, module_version: 'terrareg.models.ModuleVersion'):
+    def __init__(self, module_version: 'terrareg.models.ModuleVersion',
+                 extraction_job: Optional['terrareg.module_extraction_job_model.ModuleExtractionJob']=None,
+                 force_full_extraction: bool=False):
         """Create temporary directories and store member variables."""
         self._module_version = module_version
+        self._extraction_job = extraction_job
+        self._force_full_extraction = force_full_extraction
         self._extract_directory = tempfile.TemporaryDirectory()  # noqa: R1732
         self._upload_directory = tempfile.TemporaryDirectory()  # noqa: R1732
 
-    @staticmethod
-    def terraform_binary() -> str:
-        """Return path of terraform binary"""
-        product = terrareg.terraform_product.ProductFactory.get_product()
-        return os.path.join(os.getcwd(), "bin", product.get_executable_name())
-
     @property
     def terraform_rc_file(self):
         """Return path to terraformrc file"""
@@ -93,6 +99,11 @@ class ModuleExtractor:
         """Return path of extract directory."""
         return self._upload_directory.name
 
+    def _report_progress(self, message: str):
+        """Report progress to extraction job, if extraction is being performed for a job"""
+        if self._extraction_job is not None:
+            self._extraction_job.update_progress(message)
+
     def __enter__(self):
         """Run enter of upstream context managers."""
         self._extract_directory.__enter__()
@@ -114,7 +125,12 @@ class ModuleExtractor:
                 os.unlink(terraform_docs_config_path)
 
         try:
-            terradocs_output = subprocess.check_output(['terraform-docs', 'json', module_path])
+            terradocs_output = subprocess.check_output(
+                ['terraform-docs', 'json', module_path],
+                timeout=Config().SUBMODULE_EXTRACTION_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            raise UnableToProcessTerraformError('Timed out whilst processing the terraform code.')
         except subprocess.CalledProcessError as exc:
             raise UnableToProcessTerraformError(
                 'An error occurred whilst processing the terraform code.' +
@@ -125,47 +141,78 @@ class ModuleExtractor:
 
     @classmethod
     @contextmanager
-    def _switch_terraform_versions(cls, module_path):
-        """Switch terraform to required version for module"""
-        # Wait for global lock on terraform, so that only
-        # instance can run terraform at a time
-        if not ModuleExtractor.TERRAFORM_LOCK.acquire(blocking=True, timeout=60):
-            raise UnableToGetGlobalTerraformLockError(
-                "Unable to obtain global Terraform lock in 60 seconds"
-            )
+    def _terraform_binary_cache_lock(cls):
+        """
+        Obtain lock on Terraform binary cache directory.
+
+        A file lock is used, so that installations are not
+        performed concurrently by other threads or processes.
+        """
+        cache_directory = Config().TERRAFORM_BINARY_CACHE_DIRECTORY
+        os.makedirs(cache_directory, exist_ok=True)
+
         try:
-            config = Config()
+            with exclusive_file_lock(os.path.join(cache_directory, ".lock"), timeout=cls.TERRAFORM_BINARY_CACHE_LOCK_TIMEOUT):
+                yield
+        except FileLockTimeoutError:
+            raise UnableToObtainTerraformBinaryCacheLockError(
+                f"Unable to obtain Terraform binary cache lock in {cls.TERRAFORM_BINARY_CACHE_LOCK_TIMEOUT} seconds"
+            )
 
-            default_terraform_version = config.DEFAULT_TERRAFORM_VERSION
-            tfswitch_env = os.environ.copy()
+    @classmethod
+    @contextmanager
+    def _switch_terraform_versions(cls, module_path):
+        """
+        Install Terraform version required by module and yield the path of the binary.
 
-            if default_terraform_version:
-                tfswitch_env["TF_DEFAULT_VERSION"] = default_terraform_version
+        Terraform versions are installed once into the Terraform binary cache, keyed by version,
+        and each call is provided with its own binary path, pointing to the cached version,
+        so that Terraform can be run for multiple modules concurrently.
+        """
+        config = Config()
 
-            product = terrareg.terraform_product.ProductFactory.get_product()
-            tfswitch_env["TF_PRODUCT"] = product.get_tfswitch_product_arg()
+        default_terraform_version = config.DEFAULT_TERRAFORM_VERSION
+        tfswitch_env = os.environ.copy()
 
-            tfswitch_args = []
-            if config.TERRAFORM_ARCHIVE_MIRROR:
-                tfswitch_args += ["--mirror", config.TERRAFORM_ARCHIVE_MIRROR]
+        if default_terraform_version:
+            tfswitch_env["TF_DEFAULT_VERSION"] = default_terraform_version
 
-            # Run tfswitch
-            try:
-                subprocess.check_output(
-                    ["tfswitch", "--bin", cls.terraform_binary(), *tfswitch_args],
-                    env=tfswitch_env,
-                    cwd=module_path
-                )
-            except subprocess.CalledProcessError as exc:
-                print("An error occured whilst running tfswitch:", str(exc))
-                raise TerraformVersionSwitchError(
-                    "An error occurred whilst initialising Terraform version" +
-                    (f": {str(exc)}: {exc.output.decode('utf-8')}" if Config().DEBUG else "")
-                )
+        product = terrareg.terraform_product.ProductFactory.get_product()
+        tfswitch_env["TF_PRODUCT"] = product.get_tfswitch_product_arg()
+
+        tfswitch_args = []
+        if config.TERRAFORM_ARCHIVE_MIRROR:
+            tfswitch_args += ["--mirror", config.TERRAFORM_ARCHIVE_MIRROR]
+
+        with tempfile.TemporaryDirectory() as binary_directory:
+            terraform_binary = os.path.join(binary_directory, product.get_executable_name())
+
+            # Only hold the cache lock whilst tfswitch installs the version
+            # and links it to the binary path, so that the cache directory
+            # is not modified concurrently
+            with cls._terraform_binary_cache_lock():
+                try:
+                    subprocess.check_output(
+                        [
+                            "tfswitch",
+                            "--bin", terraform_binary,
+                            "--install", config.TERRAFORM_BINARY_CACHE_DIRECTORY,
+                            *tfswitch_args
+                        ],
+                        env=tfswitch_env,
+                        cwd=module_path,
+                        timeout=config.SUBMODULE_EXTRACTION_TIMEOUT
+                    )
+                except subprocess.TimeoutExpired:
+                    raise TerraformVersionSwitchError("Timed out whilst initialising Terraform version")
+                except subprocess.CalledProcessError as exc:
+                    print("An error occured whilst running tfswitch:", str(exc))
+                    raise TerraformVersionSwitchError(
+                        "An error occurred whilst initialising Terraform version" +
+                        (f": {str(exc)}: {exc.output.decode('utf-8')}" if Config().DEBUG else "")
+                    )
 
-            yield
-        finally:
-            ModuleExtractor.TERRAFORM_LOCK.release()
+            yield terraform_binary
 
     def _run_tfsec(self, module_path):
         """Run tfsec and return output."""
@@ -175,7 +222,9 @@ class ModuleExtractor:
                 '--ignore-hcl-errors', '--format', 'json', '--no-module-downloads', '--soft-fail',
                 '--no-colour', '--include-ignored', '--include-passed', '--disable-grouping',
                 module_path
-            ])
+            ], timeout=Config().SUBMODULE_EXTRACTION_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            raise UnableToProcessTerraformError('Timed out whilst performing security scan of code.')
         except subprocess.CalledProcessError as exc:
             raise UnableToProcessTerraformError(
                 'An error occurred whilst performing security scan of code.' +
@@ -219,8 +268,12 @@ credentials "{domain_name}" {{
   token = "{config.INTERNAL_EXTRACTION_ANALYTICS_TOKEN}"
 }}
 """
-            with open(self.terraform_rc_file, "w") as terraform_rc_fh:
+            # Write to temporary file and move into place, as the file
+            # may be read by concurrent extractions
+            temp_terraform_rc_file = f"{self.terraform_rc_file}.{uuid.uuid4().hex}"
+            with open(temp_terraform_rc_file, "w") as terraform_rc_fh:
                 terraform_rc_fh.write(terraform_rc_file_content)
+            os.replace(temp_terraform_rc_file, self.terraform_rc_file)
 
     def _override_tf_backend(self, module_path):
         """Attempt to find any files that set terraform backend and create override"""
@@ -251,24 +304,40 @@ terraform {{
     """)
         return override_filename
 
-    def _run_tf_init(self, module_path):
+    def _run_tf_init(self, module_path, terraform_binary):
         """Perform terraform init"""
         self._create_terraform_rc_file()
         self._override_tf_backend(module_path=module_path)
 
         try:
-            subprocess.check_call([self.terraform_binary(), "init"], cwd=module_path)
+            with terrareg.terraform_plugin_cache.TerraformPluginCache().use(module_path=module_path) as terraform_env:
+                subprocess.check_call(
+                    [terraform_binary, "init"],
+                    cwd=module_path,
+                    env=terraform_env,
+                    timeout=Config().SUBMODULE_EXTRACTION_TIMEOUT
+                )
+        except subprocess.TimeoutExpired:
+            print("Timed out whilst running terraform init")
+            return False
         except subprocess.CalledProcessError:
             return False
+        except UnableToObtainTerraformPluginCacheLockError as exc:
+            print(f"Unable to initialise Terraform: {exc}")
+            return False
         return True
 
-    def _get_graph_data(self, module_path):
+    def _get_graph_data(self, module_path, terraform_binary):
         """Run inframap and generate graphiz"""
         try:
             terraform_graph_data = subprocess.check_output(
-                [self.terraform_binary(), "graph"],
-                cwd=module_path
+                [terraform_binary, "graph"],
+                cwd=module_path,
+                timeout=Config().SUBMODULE_EXTRACTION_TIMEOUT
             )
+        except subprocess.TimeoutExpired:
+            print("Timed out whilst generating Terraform graph data")
+            return None
         except subprocess.CalledProcessError as exc:
             print("Failed to generate Terraform graph data:", str(exc))
             print(exc.output.decode('utf-8'))
@@ -291,13 +360,17 @@ terraform {{
 
         return None
 
-    def _get_terraform_version(self, module_path):
+    def _get_terraform_version(self, module_path, terraform_binary):
         """Run terraform -version and return output"""
         try:
             terraform_version_data = subprocess.check_output(
-                [self.terraform_binary(), "-version", "-json"],
-                cwd=module_path
+                [terraform_binary, "-version", "-json"],
+                cwd=module_path,
+                timeout=Config().SUBMODULE_EXTRACTION_TIMEOUT
             )
+        except subprocess.TimeoutExpired:
+            print("Timed out whilst generating Terraform version data")
+            return None
         except subprocess.CalledProcessError as exc:
             print("Failed to generate Terraform version data:", str(exc))
             print(exc.output.decode('utf-8'))
@@ -392,58 +465,27 @@ terraform {{
 
         pathspec_filter = self._get_pathspec_filter()
 
-        zip_excludes = []
-
-        def tar_filter(tarinfo: tarfile.TarInfo):
-            """Filter files being added to tar archive"""
+        def exclude_filter(path: str) -> bool:
+            """Return whether file should be excluded from archives"""
             # Do not include .git directory in archive
-            if tarinfo.name == ".git":
-                return None
+            if path == ".git":
+                return True
 
-            if tarinfo.name == self.IGNORE_FILE:
-                return None
+            if path == self.IGNORE_FILE:
+                return True
 
             # Check if file is part of ignore pattern
-            if pathspec_filter and pathspec_filter.match_file(tarinfo.name):
-                # Add file to exclude list, to be used to exclude from zip generation
-                zip_excludes.append(tarinfo.name)
-                return None
-
-            return tarinfo
-
-        # Create tar.gz
-        with tempfile.TemporaryDirectory(suffix='generate-archive') as temp_dir:
-            tar_file_path = os.path.join(temp_dir, self._module_version.archive_name_tar_gz)
-            with tarfile.open(tar_file_path, "w:gz") as tar:
-                tar.add(self.archive_source_directory, arcname='', recursive=True, filter=tar_filter)
-
-            # Add tar file to file storage
-            file_storage.upload_file(tar_file_path, self._module_version.base_directory, self._module_version.archive_name_tar_gz)
-
-            # Create zip
-            # Use subprocess to execute zip, rather than shutil.make_archive,
-            # as make_archive is not thread-safe and changes the CWD of the main
-            # process.
-            zip_file_path = os.path.join(temp_dir, self._module_version.archive_name_zip)
-            subprocess.call(
-                [
-                    'zip',
-                    '-r', zip_file_path,
-                    # Exclude .git directory from archive
-                    '--exclude=./.git/*',
-                    f'--exclude={self.IGNORE_FILE}'
-                ] + [
-                    f"--exclude={exclude_file}"
-                    for exclude_file in zip_excludes
-                    # for arg in ("--exclude", exclude_file)
-                ] + [
-                    '.'
-                ],
-                # Use 'cwd' to ensure zip file is generated with directory structure
-                # from the root of the module.
-                cwd=self.archive_source_directory
-            )
-            file_storage.upload_file(zip_file_path, self._module_version.base_directory, self._module_version.archive_name_zip)
+            return bool(pathspec_filter and pathspec_filter.match_file(path))
+
+        # Generate tar.gz and zip in a single pass over the module,
+        # streaming each archive directly to file storage
+        archive_generator = terrareg.archive_generator.ArchiveGenerator(
+            source_directory=self.archive_source_directory,
+            exclude_filter=exclude_filter
+        )
+        with file_storage.open_writer(self._module_version.base_directory, self._module_version.archive_name_tar_gz) as tar_gz_fh, \
+                file_storage.open_writer(self._module_version.base_directory, self._module_version.archive_name_zip) as zip_fh:
+            archive_generator.generate(tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
 
     def _get_git_commit_sha(self, module_directory: str):
         """Obtain git commit hash for module version"""
@@ -462,6 +504,12 @@ terraform {{
             terraform_version=terraform_version,
             terraform_modules=terraform_modules
         )
+        # Pre-generate graph JSON, which is otherwise expensive to generate per-request.
+        # On failure, the graph JSON is left empty and is generated when requested.
+        try:
+            module_details.update_graph_json()
+        except Exception as exc:
+            print(f"Failed to pre-generate graph JSON: {exc}")
         return module_details
 
     def _insert_database(
@@ -507,16 +555,22 @@ terraform {{
             archive_git_path=self._module_version.module_provider.archive_git_path,
         )
 
-    def _process_submodule(self, submodule: 'terrareg.models.BaseSubmodule'):
-        """Process submodule."""
-        submodule_dir = safe_join_paths(self.module_directory, submodule.path)
+    def _analyse_submodule(self, submodule_path: str, is_example: bool) -> dict:
+        """
+        Perform analysis of submodule/example, returning the results.
+
+        This does not modify the database, allowing it to be run
+        concurrently for multiple submodules.
+        """
+        submodule_dir = safe_join_paths(self.module_directory, submodule_path)
 
-        # Extract example files before performing
+        # Read example files before performing
         # any other analysis, as the analysis may modify
         # files in the repository, which should not
         # be present in the stored files in the database
-        if isinstance(submodule, terrareg.models.Example):
-            self._extract_example_files(example=submodule)
+        example_files = []
+        if is_example:
+            example_files = self._read_example_files(example_path=submodule_path)
 
         tf_docs = self._run_terraform_docs(submodule_dir)
         tfsec = self._run_tfsec(submodule_dir)
@@ -525,39 +579,114 @@ terraform {{
         terraform_graph = None
         terraform_modules = None
         terraform_version = None
-        with self._switch_terraform_versions(submodule_dir):
-            if self._run_tf_init(submodule_dir):
-                terraform_graph = self._get_graph_data(submodule_dir)
+        with self._switch_terraform_versions(submodule_dir) as terraform_binary:
+            if self._run_tf_init(submodule_dir, terraform_binary=terraform_binary):
+                terraform_graph = self._get_graph_data(submodule_dir, terraform_binary=terraform_binary)
                 terraform_modules = self._get_terraform_modules(submodule_dir)
-                terraform_version = self._get_terraform_version(submodule_dir)
+                terraform_version = self._get_terraform_version(submodule_dir, terraform_binary=terraform_binary)
 
         infracost = None
         # Run Infracost on examples, if API key is set
-        if isinstance(submodule, terrareg.models.Example) and Config().INFRACOST_API_KEY:
+        if is_example and Config().INFRACOST_API_KEY:
             try:
-                infracost = self._run_infracost(example=submodule)
+                infracost = self._run_infracost(example_path=submodule_path)
             except UnableToProcessTerraformError as exc:
                 print('An error occured whilst running infracost against example')
 
-        # Create module details row
-        module_details = self._create_module_details(
-            terraform_docs=tf_docs,
-            readme_content=readme_content,
-            tfsec=tfsec,
-            infracost=infracost,
-            terraform_graph=terraform_graph,
-            terraform_modules=terraform_modules,
-            terraform_version=terraform_version
-        )
+        return {
+            'example_files': example_files,
+            'terraform_docs': tf_docs,
+            'readme_content': readme_content,
+            'tfsec': tfsec,
+            'infracost': infracost,
+            'terraform_graph': terraform_graph,
+            'terraform_modules': terraform_modules,
+            'terraform_version': terraform_version,
+        }
+
+    def _store_submodule(self, submodule: 'terrareg.models.BaseSubmodule', analysis: dict, content_hash: Optional[str]=None):
+        """Store results of submodule analysis in database."""
+        if isinstance(submodule, terrareg.models.Example):
+            self._insert_example_files(example=submodule, example_files=analysis['example_files'])
+
+        if analysis.get('module_details'):
+            # Re-use module details of identical submodule from previous version
+            module_details = analysis['module_details'].copy()
+        else:
+            # Create module details row
+            module_details = self._create_module_details(
+                terraform_docs=analysis['terraform_docs'],
+                readme_content=analysis['readme_content'],
+                tfsec=analysis['tfsec'],
+                infracost=analysis['infracost'],
+                terraform_graph=analysis['terraform_graph'],
+                terraform_modules=analysis['terraform_modules'],
+                terraform_version=analysis['terraform_version']
+            )
 
         submodule.update_attributes(
-            module_details_id=module_details.pk
+            module_details_id=module_details.pk,
+            content_hash=content_hash
         )
 
-    def _run_infracost(self, example: 'terrareg.models.Example'):
+    def _get_submodule_content_hash(self, submodule_path: str, is_example: bool) -> str:
+        """
+        Return hash of the content of a submodule/example.
+
+        This includes the content of any local modules that the submodule calls,
+        as these affect the analysis of the submodule.
+        """
+        local_source_re = re.compile(r'^\s*source\s*=\s*"(\.\.?/[^"]*)"', re.MULTILINE)
+        base_directory = os.path.realpath(self.extract_directory)
+
+        content_hash = hashlib.sha256()
+        # Include extraction version and whether cost analysis is performed,
+        # to avoid re-using analysis that would differ
+        content_hash.update(f"{EXTRACTION_VERSION}:{bool(is_example and Config().INFRACOST_API_KEY)}\n".encode('utf-8'))
+
+        # Hash all files within the submodule and only files
+        # directly within local modules that are called
+        directories_to_hash = [(safe_join_paths(self.module_directory, submodule_path, is_dir=True), True)]
+        hashed_directories = set()
+        while directories_to_hash:
+            directory, recursive = directories_to_hash.pop(0)
+            if directory in hashed_directories:
+                continue
+            hashed_directories.add(directory)
+
+            for root, dirs, files in os.walk(directory):
+                # Ignore terraform working directories and sort
+                # directories, to ensure consistent walk order
+                dirs[:] = sorted(dir_ for dir_ in dirs if dir_ != '.terraform') if recursive else []
+                for file_name in sorted(files):
+                    file_path = os.path.join(root, file_name)
+                    if not os.path.isfile(file_path):
+                        continue
+                    with open(file_path, 'rb') as file_fh:
+                        content = file_fh.read()
+
+                    content_hash.update(os.path.relpath(file_path, base_directory).encode('utf-8') + b'\0')
+                    content_hash.update(hashlib.sha256(content).digest())
+
+                    if not file_name.endswith('.tf'):
+                        continue
+                    for source in local_source_re.findall(content.decode('utf-8', errors='ignore')):
+                        try:
+                            directories_to_hash.append((
+                                check_subdirectory_within_base_dir(
+                                    base_dir=base_directory, sub_dir=os.path.join(root, source),
+                                    is_dir=True, allow_same_directory=True),
+                                False
+                            ))
+                        except (PathDoesNotExistError, PathIsNotWithinBaseDirectoryError):
+                            pass
+
+        return content_hash.hexdigest()
+
+    def _run_infracost(self, example_path: str):
         """Run Infracost to obtain cost of examples."""
         # Ensure example path is within root module
-        safe_join_paths(self.module_directory, example.path)
+        safe_join_paths(self.module_directory, example_path)
 
         infracost_env = dict(os.environ)
         _, domain_name, _ = get_public_url_details()
@@ -571,11 +700,14 @@ terraform {{
             output_file.close()
             try:
                 subprocess.check_output(
-                    ['infracost', 'breakdown', '--path', example.path,
+                    ['infracost', 'breakdown', '--path', example_path,
                      '--format', 'json', '--out-file', output_file.name],
                     cwd=self.module_directory,
-                    env=infracost_env
+                    env=infracost_env,
+                    timeout=Config().SUBMODULE_EXTRACTION_TIMEOUT
                 )
+            except subprocess.TimeoutExpired:
+                raise UnableToProcessTerraformError('Timed out whilst performing cost analysis of code.')
             except subprocess.CalledProcessError as exc:
                 raise UnableToProcessTerraformError(
                     'An error occurred whilst performing cost analysis of code.' +
@@ -589,9 +721,10 @@ terraform {{
 
         return infracost_result
 
-    def _extract_example_files(self, example: 'terrareg.models.Example'):
-        """Extract all terraform files in example and insert into DB"""
-        example_base_dir = safe_join_paths(self.module_directory, example.path)
+    def _read_example_files(self, example_path: str) -> List[Tuple[str, str]]:
+        """Return path and content of all terraform files in example"""
+        example_files = []
+        example_base_dir = safe_join_paths(self.module_directory, example_path)
         for extension in Config().EXAMPLE_FILE_EXTENSIONS:
             for tf_file_path in safe_iglob(base_dir=example_base_dir,
                                         pattern=f'*.{extension}',
@@ -604,11 +737,24 @@ terraform {{
                 with open(tf_file_path, 'r') as file_fd:
                     content = ''.join(file_fd.readlines())
 
-                # Create example file and update content attribute
-                example_file = terrareg.models.ExampleFile.create(example=example, path=tf_file)
-                example_file.update_attributes(
-                    content=content
-                )
+                example_files.append((tf_file, content))
+        return example_files
+
+    def _insert_example_files(self, example: 'terrareg.models.Example', example_files: List[Tuple[str, str]]):
+        """Insert example files into DB"""
+        for tf_file, content in example_files:
+            # Create example file and update content attribute
+            example_file = terrareg.models.ExampleFile.create(example=example, path=tf_file)
+            example_file.update_attributes(
+                content=content
+            )
+
+    def _extract_example_files(self, example: 'terrareg.models.Example'):
+        """Extract all terraform files in example and insert into DB"""
+        self._insert_example_files(
+            example=example,
+            example_files=self._read_example_files(example_path=example.path)
+        )
 
     def _scan_submodules(self, subdirectory: str, submodule_class: Type['terrareg.models.BaseSubmodule']):
         """Scan for submodules and extract details."""
@@ -646,12 +792,72 @@ terraform {{
             if submodule_name not in submodules:
                 submodules.append(submodule_name)
 
-        # Extract all submodules
+        if not submodules:
+            return
+
+        is_example = issubclass(submodule_class, terrareg.models.Example)
+        config = Config()
+
+        # Re-use analysis of submodules that are unchanged
+        # from a previous version of the module provider
+        content_hashes = {
+            submodule_path: self._get_submodule_content_hash(submodule_path=submodule_path, is_example=is_example)
+            for submodule_path in submodules
+        }
+        analysis_results = {}
+        if config.INCREMENTAL_MODULE_EXTRACTION and not self._force_full_extraction:
+            for submodule_path in submodules:
+                previous_module_details = submodule_class.get_module_details_by_content_hash(
+                    module_version=self._module_version,
+                    module_path=submodule_path,
+                    content_hash=content_hashes[submodule_path]
+                )
+                if previous_module_details is not None:
+                    analysis_results[submodule_path] = {
+                        'module_details': previous_module_details,
+                        'example_files': self._read_example_files(example_path=submodule_path) if is_example else [],
+                    }
+            if analysis_results:
+                self._report_progress(f'Re-using analysis of {len(analysis_results)} unchanged submodules: {", ".join(analysis_results)}')
+
+        # Analyse submodules concurrently, as the analysis is dominated
+        # by running external tools for each submodule.
+        # Progress is only reported from the current thread.
+        submodules_to_analyse = [
+            submodule_path
+            for submodule_path in submodules
+            if submodule_path not in analysis_results
+        ]
+        if submodules_to_analyse:
+            self._report_progress(f'Analysing {len(submodules_to_analyse)} submodules: {", ".join(submodules_to_analyse)}')
+            executor = ThreadPoolExecutor(max_workers=max(config.SUBMODULE_EXTRACTION_CONCURRENCY, 1))
+            try:
+                futures = [
+                    executor.submit(self._analyse_submodule, submodule_path=submodule_path, is_example=is_example)
+                    for submodule_path in submodules_to_analyse
+                ]
+                # The duration of each analysis is bounded by the timeouts
+                # of the external tools that it runs
+                for submodule_path, future in zip(submodules_to_analyse, futures):
+                    analysis_results[submodule_path] = future.result()
+            finally:
+                # If an analysis fails, cancel analysis that has not yet started
+                # and wait for running analysis to complete, before the
+                # extraction directory is removed.
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        # Store all results in the database from the current thread,
+        # in the order that the submodules were found
+        self._report_progress(f'Storing details of {len(submodules)} submodules')
         for submodule_path in submodules:
             obj = submodule_class.create(
                 module_version=self._module_version,
                 module_path=submodule_path)
-            self._process_submodule(submodule=obj)
+            self._store_submodule(
+                submodule=obj,
+                analysis=analysis_results[submodule_path],
+                content_hash=content_hashes[submodule_path]
+            )
 
     def _extract_description(self, readme_content):
         """Extract description from README"""
@@ -729,8 +935,11 @@ terraform {{
         # Always perform this first before making any modifications to the repo
         if not (self._module_version.get_git_clone_url() and
                 Config().DELETE_EXTERNALLY_HOSTED_ARTIFACTS):
+            self._report_progress('Generating archives')
             self._generate_archive()
 
+        self._report_progress('Analysing root module')
+
         # Run terraform-docs on module content and obtain README
         terraform_docs = self._run_terraform_docs(self.module_directory)
         tfsec = self._run_tfsec(self.module_directory)
@@ -739,11 +948,11 @@ terraform {{
         terraform_graph = None
         terraform_modules = None
         terraform_version = None
-        with self._switch_terraform_versions(self.module_directory):
-            if self._run_tf_init(self.module_directory):
-                terraform_graph = self._get_graph_data(self.module_directory)
+        with self._switch_terraform_versions(self.module_directory) as terraform_binary:
+            if self._run_tf_init(self.module_directory, terraform_binary=terraform_binary):
+                terraform_graph = self._get_graph_data(self.module_directory, terraform_binary=terraform_binary)
                 terraform_modules = self._get_terraform_modules(self.module_directory)
-                terraform_version = self._get_terraform_version(self.module_directory)
+                terraform_version = self._get_terraform_version(self.module_directory, terraform_binary=terraform_binary)
 
         # Check for any terrareg metadata files
         terrareg_metadata = self._get_terrareg_metadata(self.module_directory)
@@ -770,13 +979,19 @@ terraform {{
 
         self._extract_additional_tab_files()
 
+        self._report_progress('Processing submodules')
         self._scan_submodules(
             submodule_class=terrareg.models.Submodule,
             subdirectory=Config().MODULES_DIRECTORY)
+        self._report_progress('Processing examples')
         self._scan_submodules(
             submodule_class=terrareg.models.Example,
             subdirectory=Config().EXAMPLES_DIRECTORY)
 
+        # Store dependencies of root module and submodules,
+        # used by the Terraform module versions API
+        self._module_version.update_dependencies()
+
 
 class ApiUploadModuleExtractor(ModuleExtractor):
     """Extraction of module uploaded via API."""
@@ -888,16 +1103,28 @@ class GitModuleExtractor(ModuleExtractor):
 
         config = Config()
         try:
-            subprocess.check_output([
-                    'git', 'clone', '--single-branch',
-                    '--branch', self._module_version.source_git_tag,
-                    git_url_with_auth,
-                    self.extract_directory
-                ],
-                stderr=subprocess.STDOUT,
-                env=env,
-                timeout=config.GIT_CLONE_TIMEOUT
-            )
+            if config.ENABLE_GIT_MIRROR_CACHE:
+                # Clone tag from local mirror of repository,
+                # which is updated with an incremental fetch
+                terrareg.git_mirror_cache.GitMirrorCache().clone(
+                    git_url=original_git_url,
+                    authenticated_git_url=git_url_with_auth,
+                    tag=self._module_version.source_git_tag,
+                    target_directory=self.extract_directory,
+                    env=env,
+                    timeout=config.GIT_CLONE_TIMEOUT
+                )
+            else:
+                subprocess.check_output([
+                        'git', 'clone', '--single-branch',
+                        '--branch', self._module_version.source_git_tag,
+                        git_url_with_auth,
+                        self.extract_directory
+                    ],
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    timeout=config.GIT_CLONE_TIMEOUT
+                )
         except subprocess.CalledProcessError as exc:
             error = 'Unknown error occurred during git clone'
             for line in exc.output.decode('utf-8').split('\n'):
@@ -922,6 +1149,7 @@ class GitModuleExtractor(ModuleExtractor):
 
     def process_upload(self):
         """Extract archive and perform data extraction from module source."""
+        self._report_progress('Cloning repository')
         self._clone_repository()
 
         super(GitModuleExtractor, self).process_upload()
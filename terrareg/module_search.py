@@ -2,10 +2,12 @@
 import datetime
 
 import sqlalchemy
-from terrareg.config import Config
+from terrareg.config import Config, SearchIndexType
 
 from terrareg.database import Database
 import terrareg.models
+import terrareg.analytics
+import terrareg.search_index
 from terrareg.filters import NamespaceTrustFilter
 import terrareg.result_data
 
@@ -98,6 +100,14 @@ class ModuleSearch(object):
         limit = 1 if limit < 1 else limit
         offset = 0 if offset < 0 else offset
 
+        if Config().SEARCH_INDEX is SearchIndexType.INVERTED_INDEX:
+            return cls._search_module_providers_from_index(
+                offset=offset, limit=limit, query=query,
+                namespaces=namespaces, modules=modules, providers=providers,
+                verified=verified, include_internal=include_internal,
+                namespace_trust_filters=namespace_trust_filters
+            )
+
         db = Database.get()
 
         select = cls._get_search_query_filter(query)
@@ -157,11 +167,9 @@ class ModuleSearch(object):
 
             count = count_result.fetchone()['count']
 
-            module_providers = []
-            for r in res:
-                namespace = terrareg.models.Namespace(name=r['namespace'])
-                module = terrareg.models.Module(namespace=namespace, name=r['module'])
-                module_providers.append(terrareg.models.ModuleProvider(module=module, name=r['provider']))
+            rows = res.fetchall()
+
+        module_providers = cls._hydrate_module_providers(rows)
 
         return terrareg.result_data.ResultData(
             offset=offset,
@@ -170,9 +178,135 @@ class ModuleSearch(object):
             count=count
         )
 
+    @classmethod
+    def _get_index_results(
+        cls,
+        query: str=None,
+        namespaces: list=None,
+        modules: list=None,
+        providers: list=None,
+        verified: bool=False,
+        include_internal: bool=False,
+        namespace_trust_filters: list=NamespaceTrustFilter.UNSPECIFIED):
+        """Return ID, score and attributes of module providers matching search from search index, ordered by relevance."""
+        trusted_namespaces = Config().TRUSTED_NAMESPACES
+
+        results = []
+        for result in terrareg.search_index.ModuleSearchIndex.get().search(query):
+            attributes = result[2]
+            if providers and attributes['provider'] not in providers:
+                continue
+            if namespaces and attributes['namespace'] not in namespaces:
+                continue
+            if modules and attributes['module'] not in modules:
+                continue
+            if verified and not attributes['verified']:
+                continue
+            if not include_internal and attributes['internal']:
+                continue
+            if namespace_trust_filters is not NamespaceTrustFilter.UNSPECIFIED:
+                trusted = attributes['namespace'] in trusted_namespaces
+                if not ((NamespaceTrustFilter.TRUSTED_NAMESPACES in namespace_trust_filters and trusted) or
+                        (NamespaceTrustFilter.CONTRIBUTED in namespace_trust_filters and not trusted)):
+                    continue
+            results.append(result)
+
+        # Order by relevance, then by module and provider name
+        results.sort(key=lambda result: (-result[1], result[2]['module'], result[2]['provider']))
+        return results
+
+    @classmethod
+    def _search_module_providers_from_index(cls, offset: int, limit: int, **kwargs):
+        """Search module providers using search index, obtaining the rows for the page of results from the database."""
+        db = Database.get()
+
+        results = cls._get_index_results(**kwargs)
+        page_ids = [module_provider_id for module_provider_id, _, _ in results[offset:offset + limit]]
+
+        rows = []
+        if page_ids:
+            select = db.select_module_provider_joined_latest_module_version(
+                db.module_provider,
+                db.module_version,
+                db.namespace
+            ).where(
+                db.module_provider.c.id.in_(page_ids)
+            )
+            with db.get_connection() as conn:
+                rows_by_id = {
+                    row._mapping[db.module_provider.c.id]: row
+                    for row in conn.execute(select)
+                }
+            # Order rows by relevance, ignoring any module providers
+            # that have been removed since the index was refreshed
+            rows = [rows_by_id[module_provider_id] for module_provider_id in page_ids if module_provider_id in rows_by_id]
+
+        return terrareg.result_data.ResultData(
+            offset=offset,
+            limit=limit,
+            rows=cls._hydrate_module_providers(rows),
+            count=len(results)
+        )
+
+    @classmethod
+    def _hydrate_module_providers(cls, rows):
+        """
+        Create module provider objects from search result rows.
+
+        The namespace, module provider and latest module version are populated from
+        the rows of the search query and the git providers and download counts are obtained
+        for all results in bulk, avoiding queries for each result when generating API responses.
+        """
+        db = Database.get()
+
+        def get_table_row(row, table):
+            """Extract columns for table from joined search row"""
+            return {column.name: row._mapping[column] for column in table.c}
+
+        namespaces = {}
+        module_provider_rows = []
+        for row in rows:
+            namespace_row = get_table_row(row, db.namespace)
+            if namespace_row['id'] not in namespaces:
+                namespaces[namespace_row['id']] = terrareg.models.Namespace.from_db_row(namespace_row)
+            module_provider_rows.append((
+                namespaces[namespace_row['id']],
+                get_table_row(row, db.module_provider),
+                get_table_row(row, db.module_version)
+            ))
+
+        git_providers = terrareg.models.GitProvider.get_by_ids(set(
+            module_provider_row['git_provider_id']
+            for _, module_provider_row, _ in module_provider_rows
+            if module_provider_row['git_provider_id']
+        ))
+
+        module_providers = []
+        for namespace, module_provider_row, module_version_row in module_provider_rows:
+            module = terrareg.models.Module(namespace=namespace, name=module_provider_row['module'])
+            module_providers.append(terrareg.models.ModuleProvider.from_db_row(
+                module=module,
+                row=module_provider_row,
+                latest_version_row=module_version_row,
+                git_provider=git_providers.get(module_provider_row['git_provider_id'])
+            ))
+
+        latest_versions = [module_provider.get_latest_version() for module_provider in module_providers]
+        total_downloads = terrareg.analytics.AnalyticsEngine.get_module_versions_total_downloads(latest_versions)
+        for latest_version in latest_versions:
+            latest_version.set_total_downloads_cache(total_downloads[latest_version.pk])
+
+        return module_providers
+
     @classmethod
     def get_search_filters(cls, query):
         """Get list of search filters and filter counts."""
+        if Config().SEARCH_INDEX is SearchIndexType.INVERTED_INDEX:
+            return cls._get_search_filter_counts(
+                (attributes['namespace'], attributes['provider'], attributes['verified'])
+                for _, _, attributes in cls._get_index_results(query=query)
+            )
+
         db = Database.get()
         main_select = cls._get_search_query_filter(query)
 
@@ -181,76 +315,47 @@ class ModuleSearch(object):
             db.module_version.c.internal == False
         )
 
+        # Obtain the attributes used for filters for all matching module providers
+        # in a single query, calculating each of the filter counts from the results
+        filter_subquery = main_select.group_by(
+            db.namespace.c.namespace,
+            db.module_provider.c.module,
+            db.module_provider.c.provider
+        ).subquery()
         with db.get_connection() as conn:
-            verified_count = conn.execute(
-                sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count')]
-                ).select_from(
-                    main_select.where(
-                        db.module_provider.c.verified==True
-                    ).subquery()
-                )
-            ).fetchone()['count']
-
-            trusted_count = conn.execute(
-                sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count')]
-                ).select_from(
-                    main_select.where(
-                        db.namespace.c.namespace.in_(tuple(Config().TRUSTED_NAMESPACES))
-                    ).subquery()
-                )
-            ).fetchone()['count']
-
-            contributed_count = conn.execute(
+            res = conn.execute(
                 sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count')]
-                ).select_from(
-                    main_select.where(
-                        ~db.namespace.c.namespace.in_(tuple(Config().TRUSTED_NAMESPACES))
-                    ).subquery()
-                )
-            ).fetchone()['count']
-
-            provider_subquery = main_select.group_by(
-                db.namespace.c.namespace,
-                db.module_provider.c.module,
-                db.module_provider.c.provider
-            ).subquery()
-            provider_res = conn.execute(
-                sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count'), provider_subquery.c.provider]
-                ).select_from(
-                    provider_subquery
-                ).group_by(provider_subquery.c.provider)
+                    filter_subquery.c.namespace,
+                    filter_subquery.c.provider,
+                    filter_subquery.c.verified
+                ).select_from(filter_subquery)
             )
-
-            namespace_subquery = main_select.group_by(
-                db.namespace.c.namespace,
-                db.module_provider.c.module,
-                db.module_provider.c.provider
-            ).subquery()
-            namespace_res = conn.execute(
-                sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count'), namespace_subquery.c.namespace]
-                ).select_from(
-                    namespace_subquery
-                ).group_by(namespace_subquery.c.namespace)
+            return cls._get_search_filter_counts(
+                (r['namespace'], r['provider'], r['verified'])
+                for r in res
             )
 
-            return {
-                'verified': verified_count,
-                'trusted_namespaces': trusted_count,
-                'contributed': contributed_count,
-                'providers': {
-                    r['provider']: r['count']
-                    for r in provider_res
-                },
-                'namespaces': {
-                    r['namespace']: r['count']
-                    for r in namespace_res
-                }
-            }
+    @staticmethod
+    def _get_search_filter_counts(results):
+        """Calculate filter counts from namespace, provider and verified flag of each search result."""
+        trusted_namespaces = Config().TRUSTED_NAMESPACES
+        filters = {
+            'verified': 0,
+            'trusted_namespaces': 0,
+            'contributed': 0,
+            'providers': {},
+            'namespaces': {}
+        }
+        for namespace, provider, verified in results:
+            if verified:
+                filters['verified'] += 1
+            if namespace in trusted_namespaces:
+                filters['trusted_namespaces'] += 1
+            else:
+                filters['contributed'] += 1
+            filters['providers'][provider] = filters['providers'].get(provider, 0) + 1
+            filters['namespaces'][namespace] = filters['namespaces'].get(namespace, 0) + 1
+        return filters
 
     @staticmethod
     def get_most_recently_published():
@@ -1,5 +1,6 @@
 
-from typing import Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Union, Tuple
 from glob import glob
 import json
 import re
@@ -12,6 +13,7 @@ import tarfile
 import hashlib
 
 import frontmatter
+import requests
 
 import terrareg.provider_version_model
 import terrareg.repository_model
@@ -29,6 +31,24 @@ from terrareg.errors import (
 )
 
 
+class _HashingFileWriter:
+    """Binary file handle wrapper, calculating the sha256 checksum of content whilst it is written"""
+
+    def __init__(self, file_fh: BinaryIO):
+        """Store member variables"""
+        self._file_fh = file_fh
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        """Write data to file and update checksum"""
+        self._hash.update(data)
+        return self._file_fh.write(data)
+
+    def hexdigest(self) -> str:
+        """Return checksum of written content"""
+        return self._hash.hexdigest()
+
+
 class ProviderExtractor:
     """Handle extracting data for provider version"""
 
@@ -60,11 +80,9 @@ class ProviderExtractor:
         except MissingReleaseArtifactError as exc:
             raise MissingSignureArtifactError(f"Could not obtain shasums signature file: {exc}")
 
-        for gpg_key in terrareg.models.GpgKey.get_by_namespace(namespace=namespace):
-            if gpg_key.verify_data_signature(signature=shasums_signature, data=shasums):
-                return gpg_key
-
-        return None
+        return terrareg.models.GpgKey.get_by_signature(
+            namespace=namespace, signature=shasums_signature, data=shasums
+        )
 
     @classmethod
     def _download_artifact(cls,
@@ -191,10 +209,12 @@ class ProviderExtractor:
                 if not os.path.isdir(documentation_directory):
                     os.mkdir(documentation_directory)
 
-                    with terrareg.module_extractor.ModuleExtractor._switch_terraform_versions(source_dir):
+                    with terrareg.module_extractor.ModuleExtractor._switch_terraform_versions(source_dir) as terraform_binary:
                         go_env = os.environ.copy()
                         go_env["GOROOT"] = "/usr/local/go"
                         go_env["GOPATH"] = temp_go_package_cache
+                        # Provide installed Terraform version to tfplugindocs
+                        go_env["PATH"] = os.pathsep.join([os.path.dirname(terraform_binary), go_env.get("PATH", "")])
 
                         # Create documentation directory, if it does not exist
                         if not os.path.isdir(documentation_directory):
@@ -284,27 +304,57 @@ class ProviderExtractor:
                 content=content
             )
 
-    def _process_release_file(self, checksum: str, file_name: str) -> None:
-        """Process file in release"""
-        # Download file
-        content = self._download_artifact(
+    def _download_release_file(self,
+                               downloader: Callable[['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata', BinaryIO], bool],
+                               checksum: str, file_name: str, target_directory: str) -> str:
+        """
+        Download file in release to target directory, verifying the checksum, and return the path of the file.
+
+        The file is streamed to disk, calculating the checksum whilst downloading.
+        Failed downloads are retried, as are downloads that do not match the checksum,
+        which may be caused by a truncated download.
+        """
+        artifact = None
+        for release_artifact in self._release_metadata.release_artifacts:
+            if release_artifact.name == file_name:
+                artifact = release_artifact
+                break
+        else:
+            raise MissingReleaseArtifactError(f"Could not find artifact in metadata: {file_name}")
+
+        file_path = os.path.join(target_directory, os.path.basename(file_name))
+        attempts = max(terrareg.config.Config().PROVIDER_ARTIFACT_DOWNLOAD_RETRIES, 0) + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                with open(file_path, "wb") as file_fh:
+                    hashing_file = _HashingFileWriter(file_fh)
+                    if not downloader(artifact, hashing_file):
+                        raise MissingReleaseArtifactError(f"Failed to download artifact file: {file_name}")
+
+                if hashing_file.hexdigest() != checksum:
+                    raise InvalidReleaseArtifactChecksumError(f"Invalid checksum for {file_name}")
+
+                return file_path
+
+            except (requests.RequestException, OSError, InvalidReleaseArtifactChecksumError) as exc:
+                if attempt >= attempts:
+                    raise
+                print(f"Failed to download {file_name} (attempt {attempt} of {attempts}), retrying: {exc}")
+
+    def _get_release_artifact_downloader(self) -> Callable[['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata', BinaryIO], bool]:
+        """Return function to download release artifacts"""
+        return self._repository.get_release_artifact_downloader(
             provider=self._provider,
-            release_metadata=self._release_metadata,
-            file_name=file_name
+            release_metadata=self._release_metadata
         )
-        if not content:
-            raise MissingReleaseArtifactError("Invalid artifact file")
-
-        # Verify content against checksum
-        if hashlib.sha256(content).hexdigest() != checksum:
-            raise InvalidReleaseArtifactChecksumError(f"Invalid checksum for {file_name}")
 
-        # Create binary object
+    def _store_release_file(self, checksum: str, file_name: str, file_path: str) -> None:
+        """Store downloaded release file as provider version binary"""
         terrareg.provider_version_binary_model.ProviderVersionBinary.create(
             provider_version=self._provider_version,
             name=file_name,
             checksum=checksum,
-            content=content
+            source_path=file_path
         )
 
     def extract_binaries(self) -> None:
@@ -322,6 +372,7 @@ class ProviderExtractor:
         shasum_line_re = re.compile(r"^([a-z0-9]{64})[\t ]+(.*)$")
 
         manifest_file_name = f"{self._provider.full_name}_{self._provider_version.version}_manifest.json"
+        release_files = []
         for line in shasums.decode('utf-8').split("\n"):
             line = line.strip()
 
@@ -336,7 +387,33 @@ class ProviderExtractor:
             file_name = match.group(2)
 
             if file_name != manifest_file_name:
-                self._process_release_file(checksum=checksum, file_name=file_name)
+                release_files.append((checksum, file_name))
+
+        if not release_files:
+            return
+
+        # Obtain downloader in the current thread, as this may
+        # require access to the database
+        downloader = self._get_release_artifact_downloader()
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+            executor = ThreadPoolExecutor(max_workers=max(terrareg.config.Config().PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY, 1))
+            try:
+                futures = [
+                    executor.submit(self._download_release_file, downloader=downloader,
+                                    checksum=checksum, file_name=file_name, target_directory=temp_directory)
+                    for checksum, file_name in release_files
+                ]
+
+                # Store each binary from the current thread, as it is downloaded,
+                # in the order of the checksum file
+                for itx, ((checksum, file_name), future) in enumerate(zip(release_files, futures)):
+                    file_path = future.result()
+                    self._store_release_file(checksum=checksum, file_name=file_name, file_path=file_path)
+                    os.unlink(file_path)
+                    print(f"Processed provider binary {itx + 1}/{len(release_files)}: {file_name}")
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
 
     def extract_manifest_file(self):
         """Extract manifest file"""
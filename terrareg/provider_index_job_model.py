@@ -0,0 +1,284 @@
+
+import datetime
+from typing import Dict, Optional, Tuple
+
+import sqlalchemy
+
+import terrareg.config
+import terrareg.database
+import terrareg.provider_model
+from terrareg.provider_index_job_status import ProviderIndexJobStatus
+
+
+class ProviderIndexJob:
+    """Queued indexing of a provider release, processed by provider index workers."""
+
+    # Duration, in seconds, after which running jobs are assumed to have been
+    # left by a terminated worker, so are re-queued and no longer counted
+    # against the provider source concurrency limit
+    RUNNING_JOB_TIMEOUT = 60 * 60
+
+    @classmethod
+    def create(cls, provider: 'terrareg.provider_model.Provider', version: str) -> 'ProviderIndexJob':
+        """
+        Queue indexing of provider release.
+
+        If a job is already queued or running for the version, or a previous
+        job has failed, the existing job is returned.
+        """
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            db.provider_index_job.c.id
+        ).select_from(
+            db.provider_index_job
+        ).where(
+            db.provider_index_job.c.provider_id==provider.pk,
+            db.provider_index_job.c.version==version,
+            db.provider_index_job.c.status.in_([
+                ProviderIndexJobStatus.QUEUED,
+                ProviderIndexJobStatus.RUNNING,
+                ProviderIndexJobStatus.FAILED,
+            ])
+        ).order_by(
+            db.provider_index_job.c.id.desc()
+        )
+        with db.get_connection() as conn:
+            row = conn.execute(select).first()
+            if row:
+                return cls(pk=row['id'])
+
+            insert = sqlalchemy.insert(db.provider_index_job).values(
+                provider_id=provider.pk,
+                version=version,
+                status=ProviderIndexJobStatus.QUEUED,
+                attempts=0,
+                created_at=datetime.datetime.now(),
+                next_attempt_at=datetime.datetime.now(),
+            )
+            res = conn.execute(insert)
+            return cls(pk=res.inserted_primary_key[0])
+
+    @classmethod
+    def _get_running_job_counts(cls, conn) -> Dict[str, int]:
+        """Return number of running jobs for each provider source"""
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            db.repository.c.provider_source_name,
+            sqlalchemy.func.count().label('count')
+        ).select_from(
+            db.provider_index_job
+        ).join(
+            db.provider,
+            db.provider_index_job.c.provider_id==db.provider.c.id
+        ).join(
+            db.repository,
+            db.provider.c.repository_id==db.repository.c.id
+        ).where(
+            db.provider_index_job.c.status==ProviderIndexJobStatus.RUNNING,
+            db.provider_index_job.c.started_at >= datetime.datetime.now() - datetime.timedelta(seconds=cls.RUNNING_JOB_TIMEOUT)
+        ).group_by(
+            db.repository.c.provider_source_name
+        )
+        return {
+            row['provider_source_name']: row['count']
+            for row in conn.execute(select).all()
+        }
+
+    @classmethod
+    def _requeue_stale_jobs(cls, conn, now: datetime.datetime):
+        """
+        Re-queue jobs that have been running for longer than the running job timeout,
+        or mark them as failed if the maximum number of attempts has been reached.
+        """
+        db = terrareg.database.Database.get()
+        stale_condition = sqlalchemy.and_(
+            db.provider_index_job.c.status==ProviderIndexJobStatus.RUNNING,
+            db.provider_index_job.c.started_at < now - datetime.timedelta(seconds=cls.RUNNING_JOB_TIMEOUT)
+        )
+        error = 'Indexing did not complete within the running job timeout'
+        conn.execute(sqlalchemy.update(db.provider_index_job).where(
+            stale_condition,
+            db.provider_index_job.c.attempts < terrareg.config.Config().PROVIDER_INDEX_JOB_MAX_ATTEMPTS
+        ).values(
+            status=ProviderIndexJobStatus.QUEUED,
+            error=error,
+            next_attempt_at=now,
+        ))
+        conn.execute(sqlalchemy.update(db.provider_index_job).where(
+            stale_condition
+        ).values(
+            status=ProviderIndexJobStatus.FAILED,
+            error=error,
+            finished_at=now,
+        ))
+
+    @classmethod
+    def claim_next(cls, worker_id: str, source_concurrency: Optional[int]=None) -> Optional['ProviderIndexJob']:
+        """
+        Claim the oldest queued job that is due to be attempted,
+        skipping jobs for provider sources that have reached the concurrency limit.
+
+        Jobs left running by terminated workers are re-queued once
+        they have been running for longer than the running job timeout.
+
+        The claim is performed using a conditional update on the job status,
+        so that only a single worker can claim each job.
+        The concurrency limit is checked before claiming, so may be briefly exceeded
+        when multiple workers claim jobs at the same time.
+        """
+        if source_concurrency is None:
+            source_concurrency = terrareg.config.Config().PROVIDER_INDEX_SOURCE_CONCURRENCY
+
+        db = terrareg.database.Database.get()
+        now = datetime.datetime.now()
+        select = sqlalchemy.select(
+            db.provider_index_job.c.id,
+            db.repository.c.provider_source_name
+        ).select_from(
+            db.provider_index_job
+        ).join(
+            db.provider,
+            db.provider_index_job.c.provider_id==db.provider.c.id
+        ).join(
+            db.repository,
+            db.provider.c.repository_id==db.repository.c.id
+        ).where(
+            db.provider_index_job.c.status==ProviderIndexJobStatus.QUEUED,
+            db.provider_index_job.c.next_attempt_at <= now
+        ).order_by(
+            db.provider_index_job.c.next_attempt_at,
+            db.provider_index_job.c.id
+        ).limit(50)
+
+        with db.get_connection() as conn:
+            cls._requeue_stale_jobs(conn, now)
+
+            candidates = conn.execute(select).all()
+            if not candidates:
+                return None
+
+            running_job_counts = cls._get_running_job_counts(conn)
+
+            for candidate in candidates:
+                if source_concurrency and running_job_counts.get(candidate['provider_source_name'], 0) >= source_concurrency:
+                    continue
+
+                update = sqlalchemy.update(db.provider_index_job).where(
+                    db.provider_index_job.c.id==candidate['id'],
+                    db.provider_index_job.c.status==ProviderIndexJobStatus.QUEUED
+                ).values(
+                    status=ProviderIndexJobStatus.RUNNING,
+                    attempts=db.provider_index_job.c.attempts + 1,
+                    worker_id=worker_id,
+                    started_at=now,
+                    finished_at=None,
+                )
+                res = conn.execute(update)
+                if res.rowcount == 1:
+                    return cls(pk=candidate['id'])
+
+        return None
+
+    @classmethod
+    def get_queue_statistics(cls) -> Tuple[int, Optional[datetime.datetime]]:
+        """Return number of queued jobs that are due and the creation time of the oldest due job"""
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            sqlalchemy.func.count().label('count'),
+            sqlalchemy.func.min(db.provider_index_job.c.created_at).label('oldest_created_at')
+        ).select_from(
+            db.provider_index_job
+        ).where(
+            db.provider_index_job.c.status==ProviderIndexJobStatus.QUEUED,
+            db.provider_index_job.c.next_attempt_at <= datetime.datetime.now()
+        )
+        with db.get_connection() as conn:
+            row = conn.execute(select).first()
+        return row['count'], row['oldest_created_at']
+
+    @property
+    def pk(self) -> int:
+        """Return ID of job"""
+        return self._pk
+
+    @property
+    def provider(self) -> Optional['terrareg.provider_model.Provider']:
+        """Return provider that the job is indexing a release for"""
+        return terrareg.provider_model.Provider.get_by_pk(self._get_db_row()['provider_id'])
+
+    @property
+    def version(self) -> str:
+        """Return version being indexed"""
+        return self._get_db_row()['version']
+
+    @property
+    def status(self) -> ProviderIndexJobStatus:
+        """Return status of job"""
+        return self._get_db_row()['status']
+
+    @property
+    def attempts(self) -> int:
+        """Return number of attempts that have been started for the job"""
+        return self._get_db_row()['attempts']
+
+    @property
+    def error(self) -> Optional[str]:
+        """Return error of last failed attempt"""
+        return self._get_db_row()['error']
+
+    def __init__(self, pk: int):
+        """Store member variables"""
+        self._pk = pk
+        self._cache_db_row = None
+
+    def _get_db_row(self):
+        """Get object from database"""
+        if self._cache_db_row is None:
+            db = terrareg.database.Database.get()
+            select = db.provider_index_job.select().where(
+                db.provider_index_job.c.id == self._pk
+            )
+            with db.get_connection() as conn:
+                res = conn.execute(select)
+                self._cache_db_row = res.fetchone()
+        return self._cache_db_row
+
+    def _update_attributes(self, **kwargs):
+        """Update attributes of job"""
+        db = terrareg.database.Database.get()
+        update = sqlalchemy.update(db.provider_index_job).where(
+            db.provider_index_job.c.id==self._pk
+        ).values(**kwargs)
+        with db.get_connection() as conn:
+            conn.execute(update)
+        self._cache_db_row = None
+
+    def mark_succeeded(self):
+        """Mark job as successfully completed"""
+        self._update_attributes(
+            status=ProviderIndexJobStatus.SUCCEEDED,
+            error=None,
+            finished_at=datetime.datetime.now()
+        )
+
+    def mark_failed(self, error: str, retry: bool=True):
+        """
+        Record failure of job attempt.
+
+        If retry is enabled and the maximum number of attempts has not been reached,
+        the job is re-queued with an exponential backoff, otherwise the job is marked as failed.
+        """
+        config = terrareg.config.Config()
+        now = datetime.datetime.now()
+        attempts = self.attempts
+        attributes = {
+            'error': error[:1024],
+            'finished_at': now,
+        }
+        if retry and attempts < config.PROVIDER_INDEX_JOB_MAX_ATTEMPTS:
+            retry_delay = config.PROVIDER_INDEX_JOB_RETRY_BACKOFF * (2 ** (attempts - 1))
+            attributes['status'] = ProviderIndexJobStatus.QUEUED
+            attributes['next_attempt_at'] = now + datetime.timedelta(seconds=retry_delay)
+        else:
+            attributes['status'] = ProviderIndexJobStatus.FAILED
+        self._update_attributes(**attributes)
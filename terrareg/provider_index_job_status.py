@@ -0,0 +1,11 @@
+
+from enum import Enum
+
+
+class ProviderIndexJobStatus(Enum):
+    """Status of provider release indexing job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
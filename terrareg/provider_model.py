@@ -6,9 +6,11 @@ Module for Provider model.
 
 import os
 import re
-from typing import Optional, Union, List
+import threading
+from typing import Dict, Optional, Tuple, Union, List
 
 import sqlalchemy
+import semantic_version
 
 import terrareg.database
 from terrareg.errors import (
@@ -26,13 +28,26 @@ import terrareg.provider_source
 import terrareg.repository_model
 import terrareg.provider_category_model
 import terrareg.provider_version_model
+import terrareg.search_index
 import terrareg.provider_extractor
 import terrareg.utils
-from terrareg.loose_version import LooseVersion
+from terrareg.version_sort_key import get_version_order_by
+from terrareg.request_identity_map import RequestIdentityMap
 
 
 class Provider:
 
+    # Cached versions API responses, by provider ID, along with
+    # the state of the provider versions used to generate each response
+    _VERSIONS_API_CACHE: Dict[int, Tuple[tuple, dict]] = {}
+    _VERSIONS_API_CACHE_LOCK = threading.Lock()
+
+    @classmethod
+    def invalidate_versions_api_cache(cls, provider_pk: int) -> None:
+        """Remove cached versions API response for provider"""
+        with cls._VERSIONS_API_CACHE_LOCK:
+            cls._VERSIONS_API_CACHE.pop(provider_pk, None)
+
     @classmethod
     def repository_name_to_provider_name(cls, repository_name: str) -> Union[None, str]:
         """Convert repository name to provider name"""
@@ -79,6 +94,7 @@ class Provider:
         )
         with db.get_connection() as conn:
             conn.execute(insert)
+        RequestIdentityMap.invalidate('provider')
 
         obj = cls(namespace=namespace, name=provider_name)
 
@@ -94,6 +110,14 @@ class Provider:
     @classmethod
     def get_by_pk(cls, pk: int) -> Union[None, 'Provider']:
         """Obtain provider by primary key"""
+        if (row := RequestIdentityMap.get('provider', ('pk', pk))) is not None:
+            namespace = terrareg.models.Namespace.get_by_pk(pk=row["namespace_id"])
+            if namespace is None:
+                return None
+            obj = cls(namespace=namespace, name=row["name"])
+            obj._cache_db_row = row
+            return obj
+
         db = terrareg.database.Database.get()
         select = sqlalchemy.select(
             db.provider.c.namespace_id,
@@ -247,6 +271,11 @@ class Provider:
         """Whether the provider should use default provider source auth"""
         return self._get_db_row()["default_provider_source_auth"]
 
+    @property
+    def last_release_poll_error(self) -> Optional[str]:
+        """Return error from last poll of provider source for new releases"""
+        return self._get_db_row()["last_release_poll_error"]
+
     def __init__(self, namespace: 'terrareg.models.Namespace', name: str):
         """Validate name and store member variables."""
         self._namespace = namespace
@@ -256,18 +285,25 @@ class Provider:
     def _get_db_row(self) -> Union[dict, None]:
         """Return database row for module provider."""
         if self._cache_db_row is None:
-            db = terrareg.database.Database.get()
-            select = db.provider.select(
-            ).join(
-                db.namespace,
-                db.provider.c.namespace_id==db.namespace.c.id
-            ).where(
-                db.namespace.c.id == self._namespace.pk,
-                db.provider.c.name == self.name
-            )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            identity_key = ('name', self._namespace.pk, self.name)
+            self._cache_db_row = RequestIdentityMap.get('provider', identity_key)
+
+            if self._cache_db_row is None:
+                db = terrareg.database.Database.get()
+                select = db.provider.select(
+                ).join(
+                    db.namespace,
+                    db.provider.c.namespace_id==db.namespace.c.id
+                ).where(
+                    db.namespace.c.id == self._namespace.pk,
+                    db.provider.c.name == self.name
+                )
+                with db.get_connection() as conn:
+                    res = conn.execute(select)
+                    self._cache_db_row = res.fetchone()
+
+                if self._cache_db_row is not None:
+                    RequestIdentityMap.add('provider', [identity_key, ('pk', self._cache_db_row['id'])], self._cache_db_row)
 
         return self._cache_db_row
 
@@ -280,46 +316,45 @@ class Provider:
     def get_all_versions(self) -> List['terrareg.provider_version_model.ProviderVersion']:
         """Return list of all provider versions"""
         db = terrareg.database.Database.get()
-        select = sqlalchemy.select(
-            db.provider_version.c.version
-        ).where(
+        # Select entire rows, so that the provider version
+        # objects do not need to re-query them
+        select = db.provider_version.select().where(
             db.provider_version.c.provider_id==self.pk
+        ).order_by(
+            *get_version_order_by(db.provider_version)
         )
         with db.get_connection() as conn:
             rows = conn.execute(select).all()
-        return sorted([
-            terrareg.provider_version_model.ProviderVersion(provider=self, version=row["version"])
-            for row in rows
-        ], reverse=True)
+
+        provider_versions = []
+        for row in rows:
+            RequestIdentityMap.add('provider_version', [('version', self.pk, row["version"]), ('pk', row["id"])], row)
+            provider_version = terrareg.provider_version_model.ProviderVersion(provider=self, version=row["version"])
+            provider_version._cache_db_row = row
+            provider_versions.append(provider_version)
+        return provider_versions
 
 
     def calculate_latest_version(self):
-        """Obtain all versions of provider and sort by semantic version numbers to obtain latest version."""
+        """Obtain latest version of provider, using the sortable version columns."""
         db = terrareg.database.Database.get()
         select = sqlalchemy.select(
             db.provider_version.c.version
-        ).join(
-            db.provider,
-            db.provider_version.c.provider_id==db.provider.c.id
+        ).select_from(
+            db.provider_version
         ).where(
-            db.provider.c.id==self.pk,
+            db.provider_version.c.provider_id==self.pk,
             db.provider_version.c.beta==False
-        )
+        ).order_by(
+            *get_version_order_by(db.provider_version)
+        ).limit(1)
         with db.get_connection() as conn:
-            res = conn.execute(select)
-
-            # Convert to list
-            rows = [r for r in res]
-
-        # Sort rows by semantic versioning
-        rows.sort(key=lambda x: LooseVersion(x['version']), reverse=True)
+            row = conn.execute(select).first()
 
-        # Ensure at least one row
-        if not rows:
+        if row is None:
             return None
 
-        # Obtain latest row
-        return terrareg.provider_version_model.ProviderVersion(provider=self, version=rows[0]['version'])
+        return terrareg.provider_version_model.ProviderVersion(provider=self, version=row['version'])
 
     def index_version(self, version: str) -> 'terrareg.provider_version_model.ProviderVersion':
         """Index single version of a provider and create new provider version"""
@@ -426,20 +461,101 @@ class Provider:
         with db.get_connection() as conn:
             conn.execute(update)
 
+        terrareg.search_index.ProviderSearchIndex.invalidate(self.pk)
+
         # Remove cached DB row
         self._cache_db_row = None
+        RequestIdentityMap.invalidate('provider')
+
+    def _get_versions_api_cache_validator(self) -> tuple:
+        """
+        Return summary of provider versions and binaries, used to determine
+        if a cached versions API response is still valid.
+
+        This detects versions indexed by other processes, which
+        do not invalidate the cache of this process.
+        """
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            sqlalchemy.func.count(sqlalchemy.distinct(db.provider_version.c.id)).label('version_count'),
+            sqlalchemy.func.max(db.provider_version.c.id).label('max_version_id'),
+            sqlalchemy.func.count(db.provider_version_binary.c.id).label('binary_count'),
+            sqlalchemy.func.max(db.provider_version_binary.c.id).label('max_binary_id')
+        ).select_from(
+            db.provider_version
+        ).outerjoin(
+            db.provider_version_binary,
+            db.provider_version_binary.c.provider_version_id==db.provider_version.c.id
+        ).where(
+            db.provider_version.c.provider_id==self.pk
+        )
+        with db.get_connection() as conn:
+            row = conn.execute(select).first()
+        return tuple(row)
+
+    def _generate_versions_api_details(self) -> dict:
+        """Generate API details for versions endpoint, obtaining all versions and binaries in a single query"""
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            db.provider_version.c.version,
+            db.provider_version.c.protocol_versions,
+            db.provider_version_binary.c.operating_system,
+            db.provider_version_binary.c.architecture
+        ).select_from(
+            db.provider_version
+        ).outerjoin(
+            db.provider_version_binary,
+            db.provider_version_binary.c.provider_version_id==db.provider_version.c.id
+        ).where(
+            db.provider_version.c.provider_id==self.pk
+        ).order_by(
+            db.provider_version.c.id,
+            db.provider_version_binary.c.id
+        )
+        with db.get_connection() as conn:
+            rows = conn.execute(select).all()
+
+        versions: Dict[str, dict] = {}
+        for row in rows:
+            if row["version"] not in versions:
+                versions[row["version"]] = {
+                    "version": row["version"],
+                    "protocols": terrareg.provider_version_model.ProviderVersion.decode_protocol_versions(row["protocol_versions"]),
+                    "platforms": []
+                }
+            if row["operating_system"] is not None:
+                versions[row["version"]]["platforms"].append({
+                    "os": row["operating_system"].value,
+                    "arch": row["architecture"].value
+                })
 
-    def get_versions_api_details(self) -> dict:
-        """Return API details for versions endpoint"""
         return {
             "id": self.id,
             "versions": [
-                version.get_api_binaries_outline()
-                for version in self.get_all_versions()
+                versions[version]
+                for version in sorted(versions, key=semantic_version.Version, reverse=True)
             ],
             "warnings": None
         }
 
+    def get_versions_api_details(self) -> dict:
+        """
+        Return API details for versions endpoint.
+
+        Responses are cached in-process, until versions of the provider are modified.
+        The returned dict is shared between requests and must not be modified.
+        """
+        validator = self._get_versions_api_cache_validator()
+        with self._VERSIONS_API_CACHE_LOCK:
+            cache_entry = self._VERSIONS_API_CACHE.get(self.pk)
+        if cache_entry is not None and cache_entry[0] == validator:
+            return cache_entry[1]
+
+        api_details = self._generate_versions_api_details()
+        with self._VERSIONS_API_CACHE_LOCK:
+            self._VERSIONS_API_CACHE[self.pk] = (validator, api_details)
+        return api_details
+
     def get_integrations(self):
         """Return integration URL and details"""
         integrations = {
@@ -0,0 +1,265 @@
+"""Background polling of provider sources for new releases and indexing of queued releases."""
+
+import datetime
+import os
+import socket
+import threading
+import traceback
+from typing import List, Optional, Tuple
+
+import flask
+import sqlalchemy
+
+import terrareg.config
+import terrareg.database
+import terrareg.errors
+import terrareg.provider_model
+from terrareg.provider_index_job_model import ProviderIndexJob
+from terrareg.request_identity_map import RequestIdentityMap
+
+
+class ProviderReleasePoller:
+    """Poll provider repositories for new releases, queueing an index job for each new release."""
+
+    # Maximum number of providers claimed by each poll
+    BATCH_SIZE = 10
+
+    def __init__(self, app: flask.Flask, stop_event: threading.Event, poll_interval: Optional[int]=None):
+        """Store member variables"""
+        self._app = app
+        self._stop_event = stop_event
+        self._poll_interval = (
+            terrareg.config.Config().PROVIDER_RELEASE_POLL_INTERVAL
+            if poll_interval is None else
+            poll_interval
+        )
+
+    def run(self):
+        """Poll providers until stopped"""
+        # Check for due providers more frequently than the poll interval,
+        # so that providers are polled evenly rather than in bursts
+        check_interval = max(min(self._poll_interval // 10, 60), 1)
+        while not self._stop_event.is_set():
+            try:
+                polled_providers = self.poll_due_providers()
+            except Exception:
+                print(f'Provider release poller failed: {traceback.format_exc()}')
+                polled_providers = 0
+
+            if not polled_providers:
+                self._stop_event.wait(check_interval)
+
+    def _claim_due_providers(self) -> List[int]:
+        """
+        Claim providers that are due to be polled, returning their IDs.
+
+        Providers are claimed by updating the last poll time using a conditional update,
+        so that multiple pollers do not poll the same provider.
+        """
+        db = terrareg.database.Database.get()
+        now = datetime.datetime.now()
+        due_before = now - datetime.timedelta(seconds=self._poll_interval)
+        select = sqlalchemy.select(
+            db.provider.c.id,
+            db.provider.c.last_release_poll_at
+        ).select_from(
+            db.provider
+        ).where(
+            db.provider.c.repository_id!=None,
+            sqlalchemy.or_(
+                db.provider.c.last_release_poll_at==None,
+                db.provider.c.last_release_poll_at < due_before
+            )
+        ).order_by(
+            # Poll providers that have never been polled first
+            db.provider.c.last_release_poll_at.isnot(None),
+            db.provider.c.last_release_poll_at
+        ).limit(self.BATCH_SIZE)
+
+        claimed_provider_ids = []
+        with db.get_connection() as conn:
+            for row in conn.execute(select).all():
+                if row['last_release_poll_at'] is None:
+                    last_poll_condition = db.provider.c.last_release_poll_at==None
+                else:
+                    last_poll_condition = db.provider.c.last_release_poll_at==row['last_release_poll_at']
+
+                update = sqlalchemy.update(db.provider).where(
+                    db.provider.c.id==row['id'],
+                    last_poll_condition
+                ).values(
+                    last_release_poll_at=now
+                )
+                if conn.execute(update).rowcount == 1:
+                    claimed_provider_ids.append(row['id'])
+
+        RequestIdentityMap.invalidate('provider')
+        return claimed_provider_ids
+
+    def poll_due_providers(self) -> int:
+        """Poll all providers that are due, returning the number of providers polled"""
+        with self._app.test_request_context():
+            provider_ids = self._claim_due_providers()
+
+        for provider_id in provider_ids:
+            if self._stop_event.is_set():
+                break
+
+            # Poll each provider in its own request context, so that
+            # cached provider source and authentication state is not retained
+            with self._app.test_request_context():
+                provider = terrareg.provider_model.Provider.get_by_pk(provider_id)
+                if provider is None:
+                    continue
+                self.poll_provider(provider)
+
+        return len(provider_ids)
+
+    def poll_provider(self, provider: 'terrareg.provider_model.Provider') -> List[ProviderIndexJob]:
+        """Obtain new releases for provider and queue index jobs for each of them"""
+        try:
+            releases_metadata = provider.repository.get_new_releases(provider=provider)
+        except Exception as exc:
+            print(f'Failed to poll releases for provider {provider.full_name}: {str(exc)}')
+            provider.update_attributes(last_release_poll_error=str(exc)[:1024])
+            return []
+
+        jobs = [
+            ProviderIndexJob.create(provider=provider, version=release_metadata.version)
+            for release_metadata in releases_metadata
+        ]
+        # Avoid updating provider when there was no previous error
+        if provider.last_release_poll_error is not None:
+            provider.update_attributes(last_release_poll_error=None)
+        return jobs
+
+    @classmethod
+    def get_statistics(cls) -> Tuple[Optional[datetime.datetime], Optional[datetime.datetime]]:
+        """
+        Return time of most recent poll and the last poll time of the provider
+        that has gone longest without being polled.
+        """
+        db = terrareg.database.Database.get()
+        select = sqlalchemy.select(
+            sqlalchemy.func.max(db.provider.c.last_release_poll_at).label('latest_poll_at'),
+            sqlalchemy.func.min(db.provider.c.last_release_poll_at).label('oldest_poll_at')
+        ).select_from(
+            db.provider
+        ).where(
+            db.provider.c.repository_id!=None
+        )
+        with db.get_connection() as conn:
+            row = conn.execute(select).first()
+        return row['latest_poll_at'], row['oldest_poll_at']
+
+
+class ProviderIndexWorker:
+    """Process queued provider index jobs."""
+
+    # Interval, in seconds, between checking for jobs when none are available
+    JOB_POLL_INTERVAL = 5
+
+    def __init__(self, worker_id: str, app: flask.Flask, stop_event: threading.Event):
+        """Store member variables"""
+        self._worker_id = worker_id
+        self._app = app
+        self._stop_event = stop_event
+
+    def run(self):
+        """Process jobs until stopped, waiting for the poll interval when no jobs are available."""
+        while not self._stop_event.is_set():
+            try:
+                processed_job = self.process_next_job()
+            except Exception:
+                print(f'Provider index worker {self._worker_id} failed to process job: {traceback.format_exc()}')
+                processed_job = False
+
+            if not processed_job:
+                self._stop_event.wait(self.JOB_POLL_INTERVAL)
+
+    def process_next_job(self) -> bool:
+        """Claim and process the next available job, returning whether a job was processed."""
+        with self._app.test_request_context():
+            job = ProviderIndexJob.claim_next(worker_id=self._worker_id)
+            if job is None:
+                return False
+
+            self.process_job(job)
+            return True
+
+    def process_job(self, job: ProviderIndexJob):
+        """Index provider version for job."""
+        provider = job.provider
+        if provider is None:
+            job.mark_failed('Provider no longer exists', retry=False)
+            return
+
+        try:
+            provider.index_version(version=job.version)
+
+        except terrareg.errors.ProviderVersionAlreadyIndexedError:
+            # Version may have been indexed through the API since the job was queued
+            job.mark_succeeded()
+        except terrareg.errors.MissingSignureArtifactError as exc:
+            # Release artifacts will not change, so do not retry
+            job.mark_failed(str(exc), retry=False)
+        except terrareg.errors.TerraregError as exc:
+            job.mark_failed(str(exc))
+        except Exception as exc:
+            job.mark_failed(f'Unexpected error during indexing: {str(exc)}')
+            if terrareg.config.Config().DEBUG:
+                print(traceback.format_exc())
+        else:
+            job.mark_succeeded()
+
+
+class ProviderReleaseScheduler:
+    """Run provider release poller and pool of provider index workers."""
+
+    def __init__(self, worker_count: Optional[int]=None):
+        """Store member variables"""
+        self._worker_count = (
+            terrareg.config.Config().PROVIDER_INDEX_WORKER_COUNT
+            if worker_count is None else
+            worker_count
+        )
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        # Application used to provide request contexts for polling and jobs
+        self._app = flask.Flask(__name__)
+        terrareg.database.Database.register_app(self._app)
+
+    def _get_worker_id(self, index: int) -> str:
+        """Return unique ID for worker"""
+        return f'{socket.gethostname()}-{os.getpid()}-provider-{index}'
+
+    def _start_thread(self, target, name: str):
+        """Start daemon thread"""
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def start(self):
+        """Start poller and worker threads"""
+        poller = ProviderReleasePoller(app=self._app, stop_event=self._stop_event)
+        self._start_thread(target=poller.run, name='provider-release-poller')
+
+        for index in range(self._worker_count):
+            worker = ProviderIndexWorker(
+                worker_id=self._get_worker_id(index),
+                app=self._app,
+                stop_event=self._stop_event
+            )
+            self._start_thread(target=worker.run, name=f'provider-index-worker-{index}')
+
+    def stop(self, timeout: Optional[float]=None):
+        """Signal threads to stop and wait for in-progress jobs to complete"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def join(self):
+        """Wait for threads to exit"""
+        for thread in self._threads:
+            thread.join()
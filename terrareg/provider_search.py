@@ -2,13 +2,14 @@
 import datetime
 
 import sqlalchemy
-from terrareg.config import Config
+from terrareg.config import Config, SearchIndexType
 
 from terrareg.database import Database
 import terrareg.models
 from terrareg.filters import NamespaceTrustFilter
 import terrareg.result_data
 import terrareg.provider_model
+import terrareg.search_index
 
 
 class ProviderSearch:
@@ -91,6 +92,24 @@ class ProviderSearch:
         limit = 1 if limit < 1 else limit
         offset = 0 if offset < 0 else offset
 
+        if Config().SEARCH_INDEX is SearchIndexType.INVERTED_INDEX:
+            results = cls._get_index_results(
+                query=query, namespaces=namespaces, providers=providers,
+                categories=categories, namespace_trust_filters=namespace_trust_filters
+            )
+            return terrareg.result_data.ResultData(
+                offset=offset,
+                limit=limit,
+                rows=[
+                    terrareg.provider_model.Provider(
+                        namespace=terrareg.models.Namespace(name=attributes['namespace']),
+                        name=attributes['name']
+                    )
+                    for _, _, attributes in results[offset:offset + limit]
+                ],
+                count=len(results)
+            )
+
         db = Database.get()
 
         select = cls._get_search_query_filter(query)
@@ -149,64 +168,83 @@ class ProviderSearch:
         )
 
 
+    @classmethod
+    def _get_index_results(
+        cls,
+        query: str=None,
+        namespaces: list=None,
+        providers: list=None,
+        categories: list=None,
+        namespace_trust_filters: list=NamespaceTrustFilter.UNSPECIFIED):
+        """Return ID, score and attributes of providers matching search from search index, ordered by relevance."""
+        trusted_namespaces = Config().TRUSTED_NAMESPACES
+
+        results = []
+        for result in terrareg.search_index.ProviderSearchIndex.get().search(query):
+            attributes = result[2]
+            if providers and attributes['name'] not in providers:
+                continue
+            if namespaces and attributes['namespace'] not in namespaces:
+                continue
+            if categories and attributes['provider_category_slug'] not in categories:
+                continue
+            if namespace_trust_filters is not NamespaceTrustFilter.UNSPECIFIED:
+                trusted = attributes['namespace'] in trusted_namespaces
+                if not ((NamespaceTrustFilter.TRUSTED_NAMESPACES in namespace_trust_filters and trusted) or
+                        (NamespaceTrustFilter.CONTRIBUTED in namespace_trust_filters and not trusted)):
+                    continue
+            results.append(result)
+
+        # Order by relevance, then by name
+        results.sort(key=lambda result: result[2]['name'], reverse=True)
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results
+
     @classmethod
     def get_search_filters(cls, query):
         """Get list of search filters and filter counts."""
+        if Config().SEARCH_INDEX is SearchIndexType.INVERTED_INDEX:
+            return cls._get_search_filter_counts(
+                (attributes['namespace'], attributes['provider_category_slug'])
+                for _, _, attributes in cls._get_index_results(query=query)
+            )
+
         db = Database.get()
         main_select = cls._get_search_query_filter(query)
 
+        # Obtain the attributes used for filters for all matching providers
+        # in a single query, calculating each of the filter counts from the results
+        filter_subquery = main_select.group_by(
+            db.namespace.c.namespace,
+            db.provider.c.name
+        ).subquery()
         with db.get_connection() as conn:
-            trusted_count = conn.execute(
-                sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count')]
-                ).select_from(
-                    main_select.where(
-                        db.namespace.c.namespace.in_(tuple(Config().TRUSTED_NAMESPACES))
-                    ).subquery()
-                )
-            ).fetchone()['count']
-
-            contributed_count = conn.execute(
+            res = conn.execute(
                 sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count')]
-                ).select_from(
-                    main_select.where(
-                        ~db.namespace.c.namespace.in_(tuple(Config().TRUSTED_NAMESPACES))
-                    ).subquery()
-                )
-            ).fetchone()['count']
-
-            main_select_subquery = main_select.subquery()
-            category_res = conn.execute(
-                sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count'), main_select_subquery.c.provider_category_slug]
-                ).select_from(
-                    main_select_subquery
-                ).group_by(main_select_subquery.c.provider_category_slug)
+                    filter_subquery.c.namespace,
+                    filter_subquery.c.provider_category_slug
+                ).select_from(filter_subquery)
             )
-
-            namespace_subquery = main_select.group_by(
-                db.namespace.c.namespace,
-                db.provider.c.name
-            ).subquery()
-            namespace_res = conn.execute(
-                sqlalchemy.select(
-                    [sqlalchemy.func.count().label('count'), namespace_subquery.c.namespace]
-                ).select_from(
-                    namespace_subquery
-                ).group_by(namespace_subquery.c.namespace)
+            return cls._get_search_filter_counts(
+                (r['namespace'], r['provider_category_slug'])
+                for r in res
             )
 
-            return {
-                'trusted_namespaces': trusted_count,
-                'contributed': contributed_count,
-                'provider_categories': {
-                    r['provider_category_slug']: r['count']
-                    for r in category_res
-                },
-                'namespaces': {
-                    r['namespace']: r['count']
-                    for r in namespace_res
-                }
-            }
-
+    @staticmethod
+    def _get_search_filter_counts(results):
+        """Calculate filter counts from namespace and provider category of each search result."""
+        trusted_namespaces = Config().TRUSTED_NAMESPACES
+        filters = {
+            'trusted_namespaces': 0,
+            'contributed': 0,
+            'provider_categories': {},
+            'namespaces': {}
+        }
+        for namespace, provider_category_slug in results:
+            if namespace in trusted_namespaces:
+                filters['trusted_namespaces'] += 1
+            else:
+                filters['contributed'] += 1
+            filters['provider_categories'][provider_category_slug] = filters['provider_categories'].get(provider_category_slug, 0) + 1
+            filters['namespaces'][namespace] = filters['namespaces'].get(namespace, 0) + 1
+        return filters
@@ -1,5 +1,5 @@
 
-from typing import Dict, Union, List, Tuple, Optional
+from typing import BinaryIO, Callable, Dict, Union, List, Tuple, Optional
 import json
 
 import terrareg.database
@@ -8,6 +8,7 @@ import terrareg.repository_model
 import terrareg.provider_model
 import terrareg.provider_version_model
 import terrareg.models
+import terrareg.provider_source.http_client
 
 
 class BaseProviderSource:
@@ -34,6 +35,11 @@ class BaseProviderSource:
         """Return login button text"""
         raise NotImplementedError
 
+    @property
+    def _http_client(self) -> 'terrareg.provider_source.http_client.ProviderSourceHttpClient':
+        """Return HTTP client for communicating with provider source"""
+        return terrareg.provider_source.http_client.ProviderSourceHttpClient.get_instance()
+
     @property
     def _config(self) -> Dict[str, Union[str, bool]]:
         """Return config for provider source"""
@@ -88,6 +94,29 @@ class BaseProviderSource:
         """Return release artifact file content"""
         raise NotImplementedError
 
+    def get_release_artifact_downloader(self,
+                                        provider: 'terrareg.provider_model.Provider',
+                                        release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata'
+                                        ) -> Callable[['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata', BinaryIO], bool]:
+        """
+        Return function that writes release artifact file content to a file handle,
+        returning whether the artifact was obtained.
+
+        Any details required from the database are obtained before returning the function,
+        so that the function can be called from other threads.
+        """
+        def download(artifact_metadata: 'terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata', target_file: BinaryIO) -> bool:
+            content = self.get_release_artifact(
+                provider=provider,
+                artifact_metadata=artifact_metadata,
+                release_metadata=release_metadata
+            )
+            if not content:
+                return False
+            target_file.write(content)
+            return True
+        return download
+
     def get_release_archive(self,
                             provider: 'terrareg.provider_model.Provider',
                             release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata') -> Tuple[Union[bytes, None], Union[None, str]]:
@@ -1,15 +1,15 @@
 
+import datetime
 import os
+import threading
 import time
-from typing import Dict, Union, List, Tuple, Optional
+from typing import BinaryIO, Callable, Dict, Union, List, Tuple, Optional
 from urllib.parse import parse_qs
 
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 import jwt
 
-import requests
-
 from terrareg.errors import GithubEntityDoesNotExistError, InvalidGithubAppMetadataError, InvalidProviderSourceConfigError, ProviderSourceDefaultAccessTokenNotConfiguredError, UnableToGenerateGithubInstallationAccessTokenError
 from .base import BaseProviderSource
 import terrareg.provider_source_type
@@ -25,9 +25,20 @@ class GithubProviderSource(BaseProviderSource):
 
     TYPE = terrareg.provider_source_type.ProviderSourceType.GITHUB
 
-    # TEMPORARY CACHE FOR INSTALLATION ACCESS TOKENS
-    # @TODO REMOVE
-    INSTALLATION_ID_TOKENS = {}
+    # Cache of installation access tokens, by installation ID,
+    # containing the token and the time that it expires
+    INSTALLATION_ID_TOKENS: Dict[str, Tuple[str, float]] = {}
+    INSTALLATION_ID_TOKENS_LOCK = threading.Lock()
+
+    # Minimum remaining duration, in seconds, of cached installation
+    # access tokens before a new token is generated
+    INSTALLATION_TOKEN_EXPIRY_MARGIN = 5 * 60
+    # Default duration, in seconds, of installation access tokens,
+    # used if the expiry is not returned
+    INSTALLATION_TOKEN_DEFAULT_DURATION = 60 * 60
+
+    # Size of chunks, in bytes, when streaming release artifacts
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
     @classmethod
     def generate_db_config_from_source_config(cls, config: Dict[str, str]) -> Dict[str, Union[str, bool]]:
@@ -129,7 +140,7 @@ class GithubProviderSource(BaseProviderSource):
         if not code:
             return None
 
-        res = requests.post(
+        res = self._http_client.post(
             f"{self._base_url}/login/oauth/access_token",
             data={
                 "client_id": self._client_id,
@@ -147,7 +158,7 @@ class GithubProviderSource(BaseProviderSource):
         if not access_token:
             return None
 
-        res = requests.get(
+        res = self._http_client.get(
             f"{self._api_url}/user",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -163,7 +174,7 @@ class GithubProviderSource(BaseProviderSource):
         if not access_token:
             return []
 
-        res = requests.get(
+        res = self._http_client.get(
             f"{self._api_url}/user/memberships/orgs",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -210,7 +221,7 @@ class GithubProviderSource(BaseProviderSource):
         """Refresh list of repositories"""
         page = 1
         while True:
-            res = requests.get(
+            res = self._http_client.get(
                 f"{self._api_url}/user/repos",
                 params={
                     "visibility": "public",
@@ -245,7 +256,7 @@ class GithubProviderSource(BaseProviderSource):
                              tag_name: str,
                              access_token: str):
         """Return commit hash for tag name"""
-        res = requests.get(
+        res = self._http_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/git/ref/tags/{tag_name}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -324,7 +335,7 @@ class GithubProviderSource(BaseProviderSource):
 
         # Obtain release ID
         repository = provider.repository
-        release_res = requests.get(
+        release_res = self._http_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases/tags/{tag}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -365,7 +376,7 @@ class GithubProviderSource(BaseProviderSource):
         access_token = self._get_access_token_for_provider(provider=provider)
 
         while obtain_results:
-            res = requests.get(
+            res = self._http_client.get(
                 f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases",
                 params={
                     "per_page": "100",
@@ -408,7 +419,7 @@ class GithubProviderSource(BaseProviderSource):
     def _get_release_artifacts_metadata(self, repository: 'terrareg.repository_model.Repository',
                                         release_id: int, access_token: str) -> List['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata']:
         """Obtain list of release artifact metadata for a given release"""
-        res = requests.get(
+        res = self._http_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases/{release_id}/assets",
             params={
                 "per_page": "100",
@@ -445,7 +456,7 @@ class GithubProviderSource(BaseProviderSource):
         if not access_token:
             return None
 
-        res = requests.get(
+        res = self._http_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/releases/assets/{artifact_metadata.provider_id}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -459,6 +470,38 @@ class GithubProviderSource(BaseProviderSource):
             return None
         return res.content
 
+    def get_release_artifact_downloader(self,
+                                        provider: 'terrareg.provider_model.Provider',
+                                        release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata'
+                                        ) -> Callable[['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata', BinaryIO], bool]:
+        """Return function that streams release artifact file content to a file handle"""
+        repository = provider.repository
+        repository_url = f"{self._api_url}/repos/{repository.owner}/{repository.name}"
+        access_token = self._get_access_token_for_provider(provider=provider)
+
+        def download(artifact_metadata: 'terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata', target_file: BinaryIO) -> bool:
+            if not access_token:
+                return False
+
+            with self._http_client.get(
+                    f"{repository_url}/releases/assets/{artifact_metadata.provider_id}",
+                    headers={
+                        "X-GitHub-Api-Version": "2022-11-28",
+                        "Accept": "application/octet-stream",
+                        "Authorization": f"Bearer {access_token}"
+                    },
+                    allow_redirects=True,
+                    stream=True) as res:
+                if res.status_code == 404:
+                    print("get_release_artifact_downloader returned 404")
+                    return False
+                res.raise_for_status()
+
+                for chunk in res.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                    target_file.write(chunk)
+            return True
+        return download
+
     def get_release_archive(self,
                             provider: 'terrareg.provider_model.Provider',
                             release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata') -> Tuple[Union[bytes, None], Union[None, str]]:
@@ -471,7 +514,7 @@ class GithubProviderSource(BaseProviderSource):
         if not access_token:
             return None, archive_id
 
-        res = requests.get(
+        res = self._http_client.get(
             f"{self._api_url}/repos/{repository.owner}/{repository.name}/tarball/{release_metadata.tag}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -502,24 +545,44 @@ class GithubProviderSource(BaseProviderSource):
         if installation_id is None:
             return None
 
-        if installation_id not in self.__class__.INSTALLATION_ID_TOKENS:
+        with self.__class__.INSTALLATION_ID_TOKENS_LOCK:
+            token, expires_at = self.__class__.INSTALLATION_ID_TOKENS.get(installation_id, (None, 0))
+        if token and expires_at - time.time() > self.INSTALLATION_TOKEN_EXPIRY_MARGIN:
+            return token
 
-            res = requests.post(
-                f"{self._api_url}/app/installations/{installation_id}/access_tokens",
-                headers={
-                    "X-GitHub-Api-Version": "2022-11-28",
-                    "Accept": "application/vnd.github+json",
-                    "Authorization": f"Bearer {self._generate_jwt()}"
-                }
+        res = self._http_client.post(
+            f"{self._api_url}/app/installations/{installation_id}/access_tokens",
+            headers={
+                "X-GitHub-Api-Version": "2022-11-28",
+                "Accept": "application/vnd.github+json",
+                "Authorization": f"Bearer {self._generate_jwt()}"
+            }
+        )
+        if res.status_code != 201:
+            print(f"UnableToGenerateGithubInstallationAccessTokenError: {res.status_code}, {res.status_code}")
+            raise UnableToGenerateGithubInstallationAccessTokenError(
+                "Unable to authenticate to Github using app installation"
             )
-            if res.status_code != 201:
-                print(f"UnableToGenerateGithubInstallationAccessTokenError: {res.status_code}, {res.status_code}")
-                raise UnableToGenerateGithubInstallationAccessTokenError(
-                    "Unable to authenticate to Github using app installation"
+        response_data = res.json()
+        token = response_data.get("token")
+        if token:
+            with self.__class__.INSTALLATION_ID_TOKENS_LOCK:
+                self.__class__.INSTALLATION_ID_TOKENS[installation_id] = (
+                    token,
+                    self._get_installation_token_expiry(response_data.get("expires_at"))
                 )
-            self.__class__.INSTALLATION_ID_TOKENS[installation_id] = res.json().get("token")
 
-        return self.__class__.INSTALLATION_ID_TOKENS[installation_id]
+        return token
+
+    @classmethod
+    def _get_installation_token_expiry(cls, expires_at: Optional[str]) -> float:
+        """Convert installation token expiry timestamp to epoch time"""
+        if isinstance(expires_at, str):
+            try:
+                return datetime.datetime.fromisoformat(expires_at.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                pass
+        return time.time() + cls.INSTALLATION_TOKEN_DEFAULT_DURATION
 
     def _generate_jwt(self):
         """Generate app installation JWT"""
@@ -543,7 +606,7 @@ class GithubProviderSource(BaseProviderSource):
 
     def _get_app_metadata(self) -> dict:
         """Return app metadata"""
-        res = requests.get(
+        res = self._http_client.get(
             f"{self._api_url}/app",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -572,7 +635,7 @@ class GithubProviderSource(BaseProviderSource):
             # Otherwise is namespace is not based on a github user/org, return None
             return None
 
-        res = requests.get(
+        res = self._http_client.get(
             url,
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -591,7 +654,7 @@ class GithubProviderSource(BaseProviderSource):
 
     def _is_entity_org_or_user(self, identity: str, access_token: str):
         """Determine if an entity is a user or organisation"""
-        res = requests.get(
+        res = self._http_client.get(
             f"{self._api_url}/users/{identity}",
             headers={
                 "X-GitHub-Api-Version": "2022-11-28",
@@ -625,7 +688,7 @@ class GithubProviderSource(BaseProviderSource):
 
         page = 1
         while True:
-            res = requests.get(
+            res = self._http_client.get(
                 url,
                 params={
                     "sort": "created",
@@ -0,0 +1,257 @@
+"""HTTP client shared by provider sources."""
+
+import hashlib
+from http.cookiejar import DefaultCookiePolicy
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+import requests.adapters
+import requests.structures
+
+import terrareg.config
+
+
+class ProviderSourceHttpClient:
+    """
+    HTTP client for communicating with provider source APIs.
+
+    Connections are pooled and kept alive between requests.
+    Responses to GET requests that provide an ETag or Last-Modified header are cached on disk
+    (see `PROVIDER_SOURCE_HTTP_CACHE_DIRECTORY`), and subsequent requests are made conditionally,
+    returning the cached response when the API returns 304 (Not Modified).
+    Requests are delayed when the API rate limit has been exhausted.
+    """
+
+    _INSTANCE = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    # Response headers retained in cached responses
+    CACHED_HEADERS = ["Content-Type", "ETag", "Last-Modified", "Link"]
+
+    # Duration, in seconds, that unused cache entries are retained
+    CACHE_ENTRY_MAX_AGE = 24 * 60 * 60
+    # Minimum interval, in seconds, between removing expired cache entries
+    CACHE_PRUNE_INTERVAL = 60 * 60
+
+    @classmethod
+    def get_instance(cls) -> 'ProviderSourceHttpClient':
+        """Return client instance for process"""
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is None:
+                cls._INSTANCE = cls()
+            return cls._INSTANCE
+
+    def __init__(self, cache_directory: Optional[str]=None, pool_size: Optional[int]=None, rate_limit_max_wait: Optional[int]=None):
+        """Create session and store member variables"""
+        config = terrareg.config.Config()
+        self._cache_directory = config.PROVIDER_SOURCE_HTTP_CACHE_DIRECTORY if cache_directory is None else cache_directory
+        pool_size = config.PROVIDER_SOURCE_HTTP_POOL_SIZE if pool_size is None else pool_size
+        self._rate_limit_max_wait = config.PROVIDER_SOURCE_RATE_LIMIT_MAX_WAIT if rate_limit_max_wait is None else rate_limit_max_wait
+
+        self._session = requests.Session()
+        # Do not retain cookies between requests, as requests
+        # are made on behalf of different users
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._rate_limit_lock = threading.Lock()
+        # Remaining requests and reset time of rate limit, by host and credentials
+        self._rate_limits: Dict[str, Tuple[int, float]] = {}
+        self._last_cache_prune = 0
+
+    def get(self, url: str, params: Optional[dict]=None, headers: Optional[dict]=None, **kwargs) -> requests.Response:
+        """Perform GET request"""
+        return self._request("GET", url, params=params, headers=headers, **kwargs)
+
+    def post(self, url: str, data: Optional[dict]=None, headers: Optional[dict]=None, **kwargs) -> requests.Response:
+        """Perform POST request"""
+        return self._request("POST", url, data=data, headers=headers, **kwargs)
+
+    @staticmethod
+    def _get_rate_limit_key(url: str, headers: dict) -> str:
+        """Return key for rate limit, based on host and credentials used for request"""
+        host = urlparse(url).netloc
+        authorization = headers.get("Authorization") or ""
+        return f"{host}:{hashlib.sha256(authorization.encode('utf-8')).hexdigest()}"
+
+    def _wait_for_rate_limit(self, rate_limit_key: str) -> None:
+        """Wait until rate limit resets, if it has been exhausted"""
+        with self._rate_limit_lock:
+            remaining, reset_time = self._rate_limits.get(rate_limit_key, (None, None))
+            if remaining is None or remaining > 0:
+                return
+            # Remove rate limit, as this will be updated by the next response
+            del self._rate_limits[rate_limit_key]
+
+        wait = reset_time - time.time() + 1
+        if 0 < wait <= self._rate_limit_max_wait:
+            print(f"Provider source API rate limit exhausted, waiting {int(wait)} seconds")
+            time.sleep(wait)
+
+    def _update_rate_limit(self, rate_limit_key: str, response: requests.Response) -> None:
+        """Store rate limit from response headers"""
+        try:
+            remaining = int(response.headers["X-RateLimit-Remaining"])
+            reset_time = float(response.headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return
+
+        with self._rate_limit_lock:
+            self._rate_limits[rate_limit_key] = (remaining, reset_time)
+
+    def _get_retry_wait(self, response: requests.Response) -> Optional[float]:
+        """Return duration to wait before retrying a rate limited request, or None if it should not be retried"""
+        if response.status_code not in (403, 429):
+            return None
+
+        wait = None
+        if (retry_after := response.headers.get("Retry-After")) and retry_after.isdigit():
+            wait = int(retry_after)
+        elif response.headers.get("X-RateLimit-Remaining") == "0" and (reset_time := response.headers.get("X-RateLimit-Reset")):
+            try:
+                wait = float(reset_time) - time.time() + 1
+            except ValueError:
+                return None
+
+        if wait is None or wait > self._rate_limit_max_wait:
+            return None
+        return max(wait, 0)
+
+    def _get_cache_path(self, url: str, params: Optional[dict], headers: dict) -> str:
+        """Return path of cache file for request"""
+        # Credentials are included in the key, to avoid responses
+        # being returned for requests with different access
+        key = hashlib.sha256(json.dumps([
+            url,
+            sorted((params or {}).items()),
+            headers.get("Accept"),
+            headers.get("Authorization"),
+        ]).encode('utf-8')).hexdigest()
+        return os.path.join(self._cache_directory, key[:2], f"{key}.json")
+
+    @staticmethod
+    def _read_cache_entry(cache_path: str) -> Optional[dict]:
+        """Read cache entry from disk"""
+        try:
+            with open(cache_path, "r") as cache_fh:
+                return json.load(cache_fh)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache_entry(self, cache_path: str, response: requests.Response) -> None:
+        """Write response to cache, if it can be used for conditional requests"""
+        if not (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            return
+
+        # Only cache API responses, rather than downloaded files
+        if "json" not in response.headers.get("Content-Type", ""):
+            return
+
+        try:
+            content = response.content.decode('utf-8')
+        except UnicodeDecodeError:
+            return
+
+        cache_entry = {
+            "url": response.url,
+            "headers": {
+                header: response.headers[header]
+                for header in self.CACHED_HEADERS
+                if header in response.headers
+            },
+            "content": content,
+        }
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write to temporary file and replace, to avoid partially written entries being read
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(cache_path), delete=False) as cache_fh:
+                json.dump(cache_entry, cache_fh)
+            os.replace(cache_fh.name, cache_path)
+        except OSError as exc:
+            print(f"Unable to write provider source HTTP cache entry: {exc}")
+
+        self._prune_cache()
+
+    def _prune_cache(self) -> None:
+        """Remove cache entries that have not been used recently"""
+        now = time.time()
+        if now - self._last_cache_prune < self.CACHE_PRUNE_INTERVAL:
+            return
+        self._last_cache_prune = now
+
+        for root, _, files in os.walk(self._cache_directory):
+            for file_name in files:
+                file_path = os.path.join(root, file_name)
+                try:
+                    if now - os.path.getmtime(file_path) > self.CACHE_ENTRY_MAX_AGE:
+                        os.unlink(file_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _generate_cached_response(cache_entry: dict, response: requests.Response) -> requests.Response:
+        """Generate response from cache entry, for a 304 response"""
+        cached_response = requests.Response()
+        cached_response.status_code = 200
+        cached_response._content = cache_entry["content"].encode('utf-8')
+        cached_response.encoding = 'utf-8'
+        cached_response.url = cache_entry["url"]
+        cached_response.request = response.request
+        cached_response.headers = requests.structures.CaseInsensitiveDict(cache_entry["headers"])
+        # Use headers from new response, such as rate limit headers
+        cached_response.headers.update({
+            header: value
+            for header, value in response.headers.items()
+            if header.lower() not in ("content-length", "content-encoding", "transfer-encoding", "content-type")
+        })
+        return cached_response
+
+    def _request(self, method: str, url: str, headers: Optional[dict]=None, stream: bool=False, **kwargs) -> requests.Response:
+        """Perform request"""
+        headers = dict(headers or {})
+        rate_limit_key = self._get_rate_limit_key(url=url, headers=headers)
+
+        cache_path = None
+        cache_entry = None
+        if method == "GET" and not stream and self._cache_directory:
+            cache_path = self._get_cache_path(url=url, params=kwargs.get("params"), headers=headers)
+            if cache_entry := self._read_cache_entry(cache_path):
+                if etag := cache_entry["headers"].get("ETag"):
+                    headers["If-None-Match"] = etag
+                if last_modified := cache_entry["headers"].get("Last-Modified"):
+                    headers["If-Modified-Since"] = last_modified
+
+        self._wait_for_rate_limit(rate_limit_key)
+
+        # Retry request once, if rate limited
+        for attempt in range(2):
+            response = self._session.request(method, url, headers=headers, stream=stream, **kwargs)
+            self._update_rate_limit(rate_limit_key, response)
+
+            retry_wait = self._get_retry_wait(response)
+            if retry_wait is None or attempt:
+                break
+            response.close()
+            print(f"Provider source API request rate limited, retrying in {int(retry_wait)} seconds")
+            time.sleep(retry_wait)
+
+        if cache_path:
+            if response.status_code == 304 and cache_entry:
+                try:
+                    # Mark cache entry as used
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+                return self._generate_cached_response(cache_entry=cache_entry, response=response)
+            elif response.status_code == 200:
+                self._write_cache_entry(cache_path=cache_path, response=response)
+
+        return response
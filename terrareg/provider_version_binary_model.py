@@ -8,6 +8,7 @@ import sqlalchemy
 from terrareg.errors import InvalidProviderBinaryArchitectureError, InvalidProviderBinaryNameError, InvalidProviderBinaryOperatingSystemError, ProviderVersionBinaryAlreadyExistsError
 
 import terrareg.provider_version_model
+import terrareg.provider_model
 import terrareg.provider_documentation_type
 import terrareg.database
 import terrareg.provider_binary_types
@@ -22,8 +23,13 @@ class ProviderVersionBinary:
                provider_version: 'terrareg.provider_version_model.ProviderVersion',
                name: str,
                checksum: str,
-               content: bytes) -> Union[None, 'ProviderVersionBinary']:
-        """Create provider version document"""
+               content: Optional[bytes]=None,
+               source_path: Optional[str]=None) -> Union[None, 'ProviderVersionBinary']:
+        """
+        Create provider version binary.
+
+        The binary is provided either as content or as the path of a local file.
+        """
         # Extract OS and arch from name and ensure filename matches an expected type
         name_re = re.compile(
             # terraform-provider-jmon_2.1.1_linux_386.zip
@@ -64,7 +70,7 @@ class ProviderVersionBinary:
 
         # Store binary
         obj = cls(pk=pk)
-        obj.create_local_binary(content=content)
+        obj.create_local_binary(content=content, source_path=source_path)
 
         return obj
 
@@ -86,7 +92,10 @@ class ProviderVersionBinary:
         )
         with db.get_connection() as conn:
             res = conn.execute(insert)
-            return res.inserted_primary_key[0]
+            pk = res.inserted_primary_key[0]
+
+        terrareg.provider_model.Provider.invalidate_versions_api_cache(provider_version.provider.pk)
+        return pk
 
     @classmethod
     def get(cls,
@@ -177,11 +186,18 @@ class ProviderVersionBinary:
                 self._cache_db_row = res.fetchone()
         return self._cache_db_row
 
-    def create_local_binary(self, content: bytes):
-        """Create local binary file"""
+    def create_local_binary(self, content: Optional[bytes]=None, source_path: Optional[str]=None):
+        """Create local binary file, from content or by uploading local file"""
         file_storage = terrareg.file_storage.FileStorageFactory().get_file_storage()
         file_storage.make_directory(self.provider_version.base_directory)
-        file_storage.write_file(self.local_file_path, content, binary=True)
+        if source_path is not None:
+            file_storage.upload_file(
+                source_path=source_path,
+                dest_directory=self.provider_version.base_directory,
+                dest_filename=self.name
+            )
+        else:
+            file_storage.write_file(self.local_file_path, content, binary=True)
 
     def get_api_outline(self) -> dict:
         """Return API details"""
@@ -8,6 +8,7 @@ import terrareg.provider_version_model
 import terrareg.provider_documentation_type
 import terrareg.database
 import terrareg.utils
+import terrareg.rendered_markdown_cache
 
 
 class ProviderVersionDocumentation:
@@ -286,6 +287,6 @@ class ProviderVersionDocumentation:
         """Return content of documentation"""
         content = terrareg.database.Database.decode_blob(self._get_db_row()["content"])
         if html:
-            content = terrareg.utils.convert_markdown_to_html(file_name=self.filename, markdown_html=content)
-            content = terrareg.utils.sanitise_html_content(content, allow_markdown_html=True)
+            content = terrareg.rendered_markdown_cache.RenderedMarkdownCache.get().render(
+                file_name=self.filename, content=content)
         return content
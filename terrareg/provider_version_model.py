@@ -20,6 +20,8 @@ import terrareg.models
 import terrareg.provider_version_documentation_model
 import terrareg.provider_version_binary_model
 import terrareg.analytics
+from terrareg.request_identity_map import RequestIdentityMap
+from terrareg.version_sort_key import get_version_sort_key
 
 
 class ProviderVersion:
@@ -43,6 +45,14 @@ class ProviderVersion:
     @classmethod
     def get_by_pk(cls, pk: int) -> Union[None, 'ProviderVersion']:
         """Obtain provider version by primary key"""
+        if (row := RequestIdentityMap.get('provider_version', ('pk', pk))) is not None:
+            provider = terrareg.provider_model.Provider.get_by_pk(pk=row["provider_id"])
+            if provider is None:
+                return None
+            obj = cls(provider=provider, version=row["version"])
+            obj._cache_db_row = row
+            return obj
+
         db = terrareg.database.Database.get()
         select = sqlalchemy.select(
             db.provider_version.c.provider_id,
@@ -174,17 +184,24 @@ class ProviderVersion:
     def _get_db_row(self):
         """Get object from database"""
         if self._cache_db_row is None:
-            db = terrareg.database.Database.get()
-            select = db._provider_version.select().join(
-                db.provider,
-                db.provider_version.c.provider_id == db.provider.c.id
-            ).where(
-                db.provider.c.id == self._provider.pk,
-                db.provider_version.c.version == self.version
-            )
-            with db.get_connection() as conn:
-                res = conn.execute(select)
-                self._cache_db_row = res.fetchone()
+            identity_key = ('version', self._provider.pk, self.version)
+            self._cache_db_row = RequestIdentityMap.get('provider_version', identity_key)
+
+            if self._cache_db_row is None:
+                db = terrareg.database.Database.get()
+                select = db._provider_version.select().join(
+                    db.provider,
+                    db.provider_version.c.provider_id == db.provider.c.id
+                ).where(
+                    db.provider.c.id == self._provider.pk,
+                    db.provider_version.c.version == self.version
+                )
+                with db.get_connection() as conn:
+                    res = conn.execute(select)
+                    self._cache_db_row = res.fetchone()
+
+                if self._cache_db_row is not None:
+                    RequestIdentityMap.add('provider_version', [identity_key, ('pk', self._cache_db_row['id'])], self._cache_db_row)
         return self._cache_db_row
 
     def generate_file_name_from_suffix(self, suffix: str) -> str:
@@ -236,16 +253,19 @@ class ProviderVersion:
             provider_version=self
         )
 
-    @property
-    def protocols(self) -> List[str]:
-        """Return list of supported protocols"""
-        protocol_json = terrareg.database.Database.decode_blob(
-            self._get_db_row()["protocol_versions"]
-        )
+    @staticmethod
+    def decode_protocol_versions(protocol_versions: Union[bytes, None]) -> List[str]:
+        """Convert protocol_versions column value to list of supported protocols"""
+        protocol_json = terrareg.database.Database.decode_blob(protocol_versions)
         if protocol_json:
             return json.loads(protocol_json)
         return ["5.0"]
 
+    @property
+    def protocols(self) -> List[str]:
+        """Return list of supported protocols"""
+        return self.decode_protocol_versions(self._get_db_row()["protocol_versions"])
+
     def update_attributes(self, **kwargs):
         """Update attributes of provider version"""
         db = terrareg.database.Database.get()
@@ -262,8 +282,11 @@ class ProviderVersion:
         with db.get_connection() as conn:
             conn.execute(update)
 
+        terrareg.provider_model.Provider.invalidate_versions_api_cache(self._provider.pk)
+
         # Remove cached DB row
         self._cache_db_row = None
+        RequestIdentityMap.invalidate('provider_version')
 
     def get_api_binaries_outline(self) -> dict:
         """Return dict of outline for versions endpoint"""
@@ -350,6 +373,10 @@ class ProviderVersion:
                 version=self.version,
                 git_tag=git_tag,
                 beta=self._extracted_beta_flag,
-                gpg_key_id=gpg_key.pk
+                gpg_key_id=gpg_key.pk,
+                **get_version_sort_key(self.version)
             )
             conn.execute(insert_statement)
+
+        terrareg.provider_model.Provider.invalidate_versions_api_cache(self._provider.pk)
+        RequestIdentityMap.invalidate('provider_version')
@@ -0,0 +1,113 @@
+"""Cache of markdown content rendered as sanitised HTML."""
+
+from collections import OrderedDict
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import terrareg.config
+from terrareg.constants import EXTRACTION_VERSION
+import terrareg.utils
+
+
+class RenderedMarkdownCache:
+    """
+    In-memory least recently used cache of markdown converted to HTML and sanitised.
+
+    Rendered content is keyed on a hash of the markdown content, the file name
+    (used to generate anchor IDs) and the extraction version.
+    Content that contains the server hostname (e.g. READMEs with example
+    module sources) must be hashed after the hostname has been substituted.
+    """
+
+    _INSTANCE = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    @classmethod
+    def get(cls) -> 'RenderedMarkdownCache':
+        """Return cache instance for process"""
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is None:
+                cls._INSTANCE = cls()
+            return cls._INSTANCE
+
+    def __init__(self, max_size: Optional[int]=None):
+        """Store member variables"""
+        # Convert maximum size from MB to bytes
+        self._max_size = (terrareg.config.Config().MARKDOWN_CACHE_MAX_SIZE if max_size is None else max_size) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, str, int], str]' = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether rendered content is cached"""
+        return self._max_size > 0
+
+    @staticmethod
+    def _get_key(file_name: str, content: str) -> Tuple[str, str, int]:
+        """Return cache key for markdown content"""
+        return (
+            hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            file_name,
+            EXTRACTION_VERSION
+        )
+
+    @staticmethod
+    def _render(file_name: str, content: str) -> str:
+        """Convert markdown to HTML and sanitise"""
+        html = terrareg.utils.convert_markdown_to_html(file_name=file_name, markdown_html=content)
+        return terrareg.utils.sanitise_html_content(html, allow_markdown_html=True)
+
+    def render(self, file_name: str, content: str) -> str:
+        """Return sanitised HTML for markdown content, using cached result if available"""
+        if not content or not self.enabled:
+            return self._render(file_name=file_name, content=content)
+
+        key = self._get_key(file_name=file_name, content=content)
+        with self._lock:
+            if (html := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return html
+            self._misses += 1
+
+        # Render outside of lock, to avoid blocking other requests
+        html = self._render(file_name=file_name, content=content)
+        size = len(html.encode('utf-8'))
+        # Do not cache content that cannot fit in cache
+        if size > self._max_size:
+            return html
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = html
+                self._size += size
+
+                # Evict least recently used content until cache is within maximum size
+                while self._size > self._max_size:
+                    _, evicted_html = self._entries.popitem(last=False)
+                    self._size -= len(evicted_html.encode('utf-8'))
+                    self._evictions += 1
+        return html
+
+    def clear(self):
+        """Remove all cached content"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_statistics(self) -> Optional[Dict[str, int]]:
+        """Return cache statistics, if cache is enabled"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'size': self._size,
+            }
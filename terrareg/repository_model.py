@@ -1,6 +1,6 @@
 
 import re
-from typing import Union, List, Tuple, Optional
+from typing import BinaryIO, Callable, Union, List, Tuple, Optional
 
 import sqlalchemy
 
@@ -233,6 +233,16 @@ class Repository:
             release_metadata=release_metadata
         )
 
+    def get_release_artifact_downloader(self,
+                                        provider: 'terrareg.provider_model.Provider',
+                                        release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata'
+                                        ) -> Callable[['terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata', BinaryIO], bool]:
+        """Return function from provider source to write release artifact file content to a file handle"""
+        return self.provider_source.get_release_artifact_downloader(
+            provider=provider,
+            release_metadata=release_metadata
+        )
+
     def get_release_archive(self,
                             provider: 'terrareg.provider_model.Provider',
                             release_metadata: 'terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata') -> Tuple[Union[bytes, None], Union[None, str]]:
@@ -0,0 +1,56 @@
+"""Request-scoped identity map of database rows."""
+
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+import flask
+
+
+class RequestIdentityMap:
+    """
+    Map of database rows loaded during the current request, keyed by table and
+    primary or natural key, so that model objects created for the same entity
+    within a request do not re-query the same row.
+
+    Rows are only retained for request contexts of apps registered with
+    `terrareg.database.Database.register_app`.
+    Only rows that exist are stored, so that rows inserted during the request are always found.
+    Models must invalidate the rows of a table whenever the table is modified.
+    """
+
+    @staticmethod
+    def _get_rows() -> Optional[Dict[str, Dict[Hashable, Any]]]:
+        """Return rows for current request, by table name, or None if not in a registered request context"""
+        if not flask.has_request_context() or not flask.current_app.extensions.get('terrareg_database'):
+            return None
+        if (rows := flask.g.get('identity_map_rows', None)) is None:
+            rows = {}
+            flask.g.identity_map_rows = rows
+        return rows
+
+    @classmethod
+    def get(cls, table_name: str, key: Hashable) -> Optional[Any]:
+        """Return row for key, if it has been loaded during the request"""
+        if (rows := cls._get_rows()) is None:
+            return None
+        return rows.get(table_name, {}).get(key)
+
+    @classmethod
+    def add(cls, table_name: str, keys: Iterable[Hashable], row: Any) -> None:
+        """Store row under each of the given keys"""
+        if row is None or (rows := cls._get_rows()) is None:
+            return
+        table_rows = rows.setdefault(table_name, {})
+        for key in keys:
+            table_rows[key] = row
+
+    @classmethod
+    def invalidate(cls, table_name: str) -> None:
+        """Remove all rows of table"""
+        if (rows := cls._get_rows()) is not None:
+            rows.pop(table_name, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Remove all rows"""
+        if (rows := cls._get_rows()) is not None:
+            rows.clear()
@@ -0,0 +1,341 @@
+"""In-memory inverted search index for modules and providers."""
+
+import bisect
+import math
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import terrareg.config
+import terrareg.database
+
+
+class InvertedSearchIndex:
+    """
+    Inverted index of search documents, ranking matches using BM25F.
+
+    Each document contains text fields, which are tokenised into terms and weighted by field,
+    along with attributes, which are used by callers to filter results and calculate facet counts.
+
+    The index is built from the database on first use.
+    Documents that have been invalidated are reloaded before each search and
+    the entire index is periodically rebuilt, to include modifications made by other processes.
+    """
+
+    # Weight of each text field of documents
+    FIELD_WEIGHTS: Dict[str, float] = {}
+
+    # BM25 term frequency saturation and document length normalisation parameters
+    K1 = 1.2
+    B = 0.75
+
+    # Weight of query terms matching the prefix of a term, rather than the entire term
+    PREFIX_MATCH_WEIGHT = 0.5
+
+    _TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+    _INSTANCE = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    @classmethod
+    def get(cls) -> 'InvertedSearchIndex':
+        """Return search index instance for process"""
+        with cls._INSTANCE_LOCK:
+            if cls._INSTANCE is None:
+                cls._INSTANCE = cls()
+            return cls._INSTANCE
+
+    @classmethod
+    def invalidate(cls, document_id: int):
+        """
+        Mark document to be reloaded from the database before the next search.
+
+        Within a database transaction, the document is invalidated once the transaction
+        has been committed, so that the reloaded document contains the modifications.
+        """
+        def invalidate_document():
+            if cls._INSTANCE is not None:
+                cls._INSTANCE._invalidate(document_id)
+        terrareg.database.Database.run_after_commit(invalidate_document)
+
+    @classmethod
+    def invalidate_all(cls):
+        """
+        Mark all documents to be reloaded from the database before the next search.
+
+        Within a database transaction, the documents are invalidated once the transaction has been committed.
+        """
+        def invalidate_documents():
+            if cls._INSTANCE is not None:
+                cls._INSTANCE._invalidate_all()
+        terrareg.database.Database.run_after_commit(invalidate_documents)
+
+    @classmethod
+    def tokenise(cls, text: Optional[str]) -> List[str]:
+        """Split text into lower-case alphanumeric terms"""
+        if not text:
+            return []
+        return cls._TOKEN_RE.findall(text.lower())
+
+    def __init__(self):
+        """Setup empty index"""
+        self._lock = threading.RLock()
+        # Attributes of each document
+        self._documents: Dict[int, dict] = {}
+        # Weighted term frequencies of each document, by term
+        self._postings: Dict[str, Dict[int, float]] = {}
+        # Weighted length of each document
+        self._document_lengths: Dict[int, float] = {}
+        self._total_document_length = 0.0
+        # Sorted list of terms, used for prefix matching
+        self._sorted_terms: Optional[List[str]] = None
+
+        self._rebuild_required = True
+        self._last_rebuild: Optional[float] = None
+        self._invalidated_documents: Set[int] = set()
+
+    def _invalidate(self, document_id: int):
+        """Mark document as invalidated"""
+        with self._lock:
+            self._invalidated_documents.add(document_id)
+
+    def _invalidate_all(self):
+        """Mark index to be rebuilt"""
+        with self._lock:
+            self._rebuild_required = True
+
+    def _load_documents(self, document_ids: Optional[Iterable[int]]=None) -> Iterable[Tuple[int, Dict[str, str], dict]]:
+        """
+        Load documents from the database, returning ID, text fields and attributes of each document.
+
+        If document IDs are provided, only these documents are loaded.
+        """
+        raise NotImplementedError
+
+    def _add_document(self, document_id: int, fields: Dict[str, str], attributes: dict):
+        """Add document to index"""
+        term_frequencies: Dict[str, float] = {}
+        document_length = 0.0
+        for field_name, text in fields.items():
+            weight = self.FIELD_WEIGHTS[field_name]
+            for term in self.tokenise(text):
+                term_frequencies[term] = term_frequencies.get(term, 0.0) + weight
+                document_length += weight
+
+        for term, term_frequency in term_frequencies.items():
+            if term not in self._postings:
+                self._postings[term] = {}
+                self._sorted_terms = None
+            self._postings[term][document_id] = term_frequency
+
+        self._documents[document_id] = dict(attributes, terms=list(term_frequencies.keys()))
+        self._document_lengths[document_id] = document_length
+        self._total_document_length += document_length
+
+    def _remove_document(self, document_id: int):
+        """Remove document from index"""
+        document = self._documents.pop(document_id, None)
+        if document is None:
+            return
+
+        for term in document['terms']:
+            postings = self._postings[term]
+            postings.pop(document_id, None)
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms = None
+
+        self._total_document_length -= self._document_lengths.pop(document_id)
+
+    def _rebuild(self):
+        """Rebuild entire index from database"""
+        self._documents = {}
+        self._postings = {}
+        self._document_lengths = {}
+        self._total_document_length = 0.0
+        self._sorted_terms = None
+
+        for document_id, fields, attributes in self._load_documents():
+            self._add_document(document_id, fields, attributes)
+
+        self._rebuild_required = False
+        self._last_rebuild = time.time()
+        self._invalidated_documents = set()
+
+    def refresh(self):
+        """Rebuild index, if required, or reload invalidated documents"""
+        with self._lock:
+            refresh_interval = terrareg.config.Config().SEARCH_INDEX_REFRESH_INTERVAL
+            if (self._rebuild_required or
+                    (refresh_interval and time.time() - self._last_rebuild >= refresh_interval)):
+                self._rebuild()
+                return
+
+            if self._invalidated_documents:
+                invalidated_documents = self._invalidated_documents
+                self._invalidated_documents = set()
+
+                for document_id in invalidated_documents:
+                    self._remove_document(document_id)
+                # Re-add documents that still exist and are searchable
+                for document_id, fields, attributes in self._load_documents(document_ids=invalidated_documents):
+                    self._add_document(document_id, fields, attributes)
+
+    def _get_matching_terms(self, query_term: str) -> Iterable[Tuple[str, float]]:
+        """Return terms matching query term, with the weight of the match"""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings.keys())
+
+        index = bisect.bisect_left(self._sorted_terms, query_term)
+        while index < len(self._sorted_terms) and self._sorted_terms[index].startswith(query_term):
+            term = self._sorted_terms[index]
+            yield term, (1.0 if term == query_term else self.PREFIX_MATCH_WEIGHT)
+            index += 1
+
+    def search(self, query: Optional[str]) -> List[Tuple[int, float, dict]]:
+        """
+        Return ID, score and attributes of documents matching all terms of query.
+
+        If no query is provided, all documents are returned with a score of 0.
+        """
+        with self._lock:
+            self.refresh()
+
+            query_terms = self.tokenise(query)
+            if not query_terms:
+                return [
+                    (document_id, 0.0, attributes)
+                    for document_id, attributes in self._documents.items()
+                ]
+
+            document_count = len(self._documents)
+            if not document_count:
+                return []
+            average_document_length = (self._total_document_length / document_count) or 1.0
+
+            scores: Optional[Dict[int, float]] = None
+            for query_term in set(query_terms):
+                # Obtain best scoring match of query term for each document
+                term_scores: Dict[int, float] = {}
+                for term, match_weight in self._get_matching_terms(query_term):
+                    postings = self._postings[term]
+                    inverse_document_frequency = math.log(
+                        1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5)
+                    )
+                    for document_id, term_frequency in postings.items():
+                        length_normalisation = 1 - self.B + self.B * self._document_lengths[document_id] / average_document_length
+                        score = match_weight * inverse_document_frequency * (
+                            term_frequency * (self.K1 + 1) / (term_frequency + self.K1 * length_normalisation)
+                        )
+                        if score > term_scores.get(document_id, 0.0):
+                            term_scores[document_id] = score
+
+                # Only retain documents that match all query terms
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        document_id: score + term_scores[document_id]
+                        for document_id, score in scores.items()
+                        if document_id in term_scores
+                    }
+                if not scores:
+                    return []
+
+            return [
+                (document_id, score, self._documents[document_id])
+                for document_id, score in scores.items()
+            ]
+
+
+class ModuleSearchIndex(InvertedSearchIndex):
+    """Search index of module providers, indexing details of the latest version of each module provider."""
+
+    FIELD_WEIGHTS = {
+        'module': 4.0,
+        'namespace': 3.5,
+        'provider': 3.0,
+        'description': 1.0,
+        'owner': 1.0,
+    }
+
+    _INSTANCE = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    def _load_documents(self, document_ids=None):
+        """Load module providers with a published latest version from the database"""
+        db = terrareg.database.Database.get()
+        select = db.select_module_provider_joined_latest_module_version(
+            db.module_provider.c.id,
+            db.module_provider.c.module,
+            db.module_provider.c.provider,
+            db.module_provider.c.verified,
+            db.namespace.c.namespace,
+            db.module_version.c.description,
+            db.module_version.c.owner,
+            db.module_version.c.internal,
+        ).where(
+            db.module_version.c.published == True,
+            db.module_version.c.beta == False
+        )
+        if document_ids is not None:
+            select = select.where(db.module_provider.c.id.in_(list(document_ids)))
+
+        with db.get_connection() as conn:
+            rows = conn.execute(select).fetchall()
+
+        for row in rows:
+            yield row['id'], {
+                'module': row['module'],
+                'namespace': row['namespace'],
+                'provider': row['provider'],
+                'description': row['description'],
+                'owner': row['owner'],
+            }, {
+                'namespace': row['namespace'],
+                'module': row['module'],
+                'provider': row['provider'],
+                'verified': bool(row['verified']),
+                'internal': bool(row['internal']),
+            }
+
+
+class ProviderSearchIndex(InvertedSearchIndex):
+    """Search index of providers with a latest version."""
+
+    FIELD_WEIGHTS = {
+        'name': 4.0,
+        'namespace': 3.5,
+        'description': 1.0,
+    }
+
+    _INSTANCE = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    def _load_documents(self, document_ids=None):
+        """Load providers with a latest version from the database"""
+        db = terrareg.database.Database.get()
+        select = db.select_provider_joined_latest_provider_version(
+            db.provider.c.id,
+            db.provider.c.name,
+            db.provider.c.description,
+            db.namespace.c.namespace,
+            db.provider_category.c.slug,
+        )
+        if document_ids is not None:
+            select = select.where(db.provider.c.id.in_(list(document_ids)))
+
+        with db.get_connection() as conn:
+            rows = conn.execute(select).fetchall()
+
+        for row in rows:
+            yield row['id'], {
+                'name': row['name'],
+                'namespace': row['namespace'],
+                'description': row['description'],
+            }, {
+                'namespace': row['namespace'],
+                'name': row['name'],
+                'provider_category_slug': row['slug'],
+            }
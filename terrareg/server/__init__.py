@@ -132,6 +132,7 @@ class Server(BaseHandler):
             static_folder=os.path.join('..', 'static'),
             template_folder=os.path.join('..', 'templates')
         )
+        terrareg.database.Database.register_app(self._app)
         self._api = Api(
             self._app,
             #prefix='v1'
@@ -579,6 +580,14 @@ class Server(BaseHandler):
             ApiTerraregModuleProviderRedirectDelete,
             '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/redirects/<string:module_provider_redirect_id>'
         )
+        self._api.add_resource(
+            ApiTerraregModuleProviderExtractionJobs,
+            '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/extraction-jobs'
+        )
+        self._api.add_resource(
+            ApiTerraregModuleProviderExtractionJob,
+            '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/extraction-jobs/<int:job_id>'
+        )
         self._api.add_resource(
             ApiModuleVersionCreateBitBucketHook,
             '/v1/terrareg/modules/<string:namespace>/<string:name>/<string:provider>/hooks/bitbucket'
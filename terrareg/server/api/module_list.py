@@ -8,6 +8,8 @@ import terrareg.auth_wrapper
 
 class ApiModuleList(ErrorCatchingResource):
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
 
     def _get(self):
@@ -4,6 +4,8 @@ import terrareg.auth_wrapper
 import terrareg.models
 import terrareg.database
 import terrareg.module_extractor
+import terrareg.config
+from terrareg.module_extraction_job_model import ModuleExtractionJob
 
 
 class ApiModuleVersionCreate(ErrorCatchingResource):
@@ -41,6 +43,14 @@ class ApiModuleVersionCreate(ErrorCatchingResource):
 
             module_version = terrareg.models.ModuleVersion(module_provider=module_provider, version=version)
 
+            # Queue extraction to be performed by extraction workers
+            if terrareg.config.Config().ASYNC_MODULE_EXTRACTION:
+                job = ModuleExtractionJob.create(module_provider=module_provider, version=version)
+                return {
+                    'status': 'Queued',
+                    'job_id': job.pk
+                }, 202
+
             with module_version.module_create_extraction_wrapper():
                 with terrareg.module_extractor.GitModuleExtractor(module_version=module_version) as me:
                     me.process_upload()
@@ -11,6 +11,7 @@ import terrareg.config
 import terrareg.models
 import terrareg.module_extractor
 import terrareg.errors
+from terrareg.module_extraction_job_model import ModuleExtractionJob
 
 
 class ApiModuleVersionCreateBitBucketHook(ErrorCatchingResource):
@@ -85,6 +86,15 @@ class ApiModuleVersionCreateBitBucketHook(ErrorCatchingResource):
                 # Create module version
                 module_version = terrareg.models.ModuleVersion(module_provider=module_provider, version=version)
 
+                # Queue import to be performed by extraction workers
+                if terrareg.config.Config().ASYNC_MODULE_EXTRACTION:
+                    job = ModuleExtractionJob.create(module_provider=module_provider, version=version)
+                    imported_versions[version] = {
+                        'status': 'Queued',
+                        'job_id': job.pk
+                    }
+                    continue
+
                 # Perform import from git
                 savepoint = transaction_context.connection.begin_nested()
                 try:
@@ -114,6 +124,12 @@ class ApiModuleVersionCreateBitBucketHook(ErrorCatchingResource):
                     'message': 'One or more tags failed to import',
                     'tags': imported_versions
                 }, 500
+            if terrareg.config.Config().ASYNC_MODULE_EXTRACTION:
+                return {
+                    'status': 'Queued',
+                    'message': 'Queued all provided tags for import',
+                    'tags': imported_versions
+                }, 202
             return {
                 'status': 'Success',
                 'message': 'Imported all provided tags',
@@ -11,6 +11,7 @@ import terrareg.config
 import terrareg.models
 import terrareg.module_extractor
 import terrareg.errors
+from terrareg.module_extraction_job_model import ModuleExtractionJob
 
 
 class ApiModuleVersionCreateGitHubHook(ErrorCatchingResource):
@@ -82,6 +83,15 @@ class ApiModuleVersionCreateGitHubHook(ErrorCatchingResource):
                 return {
                     'status': 'Success'
                 }
+            elif terrareg.config.Config().ASYNC_MODULE_EXTRACTION:
+                # Queue import to be performed by extraction workers
+                job = ModuleExtractionJob.create(module_provider=module_provider, version=version)
+                return {
+                    'status': 'Queued',
+                    'message': 'Queued provided tag for import',
+                    'tag': tag_ref,
+                    'job_id': job.pk
+                }, 202
             else:
                 # Perform import from git
                 try:
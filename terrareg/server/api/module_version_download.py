@@ -14,6 +14,8 @@ import terrareg.auth
 class ApiModuleVersionDownload(ErrorCatchingResource):
     """Provide download endpoint."""
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_terraform_api')]
 
     def _get(self, namespace, name, provider, version=None):
@@ -6,6 +6,8 @@ import terrareg.auth_wrapper
 import terrareg.models
 import terrareg.database
 import terrareg.module_extractor
+import terrareg.config
+from terrareg.module_extraction_job_model import ModuleExtractionJob
 
 
 class ApiModuleVersionImport(ErrorCatchingResource):
@@ -38,10 +40,23 @@ class ApiModuleVersionImport(ErrorCatchingResource):
             location='json',
             help='The git tag of the module to be imported. Conflicts with version.'
         )
+        parser.add_argument(
+            'force_full_extraction',
+            type=bool,
+            required=False,
+            default=False,
+            location='json',
+            help='Whether to analyse all submodules and examples, rather than re-using analysis of submodules and examples that are unchanged from previous versions.'
+        )
         return parser
 
     def _post(self, namespace, name, provider):
-        """Handle creation of module version."""
+        """
+        Handle creation of module version.
+
+        If asynchronous module extraction is enabled, an extraction job is queued
+        and a 202 response is returned containing the ID of the job.
+        """
 
         args = self._post_arg_parser().parse_args()
 
@@ -78,8 +93,18 @@ class ApiModuleVersionImport(ErrorCatchingResource):
 
             module_version = terrareg.models.ModuleVersion(module_provider=module_provider, version=version)
 
+            # Queue extraction to be performed by extraction workers
+            if terrareg.config.Config().ASYNC_MODULE_EXTRACTION:
+                job = ModuleExtractionJob.create(module_provider=module_provider, version=version,
+                                                 force_full_extraction=args.force_full_extraction)
+                return {
+                    'status': 'Queued',
+                    'job_id': job.pk
+                }, 202
+
             with module_version.module_create_extraction_wrapper():
-                with terrareg.module_extractor.GitModuleExtractor(module_version=module_version) as me:
+                with terrareg.module_extractor.GitModuleExtractor(module_version=module_version,
+                                                                  force_full_extraction=args.force_full_extraction) as me:
                     me.process_upload()
 
             return {
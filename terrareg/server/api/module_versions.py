@@ -7,6 +7,8 @@ import terrareg.auth_wrapper
 
 class ApiModuleVersions(ErrorCatchingResource):
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_terraform_api')]
 
     def _get(self, namespace, name, provider):
@@ -25,19 +27,7 @@ class ApiModuleVersions(ErrorCatchingResource):
                         module=module.name,
                         provider=module_provider.name
                     ),
-                    "versions": [
-                        {
-                            "version": v.version,
-                            "root": {
-                                # @TODO: Add providers/dependencies
-                                "providers": [],
-                                "dependencies": []
-                            },
-                            # @TODO: Add submodule information
-                            "submodules": []
-                        }
-                        for v in module_provider.get_versions()
-                    ]
+                    "versions": module_provider.get_terraform_api_versions()
                 }
             ]
         }
@@ -9,6 +9,8 @@ import terrareg.auth_wrapper
 class ApiNamespaceModules(ErrorCatchingResource):
     """Interface to obtain list of modules in namespace."""
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
 
     def _get(self, namespace):
@@ -10,6 +10,8 @@ import terrareg.models
 class ApiNamespaceProviders(ErrorCatchingResource):
     """Interface to obtain list of providers in namespace."""
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
 
     def _get(self, namespace):
@@ -9,6 +9,8 @@ import terrareg.provider_version_model
 
 class ApiProvider(ErrorCatchingResource):
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_terraform_api')]
 
     def _get(self, namespace, provider, version=None):
@@ -13,6 +13,8 @@ import terrareg.analytics
 
 class ApiProviderVersionDownload(ErrorCatchingResource):
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_terraform_api')]
 
     def _get(self, namespace, provider, version, os, arch):
@@ -11,6 +11,8 @@ import terrareg.provider_version_model
 
 class ApiProviderVersions(ErrorCatchingResource):
 
+    READ_ONLY = True
+
     method_decorators = {
         "get": [terrareg.auth_wrapper.auth_wrapper('can_access_terraform_api')],
         "post": [terrareg.auth_wrapper.auth_wrapper('can_publish_module_version', request_kwarg_map={'namespace': 'namespace'})],
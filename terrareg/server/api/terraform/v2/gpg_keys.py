@@ -14,6 +14,8 @@ import terrareg.database
 class ApiGpgKeys(ErrorCatchingResource):
     """Provide interface to create GPG Keys."""
 
+    READ_ONLY = True
+
     method_decorators = {
         "get": [terrareg.auth_wrapper.auth_wrapper("can_access_read_api")],
         "post": [
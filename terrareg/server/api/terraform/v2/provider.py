@@ -12,6 +12,8 @@ import terrareg.analytics
 class ApiV2Provider(ErrorCatchingResource):
     """Interface for providing provider details"""
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
 
     def _get_arg_parser(self):
@@ -9,6 +9,8 @@ import terrareg.auth_wrapper
 class ApiProviderCategories(ErrorCatchingResource):
     """Interface to obtain list of provider categories."""
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
 
     def _get(self):
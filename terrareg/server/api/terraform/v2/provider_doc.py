@@ -11,6 +11,8 @@ import terrareg.provider_documentation_type
 class ApiV2ProviderDoc(ErrorCatchingResource):
     """Interface for obtain provider doc details"""
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
 
     def _get_arg_parser(self):
@@ -0,0 +1,39 @@
+
+from terrareg.server.error_catching_resource import ErrorCatchingResource
+import terrareg.auth_wrapper
+from terrareg.module_extraction_job_model import ModuleExtractionJob
+
+
+class ApiTerraregModuleProviderExtractionJobs(ErrorCatchingResource):
+    """Provide interface to list module extraction jobs for module provider."""
+
+    method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_upload_module_version', request_kwarg_map={'namespace': 'namespace'})]
+
+    def _get(self, namespace, name, provider):
+        """Return most recent extraction jobs for module provider."""
+        _, _, module_provider, error = self.get_module_provider_by_names(namespace, name, provider)
+        if error:
+            return error
+
+        return [
+            job.get_api_details()
+            for job in ModuleExtractionJob.get_by_module_provider(module_provider)
+        ]
+
+
+class ApiTerraregModuleProviderExtractionJob(ErrorCatchingResource):
+    """Provide interface to obtain status, progress and logs of a module extraction job."""
+
+    method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_upload_module_version', request_kwarg_map={'namespace': 'namespace'})]
+
+    def _get(self, namespace, name, provider, job_id):
+        """Return details of extraction job, including logs."""
+        _, _, module_provider, error = self.get_module_provider_by_names(namespace, name, provider)
+        if error:
+            return error
+
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=job_id)
+        if job is None:
+            return {'status': 'Error', 'message': 'Extraction job does not exist'}, 404
+
+        return job.get_api_details(include_log=True)
@@ -12,6 +12,8 @@ import terrareg.auth_wrapper
 class ApiTerraregModuleVersionDetails(ErrorCatchingResource):
     """Interface to obtain module provider/version details."""
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
 
     def _get_arg_parser(self) -> reqparse.RequestParser:
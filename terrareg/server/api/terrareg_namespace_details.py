@@ -14,6 +14,8 @@ import terrareg.errors
 class ApiTerraregNamespaceDetails(ErrorCatchingResource):
     """Interface to obtain custom terrareg namespace details."""
 
+    READ_ONLY = True
+
     method_decorators = {
         "get": [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')],
         # Limit post methods to users with FULL namespace permissions
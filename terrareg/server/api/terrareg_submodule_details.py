@@ -11,6 +11,8 @@ import terrareg.auth_wrapper
 class ApiTerraregSubmoduleDetails(ErrorCatchingResource):
     """Interface to obtain submodule details."""
 
+    READ_ONLY = True
+
     method_decorators = [terrareg.auth_wrapper.auth_wrapper('can_access_read_api')]
 
     def _get(self, namespace, name, provider, version, submodule):
@@ -1,9 +1,11 @@
 
+import contextlib
 from typing import Tuple, Union, Dict
 
 from flask_restful import Resource
 
 from terrareg.server.base_handler import BaseHandler
+import terrareg.database
 import terrareg.errors
 import terrareg.models
 import terrareg.provider_model
@@ -20,6 +22,10 @@ def api_error(msg):
 class ErrorCatchingResource(Resource, BaseHandler):
     """Provide resource that catches terrareg errors."""
 
+    # Whether GET requests are read-only, allowing select
+    # queries to use the database read replica (see DATABASE_READ_URL)
+    READ_ONLY = False
+
     def _get(self, *args, **kwargs):
         """Placeholder for overridable get method."""
         return {'message': 'The method is not allowed for the requested URL.'}, 405
@@ -31,7 +37,8 @@ class ErrorCatchingResource(Resource, BaseHandler):
     def get(self, *args, **kwargs):
         """Run subclasses get in error handling fashion."""
         try:
-            return self._get(*args, **kwargs)
+            with (terrareg.database.Database.read_only() if self.READ_ONLY else contextlib.nullcontext()):
+                return self._get(*args, **kwargs)
         except terrareg.errors.TerraregError as exc:
             return {
                 "status": "Error",
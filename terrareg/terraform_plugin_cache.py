@@ -0,0 +1,221 @@
+"""Shared Terraform provider plugin cache, used during module extraction."""
+
+from contextlib import contextmanager
+import json
+import os
+import shutil
+from typing import Dict, Optional, Set
+
+import terrareg.config
+import terrareg.errors
+from terrareg.utils import FileLockTimeoutError, exclusive_file_lock
+
+
+class TerraformPluginCache:
+    """
+    Provider plugin cache, shared between all module extractions.
+
+    Terraform stores providers in the cache in the directory structure:
+    <hostname>/<namespace>/<type>/<version>/<os>_<arch>
+    Each of these provider package directories is tracked individually,
+    with the modification time of the package directory used to record the last use,
+    allowing the least recently used packages to be evicted when the cache exceeds the maximum size.
+
+    Terraform does not support concurrent use of a plugin cache, so each module is
+    initialised using its own plugin cache directory, populated from the shared cache.
+    The shared cache is only locked whilst packages are copied between the directories.
+    """
+
+    LOCK_TIMEOUT = 600
+    _PACKAGE_PATH_DEPTH = 5
+    _STATISTICS_FILE = ".statistics.json"
+    _LOCK_FILE = ".lock"
+    _MODULE_CACHE_DIRECTORY = os.path.join(".terraform", "plugin-cache")
+
+    def __init__(self, directory: Optional[str]=None, max_size: Optional[int]=None):
+        """Store member variables"""
+        config = terrareg.config.Config()
+        self._directory = config.TERRAFORM_PLUGIN_CACHE_DIRECTORY if directory is None else directory
+        # Convert maximum size from MB to bytes
+        self._max_size = (config.TERRAFORM_PLUGIN_CACHE_MAX_SIZE if max_size is None else max_size) * 1024 * 1024
+
+    @property
+    def directory(self) -> str:
+        """Return path of cache directory"""
+        return self._directory
+
+    @contextmanager
+    def _lock(self):
+        """Obtain exclusive lock on cache directory"""
+        os.makedirs(self._directory, exist_ok=True)
+        try:
+            with exclusive_file_lock(os.path.join(self._directory, self._LOCK_FILE), timeout=self.LOCK_TIMEOUT):
+                yield
+        except FileLockTimeoutError:
+            raise terrareg.errors.UnableToObtainTerraformPluginCacheLockError(
+                f"Unable to obtain Terraform plugin cache lock in {self.LOCK_TIMEOUT} seconds"
+            )
+
+    @classmethod
+    def _get_package_paths(cls, base_directory: str) -> Set[str]:
+        """Return relative paths of all provider packages in directory"""
+        package_paths = set()
+        if not os.path.isdir(base_directory):
+            return package_paths
+
+        for root, dirs, _ in os.walk(base_directory, followlinks=True):
+            relative_root = os.path.relpath(root, base_directory)
+            depth = 0 if relative_root == "." else len(relative_root.split(os.sep))
+            if depth == cls._PACKAGE_PATH_DEPTH - 1:
+                package_paths.update(os.path.join(relative_root, dir_) for dir_ in dirs)
+                # Do not descend into provider packages
+                dirs[:] = []
+        return package_paths
+
+    @staticmethod
+    def _link_file(source: str, destination: str):
+        """Hard link file, copying it if the destination is on another filesystem"""
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+    @classmethod
+    def _copy_packages(cls, source_directory: str, destination_directory: str, package_paths: Set[str]):
+        """
+        Copy provider packages between directories.
+
+        Files are hard linked, so that the copy is unaffected by
+        the removal of the source package and does not use additional space.
+        """
+        for package_path in package_paths:
+            shutil.copytree(
+                os.path.join(source_directory, package_path),
+                os.path.join(destination_directory, package_path),
+                symlinks=True,
+                copy_function=cls._link_file,
+                dirs_exist_ok=True
+            )
+
+    @staticmethod
+    def _get_directory_size(directory: str) -> int:
+        """Return total size of files in directory"""
+        size = 0
+        for root, _, files in os.walk(directory):
+            for file_ in files:
+                file_path = os.path.join(root, file_)
+                if not os.path.islink(file_path):
+                    size += os.path.getsize(file_path)
+        return size
+
+    def _read_statistics(self) -> Optional[Dict[str, int]]:
+        """Read statistics file from cache directory"""
+        try:
+            with open(os.path.join(self._directory, self._STATISTICS_FILE), "r") as statistics_fh:
+                return json.load(statistics_fh)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_statistics(self, statistics: Dict[str, int]):
+        """Write statistics file to cache directory"""
+        statistics_file = os.path.join(self._directory, self._STATISTICS_FILE)
+        with open(f"{statistics_file}.tmp", "w") as statistics_fh:
+            json.dump(statistics, statistics_fh)
+        os.replace(f"{statistics_file}.tmp", statistics_file)
+
+    def get_statistics(self) -> Optional[Dict[str, int]]:
+        """
+        Return cache hit, miss and eviction counts and the current size of the cache.
+
+        Returns None if the cache has not yet been used.
+        """
+        return self._read_statistics()
+
+    def _evict(self, package_sizes: Dict[str, int], in_use_packages: Set[str]) -> int:
+        """Remove least recently used packages until cache is within maximum size, returning the number of evicted packages"""
+        total_size = sum(package_sizes.values())
+        if not self._max_size or total_size <= self._max_size:
+            return 0
+
+        evicted = 0
+        packages_by_last_use = sorted(
+            package_sizes.keys(),
+            key=lambda package_path: os.path.getmtime(os.path.join(self._directory, package_path))
+        )
+        for package_path in packages_by_last_use:
+            if total_size <= self._max_size:
+                break
+            # Do not remove packages used by the current module
+            if package_path in in_use_packages:
+                continue
+
+            shutil.rmtree(os.path.join(self._directory, package_path))
+            total_size -= package_sizes.pop(package_path)
+            evicted += 1
+
+            # Remove empty parent directories of package
+            parent_directory = os.path.dirname(os.path.join(self._directory, package_path))
+            while os.path.realpath(parent_directory) != os.path.realpath(self._directory) and not os.listdir(parent_directory):
+                os.rmdir(parent_directory)
+                parent_directory = os.path.dirname(parent_directory)
+
+        return evicted
+
+    def _record_usage(self, module_path: str, cached_packages: Set[str]):
+        """Update last use of packages used by module, record statistics and evict packages"""
+        used_packages = self._get_package_paths(os.path.join(module_path, ".terraform", "providers"))
+        hits = len(used_packages & cached_packages)
+        misses = len(used_packages - cached_packages)
+
+        # Mark packages as most recently used
+        for package_path in used_packages:
+            cache_package_path = os.path.join(self._directory, package_path)
+            if os.path.isdir(cache_package_path):
+                os.utime(cache_package_path)
+
+        package_sizes = {
+            package_path: self._get_directory_size(os.path.join(self._directory, package_path))
+            for package_path in self._get_package_paths(self._directory)
+        }
+        evictions = self._evict(package_sizes=package_sizes, in_use_packages=used_packages)
+
+        statistics = self._read_statistics() or {"hits": 0, "misses": 0, "evictions": 0}
+        statistics["hits"] += hits
+        statistics["misses"] += misses
+        statistics["evictions"] += evictions
+        statistics["size"] = sum(package_sizes.values())
+        self._write_statistics(statistics)
+
+    @contextmanager
+    def use(self, module_path: str):
+        """
+        Yield environment variables for running terraform init for module using the plugin cache.
+
+        The module is provided with its own plugin cache directory, populated with the packages
+        of the shared cache, so that the shared cache is not locked whilst terraform init is running.
+        Once complete, packages downloaded by terraform init are added to the shared cache,
+        usage of the cache is recorded and least recently used packages are evicted.
+        """
+        module_cache_directory = os.path.join(module_path, self._MODULE_CACHE_DIRECTORY)
+        os.makedirs(module_cache_directory, exist_ok=True)
+
+        with self._lock():
+            cached_packages = self._get_package_paths(self._directory)
+            self._copy_packages(self._directory, module_cache_directory, cached_packages)
+
+        env = os.environ.copy()
+        env["TF_PLUGIN_CACHE_DIR"] = module_cache_directory
+        # Allow providers to be used from the cache when
+        # the module does not contain a dependency lock file.
+        # The lock file is not retained after extraction.
+        env["TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE"] = "true"
+
+        yield env
+
+        with self._lock():
+            # Add packages downloaded by the module to the shared cache,
+            # which may have been added by concurrent modules
+            new_packages = self._get_package_paths(module_cache_directory) - self._get_package_paths(self._directory)
+            self._copy_packages(module_cache_directory, self._directory, new_packages)
+
+            self._record_usage(module_path=module_path, cached_packages=cached_packages)
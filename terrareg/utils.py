@@ -1,7 +1,10 @@
 
+from contextlib import contextmanager
 import datetime
+import fcntl
 import os
 import glob
+import time
 import urllib.parse
 
 import bleach
@@ -23,6 +26,12 @@ class PathIsNotWithinBaseDirectoryError(TerraregError):
     pass
 
 
+class FileLockTimeoutError(TerraregError):
+    """Unable to obtain file lock within timeout."""
+
+    pass
+
+
 def safe_join_paths(base_dir, *sub_paths, is_dir=False, is_file=False, allow_same_directory=False):
     """Combine base_dir and sub_path and ensure directory """
 
@@ -166,3 +175,26 @@ def get_public_url_details(fallback_domain=None):
 def get_datetime_now():
     """Return datetime now"""
     return datetime.datetime.now()
+
+
+@contextmanager
+def exclusive_file_lock(lock_file, timeout):
+    """
+    Obtain exclusive lock on file, shared between threads and processes.
+
+    Raises FileLockTimeoutError if the lock cannot be obtained within the timeout (in seconds).
+    """
+    with open(lock_file, "w") as lock_fh:
+        timeout_at = time.time() + timeout
+        while True:
+            try:
+                fcntl.flock(lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.time() >= timeout_at:
+                    raise FileLockTimeoutError(f"Unable to obtain lock on {lock_file} in {timeout} seconds")
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_fh, fcntl.LOCK_UN)
@@ -0,0 +1,113 @@
+"""Generation of sortable column values for semantic versions."""
+
+import re
+from typing import Dict, Optional, Union
+
+
+VERSION_RE = re.compile(r'^([0-9]+)\.([0-9]+)\.([0-9]+)(?:-(.+))?$')
+DEV_RELEASE_RE = re.compile(r'^(.*?)dev([0-9]*)$')
+LABEL_NUMBER_RE = re.compile(r'^(.*?)([0-9]*)$')
+
+# Normalised pre-release labels, matching the normalisation of packaging.version
+PRERELEASE_LABEL_ALIASES = {
+    'alpha': 'a',
+    'beta': 'b',
+    'c': 'rc',
+    'pre': 'rc',
+    'preview': 'rc',
+}
+POST_RELEASE_LABELS = ['post', 'rev', 'r']
+
+# Ranks of the types of version for the same major, minor and patch
+DEV_RELEASE_RANK = 0
+PRERELEASE_RANK = 1
+RELEASE_RANK = 2
+POST_RELEASE_RANK = 3
+
+# Width that numbers of suffixes are padded to,
+# so that they are ordered numerically by string comparison
+PRERELEASE_NUMBER_WIDTH = 10
+
+# Size of pre-release sort key column
+PRERELEASE_COLUMN_SIZE = 128
+
+
+def _get_number_key(number: str) -> str:
+    """Return number padded for ordering by string comparison, treating a missing number as 0"""
+    return (number.lstrip('0') or '0').rjust(PRERELEASE_NUMBER_WIDTH, '0')
+
+
+def _get_dev_key(dev_number: Optional[str]) -> str:
+    """
+    Return key for development release suffix of a pre-release or post-release,
+    ordering development releases before the pre-release or post-release itself.
+    """
+    if dev_number is None:
+        return '~'
+    return f'.{_get_number_key(dev_number)}'
+
+
+def get_version_sort_key(version: str) -> Dict[str, Union[int, str]]:
+    """
+    Return database column values used to order versions.
+
+    Versions are ordered by major, minor and patch, followed by the rank of the type of version,
+    in the same manner as packaging.version (as used by LooseVersion):
+    development releases (e.g. 1.0.0-dev1) < pre-releases (e.g. 1.0.0-rc1) < releases < post-releases (e.g. 1.0.0-1 or 1.0.0-r1).
+
+    Pre-release labels are normalised, so that 'alpha' is equivalent to 'a', 'beta' to 'b' and 'c', 'pre' and 'preview' to 'rc',
+    and a missing number is equivalent to 0, e.g. 1.0.0-a1 < 1.0.0-beta < 1.0.0-b2 < 1.0.0-beta10 < 1.0.0-rc1.
+    Other labels are ordered alphabetically with the normalised labels.
+    Pre-releases and post-releases with a development release suffix (e.g. 1.0.0-rc1dev) are ordered before the same version without the suffix.
+
+    Versions that are not valid semantic versions are ordered as 0.0.0 development releases.
+    """
+    match = VERSION_RE.match(version or '')
+    if not match:
+        return {
+            'version_major': 0,
+            'version_minor': 0,
+            'version_patch': 0,
+            'version_prerelease_rank': DEV_RELEASE_RANK,
+            'version_prerelease': '',
+        }
+
+    major, minor, patch, suffix = match.groups()
+    rank = RELEASE_RANK
+    suffix_key = ''
+    if suffix:
+        suffix = suffix.lower()
+        dev_number = None
+        if (dev_match := DEV_RELEASE_RE.match(suffix)):
+            suffix, dev_number = dev_match.groups()
+
+        label, number = LABEL_NUMBER_RE.match(suffix).groups()
+        if not suffix:
+            # Development release
+            rank = DEV_RELEASE_RANK
+            suffix_key = _get_number_key(dev_number)
+        elif not label or label in POST_RELEASE_LABELS:
+            rank = POST_RELEASE_RANK
+            suffix_key = _get_number_key(number) + _get_dev_key(dev_number)
+        else:
+            rank = PRERELEASE_RANK
+            suffix_key = PRERELEASE_LABEL_ALIASES.get(label, label) + _get_number_key(number) + _get_dev_key(dev_number)
+
+    return {
+        'version_major': int(major),
+        'version_minor': int(minor),
+        'version_patch': int(patch),
+        'version_prerelease_rank': rank,
+        'version_prerelease': suffix_key[:PRERELEASE_COLUMN_SIZE],
+    }
+
+
+def get_version_order_by(table):
+    """Return order by clauses to order rows of a version table by descending version"""
+    return (
+        table.c.version_major.desc(),
+        table.c.version_minor.desc(),
+        table.c.version_patch.desc(),
+        table.c.version_prerelease_rank.desc(),
+        table.c.version_prerelease.desc(),
+    )
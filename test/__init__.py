@@ -18,6 +18,7 @@ from terrareg.server import Server
 import terrareg.config
 from terrareg.user_group_namespace_permission_type import UserGroupNamespacePermissionType
 from terrareg.constants import EXTRACTION_VERSION
+from terrareg.version_sort_key import get_version_sort_key
 import terrareg.provider_category_model
 import terrareg.provider_source.factory
 import terrareg.repository_model
@@ -159,12 +160,14 @@ class BaseTest:
             conn.execute(db.module_provider.delete())
             conn.execute(db.example_file.delete())
             conn.execute(db.module_details.delete())
+            conn.execute(db.module_details_blob.delete())
             conn.execute(db.git_provider.delete())
             conn.execute(db.analytics.delete())
             conn.execute(db.provider_analytics.delete())
             conn.execute(db.provider_version_binary.delete())
             conn.execute(db.provider_version_documentation.delete())
             conn.execute(db.provider_version.delete())
+            conn.execute(db.provider_index_job.delete())
             conn.execute(db.provider.delete())
             conn.execute(db.provider_source.delete())
             conn.execute(db.provider_category.delete())
@@ -245,7 +248,8 @@ class BaseTest:
                                 'published_at': datetime.now(),
                                 'internal': False,
                                 'module_details_id': module_details.pk,
-                                'extraction_version': version_data.get('extraction_version', EXTRACTION_VERSION)
+                                'extraction_version': version_data.get('extraction_version', EXTRACTION_VERSION),
+                                **get_version_sort_key(version_number)
                             }
 
                             insert = Database.get().module_version.insert().values(
@@ -298,6 +302,8 @@ class BaseTest:
                                     **attributes_to_update
                                 )
 
+                            module_version.update_dependencies()
+
                             # Iterate over examples and create them
                             for example_path in version_data.get('examples', {}):
                                 example_config = version_data['examples'][example_path]
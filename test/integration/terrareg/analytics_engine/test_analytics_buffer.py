@@ -0,0 +1,123 @@
+
+import datetime
+import os
+import tempfile
+import time
+from unittest import mock
+
+from terrareg.analytics import AnalyticsEngine
+from terrareg.analytics_buffer import AnalyticsBuffer
+from terrareg.database import Database
+from terrareg.models import Module, ModuleProvider, ModuleVersion, Namespace
+from . import AnalyticsIntegrationTest
+
+
+class TestAnalyticsBuffer(AnalyticsIntegrationTest):
+    """Test buffering of analytics events"""
+
+    _TEST_ANALYTICS_DATA = {}
+
+    def setup_method(self, method):
+        """Remove any pre-existing analytics"""
+        self._delete_analytics()
+
+    def teardown_method(self, method):
+        """Remove analytics created by test"""
+        self._delete_analytics()
+
+    @staticmethod
+    def _delete_analytics():
+        """Delete all analytics"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.analytics.delete())
+
+    @staticmethod
+    def _get_analytics_rows():
+        """Return all analytics rows"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            return conn.execute(db.analytics.select()).fetchall()
+
+    def test_record_module_version_download(self):
+        """Test module version downloads are buffered and inserted on flush"""
+        module_version = ModuleVersion.get(ModuleProvider.get(Module(Namespace('testnamespace'), 'publishedmodule'), 'testprovider'), '1.5.0')
+
+        with tempfile.TemporaryDirectory() as spool_directory:
+            analytics_buffer = AnalyticsBuffer(spool_directory=spool_directory, max_events=100, flush_interval=300)
+            analytics_buffer.start()
+            try:
+                with mock.patch('terrareg.config.Config.ANALYTICS_BUFFER_MAX_EVENTS', 100), \
+                        mock.patch('terrareg.analytics_buffer.AnalyticsBuffer.get', mock.MagicMock(return_value=analytics_buffer)):
+                    for _ in range(3):
+                        AnalyticsEngine.record_module_version_download(
+                            namespace_name='testnamespace', module_name='publishedmodule', provider_name='testprovider',
+                            module_version=module_version, terraform_version='1.5.2',
+                            analytics_token='test-application', user_agent='Terraform/1.5.2',
+                            auth_token=None)
+
+                # Ensure events are not inserted until flushed
+                assert self._get_analytics_rows() == []
+                spool_files = os.listdir(spool_directory)
+                assert len(spool_files) == 1
+                with open(os.path.join(spool_directory, spool_files[0]), 'r') as spool_fh:
+                    assert len(spool_fh.readlines()) == 3
+
+                analytics_buffer.flush()
+
+                rows = self._get_analytics_rows()
+                assert len(rows) == 3
+                for row in rows:
+                    assert row['parent_module_version'] == module_version.pk
+                    assert row['analytics_token'] == 'test-application'
+                    assert row['terraform_version'] == '1.5.2'
+
+                # Ensure spool file containing flushed events has been removed
+                assert spool_files[0] not in os.listdir(spool_directory)
+            finally:
+                analytics_buffer.stop()
+
+            # Ensure spool file is removed when buffer is stopped
+            assert os.listdir(spool_directory) == []
+
+    def test_flush_on_max_events(self):
+        """Test buffer is flushed by flush thread when maximum number of events is reached"""
+        with tempfile.TemporaryDirectory() as spool_directory:
+            analytics_buffer = AnalyticsBuffer(spool_directory=spool_directory, max_events=2, flush_interval=300)
+            with mock.patch.object(analytics_buffer, 'flush', mock.MagicMock()) as mock_flush:
+                analytics_buffer.start()
+                try:
+                    analytics_buffer.add('analytics', {'parent_module_version': 1, 'timestamp': datetime.datetime.now()})
+                    time.sleep(0.5)
+                    mock_flush.assert_not_called()
+
+                    analytics_buffer.add('analytics', {'parent_module_version': 1, 'timestamp': datetime.datetime.now()})
+                    for _ in range(50):
+                        if mock_flush.called:
+                            break
+                        time.sleep(0.1)
+                    mock_flush.assert_called_once_with()
+                finally:
+                    analytics_buffer.stop()
+
+    def test_recover_spool_files(self):
+        """Test recovering events from spool files left by processes that have exited"""
+        timestamp = datetime.datetime(year=2024, month=5, day=2, hour=10, minute=21, second=2)
+        with tempfile.TemporaryDirectory() as spool_directory:
+            with open(os.path.join(spool_directory, 'orphaned.spool'), 'w') as spool_fh:
+                spool_fh.write(AnalyticsBuffer._serialise_event('analytics', {
+                    'parent_module_version': 1,
+                    'timestamp': timestamp,
+                    'analytics_token': 'recovered-application',
+                }))
+                # Add partially written event
+                spool_fh.write('{"table": "analytics", "val')
+
+            AnalyticsBuffer(spool_directory=spool_directory, max_events=100, flush_interval=300).recover_spool_files()
+
+            rows = self._get_analytics_rows()
+            assert len(rows) == 1
+            assert rows[0]['analytics_token'] == 'recovered-application'
+            assert rows[0]['timestamp'] == timestamp
+
+            assert os.listdir(spool_directory) == []
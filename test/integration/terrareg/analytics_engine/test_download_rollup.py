@@ -0,0 +1,258 @@
+
+import datetime
+import gzip
+import json
+import os
+import tempfile
+from unittest import mock
+
+from terrareg.analytics import AnalyticsEngine
+from terrareg.database import Database
+from terrareg.models import Module, ModuleProvider, ModuleVersion, Namespace
+from . import AnalyticsIntegrationTest
+
+
+class TestDownloadRollup(AnalyticsIntegrationTest):
+    """Test compaction of downloads into daily rollup and download statistics"""
+
+    _TEST_ANALYTICS_DATA = {}
+
+    def setup_method(self, method):
+        """Remove any pre-existing analytics"""
+        self._delete_analytics()
+
+    def teardown_method(self, method):
+        """Remove analytics created by test"""
+        self._delete_analytics()
+
+    @staticmethod
+    def _delete_analytics():
+        """Delete all analytics and rolled up downloads"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.analytics.delete())
+            conn.execute(db.analytics_daily_download.delete())
+            conn.execute(db.analytics_rollup_state.delete())
+
+    def _record_downloads(self, module_version, timestamps):
+        """Record download of module version at each of the timestamps"""
+        for timestamp in timestamps:
+            with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=timestamp)):
+                AnalyticsEngine.record_module_version_download(
+                    namespace_name='testnamespace', module_name='publishedmodule', provider_name='testprovider',
+                    module_version=module_version, terraform_version=None,
+                    analytics_token='test-application', user_agent=None,
+                    auth_token=None)
+
+    def test_compact_download_rollup(self):
+        """Test download statistics are unchanged after compacting downloads"""
+        module_provider = ModuleProvider.get(Module(Namespace('testnamespace'), 'publishedmodule'), 'testprovider')
+        module_version = ModuleVersion.get(module_provider, '1.5.0')
+        other_module_version = ModuleVersion.get(module_provider, '2.0.0')
+
+        now = datetime.datetime(year=2024, month=6, day=15, hour=12, minute=30)
+        self._record_downloads(module_version, [
+            # Previous day
+            now - datetime.timedelta(days=1),
+            # Within week
+            now - datetime.timedelta(days=6, hours=23),
+            # Either side of start of week
+            now - datetime.timedelta(days=7, minutes=-1),
+            now - datetime.timedelta(days=7, minutes=1),
+            # Within month
+            now - datetime.timedelta(days=20),
+            # Within year
+            now - datetime.timedelta(days=200),
+            # Outside of year
+            now - datetime.timedelta(days=400),
+        ])
+        self._record_downloads(other_module_version, [
+            now - datetime.timedelta(days=2),
+            now - datetime.timedelta(days=40),
+        ])
+        # Current day
+        self._record_downloads(module_version, [now - datetime.timedelta(hours=1)])
+
+        expected_stats = {'week': 5, 'month': 7, 'year': 9, 'total': 10}
+
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now)):
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == expected_stats
+
+            # Compact downloads into a row per module version and day,
+            # ensuring the current day is not rolled up
+            assert AnalyticsEngine.compact_download_rollup() == 7
+            db = Database.get()
+            with db.get_connection() as conn:
+                assert conn.execute(db.analytics_daily_download.select().where(
+                    db.analytics_daily_download.c.date == now.date()
+                )).fetchall() == []
+
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == expected_stats
+            assert AnalyticsEngine.get_module_version_total_downloads(module_version) == 8
+            assert AnalyticsEngine.get_module_version_total_downloads(other_module_version) == 2
+            assert AnalyticsEngine.get_total_downloads() == 10
+
+            # Ensure subsequent compaction does not duplicate rollup rows
+            assert AnalyticsEngine.compact_download_rollup() == 0
+            assert AnalyticsEngine.get_total_downloads() == 10
+
+        # Record download after rollup and compact on the following day
+        self._record_downloads(module_version, [now + datetime.timedelta(hours=2)])
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now + datetime.timedelta(days=1))):
+            assert AnalyticsEngine.compact_download_rollup() == 1
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == {
+                'week': 4, 'month': 8, 'year': 10, 'total': 11
+            }
+
+    def test_compact_download_rollup_late_downloads(self):
+        """Test downloads recorded for previous days after a rollup are included in the following rollup"""
+        module_provider = ModuleProvider.get(Module(Namespace('testnamespace'), 'publishedmodule'), 'testprovider')
+        module_version = ModuleVersion.get(module_provider, '1.5.0')
+
+        now = datetime.datetime(year=2024, month=6, day=15, hour=12, minute=30)
+        self._record_downloads(module_version, [now - datetime.timedelta(days=2)])
+
+        expected_stats = {'week': 3, 'month': 3, 'year': 3, 'total': 3}
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now)):
+            assert AnalyticsEngine.compact_download_rollup() == 1
+
+            # Record download for current day, followed by a late download
+            # for a day that has already been rolled up
+            self._record_downloads(module_version, [
+                now - datetime.timedelta(hours=1),
+                now - datetime.timedelta(days=2, hours=1),
+            ])
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == expected_stats
+
+            # Ensure late download is not rolled up with the current day
+            assert AnalyticsEngine.compact_download_rollup() == 0
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == expected_stats
+
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now + datetime.timedelta(days=1))):
+            # Ensure late download is rolled up into an additional row for its day
+            assert AnalyticsEngine.compact_download_rollup() == 2
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == expected_stats
+            assert AnalyticsEngine.get_module_version_total_downloads(module_version) == 3
+            assert AnalyticsEngine.get_total_downloads() == 3
+
+    def test_compact_download_rollup_safety_window(self):
+        """Test downloads within the rollup safety window are not rolled up"""
+        module_provider = ModuleProvider.get(Module(Namespace('testnamespace'), 'publishedmodule'), 'testprovider')
+        module_version = ModuleVersion.get(module_provider, '1.5.0')
+
+        now = datetime.datetime(year=2024, month=6, day=15, hour=0, minute=2)
+        self._record_downloads(module_version, [
+            datetime.datetime(year=2024, month=6, day=14, hour=12),
+            # Previous day, within safety window
+            datetime.datetime(year=2024, month=6, day=14, hour=23, minute=59),
+        ])
+
+        expected_stats = {'week': 2, 'month': 2, 'year': 2, 'total': 2}
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now)):
+            # Ensure only the download outside of the safety window is rolled up
+            assert AnalyticsEngine.compact_download_rollup() == 1
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == expected_stats
+
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now + datetime.timedelta(minutes=10))):
+            # Ensure download is rolled up once outside of the safety window
+            assert AnalyticsEngine.compact_download_rollup() == 1
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == expected_stats
+            assert AnalyticsEngine.get_total_downloads() == 2
+
+    def test_delete_analytics_for_module_version(self):
+        """Test deleting analytics for module version removes rolled up downloads"""
+        module_provider = ModuleProvider.get(Module(Namespace('testnamespace'), 'publishedmodule'), 'testprovider')
+        module_version = ModuleVersion.get(module_provider, '1.5.0')
+
+        now = datetime.datetime(year=2024, month=6, day=15, hour=12, minute=30)
+        self._record_downloads(module_version, [now - datetime.timedelta(days=2), now - datetime.timedelta(hours=1)])
+
+        with mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now)):
+            AnalyticsEngine.compact_download_rollup()
+            assert AnalyticsEngine.get_module_version_total_downloads(module_version) == 2
+
+            AnalyticsEngine.delete_analytics_for_module_version(module_version)
+            assert AnalyticsEngine.get_module_version_total_downloads(module_version) == 0
+
+    def test_archive_analytics(self):
+        """Test archiving downloads older than retention period into monthly archive files"""
+        module_provider = ModuleProvider.get(Module(Namespace('testnamespace'), 'publishedmodule'), 'testprovider')
+        module_version = ModuleVersion.get(module_provider, '1.5.0')
+
+        now = datetime.datetime(year=2024, month=6, day=15, hour=12, minute=30)
+        self._record_downloads(module_version, [
+            now - datetime.timedelta(days=5),
+            # Months of previous year
+            datetime.datetime(year=2023, month=4, day=30, hour=23),
+            datetime.datetime(year=2023, month=3, day=1, hour=1),
+            datetime.datetime(year=2023, month=3, day=20),
+            # Current day
+            now - datetime.timedelta(hours=1),
+        ])
+
+        with tempfile.TemporaryDirectory() as data_directory, \
+                mock.patch('terrareg.config.Config.DATA_DIRECTORY', data_directory), \
+                mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now)):
+
+            # Ensure downloads are not archived when retention is disabled
+            with mock.patch('terrareg.config.Config.ANALYTICS_RETENTION_DAYS', 0):
+                AnalyticsEngine.compact_download_rollup()
+                assert AnalyticsEngine.archive_analytics() == 0
+
+            # Record late download within archive period, after the rollup,
+            # which must not be archived until it has been rolled up
+            self._record_downloads(module_version, [datetime.datetime(year=2023, month=3, day=10)])
+
+            with mock.patch('terrareg.config.Config.ANALYTICS_RETENTION_DAYS', 400):
+                assert AnalyticsEngine.archive_analytics() == 3
+                # Ensure subsequent archive does not archive further downloads
+                assert AnalyticsEngine.archive_analytics() == 0
+
+                assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == {
+                    'week': 2, 'month': 2, 'year': 2, 'total': 6
+                }
+
+            db = Database.get()
+            with db.get_connection() as conn:
+                assert len(conn.execute(db.analytics.select()).fetchall()) == 3
+
+            archive_directory = os.path.join(data_directory, 'analytics_archive')
+            archive_files = sorted(os.listdir(archive_directory))
+            assert [archive_file.split('-')[1:3] for archive_file in archive_files] == [['2023', '03'], ['2023', '04']]
+
+            with gzip.open(os.path.join(archive_directory, archive_files[0]), 'rt') as fh:
+                archived_rows = [json.loads(line) for line in fh]
+            assert [row['timestamp'] for row in archived_rows] == ['2023-03-01T01:00:00', '2023-03-20T00:00:00']
+            assert all(row['parent_module_version'] == module_version.pk for row in archived_rows)
+            assert all(row['analytics_token'] == 'test-application' for row in archived_rows)
+
+    def test_archive_analytics_minimum_retention(self):
+        """Test downloads in the first day of the year interval are retained, when retention period is shorter than a year"""
+        module_provider = ModuleProvider.get(Module(Namespace('testnamespace'), 'publishedmodule'), 'testprovider')
+        module_version = ModuleVersion.get(module_provider, '1.5.0')
+
+        now = datetime.datetime(year=2024, month=6, day=15, hour=12, minute=30)
+        self._record_downloads(module_version, [
+            # Older than a year
+            datetime.datetime(year=2023, month=6, day=14, hour=12),
+            # Either side of start of year interval, on the first (partial) day
+            now - datetime.timedelta(days=365, minutes=1),
+            now - datetime.timedelta(days=365, minutes=-1),
+            # Within month
+            now - datetime.timedelta(days=20),
+            # Current day
+            now - datetime.timedelta(hours=1),
+        ])
+
+        with tempfile.TemporaryDirectory() as data_directory, \
+                mock.patch('terrareg.config.Config.DATA_DIRECTORY', data_directory), \
+                mock.patch('terrareg.analytics.AnalyticsEngine.get_datetime_now', mock.MagicMock(return_value=now)), \
+                mock.patch('terrareg.config.Config.ANALYTICS_RETENTION_DAYS', 7):
+            AnalyticsEngine.compact_download_rollup()
+
+            # Ensure only downloads older than the minimum retention period are archived
+            assert AnalyticsEngine.archive_analytics() == 1
+
+            assert AnalyticsEngine.get_module_provider_download_stats(module_provider) == {
+                'week': 1, 'month': 2, 'year': 3, 'total': 5
+            }
@@ -1,13 +1,24 @@
 
 
 from unittest import mock
+
+import pytest
+
 from terrareg.analytics import AnalyticsEngine
+from terrareg.database import Database
 from . import AnalyticsIntegrationTest
 
 
 class TestGetPrometheusMetrics(AnalyticsIntegrationTest):
     """Test get_prometheus_metrics method."""
 
+    @pytest.fixture(autouse=True)
+    def mock_plugin_cache_statistics(self):
+        """Mock Terraform plugin cache and markdown cache statistics, as the caches may have been used by other tests."""
+        with mock.patch('terrareg.terraform_plugin_cache.TerraformPluginCache.get_statistics', mock.MagicMock(return_value=None)), \
+                mock.patch('terrareg.rendered_markdown_cache.RenderedMarkdownCache.get_statistics', mock.MagicMock(return_value=None)):
+            yield
+
     def test_get_prometheus_with_no_modules(self):
         """Test function with no analytics recorded or module providers."""
         get_total_count_mock = mock.MagicMock(return_value=0)
@@ -80,4 +91,88 @@ module_provider_usage{module_provider_id="testnamespace/publishedmodule/testprov
 module_provider_usage{module_provider_id="testnamespace/publishedmodule/testprovider", analytics_token="without-analytics-key"} 1
 module_provider_usage{module_provider_id="testnamespace/secondmodule/testprovider", analytics_token="duplicate-application"} 1
 module_provider_usage{module_provider_id="testnamespace/secondmodule/testprovider", analytics_token="test-app-using-second-module"} 1
+""".strip()
+
+    def test_get_prometheus_with_plugin_cache_statistics(self):
+        """Test function with Terraform plugin cache statistics present."""
+        # Remove any analytics imported by previous tests
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.analytics.delete())
+
+        get_total_count_mock = mock.MagicMock(return_value=0)
+        get_module_provider_version_statistics_mock = mock.MagicMock(return_value=(0, 0, 0))
+        get_statistics_mock = mock.MagicMock(return_value={'hits': 5, 'misses': 2, 'evictions': 1, 'size': 1024})
+        with mock.patch('terrareg.models.ModuleProvider.get_total_count', get_total_count_mock), \
+                mock.patch('terrareg.analytics.AnalyticsEngine.get_module_provider_version_statistics', get_module_provider_version_statistics_mock), \
+                mock.patch('terrareg.terraform_plugin_cache.TerraformPluginCache.get_statistics', get_statistics_mock):
+            assert AnalyticsEngine.get_prometheus_metrics() == """
+# HELP module_providers_count Total number of module providers with a published version
+# TYPE module_providers_count counter
+module_providers_count 0
+# HELP module_version_major_count Total number of major versions released
+# TYPE module_version_major_count counter
+module_version_major_count 0
+# HELP module_version_minor_count Total number of minor versions released
+# TYPE module_version_minor_count counter
+module_version_minor_count 0
+# HELP module_version_patch_count Total number of patch versions released
+# TYPE module_version_patch_count counter
+module_version_patch_count 0
+# HELP module_provider_usage Analytics tokens used in a module provider
+# TYPE module_provider_usage counter
+# HELP terraform_plugin_cache_hits Terraform providers used from the plugin cache during module extraction
+# TYPE terraform_plugin_cache_hits counter
+terraform_plugin_cache_hits 5
+# HELP terraform_plugin_cache_misses Terraform providers downloaded into the plugin cache during module extraction
+# TYPE terraform_plugin_cache_misses counter
+terraform_plugin_cache_misses 2
+# HELP terraform_plugin_cache_evictions Terraform providers evicted from the plugin cache
+# TYPE terraform_plugin_cache_evictions counter
+terraform_plugin_cache_evictions 1
+# HELP terraform_plugin_cache_size Size of the Terraform plugin cache in bytes
+# TYPE terraform_plugin_cache_size gauge
+terraform_plugin_cache_size 1024
+""".strip()
+
+    def test_get_prometheus_with_markdown_cache_statistics(self):
+        """Test function with rendered markdown cache statistics present."""
+        # Remove any analytics imported by previous tests
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.analytics.delete())
+
+        get_total_count_mock = mock.MagicMock(return_value=0)
+        get_module_provider_version_statistics_mock = mock.MagicMock(return_value=(0, 0, 0))
+        get_statistics_mock = mock.MagicMock(return_value={'hits': 12, 'misses': 4, 'evictions': 0, 'size': 20480})
+        with mock.patch('terrareg.models.ModuleProvider.get_total_count', get_total_count_mock), \
+                mock.patch('terrareg.analytics.AnalyticsEngine.get_module_provider_version_statistics', get_module_provider_version_statistics_mock), \
+                mock.patch('terrareg.rendered_markdown_cache.RenderedMarkdownCache.get_statistics', get_statistics_mock):
+            assert AnalyticsEngine.get_prometheus_metrics() == """
+# HELP module_providers_count Total number of module providers with a published version
+# TYPE module_providers_count counter
+module_providers_count 0
+# HELP module_version_major_count Total number of major versions released
+# TYPE module_version_major_count counter
+module_version_major_count 0
+# HELP module_version_minor_count Total number of minor versions released
+# TYPE module_version_minor_count counter
+module_version_minor_count 0
+# HELP module_version_patch_count Total number of patch versions released
+# TYPE module_version_patch_count counter
+module_version_patch_count 0
+# HELP module_provider_usage Analytics tokens used in a module provider
+# TYPE module_provider_usage counter
+# HELP rendered_markdown_cache_hits Markdown content served from the rendered markdown cache
+# TYPE rendered_markdown_cache_hits counter
+rendered_markdown_cache_hits 12
+# HELP rendered_markdown_cache_misses Markdown content rendered and added to the rendered markdown cache
+# TYPE rendered_markdown_cache_misses counter
+rendered_markdown_cache_misses 4
+# HELP rendered_markdown_cache_evictions Rendered markdown content evicted from the cache
+# TYPE rendered_markdown_cache_evictions counter
+rendered_markdown_cache_evictions 0
+# HELP rendered_markdown_cache_size Size of the rendered markdown cache in bytes
+# TYPE rendered_markdown_cache_size gauge
+rendered_markdown_cache_size 20480
 """.strip()
@@ -159,7 +159,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response.status_code = request_response_code
         mock_response.text = request_response
 
-        with unittest.mock.patch('terrareg.provider_source.github.requests.post', unittest.mock.MagicMock()) as mock_requests_post:
+        with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.post', unittest.mock.MagicMock()) as mock_requests_post:
             mock_requests_post.return_value = mock_response
 
             assert test_provider_source.get_user_access_token(code="abcdef-inputcode") == expected_response
@@ -201,7 +201,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response.status_code = 200
         mock_response.json.side_effect = response_data_values
 
-        with unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock()) as mock_requests_get, \
+        with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock()) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._add_repository') as mock__add_repository:
             mock_requests_get.return_value = mock_response
 
@@ -241,7 +241,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response = unittest.mock.MagicMock()
         mock_response.status_code = 500
 
-        with unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock()) as mock_requests_get, \
+        with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock()) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._add_repository') as mock__add_repository:
             mock_requests_get.return_value = mock_response
 
@@ -259,7 +259,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
                 unittest.mock.patch(
                     'terrareg.provider_source.github.GithubProviderSource._is_entity_org_or_user',
                     unittest.mock.MagicMock()) as mock__is_entity_org_or_user, \
-                unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock()) as mock_requests_get:
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock()) as mock_requests_get:
 
             mock__get_default_access_token.return_value = None
 
@@ -278,7 +278,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
                 unittest.mock.patch(
                     'terrareg.provider_source.github.GithubProviderSource._is_entity_org_or_user',
                     unittest.mock.MagicMock()) as mock__is_entity_org_or_user, \
-                unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock()) as mock_requests_get:
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock()) as mock_requests_get:
 
             mock__get_default_access_token.return_value = "abcdefg-access-token"
             mock__is_entity_org_or_user.return_value = None
@@ -326,7 +326,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
                 unittest.mock.patch(
                     'terrareg.provider_source.github.GithubProviderSource._is_entity_org_or_user',
                     unittest.mock.MagicMock(return_value=namespace_type)) as mock__is_entity_org_or_user, \
-                unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._add_repository') as mock__add_repository:
 
             test_provider_source.refresh_namespace_repositories(namespace=test_namespace)
@@ -372,7 +372,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
                 unittest.mock.patch(
                     'terrareg.provider_source.github.GithubProviderSource._is_entity_org_or_user',
                     unittest.mock.MagicMock(return_value=terrareg.namespace_type.NamespaceType.GITHUB_ORGANISATION)) as mock__is_entity_org_or_user, \
-                unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._add_repository') as mock__add_repository:
 
             test_provider_source.refresh_namespace_repositories(namespace=test_namespace)
@@ -586,7 +586,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         with unittest.mock.patch(
                     'terrareg.provider_source.github.GithubProviderSource._get_access_token_for_provider',
                     unittest.mock.MagicMock(return_value='abcdef-test-access-token')) as mock__get_access_token_for_provider, \
-                unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._process_release', mock__process_release):
 
             assert test_provider_source.get_new_releases(provider=test_provider) == mock_release_metadata
@@ -647,7 +647,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         with unittest.mock.patch(
                     'terrareg.provider_source.github.GithubProviderSource._get_access_token_for_provider',
                     unittest.mock.MagicMock(return_value='abcdef-test-access-token')) as mock__get_access_token_for_provider, \
-                unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._process_release', mock__process_release):
 
             assert test_provider_source.get_new_releases(provider=test_provider) == []
@@ -698,7 +698,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         with unittest.mock.patch(
                     'terrareg.provider_source.github.GithubProviderSource._get_access_token_for_provider',
                     unittest.mock.MagicMock(return_value='abcdef-test-access-token')) as mock__get_access_token_for_provider, \
-                unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._process_release', mock__process_release):
 
             # Ensure only the release metadata is returned
@@ -755,7 +755,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         with unittest.mock.patch(
                     'terrareg.provider_source.github.GithubProviderSource._get_access_token_for_provider',
                     unittest.mock.MagicMock(return_value='abcdef-test-access-token')) as mock__get_access_token_for_provider, \
-                unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._process_release', mock__process_release):
 
             # Ensure no metadata is returned
@@ -805,7 +805,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
                     'terrareg.provider_source.github.GithubProviderSource._get_access_token_for_provider',
                     unittest.mock.MagicMock(return_value=get_access_token_for_provider_response)) as mock_get_access_token_for_provider, \
                 unittest.mock.patch(
-                    'terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
+                    'terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
 
             assert test_provider_source.get_release_artifact(
                 provider=test_provider,
@@ -850,7 +850,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
                     'terrareg.provider_source.github.GithubProviderSource._get_access_token_for_provider',
                     unittest.mock.MagicMock(return_value=get_access_token_for_provider_response)) as mock_get_access_token_for_provider, \
                 unittest.mock.patch(
-                    'terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
+                    'terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
 
             assert test_provider_source.get_release_archive(
                 provider=test_provider,
@@ -1029,7 +1029,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response.status_code = response_code
         mock_response.json = unittest.mock.MagicMock(return_value=response_data)
         mock_request_get = unittest.mock.MagicMock(return_value=mock_response)
-        with unittest.mock.patch("terrareg.provider_source.github.requests.get", mock_request_get):
+        with unittest.mock.patch("terrareg.provider_source.http_client.ProviderSourceHttpClient.get", mock_request_get):
             assert test_provider_source.get_username(access_token) == expected_response
 
         if expect_call:
@@ -1102,7 +1102,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response.status_code = response_code
         mock_response.json = unittest.mock.MagicMock(return_value=response_data)
         mock_request_get = unittest.mock.MagicMock(return_value=mock_response)
-        with unittest.mock.patch("terrareg.provider_source.github.requests.get", mock_request_get):
+        with unittest.mock.patch("terrareg.provider_source.http_client.ProviderSourceHttpClient.get", mock_request_get):
             assert test_provider_source.get_user_organisations(access_token) == expected_response
 
         if expect_call:
@@ -1240,7 +1240,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
             logo_url="https://example.com/logo.png"
         )
 
-        with unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
+        with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
             assert test_provider_source._get_commit_hash_by_release(
                 repository=repository,
                 tag_name="v5.2.1",
@@ -1334,7 +1334,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response.status_code = status_code
         mock_response.json.return_value = response_data
 
-        with unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
+        with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
             res = test_provider_source._get_release_artifacts_metadata(
                 repository=test_repository,
                 release_id=173729,
@@ -1373,7 +1373,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response.json.return_value = json_res
 
         with unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._generate_jwt', unittest.mock.MagicMock(return_value='unittest JWT Auth')), \
-                unittest.mock.patch('terrareg.provider_source.github.requests.post', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_post:
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.post', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_post:
 
             if should_raise:
                 with pytest.raises(terrareg.errors.UnableToGenerateGithubInstallationAccessTokenError):
@@ -1389,6 +1389,38 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         else:
             mock_requests_post.assert_not_called()
 
+    @pytest.mark.parametrize('expires_at, current_time, expect_regenerate', [
+        # Token has not expired
+        ('2023-11-06T08:00:00Z', 1699255891, False),
+        # Token expires within expiry margin
+        ('2023-11-06T07:33:00Z', 1699255891, True),
+        # Token has expired
+        ('2023-11-06T07:00:00Z', 1699255891, True),
+        # No expiry returned, defaulting to 1 hour
+        (None, 1699255891, False),
+        (None, 1699255891 + 3600, True),
+    ])
+    def test_generate_app_installation_token_cached(self, expires_at, current_time, expect_regenerate, test_provider_source):
+        """Test generate_app_installation_token caches tokens until they expire"""
+        installation_id = f'unittest-cached-installation-{expires_at}-{current_time}'
+        mock_response = unittest.mock.MagicMock()
+        mock_response.status_code = 201
+        mock_response.json.return_value = {'token': 'unittest-access-token', 'expires_at': expires_at}
+
+        with unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._generate_jwt', unittest.mock.MagicMock(return_value='unittest JWT Auth')), \
+                unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.post', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_post:
+
+            with unittest.mock.patch('terrareg.provider_source.github.time.time', unittest.mock.MagicMock(return_value=1699255891)):
+                assert test_provider_source.generate_app_installation_token(installation_id=installation_id) == 'unittest-access-token'
+            assert mock_requests_post.call_count == 1
+
+            mock_response.json.return_value = {'token': 'unittest-new-access-token', 'expires_at': None}
+            with unittest.mock.patch('terrareg.provider_source.github.time.time', unittest.mock.MagicMock(return_value=current_time)):
+                assert test_provider_source.generate_app_installation_token(installation_id=installation_id) == (
+                    'unittest-new-access-token' if expect_regenerate else 'unittest-access-token'
+                )
+            assert mock_requests_post.call_count == (2 if expect_regenerate else 1)
+
     @pytest.mark.parametrize('private_key, expected_result', {
         (None, None),
         (TEST_GITHUB_PRIVATE_KEY.encode('utf-8'),
@@ -1413,7 +1445,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response.status_code = status_code
         mock_response.json.return_value = response_data
 
-        with unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
+        with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._generate_jwt', unittest.mock.MagicMock(return_value='unittest-mock-jwt')):
 
             if should_raise:
@@ -1464,7 +1496,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
 
         test_namespace.update_attributes(namespace_type=namespace_type)
 
-        with unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
+        with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get, \
                 unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource._generate_jwt', unittest.mock.MagicMock(return_value='unittest-mock-jwt')):
             assert test_provider_source.get_github_app_installation_id(
                 namespace=test_namespace
@@ -1496,7 +1528,7 @@ class TestGithubProviderSource(BaseProviderSourceTests):
         mock_response.status_code = status_code
         mock_response.json.return_value = response_data
 
-        with unittest.mock.patch('terrareg.provider_source.github.requests.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
+        with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get', unittest.mock.MagicMock(return_value=mock_response)) as mock_requests_get:
             assert test_provider_source._is_entity_org_or_user(
                 identity="unit-test-identity-name",
                 access_token="unittest-access-token"
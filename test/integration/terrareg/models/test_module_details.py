@@ -1,10 +1,12 @@
 
 from datetime import datetime
 import json
+import unittest.mock
 
 import pytest
 import sqlalchemy
 
+from terrareg.blob_store import BlobStore
 from terrareg.database import Database
 from terrareg.models import Example, ExampleFile, Module, ModuleDetails, Namespace, ModuleProvider, ModuleVersion
 import terrareg.errors
@@ -55,6 +57,44 @@ class TestModuleDetails(TerraregIntegrationTest):
         assert module_details.tfsec == json.loads(test_tfsec)
         assert module_details.infracost == json.loads(test_infracost)
 
+    def test_update_attributes_deduplicates_content(self):
+        """Test identical content between module details is stored once in blob store"""
+        test_readme_content = 'shared readme content between module details'
+
+        module_details_1 = ModuleDetails.create()
+        module_details_1.update_attributes(readme_content=test_readme_content, terraform_docs=test_readme_content)
+        module_details_2 = ModuleDetails.create()
+        module_details_2.update_attributes(readme_content=test_readme_content)
+
+        blob_hash = BlobStore.get_hash(Database.encode_blob(test_readme_content))
+
+        db = Database.get()
+
+        def get_reference_count():
+            with db.get_connection() as conn:
+                row = conn.execute(
+                    db.module_details_blob.select().where(
+                        db.module_details_blob.c.hash == blob_hash
+                    )
+                ).fetchone()
+            return row['reference_count'] if row else None
+
+        assert get_reference_count() == 3
+        assert module_details_2.readme_content == Database.encode_blob(test_readme_content)
+
+        # Replace content and ensure reference is removed
+        module_details_1.update_attributes(readme_content='new readme content')
+        assert get_reference_count() == 2
+        assert module_details_1.readme_content == Database.encode_blob('new readme content')
+        assert module_details_1.terraform_docs == Database.encode_blob(test_readme_content)
+
+        module_details_1.delete()
+        assert get_reference_count() == 1
+
+        module_details_2.update_attributes(readme_content=None)
+        assert get_reference_count() is None
+        assert module_details_2.readme_content == b''
+
     def test_delete(self):
         """Test delete method of ModuleDetails"""
         module_details = ModuleDetails.create()
@@ -122,3 +162,66 @@ class TestModuleDetails(TerraregIntegrationTest):
                 {"classes": ["module.main_call-root"], "data": {"id": "root.module.main_call", "source": "module.main_call", "target": "root"}}
             ]
         }
+
+    def test_update_graph_json(self):
+        """Test pre-generating graph JSON and obtaining graph JSON from pre-generated data"""
+        module_version = ModuleVersion.get(ModuleProvider.get(Module(Namespace.get("moduledetails"), "graph-test"), "provider"), "1.0.0")
+        source_module_details = module_version.module_details
+
+        module_details = ModuleDetails.create()
+        module_details.update_attributes(
+            terraform_graph=source_module_details.terraform_graph
+        )
+
+        # Ensure graph JSON is generated from graph data, before graph JSON is pre-generated
+        expected_graph_json = {
+            (full_resource_names, full_module_names): module_details.get_graph_json(
+                full_resource_names=full_resource_names,
+                full_module_names=full_module_names
+            )
+            for full_resource_names, full_module_names in ModuleDetails.GRAPH_JSON_OPTIONS
+        }
+
+        assert ModuleDetails.backfill_graph_json() >= 1
+        assert module_details._get_db_row()["terraform_graph_json"]
+
+        with unittest.mock.patch('terrareg.models.ModuleDetails._generate_graph_json') as mock_generate_graph_json:
+            for (full_resource_names, full_module_names), graph_json in expected_graph_json.items():
+                assert module_details.get_graph_json(
+                    full_resource_names=full_resource_names,
+                    full_module_names=full_module_names
+                ) == graph_json
+            mock_generate_graph_json.assert_not_called()
+
+        # Ensure backfill does not re-generate graph JSON
+        with unittest.mock.patch('terrareg.models.ModuleDetails.update_graph_json') as mock_update_graph_json:
+            assert ModuleDetails.backfill_graph_json() == 0
+            mock_update_graph_json.assert_not_called()
+
+        module_details.delete()
+
+    def test_update_graph_json_parses_graph_once(self):
+        """Test graph data is parsed once when pre-generating graph JSON for all options"""
+        module_version = ModuleVersion.get(ModuleProvider.get(Module(Namespace.get("moduledetails"), "graph-test"), "provider"), "1.0.0")
+
+        module_details = ModuleDetails.create()
+        module_details.update_attributes(
+            terraform_graph=module_version.module_details.terraform_graph
+        )
+
+        with unittest.mock.patch('terrareg.models.ModuleDetails._parse_terraform_graph',
+                                 autospec=True, side_effect=ModuleDetails._parse_terraform_graph) as mock_parse_terraform_graph:
+            module_details.update_graph_json()
+        mock_parse_terraform_graph.assert_called_once_with(module_details)
+        assert module_details._get_db_row()["terraform_graph_json"]
+
+        module_details.delete()
+
+    def test_update_graph_json_without_graph(self):
+        """Test pre-generating graph JSON for module details without graph data"""
+        module_details = ModuleDetails.create()
+        module_details.update_graph_json()
+
+        assert module_details.get_graph_json() is None
+
+        module_details.delete()
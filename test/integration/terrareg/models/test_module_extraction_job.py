@@ -0,0 +1,260 @@
+
+import datetime
+import unittest.mock
+
+import pytest
+
+from terrareg.database import Database
+from terrareg.models import Module, ModuleProvider, Namespace
+from terrareg.module_extraction_job_model import ModuleExtractionJob
+from terrareg.module_extraction_job_status import ModuleExtractionJobStatus
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestModuleExtractionJob(TerraregIntegrationTest):
+    """Test ModuleExtractionJob model class"""
+
+    def setup_method(self, method):
+        """Remove any pre-existing extraction jobs before running each test."""
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.module_extraction_job.delete())
+
+    @staticmethod
+    def _get_module_provider():
+        """Return test module provider"""
+        return ModuleProvider.get(Module(Namespace.get('moduleextraction'), 'test-module'), 'testprovider')
+
+    def test_create(self):
+        """Test creating extraction job"""
+        module_provider = self._get_module_provider()
+        job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+
+        assert isinstance(job, ModuleExtractionJob)
+        assert job.version == '5.6.7'
+        assert job.status is ModuleExtractionJobStatus.QUEUED
+        assert job.attempts == 0
+        assert job.module_provider == module_provider
+
+    def test_create_duplicate_queued_job(self):
+        """Test creating extraction job for a version that is already queued returns the existing job"""
+        module_provider = self._get_module_provider()
+        job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        duplicate_job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        assert duplicate_job.pk == job.pk
+
+        other_job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.8')
+        assert other_job.pk != job.pk
+
+    def test_get(self):
+        """Test obtaining job for module provider"""
+        module_provider = self._get_module_provider()
+        job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+
+        assert ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk).pk == job.pk
+        assert ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk + 100) is None
+
+        other_module_provider = ModuleProvider.get(Module(Namespace.get('moduleextraction'), 'bitbucketexample'), 'testprovider')
+        assert ModuleExtractionJob.get(module_provider=other_module_provider, pk=job.pk) is None
+
+    def test_claim_next(self):
+        """Test claiming jobs"""
+        module_provider = self._get_module_provider()
+        first_job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        second_job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.8')
+
+        claimed_job = ModuleExtractionJob.claim_next(worker_id='unittest-worker')
+        assert claimed_job.pk == first_job.pk
+        assert claimed_job.status is ModuleExtractionJobStatus.RUNNING
+        assert claimed_job.attempts == 1
+        assert claimed_job.get_api_details()['started_at'] is not None
+
+        assert ModuleExtractionJob.claim_next(worker_id='unittest-worker').pk == second_job.pk
+
+        # Ensure no more jobs are available
+        assert ModuleExtractionJob.claim_next(worker_id='unittest-worker') is None
+
+    def test_mark_succeeded(self):
+        """Test marking job as succeeded"""
+        module_provider = self._get_module_provider()
+        ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        job = ModuleExtractionJob.claim_next(worker_id='unittest-worker')
+
+        job.update_progress('Unittest progress')
+        job.mark_succeeded()
+
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk)
+        assert job.status is ModuleExtractionJobStatus.SUCCEEDED
+        api_details = job.get_api_details(include_log=True)
+        assert api_details['progress'] == 'Completed'
+        assert api_details['finished_at'] is not None
+        assert 'Unittest progress\n' in api_details['log']
+        assert 'Extraction completed successfully\n' in api_details['log']
+
+    @pytest.mark.parametrize('attempts, expected_delay', [
+        (1, 30),
+        (2, 60),
+    ])
+    def test_mark_failed_with_retry(self, attempts, expected_delay):
+        """Test marking job as failed, when further attempts are available"""
+        module_provider = self._get_module_provider()
+        ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        job = ModuleExtractionJob.claim_next(worker_id='unittest-worker')
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.module_extraction_job.update().where(
+                db.module_extraction_job.c.id==job.pk
+            ).values(attempts=attempts))
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_MAX_ATTEMPTS', 3), \
+                unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_RETRY_BACKOFF', 30):
+            job.mark_failed('Unittest error')
+
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk)
+        assert job.status is ModuleExtractionJobStatus.QUEUED
+        api_details = job.get_api_details(include_log=True)
+        assert api_details['error'] == 'Unittest error'
+        assert f'Attempt {attempts} failed: Unittest error\n' in api_details['log']
+
+        next_attempt_at = datetime.datetime.fromisoformat(api_details['next_attempt_at'])
+        expected_next_attempt_at = datetime.datetime.now() + datetime.timedelta(seconds=expected_delay)
+        assert (expected_next_attempt_at - datetime.timedelta(seconds=10)) < next_attempt_at <= expected_next_attempt_at
+
+        # Ensure job is not claimed before backoff has elapsed
+        assert ModuleExtractionJob.claim_next(worker_id='unittest-worker') is None
+
+    def test_mark_failed_after_max_attempts(self):
+        """Test marking job as failed, when all attempts have been used"""
+        module_provider = self._get_module_provider()
+        ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        job = ModuleExtractionJob.claim_next(worker_id='unittest-worker')
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_MAX_ATTEMPTS', 1):
+            job.mark_failed('Unittest error')
+
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk)
+        assert job.status is ModuleExtractionJobStatus.FAILED
+        api_details = job.get_api_details()
+        assert api_details['progress'] == 'Failed'
+        assert api_details['next_attempt_at'] is None
+
+    def test_claim_next_requeues_stale_running_job(self):
+        """Test jobs left running by terminated workers are re-queued or failed"""
+        module_provider = self._get_module_provider()
+        ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        job = ModuleExtractionJob.claim_next(worker_id='unittest-worker')
+
+        # Ensure running job is not re-claimed before the timeout
+        assert ModuleExtractionJob.claim_next(worker_id='unittest-worker') is None
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.module_extraction_job.update().where(
+                db.module_extraction_job.c.id==job.pk
+            ).values(
+                heartbeat_at=datetime.datetime.now() - datetime.timedelta(seconds=3660)
+            ))
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT', 3600):
+            reclaimed_job = ModuleExtractionJob.claim_next(worker_id='unittest-worker-2')
+        assert reclaimed_job.pk == job.pk
+        assert reclaimed_job.status is ModuleExtractionJobStatus.RUNNING
+        assert reclaimed_job.attempts == 2
+
+        with db.get_connection() as conn:
+            conn.execute(db.module_extraction_job.update().where(
+                db.module_extraction_job.c.id==job.pk
+            ).values(
+                heartbeat_at=datetime.datetime.now() - datetime.timedelta(seconds=3660)
+            ))
+
+        # Ensure job is failed once all attempts have been used
+        with unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_MAX_ATTEMPTS', 2), \
+                unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT', 3600):
+            assert ModuleExtractionJob.claim_next(worker_id='unittest-worker') is None
+        failed_job = ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk)
+        assert failed_job.status is ModuleExtractionJobStatus.FAILED
+        assert failed_job.get_api_details()['error'] == 'Extraction did not complete within the running job timeout'
+
+    def test_claim_next_does_not_requeue_job_with_recent_heartbeat(self):
+        """Test long-running jobs that record heartbeats are not re-queued"""
+        module_provider = self._get_module_provider()
+        ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        job = ModuleExtractionJob.claim_next(worker_id='unittest-worker')
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.module_extraction_job.update().where(
+                db.module_extraction_job.c.id==job.pk
+            ).values(
+                started_at=datetime.datetime.now() - datetime.timedelta(seconds=3660),
+                heartbeat_at=datetime.datetime.now() - datetime.timedelta(seconds=3660)
+            ))
+
+        job.update_progress('Unittest progress')
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT', 3600):
+            assert ModuleExtractionJob.claim_next(worker_id='unittest-worker-2') is None
+
+        with db.get_connection() as conn:
+            conn.execute(db.module_extraction_job.update().where(
+                db.module_extraction_job.c.id==job.pk
+            ).values(
+                heartbeat_at=datetime.datetime.now() - datetime.timedelta(seconds=3660)
+            ))
+
+        job.heartbeat()
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT', 3600):
+            assert ModuleExtractionJob.claim_next(worker_id='unittest-worker-2') is None
+
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk)
+        assert job.status is ModuleExtractionJobStatus.RUNNING
+        assert job.attempts == 1
+
+    def test_stale_worker_does_not_update_reclaimed_job(self):
+        """Test worker of a re-queued job does not overwrite the job once it has been claimed by another worker"""
+        module_provider = self._get_module_provider()
+        ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        stale_job = ModuleExtractionJob.claim_next(worker_id='unittest-worker')
+
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.module_extraction_job.update().where(
+                db.module_extraction_job.c.id==stale_job.pk
+            ).values(
+                heartbeat_at=datetime.datetime.now() - datetime.timedelta(seconds=3660)
+            ))
+
+        with unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT', 3600):
+            reclaimed_job = ModuleExtractionJob.claim_next(worker_id='unittest-worker-2')
+        assert reclaimed_job.pk == stale_job.pk
+
+        stale_job.update_progress('Stale progress')
+        stale_job.mark_succeeded()
+
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=stale_job.pk)
+        assert job.status is ModuleExtractionJobStatus.RUNNING
+        api_details = job.get_api_details(include_log=True)
+        assert api_details['progress'] == 'Starting extraction'
+        assert 'Stale progress' not in api_details['log']
+
+        stale_job.mark_failed('Stale error')
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=stale_job.pk)
+        assert job.status is ModuleExtractionJobStatus.RUNNING
+        assert job.get_api_details()['error'] == 'Extraction did not complete within the running job timeout'
+
+        reclaimed_job.mark_succeeded()
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=stale_job.pk)
+        assert job.status is ModuleExtractionJobStatus.SUCCEEDED
+
+    def test_get_by_module_provider(self):
+        """Test obtaining jobs for module provider, ordered by most recent"""
+        module_provider = self._get_module_provider()
+        first_job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.7')
+        second_job = ModuleExtractionJob.create(module_provider=module_provider, version='5.6.8')
+
+        assert [
+            job.pk for job in ModuleExtractionJob.get_by_module_provider(module_provider)
+        ] == [second_job.pk, first_job.pk]
@@ -1,4 +1,5 @@
 
+import json
 import os
 import shutil
 import tempfile
@@ -7,7 +8,7 @@ import pytest
 from terrareg.audit import AuditEvent
 from terrareg.database import Database
 
-from terrareg.models import GitProvider, Module, ModuleVersion, Namespace, ModuleProvider
+from terrareg.models import GitProvider, Module, ModuleDetails, ModuleVersion, Namespace, ModuleProvider, Submodule
 import terrareg.errors
 from test.integration.terrareg import TerraregIntegrationTest
 import terrareg.audit_action
@@ -95,6 +96,71 @@ class TestModuleProvider(TerraregIntegrationTest):
             '0.1.1', '0.0.9'
         ]
 
+    def test_get_terraform_api_versions(self):
+        """Test obtaining versions with dependencies of root module and submodules for Terraform API."""
+        namespace = Namespace(name='moduledetails')
+        module = Module(namespace=namespace, name='withterraformdocs')
+        module_provider = ModuleProvider.get(module=module, name='testprovider')
+        module_version = ModuleVersion.get(module_provider=module_provider, version='1.5.0')
+
+        module_details = ModuleDetails.create()
+        module_details.update_attributes(terraform_docs=json.dumps({
+            'modules': [
+                {'name': 'local', 'source': './local', 'version': None},
+                {'name': 'vpc', 'source': 'terraform-aws-modules/vpc/aws', 'version': '>= 5.0.0'},
+            ],
+            'providers': [{'name': 'aws', 'alias': None, 'version': '>= 4.0.0'}],
+        }))
+        submodule = Submodule.create(module_version=module_version, module_path='modules/network')
+        submodule.update_attributes(module_details_id=module_details.pk)
+        try:
+            module_version.update_dependencies()
+
+            assert module_provider.get_terraform_api_versions() == [
+                {
+                    'version': '1.5.0',
+                    'root': {
+                        'providers': [
+                            {'name': 'random', 'namespace': 'hashicorp', 'source': '', 'version': '5.2.1'},
+                            {'name': 'unsafe', 'namespace': 'someothercompany', 'source': '', 'version': '2.0.0'},
+                        ],
+                        'dependencies': []
+                    },
+                    'submodules': [
+                        {
+                            'path': 'modules/network',
+                            'providers': [
+                                {'name': 'aws', 'namespace': 'hashicorp', 'source': '', 'version': '>= 4.0.0'},
+                            ],
+                            'dependencies': [
+                                {'name': 'vpc', 'source': 'terraform-aws-modules/vpc/aws', 'version': '>= 5.0.0'},
+                            ]
+                        }
+                    ]
+                }
+            ]
+        finally:
+            submodule.delete()
+            module_version.update_dependencies()
+
+        assert module_provider.get_terraform_api_versions()[0]['submodules'] == []
+
+    def test_get_terraform_api_versions_without_dependencies(self):
+        """Test obtaining versions for Terraform API for module versions without dependencies."""
+        namespace = Namespace(name='testnamespace')
+        module = Module(namespace=namespace, name='wrongversionorder')
+        module_provider = ModuleProvider.get(module=module, name='testprovider')
+
+        versions = module_provider.get_terraform_api_versions(include_beta=False)
+        assert [version['version'] for version in versions] == [
+            '10.23.0', '2.1.0', '1.5.4',
+            '0.1.10', '0.1.09', '0.1.8',
+            '0.1.1', '0.0.9'
+        ]
+        for version in versions:
+            assert version['root'] == {'providers': [], 'dependencies': []}
+            assert version['submodules'] == []
+
     def test_module_provider_get_latest_version(self):
         """
         Test that a module provider with versions in the wrong order return correct
@@ -82,6 +82,8 @@ class TestProvider(TerraregIntegrationTest):
                 'default_provider_source_auth': use_default_provider_source_auth,
                 'description': 'Unit test repo for Terraform Provider',
                 'id': 1,
+                'last_release_poll_at': None,
+                'last_release_poll_error': None,
                 'latest_version_id': None,
                 'name': 'unittest-create',
                 'namespace_id': test_namespace.pk,
@@ -821,3 +823,50 @@ class TestProvider(TerraregIntegrationTest):
                 for provider_version_id in created_version_mapping.values():
                     conn.execute(db.provider_version_binary.delete(db.provider_version_binary.c.provider_version_id==provider_version_id))
                     conn.execute(db.provider_version.delete(db.provider_version.c.id==provider_version_id))
+
+    def test_get_versions_api_details_cache(self, test_provider, test_gpg_key):
+        """Test get_versions_api_details caches responses until versions are modified"""
+        created_version_ids = []
+        try:
+            provider_version = terrareg.provider_version_model.ProviderVersion(provider=test_provider, version="1.0.0")
+            provider_version._create_db_row(git_tag="v1.0.0", gpg_key=test_gpg_key)
+            created_version_ids.append(provider_version.pk)
+
+            with unittest.mock.patch('terrareg.provider_model.Provider._generate_versions_api_details',
+                                     side_effect=test_provider._generate_versions_api_details) as mock_generate:
+                first_response = test_provider.get_versions_api_details()
+                assert [version["version"] for version in first_response["versions"]] == ["1.0.0"]
+                assert first_response["versions"][0]["platforms"] == []
+
+                # Ensure cached response is returned
+                assert test_provider.get_versions_api_details() is first_response
+                assert mock_generate.call_count == 1
+
+                # Ensure cache is invalidated when binary is created
+                terrareg.provider_version_binary_model.ProviderVersionBinary.create(
+                    provider_version=provider_version,
+                    name=f"{test_provider.full_name}_1.0.0_linux_amd64.zip",
+                    checksum="abcefg1.0.0linuxamd64",
+                    content=b"sometestcontent"
+                )
+                assert test_provider.get_versions_api_details()["versions"][0]["platforms"] == [{"os": "linux", "arch": "amd64"}]
+                assert mock_generate.call_count == 2
+
+                # Ensure cache is invalidated when a version is created, without using the model,
+                # as would occur when a version is indexed by another process
+                db = terrareg.database.Database.get()
+                with db.get_connection() as conn:
+                    res = conn.execute(db.provider_version.insert().values(
+                        provider_id=test_provider.pk, version="1.1.0", git_tag="v1.1.0", beta=False, gpg_key_id=test_gpg_key.pk
+                    ))
+                    created_version_ids.append(res.inserted_primary_key[0])
+
+                assert [version["version"] for version in test_provider.get_versions_api_details()["versions"]] == ["1.1.0", "1.0.0"]
+                assert mock_generate.call_count == 3
+
+        finally:
+            db = terrareg.database.Database.get()
+            with db.get_connection() as conn:
+                for provider_version_id in created_version_ids:
+                    conn.execute(db.provider_version_binary.delete(db.provider_version_binary.c.provider_version_id==provider_version_id))
+                    conn.execute(db.provider_version.delete(db.provider_version.c.id==provider_version_id))
@@ -0,0 +1,153 @@
+
+import datetime
+import unittest.mock
+
+import pytest
+
+from terrareg.database import Database
+from terrareg.models import Namespace
+from terrareg.provider_index_job_model import ProviderIndexJob
+from terrareg.provider_index_job_status import ProviderIndexJobStatus
+from terrareg.provider_model import Provider
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestProviderIndexJob(TerraregIntegrationTest):
+    """Test ProviderIndexJob model class"""
+
+    def setup_method(self, method):
+        """Remove any pre-existing index jobs before running each test."""
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.provider_index_job.delete())
+
+    @staticmethod
+    def _get_provider(name='multiple-versions'):
+        """Return test provider"""
+        return Provider.get(namespace=Namespace.get('initial-providers'), name=name)
+
+    def test_create(self):
+        """Test creating index job"""
+        provider = self._get_provider()
+        job = ProviderIndexJob.create(provider=provider, version='5.6.7')
+
+        assert isinstance(job, ProviderIndexJob)
+        assert job.version == '5.6.7'
+        assert job.status is ProviderIndexJobStatus.QUEUED
+        assert job.attempts == 0
+        assert job.provider.pk == provider.pk
+
+    def test_create_duplicate_job(self):
+        """Test creating index job for a version that is already queued returns the existing job"""
+        provider = self._get_provider()
+        job = ProviderIndexJob.create(provider=provider, version='5.6.7')
+        assert ProviderIndexJob.create(provider=provider, version='5.6.7').pk == job.pk
+
+        assert ProviderIndexJob.create(provider=provider, version='5.6.8').pk != job.pk
+
+        # Ensure a new job is created once the existing job has succeeded
+        ProviderIndexJob.claim_next(worker_id='unittest-worker').mark_succeeded()
+        assert ProviderIndexJob.create(provider=provider, version='5.6.7').pk != job.pk
+
+    def test_claim_next(self):
+        """Test claiming jobs"""
+        provider = self._get_provider()
+        first_job = ProviderIndexJob.create(provider=provider, version='5.6.7')
+        second_job = ProviderIndexJob.create(provider=provider, version='5.6.8')
+
+        claimed_job = ProviderIndexJob.claim_next(worker_id='unittest-worker')
+        assert claimed_job.pk == first_job.pk
+        assert claimed_job.status is ProviderIndexJobStatus.RUNNING
+        assert claimed_job.attempts == 1
+
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker').pk == second_job.pk
+
+        # Ensure no more jobs are available
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker') is None
+
+    def test_claim_next_source_concurrency(self):
+        """Test jobs are not claimed when the concurrency limit for the provider source has been reached"""
+        first_job = ProviderIndexJob.create(provider=self._get_provider(), version='5.6.7')
+        second_job = ProviderIndexJob.create(provider=self._get_provider('update-attributes'), version='1.0.0')
+
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker', source_concurrency=1).pk == first_job.pk
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker', source_concurrency=1) is None
+
+        # Ensure job can be claimed once the running job completes
+        first_job.mark_succeeded()
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker', source_concurrency=1).pk == second_job.pk
+
+    def test_claim_next_source_concurrency_disabled(self):
+        """Test concurrency limit is not applied when set to 0"""
+        ProviderIndexJob.create(provider=self._get_provider(), version='5.6.7')
+        ProviderIndexJob.create(provider=self._get_provider(), version='5.6.8')
+
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker', source_concurrency=0) is not None
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker', source_concurrency=0) is not None
+
+    def test_claim_next_requeues_stale_running_job(self):
+        """Test jobs left running by terminated workers are re-queued or failed"""
+        ProviderIndexJob.create(provider=self._get_provider(), version='5.6.7')
+        job = ProviderIndexJob.claim_next(worker_id='unittest-worker')
+
+        # Ensure running job is not re-claimed before the timeout
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker') is None
+
+        db = Database.get()
+        def mark_job_stale():
+            with db.get_connection() as conn:
+                conn.execute(db.provider_index_job.update().where(
+                    db.provider_index_job.c.id==job.pk
+                ).values(
+                    started_at=datetime.datetime.now() - datetime.timedelta(seconds=ProviderIndexJob.RUNNING_JOB_TIMEOUT + 60)
+                ))
+
+        mark_job_stale()
+        with unittest.mock.patch('terrareg.config.Config.PROVIDER_INDEX_JOB_MAX_ATTEMPTS', 2):
+            reclaimed_job = ProviderIndexJob.claim_next(worker_id='unittest-worker-2')
+        assert reclaimed_job.pk == job.pk
+        assert reclaimed_job.status is ProviderIndexJobStatus.RUNNING
+        assert reclaimed_job.attempts == 2
+
+        # Ensure job is failed once all attempts have been used
+        mark_job_stale()
+        with unittest.mock.patch('terrareg.config.Config.PROVIDER_INDEX_JOB_MAX_ATTEMPTS', 2):
+            assert ProviderIndexJob.claim_next(worker_id='unittest-worker') is None
+        failed_job = ProviderIndexJob(pk=job.pk)
+        assert failed_job.status is ProviderIndexJobStatus.FAILED
+        assert failed_job.error == 'Indexing did not complete within the running job timeout'
+
+    @pytest.mark.parametrize('max_attempts, retry, expected_status', [
+        (3, True, ProviderIndexJobStatus.QUEUED),
+        (1, True, ProviderIndexJobStatus.FAILED),
+        (3, False, ProviderIndexJobStatus.FAILED),
+    ])
+    def test_mark_failed(self, max_attempts, retry, expected_status):
+        """Test marking job as failed"""
+        ProviderIndexJob.create(provider=self._get_provider(), version='5.6.7')
+        job = ProviderIndexJob.claim_next(worker_id='unittest-worker')
+
+        with unittest.mock.patch('terrareg.config.Config.PROVIDER_INDEX_JOB_MAX_ATTEMPTS', max_attempts), \
+                unittest.mock.patch('terrareg.config.Config.PROVIDER_INDEX_JOB_RETRY_BACKOFF', 60):
+            job.mark_failed('Unittest error', retry=retry)
+
+        job = ProviderIndexJob(pk=job.pk)
+        assert job.status is expected_status
+        assert job.error == 'Unittest error'
+
+        # Ensure retried job is not claimed until the backoff has passed
+        assert ProviderIndexJob.claim_next(worker_id='unittest-worker') is None
+
+    def test_get_queue_statistics(self):
+        """Test obtaining queue statistics"""
+        assert ProviderIndexJob.get_queue_statistics() == (0, None)
+
+        job = ProviderIndexJob.create(provider=self._get_provider(), version='5.6.7')
+        ProviderIndexJob.create(provider=self._get_provider(), version='5.6.8')
+
+        count, oldest_created_at = ProviderIndexJob.get_queue_statistics()
+        assert count == 2
+        assert datetime.datetime.now() - oldest_created_at < datetime.timedelta(minutes=1)
+
+        ProviderIndexJob.claim_next(worker_id='unittest-worker')
+        assert ProviderIndexJob.get_queue_statistics()[0] == 1
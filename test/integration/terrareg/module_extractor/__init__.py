@@ -179,9 +179,10 @@ output "submodule_test_output_{itx}" {{
             self._zip_file_directory.__exit__(*args, **kwargs)
 
     @staticmethod
-    def upload_module_version(module_version, zip_file):
+    def upload_module_version(module_version, zip_file, force_full_extraction=False):
         """Use ApiUploadModuleExtractor to upload version of module."""
-        with ApiUploadModuleExtractor(upload_file=None, module_version=module_version) as me:
+        with ApiUploadModuleExtractor(upload_file=None, module_version=module_version,
+                                      force_full_extraction=force_full_extraction) as me:
             with open(zip_file, 'rb') as zip_file_fh:
                 me._source_file = zip_file_fh
                 me._extract_archive()
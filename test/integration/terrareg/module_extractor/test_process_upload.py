@@ -4,7 +4,7 @@ import subprocess
 import json
 import os
 import tarfile
-from tempfile import TemporaryDirectory, mkdtemp
+from tempfile import mkdtemp
 import tempfile
 import platform
 
@@ -354,6 +354,65 @@ class TestProcessUpload(TerraregIntegrationTest):
             ]
         assert len(module_version.get_examples()) == 0
 
+    @pytest.mark.parametrize('force_full_extraction, incremental_module_extraction, expected_analysed_submodules', [
+        (False, True, ['modules/testmodule2']),
+        (True, True, ['modules/testmodule1', 'modules/testmodule2']),
+        (False, False, ['modules/testmodule1', 'modules/testmodule2']),
+    ])
+    def test_sub_modules_incremental_extraction(self, force_full_extraction, incremental_module_extraction, expected_analysed_submodules):
+        """Test re-use of analysis of unchanged submodules from previous module version."""
+        namespace = Namespace.get(name='testprocessupload', create=True)
+        module = Module(namespace=namespace, name='test-incremental')
+        module_provider = ModuleProvider.get(module=module, name='aws', create=True)
+
+        def upload_version(version, submodule_2_itx, force_full_extraction=False):
+            module_version = ModuleVersion(module_provider=module_provider, version=version)
+            module_version.prepare_module()
+            test_upload = UploadTestModule()
+            with test_upload as zip_file:
+                with test_upload as upload_directory:
+                    with open(os.path.join(upload_directory, 'main.tf'), 'w') as main_tf_fh:
+                        main_tf_fh.writelines(UploadTestModule.VALID_MAIN_TF_FILE)
+
+                    os.mkdir(os.path.join(upload_directory, 'modules'))
+                    for itx, submodule_itx in [(1, 1), (2, submodule_2_itx)]:
+                        root_dir = os.path.join(upload_directory, 'modules', f'testmodule{itx}')
+                        os.mkdir(root_dir)
+                        with open(os.path.join(root_dir, 'main.tf'), 'w') as main_tf_fh:
+                            main_tf_fh.writelines(UploadTestModule.SUB_MODULE_MAIN_TF.format(itx=submodule_itx))
+
+                UploadTestModule.upload_module_version(module_version=module_version, zip_file=zip_file,
+                                                       force_full_extraction=force_full_extraction)
+            return module_version
+
+        try:
+            upload_version('1.0.0', submodule_2_itx=2)
+
+            with mock.patch('terrareg.config.Config.INCREMENTAL_MODULE_EXTRACTION', incremental_module_extraction), \
+                    mock.patch.object(ApiUploadModuleExtractor, '_analyse_submodule', autospec=True,
+                                      side_effect=ApiUploadModuleExtractor._analyse_submodule) as mock_analyse_submodule:
+                # Upload new version, modifying the second submodule
+                module_version = upload_version('1.1.0', submodule_2_itx=3, force_full_extraction=force_full_extraction)
+
+            assert sorted([
+                call.kwargs['submodule_path']
+                for call in mock_analyse_submodule.call_args_list
+            ]) == expected_analysed_submodules
+
+            submodules = module_version.get_submodules()
+            submodules.sort(key=lambda x: x.path)
+            assert [sm.path for sm in submodules] == ['modules/testmodule1', 'modules/testmodule2']
+            for submodule, itx in zip(submodules, [1, 3]):
+                assert [input['name'] for input in submodule.get_terraform_inputs()] == [f'submodule_test_input_{itx}']
+
+            # Ensure re-used module details are not removed with previous version
+            ModuleVersion.get(module_provider=module_provider, version='1.0.0').delete()
+            submodules = module_version.get_submodules()
+            submodules.sort(key=lambda x: x.path)
+            assert [input['name'] for input in submodules[0].get_terraform_inputs()] == ['submodule_test_input_1']
+        finally:
+            module_provider.delete()
+
     def test_examples(self):
         """Test uploading module with examples."""
         test_upload = UploadTestModule()
@@ -1889,22 +1948,12 @@ resource "aws_s3_bucket" "test" {
             temp_dir = tempfile.mkdtemp()
             os.mkdir(os.path.join(temp_dir, 'modules'))
 
-            # Mock tempfile to obtain temporary directory used for generating archives
-            generate_archive_temp_dir = None
-            def mock_temporary_directory(suffix=None, *args, **kwargs):
-                nonlocal generate_archive_temp_dir
-                temp_dir_ret = TemporaryDirectory(suffix=suffix, *args, **kwargs)
-                if suffix == "generate-archive":
-                    generate_archive_temp_dir = temp_dir_ret.name
-                return temp_dir_ret
-
             try:
                 local_storage = terrareg.file_storage.LocalFileStorage(base_directory=temp_dir)
                 mock_local_file_storage = mock.MagicMock(wraps=local_storage)
                 with mock.patch('terrareg.config.Config.DELETE_EXTERNALLY_HOSTED_ARTIFACTS', False), \
                         mock.patch('terrareg.config.Config.DATA_DIRECTORY', temp_dir), \
-                        mock.patch('terrareg.file_storage.FileStorageFactory.get_file_storage', return_value=mock_local_file_storage), \
-                        mock.patch('tempfile.TemporaryDirectory', side_effect=mock_temporary_directory):
+                        mock.patch('terrareg.file_storage.FileStorageFactory.get_file_storage', return_value=mock_local_file_storage):
 
                     UploadTestModule.upload_module_version(module_version=module_version, zip_file=zip_file)
 
@@ -1951,10 +2000,14 @@ resource "aws_s3_bucket" "test" {
                         }
 
                     mock_local_file_storage.make_directory.assert_called_once_with("/modules/testprocessupload/test-module/aws/21.0.0")
-                    mock_local_file_storage.upload_file.assert_has_calls(calls=[
-                        mock.call(os.path.join(generate_archive_temp_dir, "source.tar.gz"), '/modules/testprocessupload/test-module/aws/21.0.0', 'source.tar.gz'),
-                        mock.call(os.path.join(generate_archive_temp_dir, "source.zip"), '/modules/testprocessupload/test-module/aws/21.0.0', 'source.zip')
+                    mock_local_file_storage.open_writer.assert_has_calls(calls=[
+                        mock.call('/modules/testprocessupload/test-module/aws/21.0.0', 'source.tar.gz'),
+                        mock.call('/modules/testprocessupload/test-module/aws/21.0.0', 'source.zip')
                     ])
+                    mock_local_file_storage.upload_file.assert_not_called()
+
+                    # Ensure no temporary files remain in module version directory
+                    assert sorted(os.listdir(os.path.join(temp_dir, 'modules', 'testprocessupload', 'test-module', 'aws', '21.0.0'))) == ['source.tar.gz', 'source.zip']
 
             finally:
                 shutil.rmtree(temp_dir)
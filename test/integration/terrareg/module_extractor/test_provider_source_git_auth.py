@@ -67,8 +67,8 @@ class TestProviderSourceGitAuthentication(TerraregIntegrationTest):
         mock_access_token = "ghs_test_token_abc123"
 
         try:
-            with unittest.mock.patch('terrareg.provider_source.github.requests.get') as mock_get, \
-                 unittest.mock.patch('terrareg.provider_source.github.requests.post') as mock_post, \
+            with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get') as mock_get, \
+                 unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.post') as mock_post, \
                  unittest.mock.patch('terrareg.module_extractor.subprocess.check_output') as mock_clone:
 
                 # Mock GitHub API calls for installation ID lookup
@@ -162,7 +162,7 @@ class TestProviderSourceGitAuthentication(TerraregIntegrationTest):
         module_version = terrareg.models.ModuleVersion(module_provider=module_provider, version='1.0.0')
 
         try:
-            with unittest.mock.patch('terrareg.provider_source.github.requests.get') as mock_get, \
+            with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get') as mock_get, \
                  unittest.mock.patch('terrareg.module_extractor.subprocess.check_output') as mock_clone, \
                  unittest.mock.patch('terrareg.config.Config.UPSTREAM_GIT_CREDENTIALS_USERNAME', 'fallback_user'), \
                  unittest.mock.patch('terrareg.config.Config.UPSTREAM_GIT_CREDENTIALS_PASSWORD', 'fallback_pass'):
@@ -249,8 +249,8 @@ class TestProviderSourceGitAuthentication(TerraregIntegrationTest):
         mock_access_token = "ghs_test_token_xyz789"
 
         try:
-            with unittest.mock.patch('terrareg.provider_source.github.requests.get') as mock_get, \
-                 unittest.mock.patch('terrareg.provider_source.github.requests.post') as mock_post, \
+            with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get') as mock_get, \
+                 unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.post') as mock_post, \
                  unittest.mock.patch('terrareg.module_extractor.subprocess.check_output') as mock_clone:
 
                 # Mock GitHub API calls for installation ID lookup
@@ -398,8 +398,8 @@ class TestProviderSourceGitAuthentication(TerraregIntegrationTest):
         mock_access_token = "ghs_namespace_default_token"
 
         try:
-            with unittest.mock.patch('terrareg.provider_source.github.requests.get') as mock_get, \
-                 unittest.mock.patch('terrareg.provider_source.github.requests.post') as mock_post, \
+            with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get') as mock_get, \
+                 unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.post') as mock_post, \
                  unittest.mock.patch('terrareg.module_extractor.subprocess.check_output') as mock_clone:
 
                 mock_get.return_value.status_code = 200
@@ -512,8 +512,8 @@ class TestProviderSourceGitAuthentication(TerraregIntegrationTest):
         mock_access_token = "ghs_module_override_token"
 
         try:
-            with unittest.mock.patch('terrareg.provider_source.github.requests.get') as mock_get, \
-                 unittest.mock.patch('terrareg.provider_source.github.requests.post') as mock_post, \
+            with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get') as mock_get, \
+                 unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.post') as mock_post, \
                  unittest.mock.patch('terrareg.module_extractor.subprocess.check_output') as mock_clone:
 
                 mock_get.return_value.status_code = 200
@@ -643,8 +643,8 @@ class TestProviderSourceGitAuthentication(TerraregIntegrationTest):
         mock_access_token = "ghs_compat_token"
 
         try:
-            with unittest.mock.patch('terrareg.provider_source.github.requests.get') as mock_get, \
-                 unittest.mock.patch('terrareg.provider_source.github.requests.post') as mock_post, \
+            with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get') as mock_get, \
+                 unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.post') as mock_post, \
                  unittest.mock.patch('terrareg.module_extractor.subprocess.check_output') as mock_clone:
 
                 mock_get.return_value.status_code = 200
@@ -724,7 +724,7 @@ class TestProviderSourceGitAuthentication(TerraregIntegrationTest):
         module_version = terrareg.models.ModuleVersion(module_provider=module_provider, version='1.0.0')
 
         try:
-            with unittest.mock.patch('terrareg.provider_source.github.requests.get') as mock_get, \
+            with unittest.mock.patch('terrareg.provider_source.http_client.ProviderSourceHttpClient.get') as mock_get, \
                  unittest.mock.patch('terrareg.module_extractor.subprocess.check_output') as mock_clone:
 
                 mock_clone.return_value = b""
@@ -0,0 +1,78 @@
+
+from unittest import mock
+
+import pytest
+
+import terrareg.config
+from terrareg.models import Module, ModuleProvider, Namespace
+from terrareg.module_search import ModuleSearch
+import terrareg.search_index
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestModuleSearchIndex(TerraregIntegrationTest):
+    """Test searching modules using inverted search index"""
+
+    @pytest.fixture(autouse=True)
+    def mock_search_index(self):
+        """Use new instance of inverted search index for each test"""
+        with mock.patch('terrareg.config.Config.SEARCH_INDEX', terrareg.config.SearchIndexType.INVERTED_INDEX), \
+                mock.patch('terrareg.config.Config.SEARCH_INDEX_REFRESH_INTERVAL', 0), \
+                mock.patch.object(terrareg.search_index.ModuleSearchIndex, '_INSTANCE', None):
+            yield
+
+    def test_search_ranking(self):
+        """Test exact matches of terms are ranked above prefix matches"""
+        result = ModuleSearch.search_module_providers(offset=0, limit=50, query='searchbynamesp')
+
+        assert result.count == 5
+        assert [module_provider.id for module_provider in result.rows] == [
+            'searchbynamesp-similar/searchbymodulename3/searchbyprovideraws',
+            'searchbynamesp-similar/searchbymodulename4/aws',
+            'searchbynamespace/searchbymodulename1/searchbyprovideraws',
+            'searchbynamespace/searchbymodulename1/searchbyprovidergcp',
+            'searchbynamespace/searchbymodulename2/published',
+        ]
+
+    def test_search_offset_limit(self):
+        """Test offset and limit of search results"""
+        result = ModuleSearch.search_module_providers(offset=2, limit=2, query='searchbynamesp')
+
+        assert result.count == 5
+        assert result.meta == {'limit': 2, 'current_offset': 2, 'prev_offset': 0, 'next_offset': 4}
+        assert [module_provider.id for module_provider in result.rows] == [
+            'searchbynamespace/searchbymodulename1/searchbyprovideraws',
+            'searchbynamespace/searchbymodulename1/searchbyprovidergcp',
+        ]
+        assert result.rows[0].get_latest_version().version == '1.2.3'
+
+    @pytest.mark.parametrize('query', [
+        '',
+        'searchbynamesp',
+        'mixedsearch',
+        'contributedmodule',
+        'this-search-does-not-exist-at-all',
+    ])
+    def test_search_filters(self, query):
+        """Test search filter counts match those obtained from the database"""
+        with mock.patch('terrareg.config.Config.TRUSTED_NAMESPACES', ['modulesearch-trusted']):
+            with mock.patch('terrareg.config.Config.SEARCH_INDEX', terrareg.config.SearchIndexType.DATABASE):
+                expected_filters = ModuleSearch.get_search_filters(query=query)
+
+            assert ModuleSearch.get_search_filters(query=query) == expected_filters
+
+    def test_update_module_provider(self):
+        """Test modifications to module provider are reflected in search results"""
+        result = ModuleSearch.search_module_providers(offset=0, limit=50, query='searchbymodulename2', verified=True)
+        assert result.count == 0
+
+        module_provider = ModuleProvider.get(Module(Namespace.get('searchbynamespace'), 'searchbymodulename2'), 'published')
+        module_provider.update_attributes(verified=True)
+        try:
+            result = ModuleSearch.search_module_providers(offset=0, limit=50, query='searchbymodulename2', verified=True)
+            assert [module_provider.id for module_provider in result.rows] == ['searchbynamespace/searchbymodulename2/published']
+        finally:
+            module_provider.update_attributes(verified=False)
+
+        result = ModuleSearch.search_module_providers(offset=0, limit=50, query='searchbymodulename2', verified=True)
+        assert result.count == 0
@@ -1,8 +1,10 @@
 
 from unittest import mock
 import pytest
+import sqlalchemy
 from terrareg.filters import NamespaceTrustFilter
 
+from terrareg.database import Database
 from terrareg.models import Module, ModuleProvider, Namespace
 from terrareg.module_search import ModuleSearch
 from test.integration.terrareg import TerraregIntegrationTest
@@ -407,3 +409,37 @@ class TestSearchModuleProviders(TerraregIntegrationTest):
 
         # Ensure that no results are returned
         assert result.count == 0
+
+    def test_search_results_hydrated(self):
+        """Test search results are populated from bulk queries, avoiding queries for each result."""
+        result = ModuleSearch.search_module_providers(
+            offset=0, limit=50,
+            query='searchbynamesp'
+        )
+        assert len(result.rows) == 5
+
+        # Obtain API outlines from module provider objects that are not pre-populated
+        expected_api_outlines = [
+            ModuleProvider(
+                module=Module(namespace=Namespace(name=module_provider._module._namespace.name), name=module_provider._module.name),
+                name=module_provider.name
+            ).get_latest_version().get_api_outline()
+            for module_provider in result.rows
+        ]
+
+        queries = []
+        def record_query(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        engine = Database.get().get_engine()
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', record_query)
+        try:
+            api_outlines = [
+                module_provider.get_latest_version().get_api_outline()
+                for module_provider in result.rows
+            ]
+        finally:
+            sqlalchemy.event.remove(engine, 'before_cursor_execute', record_query)
+
+        assert queries == []
+        assert api_outlines == expected_api_outlines
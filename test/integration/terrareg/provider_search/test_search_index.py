@@ -0,0 +1,48 @@
+
+from unittest import mock
+
+import pytest
+
+import terrareg.config
+from terrareg.provider_search import ProviderSearch
+import terrareg.search_index
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestProviderSearchIndex(TerraregIntegrationTest):
+    """Test searching providers using inverted search index"""
+
+    @pytest.fixture(autouse=True)
+    def mock_search_index(self):
+        """Use new instance of inverted search index for each test"""
+        with mock.patch('terrareg.config.Config.SEARCH_INDEX', terrareg.config.SearchIndexType.INVERTED_INDEX), \
+                mock.patch('terrareg.config.Config.SEARCH_INDEX_REFRESH_INTERVAL', 0), \
+                mock.patch.object(terrareg.search_index.ProviderSearchIndex, '_INSTANCE', None):
+            yield
+
+    def test_search(self):
+        """Test searching providers"""
+        result = ProviderSearch.search_providers(offset=0, limit=50, query='mixedsearch')
+
+        assert sorted(provider.full_name for provider in result.rows) == [
+            'terraform-provider-mixedsearch-result',
+            'terraform-provider-mixedsearch-result-multiversion',
+            'terraform-provider-mixedsearch-trusted-result',
+            'terraform-provider-mixedsearch-trusted-result-multiversion',
+            'terraform-provider-mixedsearch-trusted-second-result',
+        ]
+        assert result.count == 5
+
+    @pytest.mark.parametrize('query', [
+        '',
+        'mixedsearch',
+        'initial-providers',
+        'this-search-does-not-exist-at-all',
+    ])
+    def test_search_filters(self, query):
+        """Test search filter counts match those obtained from the database"""
+        with mock.patch('terrareg.config.Config.TRUSTED_NAMESPACES', ['providersearch']):
+            with mock.patch('terrareg.config.Config.SEARCH_INDEX', terrareg.config.SearchIndexType.DATABASE):
+                expected_filters = ProviderSearch.get_search_filters(query=query)
+
+            assert ProviderSearch.get_search_filters(query=query) == expected_filters
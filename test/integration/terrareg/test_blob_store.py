@@ -0,0 +1,56 @@
+
+import sqlalchemy
+
+from terrareg.blob_store import BlobStore
+from terrareg.database import Database
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestBlobStore(TerraregIntegrationTest):
+    """Test BlobStore class"""
+
+    def _get_blob_row(self, hash_):
+        """Return database row for blob"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            return conn.execute(
+                db.module_details_blob.select().where(
+                    db.module_details_blob.c.hash == hash_
+                )
+            ).fetchone()
+
+    def test_compress_small_content(self):
+        """Test content smaller than minimum compression size is not compressed"""
+        assert BlobStore.compress(b'small content') == (BlobStore.COMPRESSION_NONE, b'small content')
+
+    def test_compress_large_content(self):
+        """Test compressible content is compressed and can be decompressed"""
+        content = b'repeated content ' * 100
+        compression, compressed_content = BlobStore.compress(content)
+        assert compression == BlobStore.COMPRESSION_GZIP
+        assert len(compressed_content) < len(content)
+        assert BlobStore.decompress(compression=compression, content=compressed_content) == content
+
+    def test_add_reference_deduplicates_content(self):
+        """Test adding the same content multiple times stores a single blob"""
+        content = b'deduplicated blob store content ' * 20
+
+        hash_ = BlobStore.add_reference(content)
+        assert BlobStore.add_reference(content) == hash_
+        assert hash_ == BlobStore.get_hash(content)
+
+        row = self._get_blob_row(hash_)
+        assert row['reference_count'] == 2
+        assert row['size'] == len(content)
+        assert row['compression'] == BlobStore.COMPRESSION_GZIP
+
+        assert BlobStore.get_contents([hash_, None]) == {hash_: content}
+
+        # Remove single reference and ensure blob is retained
+        BlobStore.remove_references([hash_])
+        assert self._get_blob_row(hash_)['reference_count'] == 1
+
+        # Remove final reference and ensure blob is deleted
+        BlobStore.remove_references([hash_, None])
+        assert self._get_blob_row(hash_) is None
+        assert BlobStore.get_contents([hash_]) == {}
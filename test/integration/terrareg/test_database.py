@@ -0,0 +1,176 @@
+
+import os
+import tempfile
+from unittest import mock
+
+import flask
+import sqlalchemy
+
+from terrareg.database import Database
+from terrareg.models import Module, ModuleProvider, ModuleVersion, Namespace
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestDatabase(TerraregIntegrationTest):
+    """Test Database class"""
+
+    @staticmethod
+    def _execute_query():
+        """Execute query, returning the connection used"""
+        with Database.get_connection() as conn:
+            conn.execute(sqlalchemy.select(sqlalchemy.literal(1))).all()
+            return conn
+
+    def test_get_connection_request_scoped(self):
+        """Test connection is re-used within a request context and released on teardown"""
+        app = flask.Flask(__name__)
+        Database.register_app(app)
+
+        with app.test_request_context():
+            first_connection = self._execute_query()
+            assert self._execute_query() is first_connection
+            assert not first_connection.closed
+
+            # Ensure transactions use the request connection
+            with Database.start_transaction() as transaction:
+                assert transaction.connection is first_connection
+
+        assert first_connection.closed
+
+        # Ensure a new connection is used by subsequent requests
+        with app.test_request_context():
+            assert self._execute_query() is not first_connection
+
+    def test_get_connection_without_request_connection(self):
+        """Test new connections are used when request-scoped connections are not enabled for app"""
+        with flask.Flask(__name__).test_request_context():
+            first_connection = self._execute_query()
+            assert first_connection.closed
+            assert self._execute_query() is not first_connection
+
+        first_connection = self._execute_query()
+        assert first_connection.closed
+        assert self._execute_query() is not first_connection
+
+    def test_run_after_commit(self):
+        """Test callbacks are run once the current transaction has been committed"""
+        callback = mock.MagicMock()
+
+        # Ensure callback is run immediately outside of a transaction
+        Database.run_after_commit(callback)
+        callback.assert_called_once_with()
+        callback.reset_mock()
+
+        with Database.start_transaction():
+            Database.run_after_commit(callback)
+            callback.assert_not_called()
+        callback.assert_called_once_with()
+        callback.reset_mock()
+
+        # Ensure callback is not run when transaction is rolled back
+        try:
+            with Database.start_transaction():
+                Database.run_after_commit(callback)
+                raise Exception('Rollback transaction')
+        except Exception:
+            pass
+        callback.assert_not_called()
+
+        # Ensure callbacks are not retained for subsequent transactions
+        with Database.start_transaction():
+            pass
+        callback.assert_not_called()
+
+    def test_get_pool_statistics(self):
+        """Test obtaining connection pool statistics"""
+        Database.get_engine()
+        pool_statistics = Database.get_pool_statistics()
+        if Database.get_engine().dialect.name == 'sqlite':
+            # SQLite does not use a sized connection pool
+            assert pool_statistics is None
+        else:
+            assert set(pool_statistics) == {'size', 'checked_out', 'overflow'}
+
+    def test_read_replica_routing(self):
+        """Test select queries in read-only contexts use the read replica, until data is modified"""
+        app = flask.Flask(__name__)
+        Database.register_app(app)
+        db = Database.get()
+        select = sqlalchemy.select(sqlalchemy.func.count()).select_from(db.namespace)
+        with Database.get_engine().connect() as conn:
+            primary_count = conn.execute(select).scalar()
+
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                mock.patch('terrareg.config.Config.DATABASE_READ_URL', f'sqlite:///{os.path.join(temp_dir, "replica.db")}'):
+            # Create empty read replica database
+            Database.get_meta().create_all(Database.get_read_engine())
+            try:
+                with app.test_request_context():
+                    # Ensure queries outside of read-only context use the primary database
+                    with db.get_connection() as conn:
+                        assert conn.execute(select).scalar() == primary_count
+
+                    with Database.read_only():
+                        with db.get_connection() as conn:
+                            assert conn.execute(select).scalar() == 0
+
+                        # Ensure modifications use the primary database,
+                        # as well as all subsequent queries in the request
+                        with db.get_connection() as conn:
+                            conn.execute(db.namespace.insert().values(namespace='readreplicatest'))
+                            assert conn.execute(select).scalar() == primary_count + 1
+                        with db.get_connection() as conn:
+                            assert conn.execute(select).scalar() == primary_count + 1
+
+                # Ensure transactions use the primary database
+                with app.test_request_context(), Database.read_only():
+                    with db.get_connection() as conn:
+                        assert conn.execute(select).scalar() == 0
+                    with Database.start_transaction() as transaction:
+                        assert transaction.connection.execute(select).scalar() == primary_count + 1
+                    with db.get_connection() as conn:
+                        assert conn.execute(select).scalar() == primary_count + 1
+
+                # Ensure read-only context has no effect outside of request context
+                with Database.read_only():
+                    with db.get_connection() as conn:
+                        assert conn.execute(select).scalar() == primary_count + 1
+            finally:
+                with db.get_connection() as conn:
+                    conn.execute(db.namespace.delete(db.namespace.c.namespace=='readreplicatest'))
+                Database.get_read_engine().dispose()
+                Database._READ_ENGINE = None
+
+    def test_identity_map_avoids_duplicate_queries(self):
+        """Test rows are not re-queried for new objects of the same entity within a request"""
+        app = flask.Flask(__name__)
+        Database.register_app(app)
+
+        statements = []
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with app.test_request_context():
+            module_provider = ModuleProvider.get(Module(Namespace.get('testnamespace'), 'wrongversionorder'), 'testprovider')
+            versions = module_provider.get_versions()
+            assert versions
+
+            sqlalchemy.event.listen(Database.get_engine(), 'before_cursor_execute', record_statement)
+            try:
+                namespace = Namespace.get('testnamespace')
+                assert namespace.pk == module_provider.module.namespace.pk
+                assert Namespace.get_by_pk(namespace.pk).name == 'testnamespace'
+
+                other_module_provider = ModuleProvider.get(Module(namespace, 'wrongversionorder'), 'testprovider')
+                assert other_module_provider.pk == module_provider.pk
+
+                module_version = ModuleVersion(module_provider=other_module_provider, version=versions[0].version)
+                assert module_version.pk == versions[0].pk
+            finally:
+                sqlalchemy.event.remove(Database.get_engine(), 'before_cursor_execute', record_statement)
+
+            assert statements == []
+
+            # Ensure updated rows are re-queried
+            module_version.update_attributes(description=module_version.description)
+            assert ModuleVersion(module_provider=module_provider, version=versions[0].version).pk == versions[0].pk
@@ -0,0 +1,77 @@
+
+import os
+import threading
+import unittest.mock
+
+import flask
+
+import terrareg.errors
+from terrareg.models import Module, ModuleProvider, ModuleVersion, Namespace
+from terrareg.module_extraction_job_model import ModuleExtractionJob
+from terrareg.module_extraction_job_status import ModuleExtractionJobStatus
+from terrareg.module_extraction_worker import ModuleExtractionWorker
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestModuleExtractionWorker(TerraregIntegrationTest):
+    """Test ModuleExtractionWorker class"""
+
+    def _get_module_provider(self):
+        """Create new module provider for test"""
+        module = Module(Namespace('moduleextraction'), 'extractionworker')
+        if (module_provider := ModuleProvider.get(module, 'testprovider')):
+            module_provider.delete()
+
+        module_provider = ModuleProvider.get(module, 'testprovider', create=True)
+        module_provider.update_repo_clone_url_template('https://localhost/test.git')
+        return module_provider
+
+    def _get_worker(self):
+        """Return worker instance"""
+        return ModuleExtractionWorker(
+            worker_id='unittest-worker',
+            app=flask.Flask(__name__),
+            stop_event=threading.Event()
+        )
+
+    def test_process_next_job_without_jobs(self):
+        """Test processing jobs when no jobs are queued"""
+        with unittest.mock.patch('terrareg.module_extraction_job_model.ModuleExtractionJob.claim_next', return_value=None):
+            assert self._get_worker().process_next_job() is False
+
+    def test_process_next_job(self):
+        """Test processing successful extraction job"""
+        module_provider = self._get_module_provider()
+        job = ModuleExtractionJob.create(module_provider=module_provider, version='1.2.0')
+
+        def clone_repository_side_effect(self):
+            with open(os.path.join(self.extract_directory, 'main.tf'), 'w') as fh:
+                fh.write('output "test" { value = "test" }')
+
+        with unittest.mock.patch('terrareg.module_extractor.GitModuleExtractor._clone_repository', clone_repository_side_effect), \
+                unittest.mock.patch('terrareg.module_extractor.GitModuleExtractor._get_git_commit_sha',
+                                    unittest.mock.MagicMock(return_value='358335a5c2ad19f8a08228f85ff6e7e5fa1e04b2')):
+            assert self._get_worker().process_next_job() is True
+
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk)
+        assert job.status is ModuleExtractionJobStatus.SUCCEEDED
+        assert 'Cloning repository\n' in job.log
+        assert 'Analysing root module\n' in job.log
+        assert ModuleVersion.get(module_provider=module_provider, version='1.2.0') is not None
+
+    def test_process_next_job_with_failure(self):
+        """Test processing failing extraction job"""
+        module_provider = self._get_module_provider()
+        job = ModuleExtractionJob.create(module_provider=module_provider, version='1.2.0')
+
+        with unittest.mock.patch('terrareg.module_extractor.GitModuleExtractor._clone_repository',
+                                 unittest.mock.MagicMock(side_effect=terrareg.errors.GitCloneError('Unittest clone error'))), \
+                unittest.mock.patch('terrareg.config.Config.MODULE_EXTRACTION_JOB_MAX_ATTEMPTS', 1):
+            assert self._get_worker().process_next_job() is True
+
+        job = ModuleExtractionJob.get(module_provider=module_provider, pk=job.pk)
+        assert job.status is ModuleExtractionJobStatus.FAILED
+        assert job.get_api_details()['error'] == 'Unittest clone error'
+
+        # Ensure module version was rolled back
+        assert ModuleVersion.get(module_provider=module_provider, version='1.2.0') is None
@@ -8,12 +8,14 @@ from subprocess import check_output
 from tempfile import TemporaryDirectory
 import unittest.mock
 import tarfile
+import threading
 import base64
 
 from typing import ContextManager
 import contextlib
 
 import pytest
+import requests
 from terrareg.provider_binary_types import ProviderBinaryArchitectureType, ProviderBinaryOperatingSystemType
 
 import terrareg.provider_version_model
@@ -35,6 +37,7 @@ from test.integration.terrareg import TerraregIntegrationTest
 import terrareg.provider_extractor
 import terrareg.database
 import terrareg.errors
+import terrareg.file_storage
 
 
 @pytest.fixture
@@ -139,6 +142,47 @@ UnkCiCt3juqNNA==
             unittest.mock.call(provider=provider, release_metadata=release_metadata, file_name='terraform-provider-multiple-versions_1.9.4_SHA256SUMS.sig'),
         ])
 
+    def test_obtain_gpg_key_signature_issuer(self):
+        """Test obtain_gpg_key only verifies using GPG key matching signature issuer"""
+        artifacts = [
+            b"Some data",
+            base64.b64decode("""
+iLMEAAEKAB0WIQSg/EMZq6+cKKFoId9PMHLljRb/bQUCZVsR+gAKCRBPMHLljRb/bXmpA/9Ycl/a
+9ZKFevCamJLjMxw2K7OV12hWdR5X5pZ/Rse1gAOYQNaSbKwchM0ChDh/nrFMYzvErHsw/he8OjOK
+G3KtIxGITPvTgjL7Zj0OxJSQAAgQN/bmDNM/jxhYevNsJjqnHeSBHm7U6IsLHFKNiSDj1c2yom4p
+UnkCiCt3juqNNA==
+""".strip())
+        ]
+
+        namespace = terrareg.models.Namespace.get("initial-providers")
+        provider = terrareg.provider_model.Provider.get(namespace=namespace, name="multiple-versions")
+        expected_gpg_key = terrareg.models.GpgKey.get_by_fingerprint("A0FC4319ABAF9C28A16821DF4F3072E58D16FF6D")
+
+        mock_download_artifact = unittest.mock.MagicMock(side_effect=artifacts)
+        mock_verify = unittest.mock.MagicMock(return_value=expected_gpg_key)
+
+        release_metadata = terrareg.provider_source.repository_release_metadata.RepositoryReleaseMetadata(
+            name="Release v1.9.4",
+            tag="v1.9.4",
+            archive_url="https://git.example.com/artifacts/downloads/v1.9.4.tar.gz",
+            commit_hash="abcdefg123455",
+            provider_id="unittest-release-id",
+            release_artifacts=[
+                terrareg.provider_source.repository_release_metadata.ReleaseArtifactMetadata(name="", provider_id="unittest-shasum-id")
+            ]
+        )
+
+        with unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_artifact', mock_download_artifact), \
+                unittest.mock.patch('terrareg.gpg_keyring.NamespaceGpgKeyring.verify', mock_verify):
+            gpg_key = terrareg.provider_extractor.ProviderExtractor.obtain_gpg_key(
+                provider=provider, namespace=namespace, release_metadata=release_metadata)
+
+        assert gpg_key is expected_gpg_key
+
+        # Ensure only the GPG key matching the issuer was used for verification
+        mock_verify.assert_called_once()
+        assert [gpg_key.pk for gpg_key in mock_verify.call_args.kwargs['gpg_keys']] == [expected_gpg_key.pk]
+
     def test_obtain_gpg_key_signature_mismatch(self):
         """"Test obtain_gpg_key with data not matching signature"""
 
@@ -551,6 +595,7 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  ./requirements
             mock_obtain_source_code = unittest.mock.MagicMock(side_effect=mock_obtain_source_code_side_effect)
 
             mock_switch_terraform_versions = unittest.mock.MagicMock()
+            mock_switch_terraform_versions.return_value.__enter__.return_value = '/tmp/unittest-terraform-bin/terraform'
 
             mock_subprocess = unittest.mock.MagicMock()
             mock_collect_markdown_documentation = unittest.mock.MagicMock()
@@ -580,6 +625,8 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  ./requirements
                     env_vars = mock_subprocess.call.call_args_list[0].kwargs["env"]
                     # Ensure parent env variables are passed
                     assert "PATH" in env_vars
+                    # Ensure directory of installed Terraform binary is added to PATH
+                    assert env_vars["PATH"].startswith(f"/tmp/unittest-terraform-bin{os.pathsep}")
                     # Ensure GO env vars are injected
                     assert "GOROOT" in env_vars
                     assert env_vars["GOROOT"] == "/usr/local/go"
@@ -766,17 +813,34 @@ Test Markdown content: {file_}""")
                         }
 
 
-    def test__process_release_file(self, test_provider_version_wrapper):
-        """Test _process_release_file"""
+    @staticmethod
+    def _get_mock_downloader(content):
+        """Return mock release artifact downloader, writing content to file"""
+        def downloader(artifact_metadata, target_file):
+            target_file.write(content)
+            return True
+        return downloader
 
-        mock_get_release_artifact = unittest.mock.MagicMock(return_value=b"Some binary value of artifact file")
+    def test__download_release_file(self, test_provider_version_wrapper):
+        """Test _download_release_file"""
 
-        with unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact', mock_get_release_artifact), \
-                test_provider_version_wrapper() as provider_extractor:
+        with test_provider_version_wrapper() as provider_extractor, \
+                TemporaryDirectory() as temp_directory:
 
-            provider_extractor._process_release_file(
+            file_path = provider_extractor._download_release_file(
+                downloader=self._get_mock_downloader(b"Some binary value of artifact file"),
                 checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
-                file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"
+                file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip",
+                target_directory=temp_directory
+            )
+            assert file_path == os.path.join(temp_directory, "terraform-provider-multiple-versions_1.9.4_linux_amd64.zip")
+            with open(file_path, "rb") as fh:
+                assert fh.read() == b"Some binary value of artifact file"
+
+            provider_extractor._store_release_file(
+                checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
+                file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip",
+                file_path=file_path
             )
 
             # Obtain DB row for release binary
@@ -792,50 +856,76 @@ Test Markdown content: {file_}""")
                 assert row['name'] == 'terraform-provider-multiple-versions_1.9.4_linux_amd64.zip'
                 assert row['operating_system'] == ProviderBinaryOperatingSystemType.LINUX
 
-    def test__process_release_file_invalid_checksum(self, test_provider_version_wrapper):
-        """Test _process_release_file with invalid checksum"""
+    def test__download_release_file_invalid_checksum(self, test_provider_version_wrapper):
+        """Test _download_release_file with invalid checksum"""
 
-        mock_get_release_artifact = unittest.mock.MagicMock(return_value=b"Some other binary value that does not match")
+        mock_downloader = unittest.mock.MagicMock(side_effect=self._get_mock_downloader(b"Some other binary value that does not match"))
 
-        with unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact', mock_get_release_artifact), \
-                test_provider_version_wrapper() as provider_extractor:
+        with unittest.mock.patch('terrareg.config.Config.PROVIDER_ARTIFACT_DOWNLOAD_RETRIES', 2), \
+                test_provider_version_wrapper() as provider_extractor, \
+                TemporaryDirectory() as temp_directory:
 
             with pytest.raises(terrareg.errors.InvalidReleaseArtifactChecksumError):
-                provider_extractor._process_release_file(
+                provider_extractor._download_release_file(
+                    downloader=mock_downloader,
                     checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
-                    file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"
+                    file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip",
+                    target_directory=temp_directory
                 )
 
-            # Obtain DB row for release binary
-            db = terrareg.database.Database.get()
-            with db.get_connection() as conn:
-                res = conn.execute(db.provider_version_binary.select().where(
-                    db.provider_version_binary.c.provider_version_id==provider_extractor._provider_version.pk
-                )).all()
-                assert len(res) == 0
+            # Ensure download was retried
+            assert mock_downloader.call_count == 3
+
+    def test__download_release_file_retry(self, test_provider_version_wrapper):
+        """Test _download_release_file retrying failed download"""
+        call_results = iter([
+            requests.ConnectionError("Connection reset"),
+            b"Some binary value of artifact file",
+        ])
 
-    def test__process_release_file_non_existent_file(self, test_provider_version_wrapper):
-        """Test _process_release_file with non-existent file"""
+        def downloader(artifact_metadata, target_file):
+            result = next(call_results)
+            if isinstance(result, Exception):
+                # Write partial content before failing
+                target_file.write(b"Some partial")
+                raise result
+            target_file.write(result)
+            return True
 
-        mock_get_release_artifact = unittest.mock.MagicMock(return_value=None)
+        mock_downloader = unittest.mock.MagicMock(side_effect=downloader)
 
-        with unittest.mock.patch('terrareg.provider_source.github.GithubProviderSource.get_release_artifact', mock_get_release_artifact), \
-                test_provider_version_wrapper() as provider_extractor:
+        with test_provider_version_wrapper() as provider_extractor, \
+                TemporaryDirectory() as temp_directory:
+
+            file_path = provider_extractor._download_release_file(
+                downloader=mock_downloader,
+                checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
+                file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip",
+                target_directory=temp_directory
+            )
+
+            assert mock_downloader.call_count == 2
+
+            # Ensure partial content of failed download was replaced
+            with open(file_path, "rb") as fh:
+                assert fh.read() == b"Some binary value of artifact file"
+
+    def test__download_release_file_non_existent_file(self, test_provider_version_wrapper):
+        """Test _download_release_file with non-existent file"""
+
+        mock_downloader = unittest.mock.MagicMock(return_value=False)
+
+        with test_provider_version_wrapper() as provider_extractor, \
+                TemporaryDirectory() as temp_directory:
 
             with pytest.raises(terrareg.errors.MissingReleaseArtifactError):
-                provider_extractor._process_release_file(
+                provider_extractor._download_release_file(
+                    downloader=mock_downloader,
                     checksum="a41a58bd5ac74aabbe95b33909aa3fb5bca17efb9825f3924cf4ccfe393a6abc",
-                    file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip"
+                    file_name="terraform-provider-multiple-versions_1.9.4_linux_amd64.zip",
+                    target_directory=temp_directory
                 )
 
-            # Obtain DB row for release binary
-            db = terrareg.database.Database.get()
-            with db.get_connection() as conn:
-                res = conn.execute(db.provider_version_binary.select().where(
-                    db.provider_version_binary.c.provider_version_id==provider_extractor._provider_version.pk
-                )).all()
-                assert len(res) == 0
-
     def test_extract_binaries(self, test_provider_version_wrapper):
         """Test extract_binaries"""
 
@@ -849,10 +939,21 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  terraform-prov
 8720fafebf4e5ab4affc7426d78b23ce2f2b54a8dfbda4d45abf8051b4558b51  terraform-provider-multiple-versions_1.9.4_manifest.json
 0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d  terraform-provider-multiple-versions_1.9.4_windows_amd64.zip
 """)
-        mock_process_release_file = unittest.mock.MagicMock()
+        mock_downloader = unittest.mock.MagicMock()
+        mock_get_release_artifact_downloader = unittest.mock.MagicMock(return_value=mock_downloader)
+
+        def download_release_file(downloader, checksum, file_name, target_directory):
+            file_path = os.path.join(target_directory, file_name)
+            with open(file_path, "wb") as fh:
+                fh.write(checksum.encode('utf-8'))
+            return file_path
+        mock_download_release_file = unittest.mock.MagicMock(side_effect=download_release_file)
+        mock_store_release_file = unittest.mock.MagicMock()
 
         with unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_artifact', mock_download_artifact), \
-                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._process_release_file', mock_process_release_file), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._get_release_artifact_downloader', mock_get_release_artifact_downloader), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_release_file', mock_download_release_file), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._store_release_file', mock_store_release_file), \
                 test_provider_version_wrapper() as provider_extractor:
 
             provider_extractor.extract_binaries()
@@ -863,11 +964,83 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  terraform-prov
                 file_name="terraform-provider-multiple-versions_1.9.4_SHA256SUMS"
             )
 
-            mock_process_release_file.assert_has_calls(calls=[
-                unittest.mock.call(checksum='aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657', file_name='terraform-provider-multiple-versions_1.9.4_linux_arm64.zip'),
-                unittest.mock.call(checksum='5bf710f5427bafae2a01103ebb48271fedd0ab784e04d11ef95bc057dce8cf7f', file_name='terraform-provider-multiple-versions_1.9.4_windows_arm64.zip'),
-                unittest.mock.call(checksum='0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d', file_name='terraform-provider-multiple-versions_1.9.4_windows_amd64.zip')
-            ], any_order=False)
+            mock_get_release_artifact_downloader.assert_called_once_with()
+
+            expected_files = [
+                ('aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657', 'terraform-provider-multiple-versions_1.9.4_linux_arm64.zip'),
+                ('5bf710f5427bafae2a01103ebb48271fedd0ab784e04d11ef95bc057dce8cf7f', 'terraform-provider-multiple-versions_1.9.4_windows_arm64.zip'),
+                ('0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d', 'terraform-provider-multiple-versions_1.9.4_windows_amd64.zip'),
+            ]
+            assert sorted([
+                (call.kwargs['checksum'], call.kwargs['file_name'])
+                for call in mock_download_release_file.call_args_list
+            ]) == sorted(expected_files)
+            for call in mock_download_release_file.call_args_list:
+                assert call.kwargs['downloader'] is mock_downloader
+
+            # Ensure files are stored in order of checksum file
+            assert [
+                (call.kwargs['checksum'], call.kwargs['file_name'], os.path.basename(call.kwargs['file_path']))
+                for call in mock_store_release_file.call_args_list
+            ] == [
+                (checksum, file_name, file_name)
+                for checksum, file_name in expected_files
+            ]
+
+    def test_extract_binaries_concurrent_download_failure(self, test_provider_version_wrapper):
+        """Test extract_binaries with concurrent downloads, when a download fails"""
+        file_names = [
+            f"terraform-provider-multiple-versions_1.9.4_{platform}.zip"
+            for platform in ["linux_amd64", "linux_arm64", "darwin_amd64", "darwin_arm64", "windows_amd64"]
+        ]
+        mock_download_artifact = unittest.mock.MagicMock(return_value="\n".join([
+            f"{str(itx) * 64}  {file_name}"
+            for itx, file_name in enumerate(file_names)
+        ]).encode("utf-8"))
+
+        download_started = {file_name: threading.Event() for file_name in file_names}
+        target_directories = []
+
+        def download_release_file(downloader, checksum, file_name, target_directory):
+            download_started[file_name].set()
+            target_directories.append(target_directory)
+            if file_name == file_names[1]:
+                # Fail whilst the download of the following file is in progress
+                download_started[file_names[2]].wait(5)
+                raise terrareg.errors.MissingReleaseArtifactError("Unittest download failure")
+            if file_name != file_names[0]:
+                threading.Event().wait(0.2)
+
+            file_path = os.path.join(target_directory, file_name)
+            with open(file_path, "wb") as fh:
+                fh.write(checksum.encode("utf-8"))
+            return file_path
+
+        mock_download_release_file = unittest.mock.MagicMock(side_effect=download_release_file)
+        mock_store_release_file = unittest.mock.MagicMock()
+
+        with unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_artifact', mock_download_artifact), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._get_release_artifact_downloader', unittest.mock.MagicMock()), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_release_file', mock_download_release_file), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._store_release_file', mock_store_release_file), \
+                unittest.mock.patch('terrareg.config.Config.PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY', 2), \
+                test_provider_version_wrapper() as provider_extractor:
+
+            with pytest.raises(terrareg.errors.MissingReleaseArtifactError):
+                provider_extractor.extract_binaries()
+
+            # Ensure only binaries preceding the failed download in the checksum file were stored
+            assert [
+                call.kwargs['file_name']
+                for call in mock_store_release_file.call_args_list
+            ] == [file_names[0]]
+
+            # Ensure queued downloads were cancelled
+            assert not download_started[file_names[4]].is_set()
+
+            # Ensure running downloads completed and the temporary directory was removed
+            assert len(set(target_directories)) == 1
+            assert not os.path.exists(target_directories[0])
 
     def test_extract_binaries_invalid_checksum(self, test_provider_version_wrapper):
         """Test extract_binaries with invalid checksum file"""
@@ -878,15 +1051,17 @@ aec01bca39c7f614bc263e299a1fcdd09da3073369756efa6bced80531a45657  terraform-prov
 this is a random line
 0671886887347330e64e584e2e7f02d96b705ff5aad8341a05c9881ecd3ea58d  terraform-provider-multiple-versions_1.9.4_windows_amd64.zip
 """.strip())
-        mock_process_release_file = unittest.mock.MagicMock()
+        mock_download_release_file = unittest.mock.MagicMock()
 
         with unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_artifact', mock_download_artifact), \
-                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._process_release_file', mock_process_release_file), \
+                unittest.mock.patch('terrareg.provider_extractor.ProviderExtractor._download_release_file', mock_download_release_file), \
                 test_provider_version_wrapper() as provider_extractor:
 
             with pytest.raises(terrareg.errors.InvalidChecksumFileError):
                 provider_extractor.extract_binaries()
 
+            mock_download_release_file.assert_not_called()
+
     @pytest.mark.parametrize('file_content, expected_value, expected_property, expected_error', [
         # Handle default value, ensuring None is stored in database
         (None, None, ["5.0"], None),
@@ -0,0 +1,119 @@
+
+import datetime
+import threading
+import unittest.mock
+
+import flask
+import pytest
+import sqlalchemy
+
+import terrareg.errors
+from terrareg.database import Database
+from terrareg.models import Namespace
+from terrareg.provider_index_job_model import ProviderIndexJob
+from terrareg.provider_index_job_status import ProviderIndexJobStatus
+from terrareg.provider_model import Provider
+from terrareg.provider_release_poller import ProviderIndexWorker, ProviderReleasePoller
+from terrareg.provider_source.repository_release_metadata import RepositoryReleaseMetadata
+from test.integration.terrareg import TerraregIntegrationTest
+
+
+class TestProviderReleasePoller(TerraregIntegrationTest):
+    """Test ProviderReleasePoller and ProviderIndexWorker classes"""
+
+    def setup_method(self, method):
+        """Remove index jobs and reset poll state before each test"""
+        db = Database.get()
+        with db.get_connection() as conn:
+            conn.execute(db.provider_index_job.delete())
+            conn.execute(sqlalchemy.update(db.provider).values(last_release_poll_at=None, last_release_poll_error=None))
+
+    @staticmethod
+    def _get_provider():
+        """Return test provider"""
+        return Provider.get(namespace=Namespace.get('initial-providers'), name='multiple-versions')
+
+    @staticmethod
+    def _get_release_metadata(version):
+        """Return release metadata for version"""
+        return RepositoryReleaseMetadata(
+            name=f'Release v{version}', tag=f'v{version}',
+            archive_url=f'https://git.example.com/artifacts/downloads/v{version}.tar.gz',
+            commit_hash='abcdefg123455', provider_id='unittest-release-id',
+            release_artifacts=[]
+        )
+
+    @staticmethod
+    def _get_poller(poll_interval=60):
+        """Return poller instance"""
+        return ProviderReleasePoller(app=flask.Flask(__name__), stop_event=threading.Event(), poll_interval=poll_interval)
+
+    @staticmethod
+    def _get_worker():
+        """Return worker instance"""
+        return ProviderIndexWorker(worker_id='unittest-worker', app=flask.Flask(__name__), stop_event=threading.Event())
+
+    def test_poll_provider(self):
+        """Test polling provider queues index jobs for new releases"""
+        provider = self._get_provider()
+        with unittest.mock.patch('terrareg.repository_model.Repository.get_new_releases',
+                                 unittest.mock.MagicMock(return_value=[self._get_release_metadata('5.0.0'), self._get_release_metadata('5.1.0')])):
+            jobs = self._get_poller().poll_provider(provider)
+
+        assert [job.version for job in jobs] == ['5.0.0', '5.1.0']
+        assert all(job.status is ProviderIndexJobStatus.QUEUED for job in jobs)
+
+    def test_poll_provider_error(self):
+        """Test error is recorded when polling provider fails"""
+        provider = self._get_provider()
+        with unittest.mock.patch('terrareg.repository_model.Repository.get_new_releases',
+                                 unittest.mock.MagicMock(side_effect=Exception('Unittest error'))):
+            assert self._get_poller().poll_provider(provider) == []
+        assert self._get_provider().last_release_poll_error == 'Unittest error'
+
+        # Ensure error is cleared after successful poll
+        with unittest.mock.patch('terrareg.repository_model.Repository.get_new_releases',
+                                 unittest.mock.MagicMock(return_value=[])):
+            self._get_poller().poll_provider(self._get_provider())
+        assert self._get_provider().last_release_poll_error is None
+
+    def test_poll_due_providers(self):
+        """Test providers are only polled once per poll interval"""
+        poller = self._get_poller()
+        mock_get_new_releases = unittest.mock.MagicMock(return_value=[])
+        with unittest.mock.patch('terrareg.repository_model.Repository.get_new_releases', mock_get_new_releases):
+            first_poll_count = 0
+            while (polled_count := poller.poll_due_providers()):
+                first_poll_count += polled_count
+
+            assert first_poll_count > 0
+            assert mock_get_new_releases.call_count == first_poll_count
+
+            # Ensure providers are not polled again within the interval
+            assert poller.poll_due_providers() == 0
+
+        latest_poll_at, oldest_poll_at = ProviderReleasePoller.get_statistics()
+        assert datetime.datetime.now() - oldest_poll_at < datetime.timedelta(minutes=1)
+        assert latest_poll_at >= oldest_poll_at
+
+    @pytest.mark.parametrize('side_effect, expected_status', [
+        (None, ProviderIndexJobStatus.SUCCEEDED),
+        (terrareg.errors.ProviderVersionAlreadyIndexedError('Already indexed'), ProviderIndexJobStatus.SUCCEEDED),
+        (terrareg.errors.MissingSignureArtifactError('No signature'), ProviderIndexJobStatus.FAILED),
+        (terrareg.errors.UnableToObtainReleaseError('Unittest error'), ProviderIndexJobStatus.QUEUED),
+        (Exception('Unittest error'), ProviderIndexJobStatus.QUEUED),
+    ])
+    def test_process_next_job(self, side_effect, expected_status):
+        """Test processing index job"""
+        job = ProviderIndexJob.create(provider=self._get_provider(), version='5.0.0')
+
+        mock_index_version = unittest.mock.MagicMock(side_effect=side_effect)
+        with unittest.mock.patch('terrareg.provider_model.Provider.index_version', mock_index_version):
+            assert self._get_worker().process_next_job() is True
+
+        mock_index_version.assert_called_once_with(version='5.0.0')
+        assert ProviderIndexJob(pk=job.pk).status is expected_status
+
+    def test_process_next_job_without_jobs(self):
+        """Test processing jobs when no jobs are queued"""
+        assert self._get_worker().process_next_job() is False
@@ -415,6 +415,23 @@ def mock_module_provider(request):
         return versions
     mock_method(request, 'terrareg.models.ModuleProvider.get_versions', get_versions)
 
+    def _get_version_dependency_rows(self, include_beta=True, include_unpublished=False):
+        """Return mocked rows of module versions, with dependencies from root module terraform-docs."""
+        rows = []
+        for module_version in self.get_versions(include_beta=include_beta, include_unpublished=include_unpublished):
+            dependency_rows = module_version.get_dependency_rows()
+            rows += [
+                dict(row, module_version=module_version.version, path='')
+                for row in dependency_rows
+            ]
+            if not dependency_rows:
+                rows.append({
+                    'module_version': module_version.version, 'path': None, 'dependency_type': None,
+                    'name': None, 'namespace': None, 'source': None, 'version': None
+                })
+        return rows
+    mock_method(request, 'terrareg.models.ModuleProvider._get_version_dependency_rows', _get_version_dependency_rows)
+
     def update_attributes(self, **kwargs):
         """Update mock data attributes"""
         global TEST_MODULE_DATA
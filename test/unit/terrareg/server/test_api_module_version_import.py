@@ -43,6 +43,34 @@ class TestApiModuleVersionImport(TerraregUnitTest):
             mocked_prepare_module.assert_not_called()
             mocked_process_upload.assert_not_called()
 
+    @setup_test_data()
+    def test_import_by_version_with_async_extraction(self, client, mock_models):
+        """Import a module version by version with asynchronous extraction enabled"""
+        mock_job = unittest.mock.MagicMock()
+        mock_job.pk = 52
+        with unittest.mock.patch(
+                    'terrareg.models.ModuleVersion.prepare_module', return_value=False) as mocked_prepare_module, \
+                unittest.mock.patch(
+                    'terrareg.module_extractor.GitModuleExtractor.process_upload') as mocked_process_upload, \
+                unittest.mock.patch(
+                    'terrareg.module_extraction_job_model.ModuleExtractionJob.create', return_value=mock_job) as mocked_create_job, \
+                unittest.mock.patch('terrareg.config.Config.ASYNC_MODULE_EXTRACTION', True), \
+                unittest.mock.patch('terrareg.auth.AuthFactory.get_current_auth_method', self._get_mock_get_current_auth_method(True)):
+
+            res = client.post(
+                '/v1/terrareg/modules/testnamespace/modulewithrepourl/testprovider/import',
+                json={'version': '5.5.4'}
+            )
+            assert res.json == {'status': 'Queued', 'job_id': 52}
+            assert res.status_code == 202
+
+            mocked_create_job.assert_called_once()
+            assert mocked_create_job.call_args.kwargs['version'] == '5.5.4'
+            assert mocked_create_job.call_args.kwargs['module_provider'].id == 'testnamespace/modulewithrepourl/testprovider'
+
+            mocked_prepare_module.assert_not_called()
+            mocked_process_upload.assert_not_called()
+
     @setup_test_data()
     def test_import_by_version_with_valid_repository_url(self, client, mock_models):
         """Import a module version by version"""
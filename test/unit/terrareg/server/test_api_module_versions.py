@@ -22,17 +22,44 @@ class TestApiModuleVersions(TerraregUnitTest):
                         {
                             'root': {'dependencies': [], 'providers': []},
                             'submodules': [],
-                            'version': '1.2.0'
+                            'version': '1.6.1-beta'
                         },
                         {
-                            'root': {'dependencies': [], 'providers': []},
+                            'root': {
+                                'dependencies': [
+                                    {
+                                        'name': 'hashicorp-registry-module',
+                                        'source': 'matthewjohn/test-module/null',
+                                        'version': '1.5.0'
+                                    },
+                                    {
+                                        'name': 'local-registry-module',
+                                        'source': 'my-registry.example.com/matthewjohn/test-module/null',
+                                        'version': '2.1.3'
+                                    }
+                                ],
+                                'providers': [
+                                    {
+                                        'name': 'random',
+                                        'namespace': 'hashicorp',
+                                        'source': '',
+                                        'version': '>= 5.2.1, < 6.0.0'
+                                    },
+                                    {
+                                        'name': 'unsafe',
+                                        'namespace': 'someothercompany',
+                                        'source': '',
+                                        'version': '2.0.0'
+                                    }
+                                ]
+                            },
                             'submodules': [],
-                            'version': '1.6.1-beta'
+                            'version': '1.5.0'
                         },
                         {
                             'root': {'dependencies': [], 'providers': []},
                             'submodules': [],
-                            'version': '1.5.0'
+                            'version': '1.2.0'
                         }
                     ]
                 }
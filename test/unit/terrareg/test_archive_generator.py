@@ -0,0 +1,151 @@
+
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+
+from terrareg.archive_generator import ArchiveGenerator
+from test.unit.terrareg import TerraregUnitTest
+
+
+class NonSeekableWriter:
+    """Writable file handle, which does not support seek or tell"""
+
+    def __init__(self):
+        """Create buffer"""
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        """Write data to buffer"""
+        return self.buffer.write(data)
+
+    def flush(self):
+        """Do nothing"""
+        pass
+
+
+class TestArchiveGenerator(TerraregUnitTest):
+    """Test ArchiveGenerator class"""
+
+    @staticmethod
+    def _create_source_directory(source_directory):
+        """Create test files in source directory"""
+        files = {
+            'main.tf': '# Main file',
+            '.hidden-file.tf': '# Hidden file',
+            'subdir/nested-file.tf': '# Nested file',
+            'excluded-dir/file.tf': '# Excluded directory',
+            'excluded-file.tf': '# Excluded file',
+            'large-file.tf': '# Large file\n' * 100000,
+        }
+        for path, content in files.items():
+            os.makedirs(os.path.join(source_directory, os.path.dirname(path)), exist_ok=True)
+            with open(os.path.join(source_directory, path), 'w') as fh:
+                fh.write(content)
+        os.symlink('main.tf', os.path.join(source_directory, 'link.tf'))
+
+    def _generate(self, tar_gz_fh, zip_fh):
+        """Generate archives of test directory"""
+        with tempfile.TemporaryDirectory() as source_directory:
+            self._create_source_directory(source_directory)
+
+            filter_calls = []
+            def exclude_filter(path):
+                filter_calls.append(path)
+                return path in ['excluded-dir', 'excluded-file.tf']
+
+            ArchiveGenerator(source_directory=source_directory, exclude_filter=exclude_filter).generate(
+                tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
+
+        # Ensure excluded directory is not traversed
+        assert 'excluded-dir/file.tf' not in filter_calls
+
+    def _check_archives(self, tar_gz_content, zip_content):
+        """Ensure generated archives contain expected files"""
+        expected_files = {
+            '.hidden-file.tf': b'# Hidden file',
+            'large-file.tf': b'# Large file\n' * 100000,
+            'main.tf': b'# Main file',
+            'subdir/nested-file.tf': b'# Nested file',
+        }
+
+        with tarfile.open(fileobj=io.BytesIO(tar_gz_content), mode='r:gz') as tar:
+            members = tar.getmembers()
+            assert [member.name for member in members] == [
+                '.hidden-file.tf', 'large-file.tf', 'link.tf', 'main.tf', 'subdir', 'subdir/nested-file.tf'
+            ]
+            assert {
+                member.name: tar.extractfile(member).read()
+                for member in members
+                if member.isfile()
+            } == expected_files
+            link = tar.getmember('link.tf')
+            assert link.issym()
+            assert link.linkname == 'main.tf'
+            assert tar.getmember('subdir').isdir()
+
+        with zipfile.ZipFile(io.BytesIO(zip_content)) as zip_:
+            assert zip_.testzip() is None
+            assert [info.filename for info in zip_.infolist()] == [
+                '.hidden-file.tf', 'large-file.tf', 'link.tf', 'main.tf', 'subdir/', 'subdir/nested-file.tf'
+            ]
+            assert {
+                name: zip_.read(name)
+                for name in expected_files
+            } == expected_files
+            assert zip_.getinfo('subdir/').is_dir()
+            # Ensure symlink is stored as a regular file, containing the content of the link target
+            assert (zip_.getinfo('link.tf').external_attr >> 16) & 0o170000 == 0o100000
+            assert zip_.read('link.tf') == b'# Main file'
+
+    def test_generate(self):
+        """Test generating archives to seekable file handles"""
+        tar_gz_fh = io.BytesIO()
+        zip_fh = io.BytesIO()
+        self._generate(tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
+        self._check_archives(tar_gz_content=tar_gz_fh.getvalue(), zip_content=zip_fh.getvalue())
+
+    def test_generate_non_seekable(self):
+        """Test generating archives to file handles that do not support seek"""
+        tar_gz_fh = NonSeekableWriter()
+        zip_fh = NonSeekableWriter()
+        self._generate(tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
+        self._check_archives(tar_gz_content=tar_gz_fh.buffer.getvalue(), zip_content=zip_fh.buffer.getvalue())
+
+    def test_generate_zip_symlinks(self):
+        """Test symlinks are replaced with the content of link targets within the source directory in the zip archive"""
+        with tempfile.TemporaryDirectory() as parent_directory:
+            source_directory = os.path.join(parent_directory, 'module')
+            os.makedirs(os.path.join(source_directory, 'shared'))
+            with open(os.path.join(source_directory, 'shared', 'variables.tf'), 'w') as fh:
+                fh.write('variable "name" {\n  type = string\n}\n')
+            with open(os.path.join(parent_directory, 'outside.tf'), 'w') as fh:
+                fh.write('# Outside of module')
+
+            os.makedirs(os.path.join(source_directory, 'modules', 'submodule'))
+            os.symlink('../../shared/variables.tf', os.path.join(source_directory, 'modules', 'submodule', 'variables.tf'))
+            os.symlink('shared', os.path.join(source_directory, 'shared-link'))
+            os.symlink('../outside.tf', os.path.join(source_directory, 'outside.tf'))
+            os.symlink('.', os.path.join(source_directory, 'loop'))
+
+            tar_gz_fh = io.BytesIO()
+            zip_fh = io.BytesIO()
+            ArchiveGenerator(source_directory=source_directory, exclude_filter=lambda path: False).generate(
+                tar_gz_fh=tar_gz_fh, zip_fh=zip_fh)
+
+        with zipfile.ZipFile(io.BytesIO(zip_fh.getvalue())) as zip_:
+            # Ensure symlinks outside of the source directory and symlink loops are not followed
+            assert sorted(zip_.namelist()) == [
+                'modules/', 'modules/submodule/', 'modules/submodule/variables.tf',
+                'shared-link/', 'shared-link/variables.tf',
+                'shared/', 'shared/variables.tf',
+            ]
+            assert zip_.read('modules/submodule/variables.tf') == b'variable "name" {\n  type = string\n}\n'
+            assert zip_.read('shared-link/variables.tf') == b'variable "name" {\n  type = string\n}\n'
+
+        # Ensure symlinks are retained as links in tar.gz
+        with tarfile.open(fileobj=io.BytesIO(tar_gz_fh.getvalue()), mode='r:gz') as tar:
+            assert tar.getmember('modules/submodule/variables.tf').issym()
+            assert tar.getmember('shared-link').issym()
+            assert tar.getmember('outside.tf').issym()
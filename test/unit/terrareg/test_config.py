@@ -51,8 +51,10 @@ class TestConfig:
         ('APPLICATION_NAME', None),
         ('CONTRIBUTED_NAMESPACE_LABEL', None),
         ('DATABASE_URL', None),
+        ('DATABASE_READ_URL', None),
         ('DATA_DIRECTORY', 'unittest-value/data'),
         ('UPLOAD_DIRECTORY', None),
+        ('GIT_MIRROR_CACHE_DIRECTORY', None),
         ('EXAMPLES_DIRECTORY', None),
         ('EXAMPLE_ANALYTICS_TOKEN', None),
         ('GIT_PROVIDER_CONFIG', None),
@@ -98,9 +100,13 @@ class TestConfig:
         ('GO_PACKAGE_CACHE_DIRECTORY', None),
         ('PROVIDER_CATEGORIES', None),
         ('PROVIDER_SOURCES', None),
+        ('PROVIDER_SOURCE_HTTP_CACHE_DIRECTORY', None),
         ('SITE_WARNING', None),
         ('UPSTREAM_GIT_CREDENTIALS_USERNAME', None),
         ('UPSTREAM_GIT_CREDENTIALS_PASSWORD', None),
+        ('TERRAFORM_BINARY_CACHE_DIRECTORY', None),
+        ('TERRAFORM_PLUGIN_CACHE_DIRECTORY', None),
+        ('ANALYTICS_BUFFER_SPOOL_DIRECTORY', None),
     ])
     def test_string_configs(self, config_name, override_expected_value):
         """Test string configs to ensure they are overridden with environment variables."""
@@ -124,7 +130,8 @@ class TestConfig:
             assert getattr(terrareg.config.Config(), config_name) == ""
 
     @pytest.mark.parametrize('config_name, test_value, test_expected', [
-        ('SENTRY_TRACES_SAMPLE_RATE', '1.523', 1.523)
+        ('SENTRY_TRACES_SAMPLE_RATE', '1.523', 1.523),
+        ('ANALYTICS_BUFFER_FLUSH_INTERVAL', '1.523', 1.523),
     ])
     def test_custom_string_configs(self, config_name, test_value, test_expected):
         """Test string configs with custom values to ensure they are overridden with environment variables."""
@@ -139,6 +146,32 @@ class TestConfig:
         'REDIRECT_DELETION_LOOKBACK_DAYS',
         'TERRAFORM_OIDC_IDP_SESSION_EXPIRY',
         'TERRAFORM_PRESIGNED_URL_EXPIRY_SECONDS',
+        'MODULE_EXTRACTION_WORKER_COUNT',
+        'MODULE_EXTRACTION_WORKER_POLL_INTERVAL',
+        'MODULE_EXTRACTION_JOB_MAX_ATTEMPTS',
+        'MODULE_EXTRACTION_JOB_RETRY_BACKOFF',
+        'MODULE_EXTRACTION_JOB_RUNNING_TIMEOUT',
+        'SUBMODULE_EXTRACTION_CONCURRENCY',
+        'SUBMODULE_EXTRACTION_TIMEOUT',
+        'PROVIDER_ARTIFACT_DOWNLOAD_CONCURRENCY',
+        'PROVIDER_ARTIFACT_DOWNLOAD_RETRIES',
+        'PROVIDER_SOURCE_HTTP_POOL_SIZE',
+        'PROVIDER_SOURCE_RATE_LIMIT_MAX_WAIT',
+        'PROVIDER_RELEASE_POLL_INTERVAL',
+        'PROVIDER_INDEX_WORKER_COUNT',
+        'PROVIDER_INDEX_SOURCE_CONCURRENCY',
+        'PROVIDER_INDEX_JOB_MAX_ATTEMPTS',
+        'PROVIDER_INDEX_JOB_RETRY_BACKOFF',
+        'TERRAFORM_PLUGIN_CACHE_MAX_SIZE',
+        'ANALYTICS_BUFFER_MAX_EVENTS',
+        'ANALYTICS_RETENTION_DAYS',
+        'GIT_MIRROR_CACHE_MAX_SIZE',
+        'MARKDOWN_CACHE_MAX_SIZE',
+        'SEARCH_INDEX_REFRESH_INTERVAL',
+        'DATABASE_POOL_SIZE',
+        'DATABASE_POOL_MAX_OVERFLOW',
+        'DATABASE_POOL_TIMEOUT',
+        'DATABASE_POOL_RECYCLE',
     ])
     def test_integer_configs(self, config_name):
         """Test integer configs to ensure they are overridden with environment variables."""
@@ -183,6 +216,7 @@ class TestConfig:
         ('ALLOW_MODULE_HOSTING', terrareg.config.ModuleHostingMode, terrareg.config.ModuleHostingMode.ALLOW),
         ('DEFAULT_UI_DETAILS_VIEW', terrareg.config.DefaultUiInputOutputView, terrareg.config.DefaultUiInputOutputView.TABLE),
         ('PRODUCT', terrareg.config.Product, terrareg.config.Product.TERRAFORM),
+        ('SEARCH_INDEX', terrareg.config.SearchIndexType, terrareg.config.SearchIndexType.DATABASE),
     ])
     def test_enum_configs(self, config_name, enum, expected_default):
         """Test enum configs to ensure they are overridden with environment variables."""
@@ -234,6 +268,10 @@ class TestConfig:
         'ALLOW_UNAUTHENTICATED_ACCESS',
         'AUTO_GENERATE_GITHUB_ORGANISATION_NAMESPACES',
         'MODULE_VERSION_USE_GIT_COMMIT',
+        'ASYNC_MODULE_EXTRACTION',
+        'ENABLE_GIT_MIRROR_CACHE',
+        'INCREMENTAL_MODULE_EXTRACTION',
+        'DATABASE_POOL_PRE_PING',
     ])
     def test_boolean_configs(self, config_name, test_value, expected_value):
         """Test boolean configs to ensure they are overridden with environment variables."""
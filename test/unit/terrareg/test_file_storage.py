@@ -302,6 +302,39 @@ class TestLocalFileStorage(TerraregUnitTest):
             with open(os.path.join(temp_dir, file), "r") as fh:
                 assert fh.read() == "Test write content"
 
+    def test_open_writer(self):
+        """Test open_writer method"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+
+            with instance.open_writer(dest_directory="/dest_directory", dest_filename="dest_file") as fh:
+                fh.write(b"Test ")
+                fh.write(b"streamed content")
+                # Ensure destination file is not created until writer is closed
+                assert not os.path.exists(os.path.join(temp_dir, "dest_directory", "dest_file"))
+
+            assert os.listdir(os.path.join(temp_dir, "dest_directory")) == ["dest_file"]
+            with open(os.path.join(temp_dir, "dest_directory", "dest_file"), "rb") as fh:
+                assert fh.read() == b"Test streamed content"
+
+    def test_open_writer_error(self):
+        """Test open_writer method removes temporary file and leaves existing file on error"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.mkdir(os.path.join(temp_dir, "dest_directory"))
+            with open(os.path.join(temp_dir, "dest_directory", "dest_file"), "w") as fh:
+                fh.write("Original content")
+
+            instance = terrareg.file_storage.LocalFileStorage(temp_dir)
+
+            with pytest.raises(Exception, match="Test error"):
+                with instance.open_writer(dest_directory="/dest_directory", dest_filename="dest_file") as fh:
+                    fh.write(b"Partial content")
+                    raise Exception("Test error")
+
+            assert os.listdir(os.path.join(temp_dir, "dest_directory")) == ["dest_file"]
+            with open(os.path.join(temp_dir, "dest_directory", "dest_file"), "r") as fh:
+                assert fh.read() == "Original content"
+
 
 @contextlib.contextmanager
 def create_s3_file_storage_with_bucket(bucket_name, bucket_path):
@@ -532,3 +565,92 @@ class TestS3FileStorage(TerraregUnitTest):
         """Test make_directory"""
         instance = terrareg.file_storage.S3FileStorage(s3_url='s3://test-bucket')
         instance.make_directory(directory="/test/dir")
+
+    def test_open_writer_error(self):
+        """Test open_writer aborts upload on error"""
+        instance = terrareg.file_storage.S3FileStorage(s3_url='s3://test-bucket/base-path')
+        mock_s3_client = unittest.mock.MagicMock()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "test-upload-id"}
+        mock_s3_client.upload_part.return_value = {"ETag": "test-etag"}
+        instance._s3_client = mock_s3_client
+
+        with unittest.mock.patch('terrareg.file_storage.S3MultipartUploadWriter.PART_SIZE', 10):
+            with pytest.raises(Exception, match="Test error"):
+                with instance.open_writer(dest_directory="/test/dir", dest_filename="file.zip") as fh:
+                    fh.write(b"Larger than a single part")
+                    raise Exception("Test error")
+
+        mock_s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket", Key="/base-path/test/dir/file.zip", UploadId="test-upload-id"
+        )
+        mock_s3_client.complete_multipart_upload.assert_not_called()
+        mock_s3_client.put_object.assert_not_called()
+
+    def test_open_writer_complete_error(self):
+        """Test open_writer aborts upload when completing upload fails"""
+        instance = terrareg.file_storage.S3FileStorage(s3_url='s3://test-bucket/base-path')
+        mock_s3_client = unittest.mock.MagicMock()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "test-upload-id"}
+        mock_s3_client.upload_part.return_value = {"ETag": "test-etag"}
+        mock_s3_client.complete_multipart_upload.side_effect = Exception("Complete error")
+        instance._s3_client = mock_s3_client
+
+        with unittest.mock.patch('terrareg.file_storage.S3MultipartUploadWriter.PART_SIZE', 10):
+            with pytest.raises(Exception, match="Complete error"):
+                with instance.open_writer(dest_directory="/test/dir", dest_filename="file.zip") as fh:
+                    fh.write(b"Larger than a single part")
+
+        mock_s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket", Key="/base-path/test/dir/file.zip", UploadId="test-upload-id"
+        )
+
+
+class TestS3MultipartUploadWriter(TerraregUnitTest):
+    """Test S3MultipartUploadWriter class"""
+
+    @staticmethod
+    def _get_mock_s3_client():
+        """Return mock s3 client"""
+        mock_s3_client = unittest.mock.MagicMock()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "test-upload-id"}
+        mock_s3_client.upload_part.side_effect = lambda PartNumber, **kwargs: {"ETag": f"etag-{PartNumber}"}
+        return mock_s3_client
+
+    def test_small_content(self):
+        """Test content smaller than a part is uploaded using put_object"""
+        mock_s3_client = self._get_mock_s3_client()
+        writer = terrareg.file_storage.S3MultipartUploadWriter(s3_client=mock_s3_client, bucket_name="test-bucket", key="/test-key")
+        writer.write(b"Test ")
+        writer.write(b"content")
+        assert writer.tell() == 12
+        writer.complete()
+
+        mock_s3_client.put_object.assert_called_once_with(Bucket="test-bucket", Key="/test-key", Body=b"Test content")
+        mock_s3_client.create_multipart_upload.assert_not_called()
+
+    def test_multipart_upload(self):
+        """Test content is uploaded in parts once buffer reaches part size"""
+        mock_s3_client = self._get_mock_s3_client()
+        with unittest.mock.patch('terrareg.file_storage.S3MultipartUploadWriter.PART_SIZE', 4):
+            writer = terrareg.file_storage.S3MultipartUploadWriter(s3_client=mock_s3_client, bucket_name="test-bucket", key="/test-key")
+            writer.write(b"abc")
+            mock_s3_client.upload_part.assert_not_called()
+            writer.write(b"defghij")
+            assert writer.tell() == 10
+            writer.complete()
+
+        mock_s3_client.create_multipart_upload.assert_called_once_with(Bucket="test-bucket", Key="/test-key")
+        assert mock_s3_client.upload_part.call_args_list == [
+            unittest.mock.call(Bucket="test-bucket", Key="/test-key", UploadId="test-upload-id", PartNumber=1, Body=b"abcd"),
+            unittest.mock.call(Bucket="test-bucket", Key="/test-key", UploadId="test-upload-id", PartNumber=2, Body=b"efgh"),
+            unittest.mock.call(Bucket="test-bucket", Key="/test-key", UploadId="test-upload-id", PartNumber=3, Body=b"ij"),
+        ]
+        mock_s3_client.complete_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket", Key="/test-key", UploadId="test-upload-id",
+            MultipartUpload={"Parts": [
+                {"ETag": "etag-1", "PartNumber": 1},
+                {"ETag": "etag-2", "PartNumber": 2},
+                {"ETag": "etag-3", "PartNumber": 3},
+            ]}
+        )
+        mock_s3_client.put_object.assert_not_called()
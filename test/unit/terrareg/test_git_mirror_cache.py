@@ -0,0 +1,155 @@
+
+import os
+import subprocess
+import tempfile
+import unittest.mock
+
+import pytest
+
+import terrareg.errors
+from terrareg.git_mirror_cache import GitMirrorCache
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestGitMirrorCache(TerraregUnitTest):
+    """Test GitMirrorCache class"""
+
+    @staticmethod
+    def _git(*args, cwd):
+        """Run git command in directory"""
+        subprocess.check_output(
+            ['git', '-c', 'user.name=Unit Test', '-c', 'user.email=unittest@example.com', *args],
+            cwd=cwd, stderr=subprocess.STDOUT)
+
+    def _create_repository(self, directory, tags):
+        """Create git repository with a commit for each tag"""
+        os.makedirs(directory)
+        self._git('init', cwd=directory)
+        for tag in tags:
+            with open(os.path.join(directory, 'main.tf'), 'w') as fh:
+                fh.write(f'# {tag}\n')
+            self._git('add', 'main.tf', cwd=directory)
+            self._git('commit', '-m', f'Release {tag}', cwd=directory)
+            self._git('tag', tag, cwd=directory)
+
+    def _clone(self, git_mirror_cache, git_url, tag, target_directory):
+        """Clone tag using git mirror cache"""
+        git_mirror_cache.clone(
+            git_url=git_url, authenticated_git_url=git_url, tag=tag,
+            target_directory=target_directory, env=os.environ.copy(), timeout=60)
+
+    def test_clone(self):
+        """Test cloning tags using mirror, fetching new tags incrementally"""
+        with tempfile.TemporaryDirectory() as temp_directory:
+            repository = os.path.join(temp_directory, 'repository')
+            cache_directory = os.path.join(temp_directory, 'cache')
+            self._create_repository(repository, ['v1.0.0'])
+            git_mirror_cache = GitMirrorCache(directory=cache_directory, max_size=0)
+            assert git_mirror_cache.get_statistics() is None
+
+            self._clone(git_mirror_cache, repository, 'v1.0.0', os.path.join(temp_directory, 'clone1'))
+            with open(os.path.join(temp_directory, 'clone1', 'main.tf')) as fh:
+                assert fh.read() == '# v1.0.0\n'
+            # Ensure clone is shallow
+            assert subprocess.check_output(
+                ['git', 'rev-parse', '--is-shallow-repository'],
+                cwd=os.path.join(temp_directory, 'clone1')).decode('utf-8').strip() == 'true'
+
+            # Add new tag to repository and clone, using the existing mirror
+            with open(os.path.join(repository, 'main.tf'), 'w') as fh:
+                fh.write('# v1.1.0\n')
+            self._git('commit', '-am', 'Release v1.1.0', cwd=repository)
+            self._git('tag', 'v1.1.0', cwd=repository)
+
+            self._clone(git_mirror_cache, repository, 'v1.1.0', os.path.join(temp_directory, 'clone2'))
+            with open(os.path.join(temp_directory, 'clone2', 'main.tf')) as fh:
+                assert fh.read() == '# v1.1.0\n'
+
+            statistics = git_mirror_cache.get_statistics()
+            assert statistics['hits'] == 1
+            assert statistics['misses'] == 1
+            assert statistics['evictions'] == 0
+            assert statistics['size'] > 0
+            assert os.listdir(cache_directory).count(GitMirrorCache._get_mirror_name(repository)) == 1
+
+    def test_clone_non_existent_tag(self):
+        """Test cloning non-existent tag raises error"""
+        with tempfile.TemporaryDirectory() as temp_directory:
+            repository = os.path.join(temp_directory, 'repository')
+            self._create_repository(repository, ['v1.0.0'])
+            git_mirror_cache = GitMirrorCache(directory=os.path.join(temp_directory, 'cache'), max_size=0)
+
+            with pytest.raises(subprocess.CalledProcessError):
+                self._clone(git_mirror_cache, repository, 'v2.0.0', os.path.join(temp_directory, 'clone'))
+
+    def test_clone_invalid_repository(self):
+        """Test failed initial fetch does not leave mirror in cache"""
+        with tempfile.TemporaryDirectory() as temp_directory:
+            cache_directory = os.path.join(temp_directory, 'cache')
+            git_mirror_cache = GitMirrorCache(directory=cache_directory, max_size=0)
+
+            with pytest.raises(subprocess.CalledProcessError):
+                self._clone(git_mirror_cache, os.path.join(temp_directory, 'doesnotexist'), 'v1.0.0', os.path.join(temp_directory, 'clone'))
+
+            assert git_mirror_cache._get_mirror_names() == []
+
+    def test_clone_evicts_least_recently_used(self):
+        """Test least recently used mirrors are evicted when cache exceeds maximum size"""
+        with tempfile.TemporaryDirectory() as temp_directory:
+            cache_directory = os.path.join(temp_directory, 'cache')
+            git_mirror_cache = GitMirrorCache(directory=cache_directory, max_size=1)
+
+            for repository_name in ['first', 'second']:
+                self._create_repository(os.path.join(temp_directory, repository_name), ['v1.0.0'])
+                self._clone(git_mirror_cache, os.path.join(temp_directory, repository_name), 'v1.0.0',
+                            os.path.join(temp_directory, f'clone-{repository_name}'))
+            assert len(git_mirror_cache._get_mirror_names()) == 2
+
+            with unittest.mock.patch.object(git_mirror_cache, '_max_size', 1):
+                self._clone(git_mirror_cache, os.path.join(temp_directory, 'second'), 'v1.0.0',
+                            os.path.join(temp_directory, 'clone-second-again'))
+
+            # Ensure only most recently used mirror remains
+            assert git_mirror_cache._get_mirror_names() == [GitMirrorCache._get_mirror_name(os.path.join(temp_directory, 'second'))]
+            assert git_mirror_cache.get_statistics()['evictions'] == 1
+
+    def test_get_directory_size_with_removed_file(self):
+        """Test calculating directory size ignores files that are removed whilst calculating the size"""
+        with tempfile.TemporaryDirectory() as temp_directory:
+            for file_name in ['packed', 'tmp_pack_abcdef']:
+                with open(os.path.join(temp_directory, file_name), 'w') as fh:
+                    fh.write('a' * 10)
+
+            original_lstat = os.lstat
+            def mock_lstat(path, *args, **kwargs):
+                if path.endswith('tmp_pack_abcdef'):
+                    raise FileNotFoundError(path)
+                return original_lstat(path, *args, **kwargs)
+
+            with unittest.mock.patch('terrareg.git_mirror_cache.os.lstat', mock_lstat):
+                assert GitMirrorCache._get_directory_size(temp_directory) == 10
+
+    def test_clone_with_record_usage_failure(self):
+        """Test failure to record statistics does not fail clone"""
+        with tempfile.TemporaryDirectory() as temp_directory:
+            repository = os.path.join(temp_directory, 'repository')
+            self._create_repository(repository, ['v1.0.0'])
+            git_mirror_cache = GitMirrorCache(directory=os.path.join(temp_directory, 'cache'), max_size=0)
+
+            with unittest.mock.patch.object(git_mirror_cache, '_record_usage',
+                                            unittest.mock.MagicMock(side_effect=FileNotFoundError('tmp_pack_abcdef'))):
+                self._clone(git_mirror_cache, repository, 'v1.0.0', os.path.join(temp_directory, 'clone'))
+
+            with open(os.path.join(temp_directory, 'clone', 'main.tf')) as fh:
+                assert fh.read() == '# v1.0.0\n'
+
+    def test_clone_with_lock(self):
+        """Test cloning whilst mirror is locked by another process"""
+        with tempfile.TemporaryDirectory() as temp_directory, \
+                unittest.mock.patch('terrareg.git_mirror_cache.GitMirrorCache.LOCK_TIMEOUT', 0):
+            repository = os.path.join(temp_directory, 'repository')
+            git_mirror_cache = GitMirrorCache(directory=temp_directory, max_size=0)
+
+            with git_mirror_cache._lock(f"{GitMirrorCache._get_mirror_name(repository)}.lock", timeout=0):
+                with pytest.raises(terrareg.errors.UnableToObtainGitMirrorCacheLockError):
+                    self._clone(git_mirror_cache, repository, 'v1.0.0', os.path.join(temp_directory, 'clone'))
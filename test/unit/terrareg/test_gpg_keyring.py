@@ -0,0 +1,98 @@
+
+import base64
+
+import pytest
+
+from terrareg.gpg_keyring import NamespaceGpgKeyring, SignatureIssuer, get_signature_issuer
+from test.unit.terrareg import TerraregUnitTest
+
+
+# Detached signature, generated by A0FC4319ABAF9C28A16821DF4F3072E58D16FF6D,
+# using an old-format packet with a 1 octet length
+TEST_SIGNATURE_OLD_FORMAT_1_OCTET_LENGTH = base64.b64decode("""
+iLMEAAEKAB0WIQSg/EMZq6+cKKFoId9PMHLljRb/bQUCZVsR+gAKCRBPMHLljRb/bXmpA/9Ycl/a
+9ZKFevCamJLjMxw2K7OV12hWdR5X5pZ/Rse1gAOYQNaSbKwchM0ChDh/nrFMYzvErHsw/he8OjOK
+G3KtIxGITPvTgjL7Zj0OxJSQAAgQN/bmDNM/jxhYevNsJjqnHeSBHm7U6IsLHFKNiSDj1c2yom4p
+UnkCiCt3juqNNA==
+""".strip())
+
+# Partial detached signature, generated by 16E88A0F65AB92F1FA56D916005534E75B5DA016,
+# using an old-format packet with a 2 octet length
+TEST_SIGNATURE_OLD_FORMAT_2_OCTET_LENGTH = base64.b64decode("""
+iQIzBAABCgAdFiEEFuiKD2WrkvH6VtkWAFU051tdoBYFAmVbihgACgkQAFU051tdoBbgqRAA46KT
+""".strip())
+
+
+class TestGetSignatureIssuer(TerraregUnitTest):
+    """Test get_signature_issuer function"""
+
+    @pytest.mark.parametrize('signature, expected_issuer', [
+        (TEST_SIGNATURE_OLD_FORMAT_1_OCTET_LENGTH, SignatureIssuer(
+            key_id="4F3072E58D16FF6D", fingerprint="A0FC4319ABAF9C28A16821DF4F3072E58D16FF6D")),
+        (TEST_SIGNATURE_OLD_FORMAT_2_OCTET_LENGTH, SignatureIssuer(
+            key_id="005534E75B5DA016", fingerprint="16E88A0F65AB92F1FA56D916005534E75B5DA016")),
+        # New format packet, containing only issuer key ID in unhashed subpackets
+        (bytes.fromhex("c212040001080000000a09104f3072e58d16ff6d"), SignatureIssuer(
+            key_id="4F3072E58D16FF6D", fingerprint=None)),
+        # Version 3 signature
+        (bytes.fromhex("8811030500000000004f3072e58d16ff6d0108"), SignatureIssuer(
+            key_id="4F3072E58D16FF6D", fingerprint=None)),
+    ])
+    def test_get_signature_issuer(self, signature, expected_issuer):
+        """Test obtaining issuer from signatures"""
+        assert get_signature_issuer(signature) == expected_issuer
+
+    def test_get_signature_issuer_ascii_armor(self):
+        """Test obtaining issuer from ASCII armored signature"""
+        signature = (
+            b"-----BEGIN PGP SIGNATURE-----\n"
+            b"Version: Unit Test\n"
+            b"\n" +
+            base64.encodebytes(TEST_SIGNATURE_OLD_FORMAT_1_OCTET_LENGTH) +
+            b"=abcd\n"
+            b"-----END PGP SIGNATURE-----\n"
+        )
+        assert get_signature_issuer(signature) == SignatureIssuer(
+            key_id="4F3072E58D16FF6D", fingerprint="A0FC4319ABAF9C28A16821DF4F3072E58D16FF6D")
+
+    @pytest.mark.parametrize('signature', [
+        b"",
+        b"Not a signature",
+        # Public key packet
+        bytes.fromhex("9803040000"),
+        # Truncated signature packet
+        TEST_SIGNATURE_OLD_FORMAT_1_OCTET_LENGTH[:10],
+        # Signature without issuer subpackets
+        bytes.fromhex("c20a040001080000000000"),
+    ])
+    def test_get_signature_issuer_invalid(self, signature):
+        """Test obtaining issuer from invalid signatures"""
+        assert get_signature_issuer(signature) is None
+
+
+class TestNamespaceGpgKeyring(TerraregUnitTest):
+    """Test NamespaceGpgKeyring class"""
+
+    def test_get(self):
+        """Test keyrings are retained per namespace"""
+        NamespaceGpgKeyring.invalidate(1)
+        NamespaceGpgKeyring.invalidate(2)
+
+        keyring = NamespaceGpgKeyring.get(1)
+        assert NamespaceGpgKeyring.get(1) is keyring
+        assert NamespaceGpgKeyring.get(2) is not keyring
+
+    def test_invalidate(self):
+        """Test invalidating keyring for namespace"""
+        keyring = NamespaceGpgKeyring.get(1)
+        other_keyring = NamespaceGpgKeyring.get(2)
+
+        NamespaceGpgKeyring.invalidate(1)
+
+        assert NamespaceGpgKeyring.get(1) is not keyring
+        assert NamespaceGpgKeyring.get(2) is other_keyring
+
+    def test_verify_without_keys(self):
+        """Test verify with no GPG keys"""
+        assert NamespaceGpgKeyring.get(1).verify(
+            gpg_keys=[], signature=TEST_SIGNATURE_OLD_FORMAT_1_OCTET_LENGTH, data=b"data") is None
@@ -0,0 +1,209 @@
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest.mock
+
+import pytest
+
+from terrareg.provider_source.http_client import ProviderSourceHttpClient
+from test.unit.terrareg import TerraregUnitTest
+
+
+class FakeGithubRequestHandler(BaseHTTPRequestHandler):
+    """Fake Github API, recording requests made to it"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        """Disable logging"""
+        pass
+
+    def _send(self, status_code, headers=None, body=None):
+        """Send response"""
+        content = json.dumps(body).encode('utf-8') if body is not None else b""
+        self.send_response(status_code)
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        if body is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        """Handle GET request"""
+        server = self.server
+        server.requests.append((self.path, dict(self.headers), self.client_address))
+
+        if self.path.startswith("/repos/etag"):
+            if self.headers.get("If-None-Match") == '"etag-1"':
+                self._send(304, {"ETag": '"etag-1"', "X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"})
+            else:
+                self._send(200, {"ETag": '"etag-1"'}, {"path": self.path, "authorization": self.headers.get("Authorization")})
+
+        elif self.path == "/repos/last-modified":
+            if self.headers.get("If-Modified-Since") == "Wed, 21 Oct 2015 07:28:00 GMT":
+                self._send(304)
+            else:
+                self._send(200, {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}, {"modified": True})
+
+        elif self.path == "/repos/no-cache":
+            self._send(200, {}, {"cached": False})
+
+        elif self.path == "/repos/rate-limited":
+            server.rate_limited_calls += 1
+            if server.rate_limited_calls == 1:
+                self._send(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 5)}, {"message": "API rate limit exceeded"})
+            else:
+                self._send(200, {}, {"rate_limited": False})
+
+        elif self.path == "/repos/exhausted":
+            self._send(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 5)}, {"exhausted": True})
+
+        else:
+            self._send(404, {}, {"message": "Not Found"})
+
+    def do_POST(self):
+        """Handle POST request"""
+        self.server.requests.append((self.path, dict(self.headers), self.client_address))
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._send(201, {"ETag": '"post-etag"'}, {"token": "unittest-token"})
+
+
+@pytest.fixture
+def fake_github():
+    """Run fake Github API server"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGithubRequestHandler)
+    server.requests = []
+    server.rate_limited_calls = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestProviderSourceHttpClient(TerraregUnitTest):
+    """Test ProviderSourceHttpClient class"""
+
+    @staticmethod
+    def _get_url(server, path):
+        """Return URL for fake server"""
+        return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+    def test_connection_reuse(self, fake_github):
+        """Test connections are re-used between requests"""
+        client = ProviderSourceHttpClient(cache_directory="", pool_size=1, rate_limit_max_wait=0)
+        for _ in range(3):
+            assert client.get(self._get_url(fake_github, "/repos/no-cache")).status_code == 200
+
+        assert len(fake_github.requests) == 3
+        assert len(set(client_address for _, _, client_address in fake_github.requests)) == 1
+
+    def test_conditional_request_etag(self, fake_github):
+        """Test cached response is returned for 304 response to request with If-None-Match"""
+        with tempfile.TemporaryDirectory() as cache_directory:
+            client = ProviderSourceHttpClient(cache_directory=cache_directory, pool_size=1, rate_limit_max_wait=0)
+            headers = {"Authorization": "Bearer unittest-token", "Accept": "application/vnd.github+json"}
+
+            res = client.get(self._get_url(fake_github, "/repos/etag"), params={"page": "1"}, headers=headers)
+            assert res.status_code == 200
+            assert res.json() == {"path": "/repos/etag?page=1", "authorization": "Bearer unittest-token"}
+            assert "If-None-Match" not in fake_github.requests[0][1]
+
+            res = client.get(self._get_url(fake_github, "/repos/etag"), params={"page": "1"}, headers=headers)
+            assert res.status_code == 200
+            assert res.json() == {"path": "/repos/etag?page=1", "authorization": "Bearer unittest-token"}
+            assert res.headers["X-RateLimit-Remaining"] == "4999"
+            assert fake_github.requests[1][1]["If-None-Match"] == '"etag-1"'
+
+            # Ensure headers passed by caller are not modified
+            assert headers == {"Authorization": "Bearer unittest-token", "Accept": "application/vnd.github+json"}
+
+    @pytest.mark.parametrize('params, headers', [
+        ({"page": "2"}, {"Authorization": "Bearer unittest-token"}),
+        ({"page": "1"}, {"Authorization": "Bearer other-token"}),
+        ({"page": "1"}, {"Authorization": "Bearer unittest-token", "Accept": "application/json"}),
+    ])
+    def test_conditional_request_different_request(self, params, headers, fake_github):
+        """Test cached responses are not used for requests with different parameters, credentials or accepted content"""
+        with tempfile.TemporaryDirectory() as cache_directory:
+            client = ProviderSourceHttpClient(cache_directory=cache_directory, pool_size=1, rate_limit_max_wait=0)
+            client.get(self._get_url(fake_github, "/repos/etag"), params={"page": "1"}, headers={"Authorization": "Bearer unittest-token"})
+
+            res = client.get(self._get_url(fake_github, "/repos/etag"), params=params, headers=headers)
+            assert res.status_code == 200
+            assert "If-None-Match" not in fake_github.requests[1][1]
+
+    def test_conditional_request_last_modified(self, fake_github):
+        """Test cached response is returned for 304 response to request with If-Modified-Since"""
+        with tempfile.TemporaryDirectory() as cache_directory:
+            client = ProviderSourceHttpClient(cache_directory=cache_directory, pool_size=1, rate_limit_max_wait=0)
+
+            assert client.get(self._get_url(fake_github, "/repos/last-modified")).json() == {"modified": True}
+            res = client.get(self._get_url(fake_github, "/repos/last-modified"))
+            assert res.status_code == 200
+            assert res.json() == {"modified": True}
+            assert fake_github.requests[1][1]["If-Modified-Since"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+
+    def test_response_without_validators_not_cached(self, fake_github):
+        """Test responses without ETag or Last-Modified headers are not cached"""
+        with tempfile.TemporaryDirectory() as cache_directory:
+            client = ProviderSourceHttpClient(cache_directory=cache_directory, pool_size=1, rate_limit_max_wait=0)
+            client.get(self._get_url(fake_github, "/repos/no-cache"))
+            client.post(self._get_url(fake_github, "/app/installations/1/access_tokens"), headers={})
+
+            assert [files for _, _, files in os.walk(cache_directory) if files] == []
+
+    def test_stream_requests_not_cached(self, fake_github):
+        """Test streamed requests are not made conditionally"""
+        with tempfile.TemporaryDirectory() as cache_directory:
+            client = ProviderSourceHttpClient(cache_directory=cache_directory, pool_size=1, rate_limit_max_wait=0)
+            client.get(self._get_url(fake_github, "/repos/etag"))
+            with client.get(self._get_url(fake_github, "/repos/etag"), stream=True) as res:
+                assert res.status_code == 200
+            assert "If-None-Match" not in fake_github.requests[1][1]
+
+    def test_rate_limited_request_retried(self, fake_github):
+        """Test request is retried after waiting for rate limit reset"""
+        client = ProviderSourceHttpClient(cache_directory="", pool_size=1, rate_limit_max_wait=60)
+        with unittest.mock.patch('terrareg.provider_source.http_client.time.sleep') as mock_sleep:
+            res = client.get(self._get_url(fake_github, "/repos/rate-limited"))
+
+        assert res.status_code == 200
+        assert res.json() == {"rate_limited": False}
+        assert fake_github.rate_limited_calls == 2
+        mock_sleep.assert_called_once()
+        assert 0 < mock_sleep.call_args[0][0] <= 7
+
+    def test_rate_limited_request_exceeds_max_wait(self, fake_github):
+        """Test rate limited request is not retried when reset is after maximum wait"""
+        client = ProviderSourceHttpClient(cache_directory="", pool_size=1, rate_limit_max_wait=1)
+        with unittest.mock.patch('terrareg.provider_source.http_client.time.sleep') as mock_sleep:
+            res = client.get(self._get_url(fake_github, "/repos/rate-limited"))
+
+        assert res.status_code == 403
+        assert fake_github.rate_limited_calls == 1
+        mock_sleep.assert_not_called()
+
+    def test_exhausted_rate_limit_delays_next_request(self, fake_github):
+        """Test requests are delayed after rate limit remaining reaches 0"""
+        client = ProviderSourceHttpClient(cache_directory="", pool_size=1, rate_limit_max_wait=60)
+        with unittest.mock.patch('terrareg.provider_source.http_client.time.sleep') as mock_sleep:
+            client.get(self._get_url(fake_github, "/repos/exhausted"), headers={"Authorization": "Bearer unittest-token"})
+            mock_sleep.assert_not_called()
+
+            # Request using different credentials are not delayed
+            client.get(self._get_url(fake_github, "/repos/no-cache"), headers={"Authorization": "Bearer other-token"})
+            mock_sleep.assert_not_called()
+
+            client.get(self._get_url(fake_github, "/repos/no-cache"), headers={"Authorization": "Bearer unittest-token"})
+            mock_sleep.assert_called_once()
+            assert 0 < mock_sleep.call_args[0][0] <= 7
@@ -0,0 +1,54 @@
+
+import unittest.mock
+
+from terrareg.rendered_markdown_cache import RenderedMarkdownCache
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestRenderedMarkdownCache(TerraregUnitTest):
+    """Test RenderedMarkdownCache class"""
+
+    def test_render(self):
+        """Test rendering markdown, using cached HTML for subsequent renders"""
+        markdown_cache = RenderedMarkdownCache(max_size=1)
+
+        html = markdown_cache.render(file_name='README.md', content='# Test heading\n\n<script>alert(1)</script>')
+        assert html == '<h1 id="terrareg-anchor-READMEmd-test-heading">Test heading</h1>\n&lt;script&gt;alert(1)&lt;/script&gt;'
+
+        with unittest.mock.patch('terrareg.utils.convert_markdown_to_html') as mock_convert_markdown_to_html:
+            assert markdown_cache.render(file_name='README.md', content='# Test heading\n\n<script>alert(1)</script>') == html
+            mock_convert_markdown_to_html.assert_not_called()
+
+        # Ensure file name, used for anchors, is part of key
+        assert markdown_cache.render(file_name='OTHER.md', content='# Test heading\n\n<script>alert(1)</script>') == \
+            '<h1 id="terrareg-anchor-OTHERmd-test-heading">Test heading</h1>\n&lt;script&gt;alert(1)&lt;/script&gt;'
+
+        assert markdown_cache.get_statistics() == {
+            'hits': 1, 'misses': 2, 'evictions': 0,
+            'size': len(html) + len(html) - len('README') + len('OTHER')
+        }
+
+    def test_render_evicts_least_recently_used(self):
+        """Test least recently used content is evicted when cache exceeds maximum size"""
+        markdown_cache = RenderedMarkdownCache(max_size=1)
+        with unittest.mock.patch('terrareg.rendered_markdown_cache.RenderedMarkdownCache._render',
+                                 unittest.mock.MagicMock(side_effect=lambda file_name, content: content * 400 * 1024)) as mock_render:
+            markdown_cache.render(file_name='', content='a')
+            markdown_cache.render(file_name='', content='b')
+            # Use first content, making second content the least recently used
+            markdown_cache.render(file_name='', content='a')
+            markdown_cache.render(file_name='', content='c')
+            assert mock_render.call_count == 3
+
+            assert markdown_cache.get_statistics() == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 800 * 1024}
+
+            markdown_cache.render(file_name='', content='a')
+            markdown_cache.render(file_name='', content='b')
+            assert mock_render.call_count == 4
+
+    def test_render_disabled(self):
+        """Test rendering markdown with cache disabled"""
+        markdown_cache = RenderedMarkdownCache(max_size=0)
+        assert markdown_cache.render(file_name='', content='_test_') == '<p><em>test</em></p>'
+        assert markdown_cache.render(file_name='', content='_test_') == '<p><em>test</em></p>'
+        assert markdown_cache.get_statistics() is None
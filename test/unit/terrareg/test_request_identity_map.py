@@ -0,0 +1,62 @@
+
+import flask
+
+from terrareg.database import Database
+from terrareg.request_identity_map import RequestIdentityMap
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestRequestIdentityMap(TerraregUnitTest):
+    """Test RequestIdentityMap class"""
+
+    @staticmethod
+    def _get_app():
+        """Return app registered for request-scoped database state"""
+        app = flask.Flask(__name__)
+        Database.register_app(app)
+        return app
+
+    def test_add_get(self):
+        """Test rows are stored under each key for the duration of the request"""
+        app = self._get_app()
+        row = {'id': 1, 'namespace': 'unittest'}
+        with app.test_request_context():
+            RequestIdentityMap.add('namespace', [('name', 'unittest'), ('pk', 1)], row)
+
+            assert RequestIdentityMap.get('namespace', ('name', 'unittest')) is row
+            assert RequestIdentityMap.get('namespace', ('pk', 1)) is row
+            assert RequestIdentityMap.get('namespace', ('pk', 2)) is None
+            assert RequestIdentityMap.get('module_provider', ('pk', 1)) is None
+
+        # Ensure rows are not retained between requests
+        with app.test_request_context():
+            assert RequestIdentityMap.get('namespace', ('pk', 1)) is None
+
+    def test_add_non_existent_row(self):
+        """Test non-existent rows are not stored"""
+        with self._get_app().test_request_context():
+            RequestIdentityMap.add('namespace', [('pk', 1)], None)
+            assert RequestIdentityMap.get('namespace', ('pk', 1)) is None
+
+    def test_invalidate(self):
+        """Test invalidating rows of table"""
+        with self._get_app().test_request_context():
+            RequestIdentityMap.add('namespace', [('pk', 1)], {'id': 1})
+            RequestIdentityMap.add('module_provider', [('pk', 1)], {'id': 1})
+
+            RequestIdentityMap.invalidate('namespace')
+
+            assert RequestIdentityMap.get('namespace', ('pk', 1)) is None
+            assert RequestIdentityMap.get('module_provider', ('pk', 1)) == {'id': 1}
+
+            RequestIdentityMap.clear()
+            assert RequestIdentityMap.get('module_provider', ('pk', 1)) is None
+
+    def test_outside_of_registered_request_context(self):
+        """Test rows are not stored outside of request contexts of registered apps"""
+        RequestIdentityMap.add('namespace', [('pk', 1)], {'id': 1})
+        assert RequestIdentityMap.get('namespace', ('pk', 1)) is None
+
+        with flask.Flask(__name__).test_request_context():
+            RequestIdentityMap.add('namespace', [('pk', 1)], {'id': 1})
+            assert RequestIdentityMap.get('namespace', ('pk', 1)) is None
@@ -0,0 +1,137 @@
+
+import unittest.mock
+
+import pytest
+
+from terrareg.search_index import InvertedSearchIndex
+from test.unit.terrareg import TerraregUnitTest
+
+
+class MockSearchIndex(InvertedSearchIndex):
+    """Search index containing pre-defined documents"""
+
+    FIELD_WEIGHTS = {
+        'name': 4.0,
+        'description': 1.0,
+    }
+
+    def __init__(self, documents):
+        """Store documents"""
+        super(MockSearchIndex, self).__init__()
+        self.documents = documents
+        self.load_calls = []
+
+    def _load_documents(self, document_ids=None):
+        """Return documents, filtered by IDs"""
+        self.load_calls.append(None if document_ids is None else set(document_ids))
+        return [
+            (document_id, fields, {'name': fields['name']})
+            for document_id, fields in self.documents.items()
+            if document_ids is None or document_id in document_ids
+        ]
+
+
+class TestInvertedSearchIndex(TerraregUnitTest):
+    """Test InvertedSearchIndex class"""
+
+    @pytest.fixture(autouse=True)
+    def mock_refresh_interval(self):
+        """Disable periodic rebuilding of index"""
+        with unittest.mock.patch('terrareg.config.Config.SEARCH_INDEX_REFRESH_INTERVAL', 0):
+            yield
+
+    @staticmethod
+    def _get_index():
+        """Return search index with test documents"""
+        return MockSearchIndex({
+            1: {'name': 'aws-vpc', 'description': 'Creates a VPC'},
+            2: {'name': 'aws-vpc-endpoints', 'description': 'Creates VPC endpoints for an existing VPC'},
+            3: {'name': 'gcp-network', 'description': 'Creates a network, similar to an AWS VPC'},
+            4: {'name': 'kubernetes', 'description': None},
+        })
+
+    @staticmethod
+    def _get_ids(results):
+        """Return document IDs ordered by score"""
+        return [document_id for document_id, _, _ in sorted(results, key=lambda result: -result[1])]
+
+    @pytest.mark.parametrize('text, expected_terms', [
+        (None, []),
+        ('', []),
+        ('aws-vpc', ['aws', 'vpc']),
+        ('My_Module v1.2', ['my', 'module', 'v1', '2']),
+    ])
+    def test_tokenise(self, text, expected_terms):
+        """Test tokenising text into terms"""
+        assert InvertedSearchIndex.tokenise(text) == expected_terms
+
+    def test_search_without_query(self):
+        """Test search without query returns all documents"""
+        results = self._get_index().search('')
+        assert sorted(document_id for document_id, _, _ in results) == [1, 2, 3, 4]
+        assert all(score == 0 for _, score, _ in results)
+
+    def test_search_ranking(self):
+        """Test matches in weighted fields and shorter documents are ranked higher"""
+        assert self._get_ids(self._get_index().search('vpc')) == [1, 2, 3]
+
+    def test_search_requires_all_terms(self):
+        """Test documents must match all terms of query"""
+        assert self._get_ids(self._get_index().search('vpc endpoints')) == [2]
+        assert self._get_index().search('vpc kubernetes') == []
+
+    def test_search_prefix_match(self):
+        """Test query terms match the prefix of terms, ranking exact matches higher"""
+        index = MockSearchIndex({
+            1: {'name': 'network-peering', 'description': None},
+            2: {'name': 'net', 'description': None},
+        })
+        assert self._get_ids(index.search('net')) == [2, 1]
+        assert self._get_ids(index.search('kube')) == []
+
+    def test_invalidate(self):
+        """Test invalidated documents are reloaded before search"""
+        index = self._get_index()
+        assert self._get_ids(index.search('kubernetes')) == [4]
+        assert index.load_calls == [None]
+
+        index.documents[4] = {'name': 'k8s', 'description': None}
+        index.documents[5] = {'name': 'kubernetes-cluster', 'description': None}
+        with unittest.mock.patch.object(MockSearchIndex, '_INSTANCE', index):
+            MockSearchIndex.invalidate(4)
+            MockSearchIndex.invalidate(5)
+
+        assert self._get_ids(index.search('kubernetes')) == [5]
+        assert self._get_ids(index.search('k8s')) == [4]
+        assert index.load_calls == [None, {4, 5}]
+
+        # Ensure removed documents are removed from index
+        del index.documents[5]
+        index._invalidate(5)
+        assert index.search('kubernetes') == []
+
+    def test_invalidate_all(self):
+        """Test index is rebuilt after invalidating all documents"""
+        index = self._get_index()
+        index.search('vpc')
+
+        index.documents = {6: {'name': 'azure-vnet', 'description': None}}
+        index._invalidate_all()
+
+        assert index.search('vpc') == []
+        assert self._get_ids(index.search('azure')) == [6]
+        assert index.load_calls == [None, None]
+
+    def test_refresh_interval(self):
+        """Test index is rebuilt once refresh interval has elapsed"""
+        index = self._get_index()
+        with unittest.mock.patch('terrareg.config.Config.SEARCH_INDEX_REFRESH_INTERVAL', 60), \
+                unittest.mock.patch('terrareg.search_index.time.time', unittest.mock.MagicMock(return_value=1000)):
+            index.search('vpc')
+            index.search('vpc')
+        assert index.load_calls == [None]
+
+        with unittest.mock.patch('terrareg.config.Config.SEARCH_INDEX_REFRESH_INTERVAL', 60), \
+                unittest.mock.patch('terrareg.search_index.time.time', unittest.mock.MagicMock(return_value=1060)):
+            index.search('vpc')
+        assert index.load_calls == [None, None]
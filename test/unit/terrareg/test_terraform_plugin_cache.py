@@ -0,0 +1,110 @@
+
+import fcntl
+import os
+import tempfile
+import time
+import unittest.mock
+
+import pytest
+
+import terrareg.errors
+from terrareg.terraform_plugin_cache import TerraformPluginCache
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestTerraformPluginCache(TerraregUnitTest):
+    """Test TerraformPluginCache class"""
+
+    @staticmethod
+    def _create_package(base_directory, package_path, size=0, symlink_to=None):
+        """Create provider package in directory"""
+        package_directory = os.path.join(base_directory, package_path)
+        os.makedirs(os.path.dirname(package_directory), exist_ok=True)
+        if symlink_to:
+            os.symlink(os.path.join(symlink_to, package_path), package_directory)
+        else:
+            os.makedirs(package_directory)
+            with open(os.path.join(package_directory, 'terraform-provider'), 'wb') as fh:
+                fh.write(b'0' * size)
+
+    def test_use(self):
+        """Test using plugin cache records hits and misses"""
+        with tempfile.TemporaryDirectory() as cache_directory, \
+                tempfile.TemporaryDirectory() as module_directory:
+            plugin_cache = TerraformPluginCache(directory=cache_directory, max_size=0)
+            assert plugin_cache.get_statistics() is None
+
+            self._create_package(cache_directory, 'registry.terraform.io/hashicorp/null/3.2.1/linux_amd64', size=10)
+
+            with plugin_cache.use(module_path=module_directory) as env:
+                module_cache_directory = os.path.join(module_directory, '.terraform', 'plugin-cache')
+                assert env['TF_PLUGIN_CACHE_DIR'] == module_cache_directory
+                assert env['TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE'] == 'true'
+
+                # Ensure module cache has been populated from shared cache
+                assert os.path.isfile(os.path.join(module_cache_directory, 'registry.terraform.io/hashicorp/null/3.2.1/linux_amd64/terraform-provider'))
+
+                # Mimic terraform init, downloading new provider into module cache
+                # and linking packages into the module
+                self._create_package(module_cache_directory, 'registry.terraform.io/hashicorp/random/3.5.1/linux_amd64', size=20)
+                providers_directory = os.path.join(module_directory, '.terraform', 'providers')
+                self._create_package(providers_directory, 'registry.terraform.io/hashicorp/null/3.2.1/linux_amd64', symlink_to=module_cache_directory)
+                self._create_package(providers_directory, 'registry.terraform.io/hashicorp/random/3.5.1/linux_amd64', symlink_to=module_cache_directory)
+
+            # Ensure downloaded provider has been added to shared cache
+            assert os.path.isfile(os.path.join(cache_directory, 'registry.terraform.io/hashicorp/random/3.5.1/linux_amd64/terraform-provider'))
+            assert plugin_cache.get_statistics() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 30}
+
+    def test_use_does_not_lock_during_init(self):
+        """Test plugin cache is not locked whilst module is being initialised"""
+        with tempfile.TemporaryDirectory() as cache_directory, \
+                tempfile.TemporaryDirectory() as module_directory:
+            plugin_cache = TerraformPluginCache(directory=cache_directory, max_size=0)
+
+            with plugin_cache.use(module_path=module_directory):
+                with open(os.path.join(cache_directory, '.lock'), 'w') as lock_fh:
+                    # Ensure lock can be obtained without blocking
+                    fcntl.flock(lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    def test_use_evicts_least_recently_used(self):
+        """Test least recently used packages are evicted when cache exceeds maximum size"""
+        with tempfile.TemporaryDirectory() as cache_directory, \
+                tempfile.TemporaryDirectory() as module_directory:
+            plugin_cache = TerraformPluginCache(directory=cache_directory, max_size=1)
+
+            old_package = 'registry.terraform.io/hashicorp/null/3.2.1/linux_amd64'
+            recent_package = 'registry.terraform.io/hashicorp/null/3.2.2/linux_amd64'
+            in_use_package = 'registry.terraform.io/hashicorp/random/3.5.1/linux_amd64'
+            self._create_package(cache_directory, old_package, size=512 * 1024)
+            self._create_package(cache_directory, recent_package, size=512 * 1024)
+            os.utime(os.path.join(cache_directory, old_package), (time.time() - 200, time.time() - 200))
+            os.utime(os.path.join(cache_directory, recent_package), (time.time() - 100, time.time() - 100))
+
+            with plugin_cache.use(module_path=module_directory) as env:
+                self._create_package(env['TF_PLUGIN_CACHE_DIR'], in_use_package, size=512 * 1024)
+                self._create_package(
+                    os.path.join(module_directory, '.terraform', 'providers'),
+                    in_use_package,
+                    symlink_to=env['TF_PLUGIN_CACHE_DIR']
+                )
+
+            # Ensure oldest package has been removed, along with the empty version directory
+            assert not os.path.exists(os.path.join(cache_directory, 'registry.terraform.io/hashicorp/null/3.2.1'))
+            assert os.path.isdir(os.path.join(cache_directory, recent_package))
+            assert os.path.isdir(os.path.join(cache_directory, in_use_package))
+
+            assert plugin_cache.get_statistics() == {'hits': 0, 'misses': 1, 'evictions': 1, 'size': 1024 * 1024}
+
+    def test_use_with_lock(self):
+        """Test using plugin cache whilst locked by another process"""
+        with tempfile.TemporaryDirectory() as cache_directory, \
+                unittest.mock.patch('terrareg.terraform_plugin_cache.TerraformPluginCache.LOCK_TIMEOUT', 0):
+            plugin_cache = TerraformPluginCache(directory=cache_directory, max_size=0)
+
+            with open(os.path.join(cache_directory, '.lock'), 'w') as lock_fh:
+                fcntl.flock(lock_fh, fcntl.LOCK_EX)
+
+                with pytest.raises(terrareg.errors.UnableToObtainTerraformPluginCacheLockError):
+                    with plugin_cache.use(module_path=cache_directory):
+                        pass
@@ -0,0 +1,73 @@
+
+import pytest
+
+from terrareg.version_sort_key import get_version_sort_key
+from test.unit.terrareg import TerraregUnitTest
+
+
+class TestVersionSortKey(TerraregUnitTest):
+
+    @pytest.mark.parametrize('version, expected_key', [
+        ('1.2.3', {'version_major': 1, 'version_minor': 2, 'version_patch': 3,
+                   'version_prerelease_rank': 2, 'version_prerelease': ''}),
+        ('0.1.09', {'version_major': 0, 'version_minor': 1, 'version_patch': 9,
+                    'version_prerelease_rank': 2, 'version_prerelease': ''}),
+        ('1.0.0-beta', {'version_major': 1, 'version_minor': 0, 'version_patch': 0,
+                        'version_prerelease_rank': 1, 'version_prerelease': 'b0000000000~'}),
+        ('1.0.0-rc02', {'version_major': 1, 'version_minor': 0, 'version_patch': 0,
+                        'version_prerelease_rank': 1, 'version_prerelease': 'rc0000000002~'}),
+        ('1.0.0-preview3', {'version_major': 1, 'version_minor': 0, 'version_patch': 0,
+                            'version_prerelease_rank': 1, 'version_prerelease': 'rc0000000003~'}),
+        ('1.0.0-rc1dev2', {'version_major': 1, 'version_minor': 0, 'version_patch': 0,
+                           'version_prerelease_rank': 1, 'version_prerelease': 'rc0000000001.0000000002'}),
+        ('1.0.0-dev1', {'version_major': 1, 'version_minor': 0, 'version_patch': 0,
+                        'version_prerelease_rank': 0, 'version_prerelease': '0000000001'}),
+        ('1.0.0-1', {'version_major': 1, 'version_minor': 0, 'version_patch': 0,
+                     'version_prerelease_rank': 3, 'version_prerelease': '0000000001~'}),
+        ('1.0.0-r2', {'version_major': 1, 'version_minor': 0, 'version_patch': 0,
+                      'version_prerelease_rank': 3, 'version_prerelease': '0000000002~'}),
+        # Invalid versions
+        ('1.0', {'version_major': 0, 'version_minor': 0, 'version_patch': 0,
+                 'version_prerelease_rank': 0, 'version_prerelease': ''}),
+        (None, {'version_major': 0, 'version_minor': 0, 'version_patch': 0,
+                'version_prerelease_rank': 0, 'version_prerelease': ''}),
+    ])
+    def test_get_version_sort_key(self, version, expected_key):
+        """Test sort key column values for versions"""
+        assert get_version_sort_key(version) == expected_key
+
+    def test_version_sort_key_ordering(self):
+        """Test ordering of versions by sort key"""
+        versions = [
+            '1.0.0-beta10', '0.1.10', '10.0.0', '1.0.0', '1.0.0-rc1',
+            '0.1.09', '1.0.0-beta2', '2.0.0', '1.0.0-beta', '1.0.1-alpha'
+        ]
+        versions.sort(key=lambda version: tuple(get_version_sort_key(version).values()), reverse=True)
+        assert versions == [
+            '10.0.0', '2.0.0', '1.0.1-alpha', '1.0.0', '1.0.0-rc1',
+            '1.0.0-beta10', '1.0.0-beta2', '1.0.0-beta', '0.1.10', '0.1.09'
+        ]
+
+    def test_version_sort_key_suffix_ordering(self):
+        """Test ordering of development, pre-release and post-release suffixes"""
+        versions = [
+            '1.0.0-r1', '1.0.0-b2', '1.0.0', '1.0.0-dev', '1.0.0-beta1', '1.0.0-1',
+            '1.0.0-c1', '1.0.0-alpha', '1.0.0-rc2', '1.0.0-dev2', '1.0.0-post2', '1.0.0-rc1dev', '1.0.0-a1'
+        ]
+        versions.sort(key=lambda version: tuple(get_version_sort_key(version).values()))
+        assert versions == [
+            '1.0.0-dev', '1.0.0-dev2', '1.0.0-alpha', '1.0.0-a1', '1.0.0-beta1', '1.0.0-b2',
+            '1.0.0-rc1dev', '1.0.0-c1', '1.0.0-rc2', '1.0.0', '1.0.0-r1', '1.0.0-1', '1.0.0-post2'
+        ]
+
+    @pytest.mark.parametrize('version, equivalent_version', [
+        ('1.0.0-b1', '1.0.0-beta1'),
+        ('1.0.0-a', '1.0.0-alpha0'),
+        ('1.0.0-pre1', '1.0.0-rc1'),
+        ('1.0.0-preview1', '1.0.0-c1'),
+        ('1.0.0-rev1', '1.0.0-1'),
+        ('1.0.0-RC1', '1.0.0-rc1'),
+    ])
+    def test_version_sort_key_equivalent_suffixes(self, version, equivalent_version):
+        """Test sort keys of equivalent suffixes are equal"""
+        assert get_version_sort_key(version) == get_version_sort_key(equivalent_version)